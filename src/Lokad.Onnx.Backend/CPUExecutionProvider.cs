@@ -47,6 +47,9 @@ public class CPUExecutionProvider : Runtime
         OpType.ReduceMean,
         OpType.ReduceMax,
         OpType.Softmax,
+        OpType.Gelu,
+        OpType.LayerNormalization,
+        OpType.MatMulAdd,
     };
 
     public static OptimizationMode OptimizationMode { get; set; } = OptimizationMode.Speed;
@@ -79,7 +82,13 @@ public class CPUExecutionProvider : Runtime
         }
     }
 
-    public static OpResult Add(ITensor? A, ITensor? B)
+    /// <summary>
+    /// Add two tensors with broadcasting.
+    /// </summary>
+    /// <param name="destination">If not null, a tensor that the output is written to when it is a dense tensor with the type and shape of the output,
+    /// usually one of the inputs that is dead after this op. Otherwise the output is written to a new tensor. The other elementwise ops take
+    /// the same parameter.</param>
+    public static OpResult Add(ITensor? A, ITensor? B, ITensor? destination = null)
     {
         var op = OpType.Add;
         if (A is null) return MissingInput(op, nameof(A));
@@ -89,29 +98,23 @@ public class CPUExecutionProvider : Runtime
             return WrongInputType(op, nameof(B), "Input tensors must be of the same type.", B);
         }
 
-        Profiler.StartOpStage(OpStage.Broadcast);
-        if (!ITensor.Broadcast(A, B, out var bA, out var bB))
+        // Broadcast operands are read in place by the kernels, so a broadcast operand is never materialized.
+        if (!ArrayUtilities.TryGetBroadcastShape(A.Dims, B.Dims, out var dims))
         {
             return CannotBroadcast(op, A, B);
         }
-        if (OptimizationMode == OptimizationMode.Speed)
-        {
-            Profiler.StartOpStage(OpStage.Copy);
-            bA = bA.ToDenseTensor();
-            bB = bB.ToDenseTensor();    
-        }
         Profiler.StartOpStage(OpStage.Math);
         switch (A.ElementType)
         {
-            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Add((Tensor<byte>)bA, (Tensor<byte>)bB));
-            case TensorElementType.Int32: return Success(op, Tensor<int>.Add((Tensor<int>)bA, (Tensor<int>)bB));
-            case TensorElementType.Float: return Success(op, Tensor<float>.Add((Tensor<float>)bA, (Tensor<float>)bB));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Add((Tensor<double>)bA, (Tensor<double>)bB));
+            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Add((Tensor<byte>)A, (Tensor<byte>)B, Destination<byte>(destination, dims)));
+            case TensorElementType.Int32: return Success(op, Tensor<int>.Add((Tensor<int>)A, (Tensor<int>)B, Destination<int>(destination, dims)));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Add((Tensor<float>)A, (Tensor<float>)B, Destination<float>(destination, dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Add((Tensor<double>)A, (Tensor<double>)B, Destination<double>(destination, dims)));
             default: return InputTypeNotSupported(op, nameof(A), A);
         }
     }
 
-    public static OpResult Sub(ITensor? A, ITensor? B)
+    public static OpResult Sub(ITensor? A, ITensor? B, ITensor? destination = null)
     {
         var op = OpType.Sub;
         if (A is null) return MissingInput(op, nameof(A));
@@ -120,29 +123,22 @@ public class CPUExecutionProvider : Runtime
         {
             return WrongInputType(op, nameof(B), "Input tensors must be of the same type.", B);
         }
-        Profiler.StartOpStage(OpStage.Broadcast);
-        if (!ITensor.Broadcast(A, B, out var bA, out var bB))
+        if (!ArrayUtilities.TryGetBroadcastShape(A.Dims, B.Dims, out var dims))
         {
             return CannotBroadcast(op, A, B);
         }
-        if (OptimizationMode == OptimizationMode.Speed)
-        {
-            Profiler.StartOpStage(OpStage.Copy);
-            bA = bA.ToDenseTensor();
-            bB = bB.ToDenseTensor();
-        }
         Profiler.StartOpStage(OpStage.Math);
         switch (A.ElementType)
         {
-            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Subtract((Tensor<byte>)bA, (Tensor<byte>)bB));
-            case TensorElementType.Int32: return Success(op, Tensor<int>.Subtract((Tensor<int>)bA, (Tensor<int>)bB));
-            case TensorElementType.Float: return Success(op, Tensor<float>.Subtract((Tensor<float>)bA, (Tensor<float>)bB));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Subtract((Tensor<double>)bA, (Tensor<double>)bB));
+            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Subtract((Tensor<byte>)A, (Tensor<byte>)B, Destination<byte>(destination, dims)));
+            case TensorElementType.Int32: return Success(op, Tensor<int>.Subtract((Tensor<int>)A, (Tensor<int>)B, Destination<int>(destination, dims)));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Subtract((Tensor<float>)A, (Tensor<float>)B, Destination<float>(destination, dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Subtract((Tensor<double>)A, (Tensor<double>)B, Destination<double>(destination, dims)));
             default: return InputTypeNotSupported(op, nameof(A), A);
         }
     }
 
-    public static OpResult Mul(ITensor? A, ITensor? B)
+    public static OpResult Mul(ITensor? A, ITensor? B, ITensor? destination = null)
     {
         var op = OpType.Mul;
         if (A is null) return MissingInput(op, nameof(A));
@@ -151,30 +147,22 @@ public class CPUExecutionProvider : Runtime
         {
             return WrongInputType(op, nameof(B), "Input tensors must be of the same type.", B);
         }
-        Profiler.StartOpStage(OpStage.Broadcast);
-        if (!ITensor.Broadcast(A, B, out var bA, out var bB))
+        if (!ArrayUtilities.TryGetBroadcastShape(A.Dims, B.Dims, out var dims))
         {
             return CannotBroadcast(op, A, B);
         }
-
-        if (OptimizationMode == OptimizationMode.Speed)
-        {
-            Profiler.StartOpStage(OpStage.Copy); 
-            bA = bA.ToDenseTensor();
-            bB = bB.ToDenseTensor();
-        }
-        Profiler.StartOpStage(OpStage.Math);     
+        Profiler.StartOpStage(OpStage.Math);
         switch (A.ElementType)
         {
-            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Multiply((Tensor<byte>)bA, (Tensor<byte>)bB));
-            case TensorElementType.Int32: return Success(op, Tensor<int>.Multiply((Tensor<int>)bA, (Tensor<int>)bB));
-            case TensorElementType.Float: return Success(op, Tensor<float>.Multiply((Tensor<float>)bA, (Tensor<float>)bB));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Multiply((Tensor<double>)bA, (Tensor<double>)bB));
+            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Multiply((Tensor<byte>)A, (Tensor<byte>)B, Destination<byte>(destination, dims)));
+            case TensorElementType.Int32: return Success(op, Tensor<int>.Multiply((Tensor<int>)A, (Tensor<int>)B, Destination<int>(destination, dims)));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Multiply((Tensor<float>)A, (Tensor<float>)B, Destination<float>(destination, dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Multiply((Tensor<double>)A, (Tensor<double>)B, Destination<double>(destination, dims)));
             default: return InputTypeNotSupported(op, nameof(A), A);
         }
     }
 
-    public static OpResult Div(ITensor? A, ITensor? B)
+    public static OpResult Div(ITensor? A, ITensor? B, ITensor? destination = null)
     {
         var op = OpType.Div;
         if (A is null) return MissingInput(op, nameof(A));
@@ -183,29 +171,21 @@ public class CPUExecutionProvider : Runtime
         {
             return WrongInputType(op, nameof(B), "Input tensors must be of the same type.", B);
         }
-        Profiler.StartOpStage(OpStage.Broadcast);
-        if (!ITensor.Broadcast(A, B, out var bA, out var bB))
+        if (!ArrayUtilities.TryGetBroadcastShape(A.Dims, B.Dims, out var dims))
         {
             return CannotBroadcast(op, A, B);
         }
-
-        if (OptimizationMode == OptimizationMode.Speed)
-        {
-            Profiler.StartOpStage(OpStage.Copy);
-            bA = bA.ToDenseTensor();
-            bB = bB.ToDenseTensor();
-        }
         Profiler.StartOpStage(OpStage.Math);
         switch (A.ElementType)
         {
-            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Divide((Tensor<byte>)bA, (Tensor<byte>)bB));
-            case TensorElementType.Float: return Success(op, Tensor<float>.Divide((Tensor<float>)bA, (Tensor<float>)bB));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Divide((Tensor<double>)bA, (Tensor<double>)bB));
+            case TensorElementType.UInt8: return Success(op, Tensor<byte>.Divide((Tensor<byte>)A, (Tensor<byte>)B, Destination<byte>(destination, dims)));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Divide((Tensor<float>)A, (Tensor<float>)B, Destination<float>(destination, dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Divide((Tensor<double>)A, (Tensor<double>)B, Destination<double>(destination, dims)));
             default: return InputTypeNotSupported(op, nameof(A), A);
         }
     }
 
-    public static OpResult Pow(ITensor? A, ITensor? B)
+    public static OpResult Pow(ITensor? A, ITensor? B, ITensor? destination = null)
     {
         var op = OpType.Pow;
         if (A is null) return MissingInput(op, nameof(A));
@@ -214,23 +194,15 @@ public class CPUExecutionProvider : Runtime
         {
             return WrongInputType(op, nameof(B), "Input tensors must be of the same type.", B);
         }
-        Profiler.StartOpStage(OpStage.Broadcast);    
-        if (!ITensor.Broadcast(A, B, out var bA, out var bB))
+        if (!ArrayUtilities.TryGetBroadcastShape(A.Dims, B.Dims, out var dims))
         {
             return CannotBroadcast(op, A, B);
         }
-
-        if (OptimizationMode == OptimizationMode.Speed)
-        {
-            Profiler.StartOpStage(OpStage.Copy);
-            bA = bA.ToDenseTensor();
-            bB = bB.ToDenseTensor();
-        }
         Profiler.StartOpStage(OpStage.Math);
         switch (A.ElementType)
         {
-            case TensorElementType.Float: return Success(op, Tensor<float>.Pow((Tensor<float>)bA, (Tensor<float>)bB));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Pow((Tensor<double>)bA, (Tensor<double>)bB));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Pow((Tensor<float>)A, (Tensor<float>)B, Destination<float>(destination, dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Pow((Tensor<double>)A, (Tensor<double>)B, Destination<double>(destination, dims)));
             default: return InputTypeNotSupported(op, nameof(A), A);
         }
     }
@@ -290,7 +262,7 @@ public class CPUExecutionProvider : Runtime
         }
     }
 
-    public static OpResult Relu(ITensor? X)
+    public static OpResult Relu(ITensor? X, ITensor? destination = null)
     {
         var op = OpType.Relu;
         if (X is null) return MissingInput(op, nameof(X));
@@ -302,8 +274,8 @@ public class CPUExecutionProvider : Runtime
         Profiler.StartOpStage(OpStage.Math);
         switch (X.ElementType)
         {
-            case TensorElementType.Float: return Success(op, Tensor<float>.Relu((Tensor<float>)X));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Relu((Tensor<double>)X));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Relu((Tensor<float>)X, Destination<float>(destination, X.Dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Relu((Tensor<double>)X, Destination<double>(destination, X.Dims)));
             default: return InputTypeNotSupported(op, nameof(X), X);
         }
     }
@@ -356,7 +328,7 @@ public class CPUExecutionProvider : Runtime
         }
     }
 
-    public static OpResult MatMul(ITensor? A, ITensor? B)
+    public static OpResult MatMul(ITensor? A, ITensor? B, ITensor? destination = null)
     {
         var op = OpType.MatMul;
         if (A is null) return MissingInput(op, nameof(A));
@@ -371,13 +343,43 @@ public class CPUExecutionProvider : Runtime
         switch (A.ElementType)
         {
             case TensorElementType.Int32: return Success(op, Tensor<int>.MatMul((Tensor<int>)A, (Tensor<int>)B));
-            case TensorElementType.Float: return Success(op, Tensor<float>.MatMul((Tensor<float>)A, (Tensor<float>)B));
+            case TensorElementType.Float: return Success(op, Tensor<float>.MatMul((Tensor<float>)A, (Tensor<float>)B, null, Destination<float>(destination, ShapeInference.MatMulShape(A.Dims, B.Dims))));
             case TensorElementType.Double: return Success(op, Tensor<double>.MatMul((Tensor<double>)A, (Tensor<double>)B));
             default: return InputTypeNotSupported(op, nameof(A), A);
         }
     }
 
-    public static OpResult Sqrt(ITensor? A)
+    /// <summary>
+    /// A MatMul followed by an Add of a bias with one element per column of the product, created by <see cref="GraphOptimizer.FuseMatMulAdd(ComputationalGraph)"/>.
+    /// The bias is added while computing the product instead of in a separate pass over the result. If the bias can't be added that way the 
+    /// op is executed as a MatMul and an Add.
+    /// </summary>
+    public static OpResult MatMulAdd(ITensor? A, ITensor? B, ITensor? C, ITensor? destination = null)
+    {
+        var op = OpType.MatMulAdd;
+        if (A is null) return MissingInput(op, nameof(A));
+        if (B is null) return MissingInput(op, nameof(B));
+        if (C is null) return MissingInput(op, nameof(C));
+
+        if (A.ElementType == TensorElementType.Float && B.ElementType == TensorElementType.Float && C.ElementType == TensorElementType.Float
+            && A.Rank >= 2 && B.Rank >= 2 && C.Rank >= 1 && C.Rank <= Math.Max(A.Rank, B.Rank) && C.Dims[^1] == B.Dims[^1] && C.Length == B.Dims[^1])
+        {
+            if (OptimizationMode == OptimizationMode.Speed)
+            {
+                Profiler.StartOpStage(OpStage.Copy);
+                A = A.ToDenseTensor();
+                B = B.ToDenseTensor();
+            }
+            return Success(op, Tensor<float>.MatMul((Tensor<float>)A, (Tensor<float>)B, (Tensor<float>)C, Destination<float>(destination, ShapeInference.MatMulShape(A.Dims, B.Dims))));
+        }
+        else
+        {
+            var r = MatMul(A, B);
+            return r.Status == OpStatus.Success ? Add(r.Outputs[0], C, destination) : r;
+        }
+    }
+
+    public static OpResult Sqrt(ITensor? A, ITensor? destination = null)
     {
         var op = OpType.Sqrt;
         if (A is null) return MissingInput(op, nameof(A));
@@ -389,21 +391,35 @@ public class CPUExecutionProvider : Runtime
         Profiler.StartOpStage(OpStage.Math);
         switch (A.ElementType)
         {
-            case TensorElementType.Float: return Success(op, Tensor<float>.Sqrt((Tensor<float>)A));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Sqrt((Tensor<double>)A));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Sqrt((Tensor<float>)A, Destination<float>(destination, A.Dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Sqrt((Tensor<double>)A, Destination<double>(destination, A.Dims)));
             default: return InputTypeNotSupported(op, nameof(A), A);
         }
     }
 
-    public static OpResult Erf(ITensor? X)
+    public static OpResult Erf(ITensor? X, ITensor? destination = null)
     {
         var op = OpType.Erf;
         if (X is null) return MissingInput(op, nameof(X));
         Profiler.StartOpStage(OpStage.Math);
         switch (X.ElementType)
         {
-            case TensorElementType.Float: return Success(op, Tensor<float>.Erf((Tensor<float>)X));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Erf((Tensor<double>)X));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Erf((Tensor<float>)X, Destination<float>(destination, X.Dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Erf((Tensor<double>)X, Destination<double>(destination, X.Dims)));
+            default: return InputTypeNotSupported(op, nameof(X), X);
+        }
+    }
+
+    public static OpResult Gelu(ITensor? X, string? approximate = null, ITensor? destination = null)
+    {
+        var op = OpType.Gelu;
+        if (X is null) return MissingInput(op, nameof(X));
+        if (approximate is not null && approximate != "none" && approximate != "tanh") return AttributeNotSupported(op, nameof(approximate), approximate);
+        Profiler.StartOpStage(OpStage.Math);
+        switch (X.ElementType)
+        {
+            case TensorElementType.Float: return Success(op, Tensor<float>.Gelu((Tensor<float>)X, approximate == "tanh", Destination<float>(destination, X.Dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Gelu((Tensor<double>)X, approximate == "tanh", Destination<double>(destination, X.Dims)));
             default: return InputTypeNotSupported(op, nameof(X), X);
         }
     }
@@ -448,25 +464,30 @@ public class CPUExecutionProvider : Runtime
         }
     }
 
-    public static OpResult Cast(ITensor? input, long to)
+    public static OpResult Cast(ITensor? input, long to, ITensor? destination = null)
     {
         var op = OpType.Cast;
         if (input is null) return MissingInput(op, nameof(input));
-        Profiler.StartOpStage(OpStage.Copy);
         var type = (TensorElementType)to;
+        if (ReferenceEquals(destination, input) && input.ElementType == type)
+        {
+            // Casting a tensor to its own type in place leaves it unchanged.
+            return Success(op, input);
+        }
+        Profiler.StartOpStage(OpStage.Copy);
         switch (type)
         {
-            case TensorElementType.Bool: return Success(op, input.Cast<bool>());
-            case TensorElementType.Int8: return Success(op, input.Cast<sbyte>());
-            case TensorElementType.UInt8: return Success(op, input.Cast<byte>());
-            case TensorElementType.Int16: return Success(op, input.Cast<short>());
-            case TensorElementType.UInt16: return Success(op, input.Cast<ushort>());
-            case TensorElementType.Int32: return Success(op, input.Cast<int>());
-            case TensorElementType.UInt32: return Success(op, input.Cast<uint>());
-            case TensorElementType.Int64: return Success(op, input.Cast<long>());
-            case TensorElementType.UInt64: return Success(op, input.Cast<ulong>());
-            case TensorElementType.Float: return Success(op, input.Cast<float>());
-            case TensorElementType.Double: return Success(op, input.Cast<double>());
+            case TensorElementType.Bool: return Success(op, CastTo<bool>(input, destination));
+            case TensorElementType.Int8: return Success(op, CastTo<sbyte>(input, destination));
+            case TensorElementType.UInt8: return Success(op, CastTo<byte>(input, destination));
+            case TensorElementType.Int16: return Success(op, CastTo<short>(input, destination));
+            case TensorElementType.UInt16: return Success(op, CastTo<ushort>(input, destination));
+            case TensorElementType.Int32: return Success(op, CastTo<int>(input, destination));
+            case TensorElementType.UInt32: return Success(op, CastTo<uint>(input, destination));
+            case TensorElementType.Int64: return Success(op, CastTo<long>(input, destination));
+            case TensorElementType.UInt64: return Success(op, CastTo<ulong>(input, destination));
+            case TensorElementType.Float: return Success(op, CastTo<float>(input, destination));
+            case TensorElementType.Double: return Success(op, CastTo<double>(input, destination));
             //case TensorElementType.Float16: return Success(op, input.Cast<Half>());
             //case TensorElementType.BFloat16: return Success(op, input.Cast<BFloat16>());
             //case TensorElementType.Complex64: return Success(op, input.Cast<System.Numerics.Complex>());
@@ -677,7 +698,7 @@ public class CPUExecutionProvider : Runtime
         }
     }
 
-    public static OpResult Softmax(ITensor? input, int? _axis)
+    public static OpResult Softmax(ITensor? input, int? _axis, ITensor? destination = null)
     {
         var op = OpType.Softmax;
         if (input is null) return MissingInput(op, nameof(input));
@@ -688,11 +709,45 @@ public class CPUExecutionProvider : Runtime
         }
         switch (input.ElementType)
         {
-            case TensorElementType.Float: return Success(op, Tensor<float>.Softmax((Tensor<float>) input, axis));
-            case TensorElementType.Double: return Success(op, Tensor<double>.Softmax((Tensor<double>) input, axis));
+            case TensorElementType.Float: return Success(op, Tensor<float>.Softmax((Tensor<float>) input, axis, Destination<float>(destination, input.Dims)));
+            case TensorElementType.Double: return Success(op, Tensor<double>.Softmax((Tensor<double>) input, axis, Destination<double>(destination, input.Dims)));
             default: return InputTypeNotSupported(op, nameof(input), input);
         }
     }
+
+    /// <summary>
+    /// Layer normalization over the dimensions from <paramref name="_axis"/> to the last dimension.
+    /// </summary>
+    /// <param name="outputs">The number of outputs of the node: Y, and optionally the Mean and InvStdDev of each normalized slice.</param>
+    /// <param name="destination">A tensor Y can be written to instead of a new tensor.</param>
+    public static OpResult LayerNormalization(ITensor? X, ITensor? Scale, ITensor? B, int? _axis, float? _epsilon, int outputs = 1, ITensor? destination = null)
+    {
+        var op = OpType.LayerNormalization;
+        if (X is null) return MissingInput(op, nameof(X));
+        if (Scale is null) return MissingInput(op, nameof(Scale));
+        if (X.ElementType != TensorElementType.Float) return InputTypeNotSupported(op, nameof(X), X);
+        if (Scale.ElementType != X.ElementType) return WrongInputType(op, nameof(Scale), X.ElementType, Scale);
+        if (B is not null && B.ElementType != X.ElementType) return WrongInputType(op, nameof(B), X.ElementType, B);
+        var axis = _axis.HasValue ? _axis.Value : -1;
+        var epsilon = _epsilon.HasValue ? _epsilon.Value : 1e-5f;
+        var Y = Tensor<float>.LayerNormalization((Tensor<float>) X, (Tensor<float>) Scale, (Tensor<float>?) B, axis, epsilon, out var mean, out var invStdDev, 
+            Destination<float>(destination, X.Dims));
+        return Success(op, new ITensor[] { Y, mean, invStdDev }.Take(outputs).ToArray());
+    }
+
+    /// <summary>
+    /// The tensor an op with an output of type <typeparamref name="T"/> and shape <paramref name="dims"/> can write its output to, or null if 
+    /// <paramref name="destination"/> is not a writable dense row-major tensor with this type and shape.
+    /// </summary>
+    private static Tensor<T>? Destination<T>(ITensor? destination, int[]? dims) where T : unmanaged =>
+        destination is DenseTensor<T> { IsReversedStride: false, IsReadOnly: false } d && dims is not null && d.Dimensions.SequenceEqual(dims) ? d : null;
+
+    /// <summary>
+    /// Cast a tensor to <typeparamref name="U"/> in its own buffer if <paramref name="destination"/> is the tensor and its elements have the 
+    /// size of <typeparamref name="U"/>, or to a new tensor otherwise.
+    /// </summary>
+    private static ITensor CastTo<U>(ITensor input, ITensor? destination) where U : unmanaged =>
+        (ReferenceEquals(destination, input) ? input.CastInPlace<U>() : null) ?? input.Cast<U>();
 }
 
 
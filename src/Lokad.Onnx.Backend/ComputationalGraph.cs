@@ -1,9 +1,11 @@
 ﻿namespace Lokad.Onnx;
 
 using System;
+using System.Collections.Concurrent;
 using System.Collections.Generic;
 using System.Diagnostics;
 using System.Linq;
+using System.Threading.Tasks;
 
 using Satsuma;
 
@@ -18,7 +20,7 @@ public class ComputationalGraph : Runtime
 
     public Dictionary<string, ITensor> Outputs = new Dictionary<string, ITensor>();
 
-    public Dictionary<string, ITensor> Initializers = new Dictionary<string, ITensor>();
+    public InitializerDictionary Initializers = new InitializerDictionary();
 
     public Dictionary<string, ITensor?> IntermediateOutputs = new Dictionary<string, ITensor?>();
 
@@ -31,6 +33,44 @@ public class ComputationalGraph : Runtime
     public Dictionary<string, object> Metadata = new Dictionary<string, object>();
 
     public Dictionary<string, string> MetadataProps = new Dictionary<string, string>();
+
+    /// <summary>
+    /// If true, intermediate tensors are released as soon as their last consumer has executed instead of being kept until <see cref="Reset(bool)"/>.
+    /// Peak memory use during execution is then bounded by the tensors that are live at the same time rather than the sum of all intermediate tensors.
+    /// </summary>
+    public bool ReleaseDeadTensors = false;
+
+    /// <summary>
+    /// If true, elementwise nodes of a compiled plan write their output to the buffer of an input tensor that is dead after the node executes 
+    /// instead of allocating a new tensor. See <see cref="PlanNode.InPlaceInput"/>.
+    /// </summary>
+    public bool ExecuteInPlace = false;
+
+    /// <summary>
+    /// If not null, tensors created while executing a compiled plan draw their buffers from this arena and dead tensors return them to it.
+    /// </summary>
+    public TensorArena? Arena = null;
+
+    /// <summary>
+    /// The maximum number of nodes of a compiled plan that may execute concurrently. Nodes whose inputs are all available are scheduled 
+    /// on a bounded pool of workers, so independent branches of the graph like the query, key and value projections of an attention block 
+    /// run in parallel. Each node computes the same values regardless of scheduling so graph outputs are deterministic. 1 executes nodes 
+    /// sequentially in graph order.
+    /// </summary>
+    public int InterOpParallelism = 1;
+
+    /// <summary>
+    /// The maximum number of shape-specialized plans cached by <see cref="GetPlan(object, bool, IReadOnlyCollection{string}?)"/>. When the cache is full it is cleared, 
+    /// so graphs executed with many different input shapes like variable sequence lengths do not accumulate plans.
+    /// </summary>
+    public int MaxSpecializedPlans = 16;
+
+    private readonly ConcurrentDictionary<string, ExecutionPlan> plans = new ConcurrentDictionary<string, ExecutionPlan>();
+
+    // The nodes of the weighted graph that produce each tensor, and the nodes that consume tensors whose producer was not added yet.
+    private readonly Dictionary<string, Satsuma.Node> weightedGraphProducers = new Dictionary<string, Satsuma.Node>();
+
+    private readonly Dictionary<string, List<Satsuma.Node>> weightedGraphConsumers = new Dictionary<string, List<Satsuma.Node>>();
     #endregion
 
     #region Methods
@@ -45,7 +85,249 @@ public class ComputationalGraph : Runtime
 
     public ITensor[] GetInputTensors(string[] names) => names.Select(n => GetInputTensor(n)).ToArray();
 
-    public Dictionary<string, ITensor> GetRequiredInputs(bool useInitializers)
+    /// <summary>
+    /// Liveness analysis of intermediate tensors. 
+    /// </summary>
+    /// <returns>The index in <see cref="Nodes"/> of the last node that consumes each intermediate tensor. Intermediate tensors that 
+    /// are never consumed are mapped to the node that produces them.</returns>
+    public Dictionary<string, int> GetIntermediateTensorLastUses() => GetIntermediateTensorLastUses(Nodes);
+
+    /// <summary>
+    /// Liveness analysis of intermediate tensors for a subset of the graph nodes in execution order.
+    /// </summary>
+    /// <returns>The index in <paramref name="nodes"/> of the last node that consumes each intermediate tensor.</returns>
+    public Dictionary<string, int> GetIntermediateTensorLastUses(IReadOnlyList<Node> nodes)
+    {
+        var lastUses = new Dictionary<string, int>();
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            foreach (var o in nodes[i].Outputs)
+            {
+                if (IntermediateOutputs.ContainsKey(o))
+                {
+                    lastUses[o] = i;
+                }
+            }
+            foreach (var input in nodes[i].Inputs)
+            {
+                if (IntermediateOutputs.ContainsKey(input) && !Inputs.ContainsKey(input) && !Initializers.ContainsKey(input))
+                {
+                    lastUses[input] = i;
+                }
+            }
+        }
+        return lastUses;
+    }
+
+    public Dictionary<string, int> GetProducers() => GetProducers(Nodes);
+
+    /// <summary>
+    /// Get the index in <paramref name="nodes"/> of the node that produces each tensor.
+    /// </summary>
+    public static Dictionary<string, int> GetProducers(IReadOnlyList<Node> nodes)
+    {
+        var producers = new Dictionary<string, int>();
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            foreach (var output in nodes[i].Outputs)
+            {
+                producers[output] = i;
+            }
+        }
+        return producers;
+    }
+
+    public Dictionary<string, List<int>> GetConsumers() => GetConsumers(Nodes);
+
+    /// <summary>
+    /// Get the indices in <paramref name="nodes"/> of the nodes that consume each tensor. A node that uses a tensor for several of its inputs is
+    /// listed once.
+    /// </summary>
+    public static Dictionary<string, List<int>> GetConsumers(IReadOnlyList<Node> nodes)
+    {
+        var consumers = new Dictionary<string, List<int>>();
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            foreach (var input in nodes[i].Inputs.Distinct())
+            {
+                if (string.IsNullOrEmpty(input)) continue;
+                if (!consumers.TryGetValue(input, out var c))
+                {
+                    c = new List<int>();
+                    consumers.Add(input, c);
+                }
+                c.Add(i);
+            }
+        }
+        return consumers;
+    }
+
+    public int[][] GetPredecessors() => GetPredecessors(Nodes);
+
+    /// <summary>
+    /// Get the indices in <paramref name="nodes"/> of the nodes that produce the inputs of each node, in ascending order.
+    /// </summary>
+    public static int[][] GetPredecessors(IReadOnlyList<Node> nodes)
+    {
+        var producers = GetProducers(nodes);
+        var predecessors = new int[nodes.Count][];
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            var p = new SortedSet<int>();
+            foreach (var input in nodes[i].Inputs)
+            {
+                if (!string.IsNullOrEmpty(input) && producers.TryGetValue(input, out var j) && j != i)
+                {
+                    p.Add(j);
+                }
+            }
+            predecessors[i] = p.ToArray();
+        }
+        return predecessors;
+    }
+
+    public List<Node> GetRequiredNodes(IEnumerable<string> tensorNames) => GetRequiredNodes(Nodes, tensorNames);
+
+    /// <summary>
+    /// Get the nodes that must execute to compute the tensors in <paramref name="tensorNames"/>: the nodes that produce them and,
+    /// transitively, the nodes that produce their inputs. The nodes are returned in the same order as in <paramref name="nodes"/>.
+    /// </summary>
+    public static List<Node> GetRequiredNodes(IReadOnlyList<Node> nodes, IEnumerable<string> tensorNames)
+    {
+        var producers = GetProducers(nodes);
+        var required = new bool[nodes.Count];
+        var stack = new Stack<int>();
+        foreach (var name in tensorNames)
+        {
+            if (producers.TryGetValue(name, out var p) && !required[p])
+            {
+                required[p] = true;
+                stack.Push(p);
+            }
+        }
+        while (stack.Count > 0)
+        {
+            foreach (var input in nodes[stack.Pop()].Inputs)
+            {
+                if (!string.IsNullOrEmpty(input) && producers.TryGetValue(input, out var p) && !required[p])
+                {
+                    required[p] = true;
+                    stack.Push(p);
+                }
+            }
+        }
+        return nodes.Where((_, i) => required[i]).ToList();
+    }
+
+    public bool IsTopologicallySorted() => IsTopologicallySorted(Nodes);
+
+    /// <summary>
+    /// True if every node comes after the nodes that produce its inputs.
+    /// </summary>
+    public static bool IsTopologicallySorted(IReadOnlyList<Node> nodes)
+    {
+        var predecessors = GetPredecessors(nodes);
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            if (predecessors[i].Length > 0 && predecessors[i][^1] > i)
+            {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    public List<Node> GetTopologicalOrder() => GetTopologicalOrder(Nodes);
+
+    /// <summary>
+    /// Sort nodes so that every node comes after the nodes that produce its inputs. Among the nodes whose inputs are available, the node that
+    /// comes first in <paramref name="nodes"/> is placed first, so nodes that are already sorted keep their order.
+    /// </summary>
+    /// <exception cref="InvalidOperationException">The nodes have a cycle.</exception>
+    public static List<Node> GetTopologicalOrder(IReadOnlyList<Node> nodes)
+    {
+        var predecessors = GetPredecessors(nodes);
+        var successors = nodes.Select(_ => new List<int>()).ToArray();
+        var pending = new int[nodes.Count];
+        var ready = new PriorityQueue<int, int>();
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            pending[i] = predecessors[i].Length;
+            foreach (var p in predecessors[i])
+            {
+                successors[p].Add(i);
+            }
+            if (pending[i] == 0)
+            {
+                ready.Enqueue(i, i);
+            }
+        }
+        var order = new List<Node>(nodes.Count);
+        while (ready.TryDequeue(out var i, out _))
+        {
+            order.Add(nodes[i]);
+            foreach (var s in successors[i])
+            {
+                if (--pending[s] == 0)
+                {
+                    ready.Enqueue(s, s);
+                }
+            }
+        }
+        if (order.Count != nodes.Count)
+        {
+            throw new InvalidOperationException($"The graph nodes have a cycle that includes the node {nodes[Array.FindIndex(pending, p => p > 0)].Name}.");
+        }
+        return order;
+    }
+
+    /// <summary>
+    /// Add a node to <see cref="WeightedDirectedGraph"/> with an arc from the node that produces each of its inputs. Nodes can be added in
+    /// any order: arcs from producers that are added later are created when the producer is added.
+    /// </summary>
+    internal void AddWeightedGraphNode(Node node)
+    {
+        WeightedDirectedGraph.AddNode(node.Name);
+        foreach (var input in node.Inputs)
+        {
+            if (string.IsNullOrEmpty(input))
+            {
+                continue;
+            }
+            if (weightedGraphProducers.TryGetValue(input, out var p))
+            {
+                WeightedDirectedGraph.AddArc(p, node.WeightedGraphNode, Satsuma.Directedness.Directed, label: input);
+            }
+            else
+            {
+                if (!weightedGraphConsumers.TryGetValue(input, out var c))
+                {
+                    c = new List<Satsuma.Node>();
+                    weightedGraphConsumers.Add(input, c);
+                }
+                c.Add(node.WeightedGraphNode);
+            }
+        }
+        foreach (var output in node.Outputs)
+        {
+            weightedGraphProducers[output] = node.WeightedGraphNode;
+            if (weightedGraphConsumers.Remove(output, out var consumers))
+            {
+                foreach (var c in consumers)
+                {
+                    WeightedDirectedGraph.AddArc(node.WeightedGraphNode, c, Satsuma.Directedness.Directed, label: output);
+                }
+            }
+        }
+    }
+
+    public Dictionary<string, ITensor> GetRequiredInputs(bool useInitializers) => GetRequiredInputs(Inputs, useInitializers);
+
+    /// <summary>
+    /// Get the graph inputs that must be provided by the user. When initializers are used, graph inputs that have an initializer with the same
+    /// shape and type are assigned the initializer value in <paramref name="Inputs"/>.
+    /// </summary>
+    public Dictionary<string, ITensor> GetRequiredInputs(Dictionary<string, ITensor> Inputs, bool useInitializers)
     {
         var requiredInputs = new Dictionary<string, ITensor>(Inputs);
         if (useInitializers)
@@ -72,10 +354,12 @@ public class ComputationalGraph : Runtime
         return requiredInputs;
     }
 
-    public bool ResolveInputs(ITensor[] userInputs, bool useInitializers)
+    public bool ResolveInputs(ITensor[] userInputs, bool useInitializers) => ResolveInputs(Inputs, userInputs, useInitializers);
+
+    public bool ResolveInputs(Dictionary<string, ITensor> Inputs, ITensor[] userInputs, bool useInitializers)
     {
         var op = Begin("Resolving {c} graph inputs for execution", Inputs.Count);
-        var requiredInputs = GetRequiredInputs(useInitializers);   
+        var requiredInputs = GetRequiredInputs(Inputs, useInitializers);   
         Info("{uic} user input(s) required for graph execution: {uig}.", requiredInputs.Count, requiredInputs.Select(ui => ui.Value.TensorNameDesc()));
         if (userInputs.Length != requiredInputs.Count)
         {
@@ -101,10 +385,12 @@ public class ComputationalGraph : Runtime
         return true;
     }
 
-    public bool ResolveInputs(Dictionary<string, ITensor> userInputs, bool useInitializers)
+    public bool ResolveInputs(Dictionary<string, ITensor> userInputs, bool useInitializers) => ResolveInputs(Inputs, userInputs, useInitializers);
+
+    public bool ResolveInputs(Dictionary<string, ITensor> Inputs, Dictionary<string, ITensor> userInputs, bool useInitializers)
     {
         var op = Begin("Resolving {c} graph inputs for execution", Inputs.Count);
-        var requiredInputs = GetRequiredInputs(useInitializers);
+        var requiredInputs = GetRequiredInputs(Inputs, useInitializers);
         Info("{uic} user input(s) required for graph execution: {uig}.", requiredInputs.Count, requiredInputs.Select(ui => ui.Value.TensorNameDesc()));
         if (userInputs.Count != requiredInputs.Count)
         {
@@ -196,30 +482,103 @@ public class ComputationalGraph : Runtime
         return true;
     }
 
-    public bool Execute(object userInputs, bool useInitializers, ExecutionProvider provider = ExecutionProvider.CPU)
+    /// <summary>
+    /// True if <paramref name="tensor"/> is backed by the same managed array as a materialized initializer or a constant of <paramref name="plan"/>, 
+    /// e.g. a graph output that is an initializer or a Reshape or Identity of a weight. Writing to such a tensor changes the model.
+    /// </summary>
+    public bool SharesInitializerArray(ITensor tensor, ExecutionPlan? plan = null) =>
+        Initializers.Keys.Any(n => Initializers.IsMaterialized(n) && ITensor.SharesArray(tensor, Initializers[n])) ||
+        (plan is not null && plan.Constants.Values.Any(c => ITensor.SharesArray(tensor, c)));
+
+    protected bool ValidateOutputBuffers(Dictionary<string, ITensor>? outputBuffers) => ValidateOutputBuffers(Outputs, outputBuffers);
+
+    protected bool ValidateOutputBuffers(Dictionary<string, ITensor> Outputs, Dictionary<string, ITensor>? outputBuffers)
     {
-        if (userInputs is ITensor[] uia)
+        if (outputBuffers is null)
+        {
+            return true;
+        }
+        foreach (var kv in outputBuffers)
         {
-            if (!ResolveInputs(uia, useInitializers))
+            if (!Outputs.ContainsKey(kv.Key))
             {
+                Error("The output buffer {b} does not correspond to a graph output.", kv.Key);
+                return false;
+            }
+            if (kv.Value.ElementType != Outputs[kv.Key].ElementType)
+            {
+                Error("The output buffer {b} has element type {t} but the graph output has element type {o}.", kv.Key, kv.Value.ElementType, Outputs[kv.Key].ElementType);
                 return false;
             }
         }
+        return true;
+    }
+
+    protected bool ResolveUserInputs(object userInputs, bool useInitializers) => ResolveUserInputs(Inputs, userInputs, useInitializers);
+
+    protected bool ResolveUserInputs(Dictionary<string, ITensor> Inputs, object userInputs, bool useInitializers)
+    {
+        if (userInputs is ITensor[] uia)
+        {
+            return ResolveInputs(Inputs, uia, useInitializers);
+        }
         else if (userInputs is Dictionary<string, ITensor> uid)
         {
-            if (!ResolveInputs(uid, useInitializers))
+            return ResolveInputs(Inputs, uid, useInitializers);
+        }
+        else
+        {
+            Error("Unsupported user inputs type: {t}.", userInputs.GetType().Name);
+            return false;
+        }
+    }
+
+    protected bool AssignOutput(Node node, string name, ITensor output, Dictionary<string, ITensor>? outputBuffers) => AssignOutput(Outputs, node, name, output, outputBuffers);
+
+    protected bool AssignOutput(Dictionary<string, ITensor> Outputs, Node node, string name, ITensor output, Dictionary<string, ITensor>? outputBuffers)
+    {
+        if (outputBuffers is not null && outputBuffers.TryGetValue(name, out var ob))
+        {
+            if (!ob.Dims.SequenceEqual(output.Dims))
             {
+                Error("Cannot write node {n} output {o} with shape {s} to output buffer with shape {bs}.", node.Name, name, output.Dims, ob.Dims);
                 return false;
             }
+            // The output was already written to the buffer if the kernel of the node used it as the destination.
+            if (!ReferenceEquals(output, ob))
+            {
+                output.CopyTo(ob);
+            }
+            Outputs[name] = ob;
+            ob.Name = name;
         }
         else
         {
-            Error("Unsupported user inputs type: {t}.", userInputs.GetType().Name);
+            Outputs[name] = output;
+            output.Name = name;
+        }
+        return true;
+    }
+
+    public bool Execute(object userInputs, bool useInitializers, ExecutionProvider provider = ExecutionProvider.CPU) =>
+        Execute(userInputs, useInitializers, null, provider);
+
+    /// <summary>
+    /// Execute the graph writing the values of graph outputs into caller-provided tensors.
+    /// </summary>
+    /// <param name="outputBuffers">Preallocated tensors keyed by graph output name. Each tensor must have the same element type and shape as the corresponding output. 
+    /// Graph outputs not in the dictionary are allocated as usual. When the graph is executed with a compiled plan, a node that computes an output with a 
+    /// buffer writes it directly to the buffer if its kernel can, so a buffer must not share memory with an input tensor.</param>
+    public bool Execute(object userInputs, bool useInitializers, Dictionary<string, ITensor>? outputBuffers, ExecutionProvider provider = ExecutionProvider.CPU)
+    {
+        if (!ValidateOutputBuffers(outputBuffers) || !ResolveUserInputs(userInputs, useInitializers))
+        {
             return false;
         }
 
         int count = 0;
         var op = Begin("Executing graph {n} from {f}", Metadata["Name"], ModelFile);
+        var lastUses = ReleaseDeadTensors ? GetIntermediateTensorLastUses() : null;
         
         foreach (var node in Nodes) 
         {
@@ -259,10 +618,21 @@ public class ComputationalGraph : Runtime
                         IntermediateOutputs[node.Outputs[i]] = r.Outputs[i];
                         r.Outputs[i].Name = node.Outputs[i];
                     }
-                    else
+                    else if (!AssignOutput(node, node.Outputs[i], r.Outputs[i], outputBuffers))
                     {
-                        Outputs[node.Outputs[i]] = r.Outputs[i];
-                        r.Outputs[i].Name = node.Outputs[i];
+                        Error("Stopping graph execution at node {c} {n}.", count, node.Name);
+                        return false;
+                    }
+                }
+                if (lastUses is not null)
+                {
+                    foreach (var t in node.Inputs.Concat(node.Outputs))
+                    {
+                        if (lastUses.TryGetValue(t, out var last) && last == count - 1)
+                        {
+                            Debug("Releasing dead intermediate tensor {t}.", t);
+                            IntermediateOutputs[t] = null;
+                        }
                     }
                 }
             }
@@ -271,10 +641,390 @@ public class ComputationalGraph : Runtime
         return true;    
     }
 
+    /// <summary>
+    /// Compile the graph into an execution plan that can be run with <see cref="Execute(ExecutionPlan, object, bool, Dictionary{string, ITensor}?)"/>.
+    /// </summary>
+    public ExecutionPlan Compile(ExecutionProvider provider = ExecutionProvider.CPU) => new ExecutionPlan(this, provider);
+
+    /// <summary>
+    /// Compile the graph into an execution plan specialized for the given graph input shapes.
+    /// </summary>
+    public ExecutionPlan Compile(IReadOnlyDictionary<string, int[]> inputShapes, ExecutionProvider provider = ExecutionProvider.CPU) => 
+        new ExecutionPlan(this, inputShapes, provider);
+
+    /// <summary>
+    /// Compile the graph into an execution plan that only computes the tensors in <paramref name="outputNames"/>. These can be any graph 
+    /// outputs or intermediate tensors, and only the nodes they depend on are executed.
+    /// </summary>
+    public ExecutionPlan Compile(IReadOnlyCollection<string> outputNames, ExecutionProvider provider = ExecutionProvider.CPU) => 
+        new ExecutionPlan(this, null, outputNames, provider);
+
+    /// <summary>
+    /// Compile the graph into an execution plan specialized for the given graph input shapes that only computes the tensors in <paramref name="outputNames"/>.
+    /// </summary>
+    public ExecutionPlan Compile(IReadOnlyDictionary<string, int[]> inputShapes, IReadOnlyCollection<string> outputNames, ExecutionProvider provider = ExecutionProvider.CPU) =>
+        new ExecutionPlan(this, inputShapes, outputNames, provider);
+
+    /// <summary>
+    /// Get an execution plan specialized for the shapes of the user inputs. Plans are compiled on first use and cached by input shapes,
+    /// so repeated executions with the same shapes like a fixed batch size and sequence length reuse the same plan.
+    /// </summary>
+    /// <param name="outputNames">If not null, the plan only computes these tensors.</param>
+    public ExecutionPlan GetPlan(object userInputs, bool useInitializers, IReadOnlyCollection<string>? outputNames = null)
+    {
+        var key = (useInitializers ? "i;" : ";") + userInputs switch
+        {
+            ITensor[] uia => uia.Select(t => t.Dims.Select(d => d.ToString()).JoinWith("x")).JoinWith(","),
+            Dictionary<string, ITensor> uid => ShapeInference.ShapeKey(uid.ToDictionary(kv => kv.Key, kv => kv.Value.Dims)),
+            _ => throw new ArgumentException($"Unsupported user inputs type: {userInputs.GetType().Name}.")
+        } + OutputNamesKey(outputNames);
+        if (plans.TryGetValue(key, out var plan))
+        {
+            return plan;
+        }
+        var inputs = Model.Graph.Input.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
+        if (!ResolveUserInputs(inputs, userInputs, useInitializers))
+        {
+            throw new ArgumentException("The user inputs do not match the graph inputs.");
+        }
+        plan = new ExecutionPlan(this, inputs.ToDictionary(kv => kv.Key, kv => kv.Value.Dims), outputNames);
+        if (plans.Count >= MaxSpecializedPlans)
+        {
+            plans.Clear();
+        }
+        return plans.GetOrAdd(key, plan);
+    }
+
+    /// <summary>
+    /// Get an execution plan that only computes the tensors in <paramref name="outputNames"/> for inputs of any shape. Plans are compiled on 
+    /// first use and cached by output names.
+    /// </summary>
+    public ExecutionPlan GetPlan(IReadOnlyCollection<string> outputNames)
+    {
+        var key = "*" + OutputNamesKey(outputNames);
+        if (plans.TryGetValue(key, out var plan))
+        {
+            return plan;
+        }
+        plan = Compile(outputNames);
+        if (plans.Count >= MaxSpecializedPlans)
+        {
+            plans.Clear();
+        }
+        return plans.GetOrAdd(key, plan);
+    }
+
+    /// <summary>
+    /// Create a context for executing a compiled plan of this graph concurrently with other executions. The context uses the 
+    /// current values of <see cref="ReleaseDeadTensors"/> and <see cref="InterOpParallelism"/>, and its own arena if this graph uses an arena.
+    /// </summary>
+    public GraphExecutionContext CreateContext(ExecutionPlan plan) => new GraphExecutionContext(plan, Arena is not null ? new TensorArena() : null);
+
+    /// <summary>
+    /// Execute the graph using a compiled execution plan. Only graph outputs are assigned, intermediate tensors are not stored in 
+    /// <see cref="IntermediateOutputs"/>.
+    /// </summary>
+    public bool Execute(ExecutionPlan plan, object userInputs, bool useInitializers, Dictionary<string, ITensor>? outputBuffers = null) =>
+        Execute(new GraphExecutionContext(plan, Inputs, Outputs, Arena), userInputs, useInitializers, outputBuffers);
+
+    /// <summary>
+    /// Execute only the nodes needed to compute the tensors in <paramref name="outputNames"/>, which can be any graph outputs or intermediate 
+    /// tensors. After execution <see cref="Outputs"/> contains only these tensors, until the graph is reset.
+    /// </summary>
+    public bool Execute(object userInputs, bool useInitializers, IReadOnlyCollection<string> outputNames, Dictionary<string, ITensor>? outputBuffers = null)
+    {
+        ExecutionPlan plan;
+        try
+        {
+            plan = GetPlan(outputNames);
+        }
+        catch (ArgumentException e)
+        {
+            Error("Could not compile an execution plan for outputs {o}: {m}", outputNames, e.Message);
+            return false;
+        }
+        Outputs = new Dictionary<string, ITensor>(plan.OutputDeclarations);
+        return Execute(plan, userInputs, useInitializers, outputBuffers);
+    }
+
+    /// <summary>
+    /// Execute the graph using a compiled execution plan, storing the graph inputs and outputs in <paramref name="context"/> instead of in
+    /// this graph. The graph is not modified, so this method can be called concurrently from many threads with different contexts.
+    /// </summary>
+    public bool Execute(GraphExecutionContext context, object userInputs, bool useInitializers, Dictionary<string, ITensor>? outputBuffers = null)
+    {
+        var plan = context.Plan;
+        if (plan.Graph != this)
+        {
+            Error("The execution plan was not compiled for this graph.");
+            return false;
+        }
+        if (!ValidateOutputBuffers(context.Outputs, outputBuffers) || !ResolveUserInputs(context.Inputs, userInputs, useInitializers))
+        {
+            return false;
+        }
+        if (!plan.AcceptsInputs(context.Inputs))
+        {
+            Error("The execution plan was specialized for input shapes {s} and cannot execute inputs {i}.", ShapeInference.ShapeKey(plan.InputShapes!), 
+                context.Inputs.Values.Select(t => t.TensorNameDesc()));
+            return false;
+        }
+        var slots = context.Slots;
+        foreach (var kv in plan.InitializerSlots)
+        {
+            slots[kv.Value] = Initializers[kv.Key];
+        }
+        foreach (var kv in plan.Constants)
+        {
+            slots[kv.Key] = kv.Value;
+        }
+        foreach (var kv in context.Inputs)
+        {
+            slots[plan.Slots[kv.Key]] = kv.Value;
+        }
+
+        var op = Begin("Executing plan for graph {n} from {f}", Metadata["Name"], ModelFile);
+        var arena = context.Arena;
+        using var scope = arena?.Activate();
+        try
+        {
+            var parallelism = Math.Min(context.InterOpParallelism, plan.Nodes.Length);
+            if (parallelism > 1 && Profiler.Enabled)
+            {
+                Info("Profiling is enabled, executing nodes sequentially.");
+                parallelism = 1;
+            }
+            var ok = parallelism > 1 ? ExecuteConcurrently(context, outputBuffers, parallelism) : ExecuteSequentially(context, outputBuffers);
+            if (!ok)
+            {
+                op.Abandon();
+                return false;
+            }
+            if (arena is not null)
+            {
+                // Intermediate tensors are never visible outside the plan execution so any that are still live are dead now.
+                foreach (var s in plan.IntermediateSlots)
+                {
+                    if (slots[s] is ITensor t)
+                    {
+                        arena.Release(t);
+                    }
+                }
+                Debug("Tensor arena: {a}.", arena.ToString());
+            }
+        }
+        finally
+        {
+            arena?.EndRun();
+            Array.Clear(slots);
+        }
+        op.Complete();
+        return true;
+    }
+
+    protected bool ExecuteSequentially(GraphExecutionContext context, Dictionary<string, ITensor>? outputBuffers)
+    {
+        var plan = context.Plan;
+        for (int n = 0; n < plan.Nodes.Length; n++)
+        {
+            if (!ExecutePlanNode(context, n, outputBuffers))
+            {
+                return false;
+            }
+            if (context.ReleaseDeadTensors)
+            {
+                var pn = plan.Nodes[n];
+                for (int i = 0; i < pn.ReleaseSlots.Length; i++)
+                {
+                    ReleaseSlot(context, pn.ReleaseSlots[i]);
+                }
+            }
+        }
+        return true;
+    }
+
+    /// <summary>
+    /// Execute the nodes of a plan on up to <paramref name="parallelism"/> threads, including the calling thread. A node is queued as soon as 
+    /// all the nodes producing its inputs have executed. Since nodes may complete out of graph order, dead intermediate tensors are released 
+    /// when their last consumer completes rather than at the position of their last use in the node list.
+    /// </summary>
+    protected bool ExecuteConcurrently(GraphExecutionContext context, Dictionary<string, ITensor>? outputBuffers, int parallelism)
+    {
+        var plan = context.Plan;
+        var sync = new object();
+        var pending = plan.Nodes.Select(pn => pn.Predecessors.Length).ToArray();
+        var consumers = (int[]) plan.SlotConsumers.Clone();
+        var intermediates = plan.IntermediateSlots.ToHashSet();
+        var remaining = plan.Nodes.Length;
+        var failed = false;
+        using var ready = new BlockingCollection<int>();
+        for (int n = 0; n < plan.Nodes.Length; n++)
+        {
+            if (pending[n] == 0)
+            {
+                ready.Add(n);
+            }
+        }
+
+        void Worker()
+        {
+            using var scope = context.Arena?.Activate();
+            foreach (var n in ready.GetConsumingEnumerable())
+            {
+                lock (sync)
+                {
+                    if (failed)
+                    {
+                        continue;
+                    }
+                }
+                bool ok;
+                try
+                {
+                    ok = ExecutePlanNode(context, n, outputBuffers);
+                }
+                catch (Exception e)
+                {
+                    Error("Execution of node {c} {n} failed: {m}", n + 1, plan.Nodes[n].Node.Name, e.Message);
+                    ok = false;
+                }
+                lock (sync)
+                {
+                    if (failed)
+                    {
+                        continue;
+                    }
+                    else if (!ok)
+                    {
+                        failed = true;
+                        ready.CompleteAdding();
+                        continue;
+                    }
+                    var pn = plan.Nodes[n];
+                    if (context.ReleaseDeadTensors)
+                    {
+                        foreach (var s in pn.InputSlots.Distinct())
+                        {
+                            if (s != -1 && consumers[s] > 0 && --consumers[s] == 0)
+                            {
+                                ReleaseSlot(context, s);
+                            }
+                        }
+                        foreach (var s in pn.OutputSlots)
+                        {
+                            if (plan.SlotConsumers[s] == 0 && intermediates.Contains(s))
+                            {
+                                ReleaseSlot(context, s);
+                            }
+                        }
+                    }
+                    foreach (var next in pn.Successors)
+                    {
+                        if (--pending[next] == 0)
+                        {
+                            ready.Add(next);
+                        }
+                    }
+                    if (--remaining == 0)
+                    {
+                        ready.CompleteAdding();
+                    }
+                }
+            }
+        }
+
+        Debug("Executing {c} nodes on {p} workers.", plan.Nodes.Length, parallelism);
+        var workers = Enumerable.Range(0, parallelism - 1).Select(_ => Task.Run(Worker)).ToArray();
+        Worker();
+        Task.WaitAll(workers);
+        return !failed;
+    }
+
+    protected bool ExecutePlanNode(GraphExecutionContext context, int n, Dictionary<string, ITensor>? outputBuffers)
+    {
+        var slots = context.Slots;
+        var arena = context.Arena;
+        var outputs = context.Outputs;
+        var pn = context.Plan.Nodes[n];
+        var node = pn.Node;
+        var inputs = new ITensor?[pn.InputSlots.Length];
+        for (int i = 0; i < inputs.Length; i++)
+        {
+            inputs[i] = pn.InputSlots[i] == -1 ? null : slots[pn.InputSlots[i]];
+        }
+
+        // A node computing a graph output with a caller-provided buffer writes the output directly to the buffer when its kernel can.
+        ITensor? ob = null;
+        var outputKernel = pn.OutputKernel;
+        if (outputKernel is not null && outputBuffers is not null)
+        {
+            outputBuffers.TryGetValue(node.Outputs[0], out ob);
+        }
+
+        arena?.BeginNode();
+        Profiler.StartNodeProfile(node.ID, node.Op);
+        var r = ob is not null ? node.Execute(x => outputKernel!(x, ob), inputs) : 
+            node.Execute(context.ExecuteInPlace && pn.InPlaceKernel is not null ? pn.InPlaceKernel : pn.Kernel, inputs);
+        Profiler.StopNodeProfile();
+
+        if (r.Status == OpStatus.Failure)
+        {
+            Error("Execution of node {c} {n} with op {op} failed: {m}", n + 1, node.Name, node.Op, r.Message ?? "");
+            Error("Stopping graph execution at node {c} {n}.", n + 1, node.Name);
+            return false;
+        }
+        // A caller-provided buffer does not share the buffers of the node inputs or temporaries so it is not tracked by the arena.
+        arena?.EndNode(inputs, ob is null ? r.Outputs : r.Outputs.Where(o => !ReferenceEquals(o, ob)).ToArray());
+        for (int i = 0; i < pn.OutputSlots.Length; i++)
+        {
+            slots[pn.OutputSlots[i]] = r.Outputs[i];
+            if (context.Plan.IsOutputSlot(pn.OutputSlots[i]))
+            {
+                bool assigned, copied;
+                ITensor? output;
+                lock (outputs)
+                {
+                    assigned = AssignOutput(outputs, node, node.Outputs[i], r.Outputs[i], outputBuffers);
+                    output = assigned ? outputs[node.Outputs[i]] : null;
+                    copied = assigned && !ReferenceEquals(output, r.Outputs[i]);
+                }
+                if (!assigned)
+                {
+                    Error("Stopping graph execution at node {c} {n}.", n + 1, node.Name);
+                    return false;
+                }
+                else if (copied)
+                {
+                    // The output was copied to a caller-provided buffer so the tensor itself is dead. Nodes that read the output read the buffer.
+                    slots[pn.OutputSlots[i]] = output;
+                    arena?.Release(r.Outputs[i]);
+                }
+            }
+        }
+        return true;
+    }
+
+    private static string OutputNamesKey(IReadOnlyCollection<string>? outputNames) => outputNames is null ? "" : "|" + outputNames.JoinWith(",");
+
+    private static void ReleaseSlot(GraphExecutionContext context, int slot)
+    {
+        var t = context.Slots[slot];
+        context.Slots[slot] = null;
+        if (t is not null)
+        {
+            context.Arena?.Release(t);
+        }
+    }
+
     public bool ExecuteNode(object userInputs, string nodeLabel, bool useInitializers, ExecutionProvider provider = ExecutionProvider.CPU)
     {
         var node = Nodes.FirstOrDefault(n => n.Name == nodeLabel);
-        if (node.Name == "")
+        if (string.IsNullOrEmpty(node.Name) && Model.Graph.Node.FirstOrDefault(n => n.Name == nodeLabel) is NodeProto np)
+        {
+            // The node may have been replaced by a graph optimization but it can still be executed on its own.
+            node = np.ToNode();
+        }
+        if (string.IsNullOrEmpty(node.Name))
         {
             Error("Could not find node {n} in graph.", nodeLabel); 
             return false;    
@@ -339,6 +1089,7 @@ public class ComputationalGraph : Runtime
         {
             IntermediateOutputs[o] = null;
         }
+        Inputs = Model.Graph.Input.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
         Outputs = Model.Graph.Output.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
         if (gc)
         {
@@ -0,0 +1,419 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+
+using static Lokad.Onnx.OpResult;
+
+/// <summary>
+/// A kernel bound to a graph node with its attributes already converted. Takes the node input tensors in node input order.
+/// </summary>
+public delegate OpResult OpKernel(ITensor?[] inputs);
+
+/// <summary>
+/// A kernel bound to a graph node that writes the first node output to <paramref name="destination"/> when it has the type and shape of the output.
+/// </summary>
+public delegate OpResult OpDestinationKernel(ITensor?[] inputs, ITensor destination);
+
+/// <summary>
+/// A graph node compiled into an execution plan, with its inputs and outputs resolved to tensor slots.
+/// </summary>
+public class PlanNode
+{
+    #region Constructors
+    public PlanNode(Node node, int[] inputSlots, int[] outputSlots, OpKernel kernel)
+    {
+        Node = node;
+        InputSlots = inputSlots;
+        OutputSlots = outputSlots;
+        Kernel = kernel;
+    }
+    #endregion
+
+    #region Properties
+    /// <summary>
+    /// The slots of intermediate tensors that are dead after this node executes.
+    /// </summary>
+    public int[] ReleaseSlots { get; internal set; } = Array.Empty<int>();
+
+    /// <summary>
+    /// The indices in the plan of the nodes that produce the inputs of this node.
+    /// </summary>
+    public int[] Predecessors { get; internal set; } = Array.Empty<int>();
+
+    /// <summary>
+    /// The indices in the plan of the nodes that consume the outputs of this node.
+    /// </summary>
+    public int[] Successors { get; internal set; } = Array.Empty<int>();
+
+    /// <summary>
+    /// The index of the node input whose buffer the output of this node is written to, or -1 if the node allocates its output. An input is
+    /// only written to if it is an intermediate tensor that no other node reads, and whose buffer is not shared with any other tensor.
+    /// </summary>
+    public int InPlaceInput { get; internal set; } = -1;
+
+    /// <summary>
+    /// The kernel that writes the output of this node to the buffer of the input at <see cref="InPlaceInput"/>, or null.
+    /// </summary>
+    public OpKernel? InPlaceKernel { get; internal set; }
+
+    /// <summary>
+    /// The kernel that writes the first output of this node to a caller-provided output buffer, or null if that output is not an output of
+    /// the plan or the op always allocates its output.
+    /// </summary>
+    public OpDestinationKernel? OutputKernel { get; internal set; }
+    #endregion
+
+    #region Fields
+    public readonly Node Node;
+
+    /// <summary>
+    /// The tensor slot of each node input, or -1 for an omitted optional input.
+    /// </summary>
+    public readonly int[] InputSlots;
+
+    public readonly int[] OutputSlots;
+
+    public readonly OpKernel Kernel;
+    #endregion
+}
+
+/// <summary>
+/// A flat execution plan for a <see cref="ComputationalGraph"/>. Every tensor name in the graph is assigned an integer slot, node attributes
+/// are converted and kernels are bound once at compile time, so executing the plan only needs array lookups and direct delegate calls.
+/// A plan can also be specialized for one set of graph input shapes. The shapes of all tensors are then inferred at compile time, nodes that
+/// only compute values from shapes are evaluated once and removed from the plan, and nodes that only change the shape of their input are
+/// bound to their output shape. A plan can also compute only some of the graph outputs or intermediate tensors, in which case only the nodes 
+/// these tensors depend on are executed.
+/// </summary>
+public class ExecutionPlan : Runtime
+{
+    #region Constructors
+    public ExecutionPlan(ComputationalGraph graph, ExecutionProvider provider = ExecutionProvider.CPU) : this(graph, null, null, provider) {}
+
+    public ExecutionPlan(ComputationalGraph graph, IReadOnlyDictionary<string, int[]>? inputShapes, ExecutionProvider provider = ExecutionProvider.CPU) : 
+        this(graph, inputShapes, null, provider) {}
+
+    /// <summary>
+    /// Compile an execution plan.
+    /// </summary>
+    /// <param name="inputShapes">If not null, the plan is specialized for these graph input shapes and can only execute inputs with these shapes.</param>
+    /// <param name="outputNames">If not null, the plan only computes these tensors, which can be graph outputs or intermediate tensors, instead of
+    /// the graph outputs.</param>
+    public ExecutionPlan(ComputationalGraph graph, IReadOnlyDictionary<string, int[]>? inputShapes, IReadOnlyCollection<string>? outputNames, ExecutionProvider provider = ExecutionProvider.CPU)
+    {
+        if (provider != ExecutionProvider.CPU)
+        {
+            throw new NotSupportedException($"The execution provider {provider} is not supported.");
+        }
+        var graphOutputs = graph.Model.Graph.Output.Select(vp => vp.Name).ToArray();
+        var outputs = outputNames?.Distinct().ToArray() ?? graphOutputs;
+        if (outputNames is not null)
+        {
+            var producers = graph.GetProducers();
+            foreach (var o in outputs)
+            {
+                if (!producers.ContainsKey(o))
+                {
+                    throw new ArgumentException($"The tensor {o} is not computed by any node of the graph.", nameof(outputNames));
+                }
+            }
+        }
+        var op = Begin("Compiling execution plan for graph {n} with {c} nodes", graph.Metadata.ContainsKey("Name") ? graph.Metadata["Name"] : "", graph.Nodes.Count);
+        Graph = graph;
+        Provider = provider;
+        InputShapes = inputShapes;
+        var requiredNodes = outputNames is null ? graph.Nodes : graph.GetRequiredNodes(outputs);
+        var shapes = new Dictionary<string, TensorShape>();
+        var values = new Dictionary<string, ITensor>();
+        if (inputShapes is not null)
+        {
+            shapes = ShapeInference.InferShapes(graph, inputShapes, out values, requiredNodes);
+        }
+
+        // Nodes whose outputs are all known at compile time are not executed. Their outputs are loaded into the slots like initializers.
+        var outputSet = outputs.ToHashSet();
+        bool IsEvaluated(Node n) => n.Outputs.All(values.ContainsKey) && !n.Outputs.Any(outputSet.Contains);
+        var graphNodes = requiredNodes.Where(n => !IsEvaluated(n)).ToList();
+        foreach (var name in graph.Inputs.Keys.Concat(graph.Initializers.Keys).Concat(graphOutputs).Concat(outputs))
+        {
+            AddSlot(name);
+        }
+        var constants = new Dictionary<int, ITensor>();
+        foreach (var node in requiredNodes.Where(IsEvaluated))
+        {
+            foreach (var o in node.Outputs)
+            {
+                constants[AddSlot(o)] = values[o];
+            }
+        }
+        var nodes = new PlanNode[graphNodes.Count];
+        var bound = new bool[graphNodes.Count];
+        for (int i = 0; i < graphNodes.Count; i++)
+        {
+            var node = graphNodes[i];
+            var inputSlots = node.Inputs.Select(n => string.IsNullOrEmpty(n) ? -1 : AddSlot(n)).ToArray();
+            var outputSlots = node.Outputs.Select(n => AddSlot(n)).ToArray();
+            OpKernel kernel;
+            try
+            {
+                kernel = (node.Op is OpType.Reshape or OpType.Unsqueeze) && shapes.TryGetValue(node.Outputs[0], out var s) ? BindReshape(node.Op, s.Dims) : node.BindCPU(graph);
+                bound[i] = true;
+            }
+            catch (Exception e)
+            {
+                Error("Could not bind kernel for node {n} with op {op}: {m}", node.Name, node.Op, e.Message);
+                var nop = node.Op;
+                var message = e.Message;
+                kernel = x => Failure(nop, message);
+            }
+            nodes[i] = new PlanNode(node, inputSlots, outputSlots, kernel);
+        }
+        var intermediates = graph.GetIntermediateTensorLastUses(graphNodes).Where(kv => !constants.ContainsKey(Slots[kv.Key]) && !outputSet.Contains(kv.Key))
+            .ToDictionary(kv => kv.Key, kv => kv.Value);
+        var releaseSlots = nodes.Select(_ => new List<int>()).ToArray();
+        foreach (var kv in intermediates)
+        {
+            releaseSlots[kv.Value].Add(Slots[kv.Key]);
+        }
+        for (int i = 0; i < nodes.Length; i++)
+        {
+            nodes[i].ReleaseSlots = releaseSlots[i].ToArray();
+        }
+
+        // Data dependencies between nodes, used to schedule independent nodes concurrently.
+        var predecessors = ComputationalGraph.GetPredecessors(graphNodes);
+        var successors = nodes.Select(_ => new List<int>()).ToArray();
+        for (int i = 0; i < nodes.Length; i++)
+        {
+            nodes[i].Predecessors = predecessors[i];
+            foreach (var p in predecessors[i])
+            {
+                successors[p].Add(i);
+            }
+        }
+        for (int i = 0; i < nodes.Length; i++)
+        {
+            nodes[i].Successors = successors[i].ToArray();
+        }
+
+        // The number of nodes that consume each intermediate tensor, used to release tensors when nodes execute out of list order.
+        var intermediateSlots = intermediates.Keys.Select(n => Slots[n]).ToHashSet();
+        var consumers = new int[slotNames.Count];
+        foreach (var pn in nodes)
+        {
+            foreach (var s in pn.InputSlots.Distinct())
+            {
+                if (intermediateSlots.Contains(s))
+                {
+                    consumers[s]++;
+                }
+            }
+        }
+        SlotConsumers = consumers;
+
+        // An elementwise node can write its output to the buffer of an input when it is the only node that reads the input, and the input was
+        // allocated by a node whose outputs never share a buffer with another tensor, so no live tensor can observe the overwritten values.
+        var slotProducers = Enumerable.Repeat(-1, slotNames.Count).ToArray();
+        for (int i = 0; i < nodes.Length; i++)
+        {
+            foreach (var s in nodes[i].OutputSlots)
+            {
+                slotProducers[s] = i;
+            }
+        }
+        var inPlace = 0;
+        for (int i = 0; i < nodes.Length; i++)
+        {
+            var pn = nodes[i];
+            if (!bound[i])
+            {
+                continue;
+            }
+            for (int j = 0; j < pn.InputSlots.Length; j++)
+            {
+                var s = pn.InputSlots[j];
+                if (s == -1 || !Node.CanExecuteInPlace(pn.Node.Op, j) || !intermediateSlots.Contains(s) || consumers[s] != 1 || slotProducers[s] == -1
+                    || !AllocatingOps.Contains(nodes[slotProducers[s]].Node.Op))
+                {
+                    continue;
+                }
+                if (shapes.TryGetValue(slotNames[s], out var inputShape) && shapes.TryGetValue(pn.Node.Outputs[0], out var outputShape) 
+                    && !inputShape.Dims.AsSpan().SequenceEqual(outputShape.Dims))
+                {
+                    continue;
+                }
+                // A Cast can only convert the elements of its input in place when both element types have the same size, which is only known 
+                // when the plan is specialized for input shapes.
+                if (pn.Node.Op == OpType.Cast && !(shapes.TryGetValue(slotNames[s], out var inputType) && shapes.TryGetValue(pn.Node.Outputs[0], out var outputType) 
+                    && TensorBase.GetElementTypeInfo(inputType.ElementType)?.TypeSize is int size && size == TensorBase.GetElementTypeInfo(outputType.ElementType)?.TypeSize))
+                {
+                    continue;
+                }
+                if (pn.Node.BindCPUInPlace(graph, j) is OpKernel kernel)
+                {
+                    pn.InPlaceInput = j;
+                    pn.InPlaceKernel = kernel;
+                    inPlace++;
+                    break;
+                }
+            }
+        }
+        Nodes = nodes;
+        SlotNames = slotNames.ToArray();
+        InputSlots = graph.Inputs.Keys.Select(n => Slots[n]).ToArray();
+        OutputNames = outputs;
+        OutputSlots = outputs.Select(n => Slots[n]).ToArray();
+        isOutputSlot = new bool[SlotNames.Length];
+        foreach (var s in OutputSlots)
+        {
+            isOutputSlot[s] = true;
+        }
+        for (int i = 0; i < nodes.Length; i++)
+        {
+            if (bound[i] && isOutputSlot[nodes[i].OutputSlots[0]])
+            {
+                nodes[i].OutputKernel = nodes[i].Node.BindCPUToDestination(graph);
+            }
+        }
+        InputDeclarations = graph.Model.Graph.Input.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
+        // Intermediate tensors only have a declaration if the model has value info for them.
+        var declarations = graph.Model.Graph.Output.Concat(graph.Model.Graph.ValueInfo).Where(vp => vp.Type.ValueCase == TypeProto.ValueOneofCase.TensorType)
+            .GroupBy(vp => vp.Name).ToDictionary(g => g.Key, g => g.First());
+        OutputDeclarations = outputs.Where(declarations.ContainsKey).ToDictionary(n => n, n => declarations[n].ToTensor());
+        IntermediateSlots = graph.IntermediateOutputs.Keys.Where(n => Slots.ContainsKey(n) && !graph.Inputs.ContainsKey(n) && !graph.Initializers.ContainsKey(n) && !outputSet.Contains(n))
+            .Select(n => Slots[n]).Where(s => !constants.ContainsKey(s)).ToArray();
+        Constants = constants;
+        // Initializers that are only read by nodes evaluated at compile time or not needed for the outputs are never loaded.
+        InitializerSlots = graphNodes.SelectMany(n => n.Inputs).Concat(outputs).Where(n => !string.IsNullOrEmpty(n) && graph.Initializers.ContainsKey(n))
+            .Distinct().ToDictionary(n => n, n => Slots[n]);
+        SlotShapes = SlotNames.Select(n => shapes.TryGetValue(n, out var s) ? s : null).ToArray();
+        op.Complete();
+        if (inputShapes is null)
+        {
+            Info("Compiled execution plan with {n} nodes and {s} tensor slots.", Nodes.Length, SlotNames.Length);
+        }
+        else
+        {
+            Info("Compiled execution plan with {n} nodes and {s} tensor slots for input shapes {i}. {c} node(s) were evaluated at compile time and {k} tensor shape(s) are known.",
+                Nodes.Length, SlotNames.Length, ShapeInference.ShapeKey(inputShapes), requiredNodes.Count - Nodes.Length, SlotShapes.Count(s => s is not null));
+        }
+        if (inPlace > 0)
+        {
+            Debug("{c} node(s) of the execution plan write their output to the buffer of a dead input.", inPlace);
+        }
+        if (outputNames is not null)
+        {
+            Info("The execution plan computes the tensors {o} and skips {c} node(s) not needed to compute them.", outputs, graph.Nodes.Count - requiredNodes.Count);
+        }
+    }
+    #endregion
+
+    #region Properties
+    public ComputationalGraph Graph { get; }
+
+    public ExecutionProvider Provider { get; }
+
+    public PlanNode[] Nodes { get; }
+
+    /// <summary>
+    /// The name of the tensor assigned to each slot.
+    /// </summary>
+    public string[] SlotNames { get; }
+
+    public Dictionary<string, int> Slots { get; } = new Dictionary<string, int>();
+
+    public int SlotCount => SlotNames.Length;
+
+    public int[] InputSlots { get; }
+
+    /// <summary>
+    /// The names of the tensors assigned to the outputs of an execution: the graph outputs, or the tensors the plan was compiled for.
+    /// </summary>
+    public string[] OutputNames { get; }
+
+    public int[] OutputSlots { get; }
+
+    public int[] IntermediateSlots { get; }
+
+    /// <summary>
+    /// The graph inputs as declared by the model, before any user input is resolved.
+    /// </summary>
+    public IReadOnlyDictionary<string, ITensor> InputDeclarations { get; }
+
+    /// <summary>
+    /// The outputs of the plan as declared by the model. Intermediate tensors that the model does not declare value info for are not included.
+    /// </summary>
+    public IReadOnlyDictionary<string, ITensor> OutputDeclarations { get; }
+
+    /// <summary>
+    /// The number of nodes that consume the intermediate tensor in each slot. Slots for graph inputs, initializers and outputs have 0 consumers.
+    /// </summary>
+    public int[] SlotConsumers { get; }
+
+    /// <summary>
+    /// The graph input shapes this plan is specialized for, or null if the plan can execute inputs of any shape.
+    /// </summary>
+    public IReadOnlyDictionary<string, int[]>? InputShapes { get; }
+
+    /// <summary>
+    /// The shape, strides and buffer length of the tensor in each slot, or null if it is not known at compile time.
+    /// </summary>
+    public TensorShape?[] SlotShapes { get; }
+
+    /// <summary>
+    /// The values computed at compile time of the outputs of nodes that were removed from a specialized plan, keyed by slot.
+    /// </summary>
+    public IReadOnlyDictionary<int, ITensor> Constants { get; }
+
+    /// <summary>
+    /// The slots of the initializers that the nodes of the plan read or that are outputs of the plan, keyed by name. Executing the plan only 
+    /// converts these initializers to tensors.
+    /// </summary>
+    public IReadOnlyDictionary<string, int> InitializerSlots { get; }
+    #endregion
+
+    #region Methods
+    public bool IsOutputSlot(int slot) => isOutputSlot[slot];
+
+    public int Slot(string name) => Slots.TryGetValue(name, out var s) ? s : throw new ArgumentException($"The tensor {name} does not have a slot in the execution plan.");
+
+    /// <summary>
+    /// True if the plan can execute graph inputs with these shapes.
+    /// </summary>
+    public bool AcceptsInputs(IReadOnlyDictionary<string, ITensor> inputs) =>
+        InputShapes is null || InputShapes.All(kv => inputs.TryGetValue(kv.Key, out var t) && t.Dims.AsSpan().SequenceEqual(kv.Value));
+
+    /// <summary>
+    /// Bind a Reshape or Unsqueeze node whose output shape is known, skipping the computation of the output shape from the node inputs.
+    /// </summary>
+    private static OpKernel BindReshape(OpType op, int[] dims) => x => x[0] is ITensor t ? Success(op, t.Reshape(dims)) : MissingInput(op, "data");
+
+    private int AddSlot(string name)
+    {
+        if (!Slots.TryGetValue(name, out var s))
+        {
+            s = slotNames.Count;
+            Slots.Add(name, s);
+            slotNames.Add(name);
+        }
+        return s;
+    }
+    #endregion
+
+    #region Fields
+    /// <summary>
+    /// The ops whose outputs are always written to new buffers that are not shared with their inputs or with any other tensor.
+    /// </summary>
+    private static readonly HashSet<OpType> AllocatingOps = new HashSet<OpType>()
+    {
+        OpType.Add, OpType.Sub, OpType.Mul, OpType.Div, OpType.Pow, OpType.Sqrt, OpType.Relu, OpType.Erf, OpType.Gelu, OpType.Cast,
+        OpType.Conv, OpType.MaxPool, OpType.MatMul, OpType.MatMulAdd, OpType.Softmax, OpType.LayerNormalization
+    };
+
+    private readonly List<string> slotNames = new List<string>();
+
+    private readonly bool[] isOutputSlot;
+    #endregion
+}
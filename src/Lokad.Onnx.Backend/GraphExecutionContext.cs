@@ -0,0 +1,82 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Collections.Generic;
+
+/// <summary>
+/// The state of one execution of a compiled <see cref="ExecutionPlan"/>: the resolved graph inputs, the graph outputs and the tensor slots.
+/// The graph and the plan are only read while executing, so the same <see cref="ComputationalGraph"/> can be executed concurrently by many
+/// threads as long as each execution uses its own context. A context can be reused for any number of executions, one at a time.
+/// </summary>
+public class GraphExecutionContext : Runtime
+{
+    #region Constructors
+    public GraphExecutionContext(ExecutionPlan plan, TensorArena? arena = null)
+    {
+        Plan = plan;
+        Arena = arena;
+        ReleaseDeadTensors = plan.Graph.ReleaseDeadTensors;
+        ExecuteInPlace = plan.Graph.ExecuteInPlace;
+        InterOpParallelism = plan.Graph.InterOpParallelism;
+        Reset();
+    }
+
+    /// <summary>
+    /// Create a context that reads and writes the input and output dictionaries of the graph itself, like the single-threaded execution methods
+    /// of <see cref="ComputationalGraph"/>.
+    /// </summary>
+    internal GraphExecutionContext(ExecutionPlan plan, Dictionary<string, ITensor> inputs, Dictionary<string, ITensor> outputs, TensorArena? arena)
+    {
+        Plan = plan;
+        Arena = arena;
+        ReleaseDeadTensors = plan.Graph.ReleaseDeadTensors;
+        ExecuteInPlace = plan.Graph.ExecuteInPlace;
+        InterOpParallelism = plan.Graph.InterOpParallelism;
+        Inputs = inputs;
+        Outputs = outputs;
+        Slots = new ITensor?[plan.SlotCount];
+    }
+    #endregion
+
+    #region Properties
+    public ExecutionPlan Plan { get; }
+
+    public ComputationalGraph Graph => Plan.Graph;
+
+    /// <summary>
+    /// The graph inputs, including the user inputs of the last execution.
+    /// </summary>
+    public Dictionary<string, ITensor> Inputs { get; private set; }
+
+    /// <summary>
+    /// The graph outputs of the last execution.
+    /// </summary>
+    public Dictionary<string, ITensor> Outputs { get; private set; }
+
+    /// <summary>
+    /// If not null, tensors created during execution draw their buffers from this arena. An arena must not be shared by contexts that
+    /// execute concurrently.
+    /// </summary>
+    public TensorArena? Arena { get; set; }
+
+    public bool ReleaseDeadTensors { get; set; }
+
+    public bool ExecuteInPlace { get; set; }
+
+    public int InterOpParallelism { get; set; }
+
+    internal ITensor?[] Slots { get; private set; }
+    #endregion
+
+    #region Methods
+    /// <summary>
+    /// Clear the inputs and outputs of the last execution so that the tensors they reference can be collected.
+    /// </summary>
+    public void Reset()
+    {
+        Inputs = new Dictionary<string, ITensor>(Plan.InputDeclarations);
+        Outputs = new Dictionary<string, ITensor>(Plan.OutputDeclarations);
+        Slots = new ITensor?[Plan.SlotCount];
+    }
+    #endregion
+}
@@ -0,0 +1,418 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+
+/// <summary>
+/// Graph rewrite passes that run when a model is loaded. Each pass replaces a pattern of nodes in <see cref="ComputationalGraph.Nodes"/>
+/// with fewer nodes that compute the same graph outputs with less work and fewer intermediate tensors.
+/// </summary>
+public class GraphOptimizer : Runtime
+{
+    #region Properties
+    /// <summary>
+    /// If false, <see cref="Model.Load(ModelProto)"/> executes the graph nodes exactly as they are in the model.
+    /// </summary>
+    public static bool Enabled { get; set; } = true;
+    #endregion
+
+    #region Methods
+    /// <summary>
+    /// Run all the optimization passes on a graph.
+    /// </summary>
+    public static void Optimize(ComputationalGraph graph)
+    {
+        var op = Begin("Optimizing graph with {c} nodes", graph.Nodes.Count);
+        var folded = FoldConstants(graph);
+        var matmuladd = FuseMatMulAdd(graph);
+        var gelu = FuseGelu(graph);
+        var layernorm = FuseLayerNormalization(graph);
+        op.Complete();
+        Info("Folded {f} constant node(s). Fused {c} MatMul and Add node pair(s), {g} GELU subgraph(s) and {l} layer normalization subgraph(s). " +
+            "The optimized graph has {n} nodes.", folded, matmuladd, gelu, layernorm, graph.Nodes.Count);
+    }
+
+    /// <summary>
+    /// Evaluate each node whose inputs are all constant once with the CPU execution provider, store its outputs as initializers and remove
+    /// it from the graph. Nodes are in topological order, so chains of nodes that only depend on initializers and Constant nodes, like shape
+    /// computations and reshapes of weights, are folded in a single pass and no longer execute on every run. 
+    /// </summary>
+    /// <returns>The number of folded nodes.</returns>
+    public static int FoldConstants(ComputationalGraph graph)
+    {
+        var nodes = graph.Nodes;
+        var removed = new HashSet<int>();
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            var node = nodes[i];
+            if (NonDeterministicOps.Contains(node.Op) || !CPUExecutionProvider.SupportsOp(node.Op) || node.Outputs.Any(graph.Outputs.ContainsKey)
+                || !node.Inputs.All(n => string.IsNullOrEmpty(n) || IsConstant(graph, n)))
+            {
+                continue;
+            }
+            var inputs = node.Inputs.Select(n => string.IsNullOrEmpty(n) ? null : graph.Initializers[n]).ToArray();
+            OpResult r;
+            try
+            {
+                r = node.Execute(node.BindCPU(graph), inputs);
+            }
+            catch (Exception e)
+            {
+                r = OpResult.Failure(node.Op, e.Message);
+            }
+            if (r.Status != OpStatus.Success)
+            {
+                Debug("Could not fold constant node {n} with op {op}: {m}", node.Name, node.Op, r.Message ?? "");
+                continue;
+            }
+            Debug("Folding constant node {n} with op {op}.", node.Name, node.Op);
+            for (int j = 0; j < node.Outputs.Length; j++)
+            {
+                if (!string.IsNullOrEmpty(node.Outputs[j]))
+                {
+                    graph.Initializers[node.Outputs[j]] = r.Outputs[j];
+                    graph.IntermediateOutputs.Remove(node.Outputs[j]);
+                }
+            }
+            removed.Add(i);
+        }
+        if (removed.Count > 0)
+        {
+            graph.Nodes = nodes.Where((_, i) => !removed.Contains(i)).ToList();
+
+            // Initializers that were only used to compute folded values are dead.
+            var used = graph.Nodes.SelectMany(n => n.Inputs).ToHashSet();
+            foreach (var name in removed.SelectMany(i => nodes[i].Inputs).Distinct())
+            {
+                if (!string.IsNullOrEmpty(name) && !used.Contains(name) && !graph.Inputs.ContainsKey(name) && !graph.Outputs.ContainsKey(name))
+                {
+                    graph.Initializers.Remove(name);
+                }
+            }
+        }
+        return removed.Count;
+    }
+
+    /// <summary>
+    /// Replace each MatMul whose only consumer is an Add of a bias initializer with a single <see cref="OpType.MatMulAdd"/> node, so the bias
+    /// is added while computing the product instead of in a separate pass over it.
+    /// </summary>
+    /// <returns>The number of fused node pairs.</returns>
+    public static int FuseMatMulAdd(ComputationalGraph graph)
+    {
+        var nodes = graph.Nodes;
+        var consumers = graph.GetConsumers();
+        var removed = new HashSet<int>();
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            var matmul = nodes[i];
+            if (matmul.Op != OpType.MatMul || matmul.Inputs.Length != 2 || !IsIntermediate(graph, matmul.Outputs[0]))
+            {
+                continue;
+            }
+            var product = matmul.Outputs[0];
+            if (!consumers.TryGetValue(product, out var c) || c.Count != 1 || nodes[c[0]].Op != OpType.Add || nodes[c[0]].Inputs.Length != 2)
+            {
+                continue;
+            }
+            var j = c[0];
+            var add = nodes[j];
+            var bias = add.Inputs[0] == product ? add.Inputs[1] : add.Inputs[0];
+
+            // The kernel falls back to a MatMul and an Add when the bias it is given at run time is not a row vector, so this only
+            // needs to recognize the pattern.
+            if (bias == product || !graph.Initializers.TryGetValue(bias, out var b) || b.ElementType != TensorElementType.Float || b.Rank == 0 || b.Length != b.Dims[^1])
+            {
+                continue;
+            }
+            Debug("Fusing MatMul node {m} and Add node {a} with bias {b}.", matmul.Name, add.Name, b.TensorNameDesc());
+            nodes[j] = Fuse(OpType.MatMulAdd, matmul, add, new[] { matmul.Inputs[0], matmul.Inputs[1], bias });
+            graph.IntermediateOutputs.Remove(product);
+            removed.Add(i);
+        }
+        if (removed.Count > 0)
+        {
+            graph.Nodes = nodes.Where((_, i) => !removed.Contains(i)).ToList();
+        }
+        return removed.Count;
+    }
+
+    /// <summary>
+    /// Replace each subgraph that computes the exact GELU of a tensor x as x / sqrt(2), Erf, + 1, * x and * 0.5 with a single 
+    /// <see cref="OpType.Gelu"/> node. The two multiplications can be in any order and the division can be a multiplication by 1 / sqrt(2).
+    /// </summary>
+    /// <returns>The number of fused subgraphs.</returns>
+    public static int FuseGelu(ComputationalGraph graph)
+    {
+        var nodes = graph.Nodes;
+        var consumers = graph.GetConsumers();
+        var producers = graph.GetProducers();
+        var removed = new HashSet<int>();
+        var count = 0;
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            var erf = nodes[i];
+            if (erf.Op != OpType.Erf || erf.Inputs.Length != 1 || !producers.TryGetValue(erf.Inputs[0], out var d)
+                || !TryGetSingleConsumer(graph, consumers, erf.Inputs[0], out _))
+            {
+                continue;
+            }
+            var div = nodes[d];
+            var x = div.Op == OpType.Div && div.Inputs.Length == 2 && IsScalar(graph, producers, div.Inputs[1], MathF.Sqrt(2.0f)) ? div.Inputs[0]
+                : div.Op == OpType.Mul ? OtherInput(div, c => IsScalar(graph, producers, c, 1.0f / MathF.Sqrt(2.0f)))
+                : null;
+            if (x is null)
+            {
+                continue;
+            }
+
+            // 1 + erf(x / sqrt(2))
+            if (!TryGetSingleConsumer(graph, consumers, erf.Outputs[0], out var a) || nodes[a].Op != OpType.Add 
+                || !IsScalar(graph, producers, OtherInput(nodes[a], erf.Outputs[0]), 1.0f))
+            {
+                continue;
+            }
+            var add = nodes[a];
+            if (!TryGetSingleConsumer(graph, consumers, add.Outputs[0], out var m) || nodes[m].Op != OpType.Mul || OtherInput(nodes[m], add.Outputs[0]) is not string operand)
+            {
+                continue;
+            }
+            var pattern = new List<int>() { d, i, a, m };
+            if (operand == x || IsScalar(graph, producers, operand, 0.5f))
+            {
+                // x * (1 + erf) * 0.5 or 0.5 * (1 + erf) * x
+                if (!TryGetSingleConsumer(graph, consumers, nodes[m].Outputs[0], out var last) || nodes[last].Op != OpType.Mul 
+                    || OtherInput(nodes[last], nodes[m].Outputs[0]) is not string f || !(operand == x ? IsScalar(graph, producers, f, 0.5f) : f == x))
+                {
+                    continue;
+                }
+                pattern.Add(last);
+            }
+            else if (producers.TryGetValue(operand, out var h) && nodes[h].Op == OpType.Mul && TryGetSingleConsumer(graph, consumers, operand, out _)
+                && IsScalar(graph, producers, OtherInput(nodes[h], x), 0.5f))
+            {
+                // (x * 0.5) * (1 + erf)
+                pattern.Insert(0, h);
+            }
+            else
+            {
+                continue;
+            }
+            if (pattern.Any(removed.Contains))
+            {
+                continue;
+            }
+
+            var end = pattern.Max();
+            Debug("Fusing GELU subgraph of {c} nodes from node {f} to node {l}.", pattern.Count, div.Name, nodes[end].Name);
+            foreach (var p in pattern.Where(p => p != end))
+            {
+                removed.Add(p);
+                graph.IntermediateOutputs.Remove(nodes[p].Outputs[0]);
+            }
+            nodes[end] = Fuse(OpType.Gelu, div, nodes[end], new[] { x });
+            count++;
+        }
+        if (removed.Count > 0)
+        {
+            graph.Nodes = nodes.Where((_, i) => !removed.Contains(i)).ToList();
+        }
+        return count;
+    }
+
+    /// <summary>
+    /// Replace each subgraph that computes the layer normalization of a tensor x over its last dimension as ReduceMean, Sub, Pow 2, ReduceMean, 
+    /// Add epsilon, Sqrt, Div, Mul by the scale and Add of the bias with a single <see cref="OpType.LayerNormalization"/> node.
+    /// </summary>
+    /// <returns>The number of fused subgraphs.</returns>
+    public static int FuseLayerNormalization(ComputationalGraph graph)
+    {
+        var nodes = graph.Nodes;
+        var consumers = graph.GetConsumers();
+        var producers = graph.GetProducers();
+        var removed = new HashSet<int>();
+        var count = 0;
+
+        // Find the single consumer of the output of a node if it has the specified op.
+        bool Next(int node, OpType op, out int next) => TryGetSingleConsumer(graph, consumers, nodes[node].Outputs[0], out next) && nodes[next].Op == op;
+
+        for (int i = 0; i < nodes.Count; i++)
+        {
+            var mean = nodes[i];
+            if (mean.Op != OpType.ReduceMean || !IsLastAxisMean(graph, producers, mean) || !Next(i, OpType.Sub, out var sub) 
+                || nodes[sub].Inputs[0] != mean.Inputs[0] || nodes[sub].Inputs[1] != mean.Outputs[0])
+            {
+                continue;
+            }
+            var x = mean.Inputs[0];
+
+            // The deviation x - mean is used by both the variance and the normalization.
+            var deviation = nodes[sub].Outputs[0];
+            if (!IsIntermediate(graph, deviation) || !consumers.TryGetValue(deviation, out var dc) || dc.Count != 2)
+            {
+                continue;
+            }
+            var pow = dc.FirstOrDefault(c => nodes[c].Op == OpType.Pow, -1);
+            var div = dc.FirstOrDefault(c => nodes[c].Op == OpType.Div, -1);
+            if (pow == -1 || div == -1 || nodes[pow].Inputs[0] != deviation || !IsScalar(graph, producers, nodes[pow].Inputs[1], 2.0f) || nodes[div].Inputs[0] != deviation)
+            {
+                continue;
+            }
+            if (!Next(pow, OpType.ReduceMean, out var variance) || !IsLastAxisMean(graph, producers, nodes[variance])
+                || !Next(variance, OpType.Add, out var add) || !TryGetScalar(graph, producers, OtherInput(nodes[add], nodes[variance].Outputs[0]), out var epsilon)
+                || !Next(add, OpType.Sqrt, out var sqrt) || !Next(sqrt, OpType.Div, out var d) || d != div || nodes[div].Inputs[1] != nodes[sqrt].Outputs[0])
+            {
+                continue;
+            }
+            if (!Next(div, OpType.Mul, out var mul) || OtherInput(nodes[mul], nodes[div].Outputs[0]) is not string scale || !IsConstant(graph, scale)
+                || !Next(mul, OpType.Add, out var shift) || OtherInput(nodes[shift], nodes[mul].Outputs[0]) is not string bias || !IsConstant(graph, bias))
+            {
+                continue;
+            }
+            var pattern = new[] { i, sub, pow, variance, add, sqrt, div, mul, shift };
+            if (pattern.Any(removed.Contains))
+            {
+                continue;
+            }
+
+            var end = pattern.Max();
+            Debug("Fusing layer normalization subgraph from node {f} to node {l}.", mean.Name, nodes[end].Name);
+            foreach (var p in pattern.Where(p => p != end))
+            {
+                removed.Add(p);
+                graph.IntermediateOutputs.Remove(nodes[p].Outputs[0]);
+            }
+            var attributes = new Dictionary<string, object>() { { "axis", -1L }, { "epsilon", epsilon } };
+            nodes[end] = Fuse(OpType.LayerNormalization, mean, nodes[end], new[] { x, scale, bias }, attributes);
+            count++;
+        }
+        if (removed.Count > 0)
+        {
+            graph.Nodes = nodes.Where((_, i) => !removed.Contains(i)).ToList();
+        }
+        return count;
+    }
+
+    /// <summary>
+    /// True if a ReduceMean node computes the mean over the last axis only and keeps the reduced dimension.
+    /// </summary>
+    private static bool IsLastAxisMean(ComputationalGraph graph, Dictionary<string, int> producers, Node node)
+    {
+        if ((node.Int("keepdims") ?? 1) != 1)
+        {
+            return false;
+        }
+        if (node.Inputs.Length > 1 && !string.IsNullOrEmpty(node.Inputs[1]))
+        {
+            return TryGetConstant(graph, producers, node.Inputs[1], out var value) && value is ITensor t && t.ElementType == TensorElementType.Int64 
+                && t.Length == 1 && (long) t.GetValue(0) == -1;
+        }
+        else
+        {
+            return node.Ints("axes") is int[] axes && axes.Length == 1 && axes[0] == -1;
+        }
+    }
+
+    /// <summary>
+    /// Create a node that replaces the nodes from <paramref name="first"/> to <paramref name="last"/> in a fused pattern. The fused node takes
+    /// the place of the last node of the pattern and has the same outputs.
+    /// </summary>
+    private static Node Fuse(OpType op, Node first, Node last, string[] inputs, Dictionary<string, object>? attributes = null)
+    {
+        var name = first.Name + "_" + last.Name;
+        return new Node()
+        {
+            Name = name,
+            ID = name.GetHashCode(),
+            WeightedGraphNode = last.WeightedGraphNode,
+            Attributes = attributes ?? new Dictionary<string, object>(),
+            Op = op,
+            Inputs = inputs,
+            Outputs = last.Outputs
+        };
+    }
+
+    /// <summary>
+    /// True if the tensor is an intermediate tensor with exactly one consumer.
+    /// </summary>
+    private static bool TryGetSingleConsumer(ComputationalGraph graph, Dictionary<string, List<int>> consumers, string name, out int consumer)
+    {
+        if (IsIntermediate(graph, name) && consumers.TryGetValue(name, out var c) && c.Count == 1)
+        {
+            consumer = c[0];
+            return true;
+        }
+        consumer = -1;
+        return false;
+    }
+
+    /// <summary>
+    /// Get the input of a binary node other than <paramref name="input"/>, or null if the node does not have <paramref name="input"/> as exactly one
+    /// of its 2 inputs.
+    /// </summary>
+    private static string? OtherInput(Node node, string input) =>
+        node.Inputs.Length != 2 || node.Inputs[0] == node.Inputs[1] ? null : node.Inputs[0] == input ? node.Inputs[1] : node.Inputs[1] == input ? node.Inputs[0] : null;
+
+    /// <summary>
+    /// Get the input of a binary node that satisfies <paramref name="other"/> for its other input.
+    /// </summary>
+    private static string? OtherInput(Node node, Func<string, bool> other) =>
+        node.Inputs.Length != 2 ? null : other(node.Inputs[1]) ? node.Inputs[0] : other(node.Inputs[0]) ? node.Inputs[1] : null;
+
+    /// <summary>
+    /// True if the tensor is a float scalar constant with a value within single precision rounding of <paramref name="value"/>.
+    /// </summary>
+    private static bool IsScalar(ComputationalGraph graph, Dictionary<string, int> producers, string? name, float value) =>
+        TryGetScalar(graph, producers, name, out var v) && MathF.Abs(v - value) <= 1e-6f * MathF.Abs(value);
+
+    /// <summary>
+    /// Get the value of a tensor that is a float scalar initializer or the output of a Constant node.
+    /// </summary>
+    private static bool TryGetScalar(ComputationalGraph graph, Dictionary<string, int> producers, string? name, out float value)
+    {
+        value = TryGetConstant(graph, producers, name, out var c) ? c switch
+        {
+            float f => f,
+            ITensor t when t.ElementType == TensorElementType.Float && t.Length == 1 => (float) t.GetValue(0),
+            _ => float.NaN
+        } : float.NaN;
+        return !float.IsNaN(value);
+    }
+
+    /// <summary>
+    /// Get the value of a tensor that is a constant initializer or the output of a Constant node.
+    /// </summary>
+    private static bool TryGetConstant(ComputationalGraph graph, Dictionary<string, int> producers, string? name, out object? value)
+    {
+        value = name is null || graph.Inputs.ContainsKey(name) && !IsConstant(graph, name) ? null
+            : graph.Initializers.TryGetValue(name, out var i) ? i
+            : producers.TryGetValue(name, out var p) && graph.Nodes[p].Op == OpType.Constant ? graph.Nodes[p].OneOfAttr("value", "value_float", "value_int", "value_ints")
+            : null;
+        return value is not null;
+    }
+
+    /// <summary>
+    /// True if the tensor is an initializer that cannot be overridden by the user. From IR version 4 an initializer that is also a graph input
+    /// is only a default value. Before IR version 4 every initializer had to be listed as a graph input, so those are still constants.
+    /// </summary>
+    internal static bool IsConstant(ComputationalGraph graph, string name) => 
+        graph.Initializers.ContainsKey(name) && (!graph.Inputs.ContainsKey(name) || graph.Model.IrVersion < 4);
+
+    /// <summary>
+    /// True if the tensor is produced by a node and is not visible outside the graph, so it can be removed by a rewrite.
+    /// </summary>
+    private static bool IsIntermediate(ComputationalGraph graph, string name) =>
+        graph.IntermediateOutputs.ContainsKey(name) && !graph.Outputs.ContainsKey(name) && !graph.Inputs.ContainsKey(name) && !graph.Initializers.ContainsKey(name);
+    #endregion
+
+    #region Fields
+    /// <summary>
+    /// Ops that must execute on every run even when their inputs are constant.
+    /// </summary>
+    internal static readonly HashSet<OpType> NonDeterministicOps = new HashSet<OpType>()
+    {
+        OpType.RandomNormal, OpType.RandomNormalLike, OpType.RandomUniform, OpType.RandomUniformLike, OpType.Multinomial, OpType.Bernoulli
+    };
+    #endregion
+}
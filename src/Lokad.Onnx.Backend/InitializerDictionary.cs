@@ -0,0 +1,141 @@
+namespace Lokad.Onnx;
+
+using System;
+using System.Collections;
+using System.Collections.Generic;
+using System.Diagnostics.CodeAnalysis;
+using System.Linq;
+
+/// <summary>
+/// The initializer tensors of a graph, keyed by name. Initializers added from tensor protos are only converted to tensors when they are first
+/// read, so loading a model does not touch the weights of initializers that are never used. Conversion is thread-safe, so the initializers
+/// can be read by concurrent executions of the graph.
+/// </summary>
+public class InitializerDictionary : IDictionary<string, ITensor>, IReadOnlyDictionary<string, ITensor>
+{
+    #region Properties
+    public ITensor this[string name]
+    {
+        get => tensors[name].Value;
+        set
+        {
+            tensors[name] = new Lazy<ITensor>(value);
+            shapes[name] = new TensorShape(value.ElementType, value.Dims);
+        }
+    }
+
+    public ICollection<string> Keys => tensors.Keys;
+
+    public ICollection<ITensor> Values => tensors.Values.Select(t => t.Value).ToList();
+
+    public int Count => tensors.Count;
+
+    /// <summary>
+    /// The number of initializers that have been converted to tensors.
+    /// </summary>
+    public int MaterializedCount => tensors.Values.Count(t => t.IsValueCreated);
+
+    public bool IsReadOnly => false;
+
+    IEnumerable<string> IReadOnlyDictionary<string, ITensor>.Keys => Keys;
+
+    IEnumerable<ITensor> IReadOnlyDictionary<string, ITensor>.Values => Values;
+    #endregion
+
+    #region Methods
+    public void Add(string name, ITensor tensor) => Add(name, new TensorShape(tensor.ElementType, tensor.Dims), new Lazy<ITensor>(tensor));
+
+    /// <summary>
+    /// Add an initializer that is created by <paramref name="factory"/> when it is first read.
+    /// </summary>
+    public void Add(string name, Func<ITensor> factory) => tensors.Add(name, new Lazy<ITensor>(factory));
+
+    /// <summary>
+    /// Add an initializer with a known shape that is created by <paramref name="factory"/> when it is first read. Reading the shape with
+    /// <see cref="GetShape(string)"/> does not create the tensor.
+    /// </summary>
+    public void Add(string name, TensorShape shape, Func<ITensor> factory) => Add(name, shape, new Lazy<ITensor>(factory));
+
+    /// <summary>
+    /// Add an initializer that is converted from a tensor proto when it is first read.
+    /// </summary>
+    public void Add(TensorProto tp) => Add(tp, () => tp.ToTensor());
+
+    /// <summary>
+    /// Add an initializer with the shape of a tensor proto that is created by <paramref name="factory"/> when it is first read, like a tensor
+    /// over external data.
+    /// </summary>
+    public void Add(TensorProto tp, Func<ITensor> factory) => 
+        Add(tp.Name, new TensorShape((TensorElementType) tp.DataType, tp.Dims.Select(d => Convert.ToInt32(d)).ToArray()), factory);
+
+    public void Add(KeyValuePair<string, ITensor> item) => Add(item.Key, item.Value);
+
+    /// <summary>
+    /// True if the initializer has been converted to a tensor.
+    /// </summary>
+    public bool IsMaterialized(string name) => tensors.TryGetValue(name, out var t) && t.IsValueCreated;
+
+    /// <summary>
+    /// The element type and dimensions of an initializer, which are read without converting the initializer to a tensor when they are known.
+    /// </summary>
+    public TensorShape GetShape(string name)
+    {
+        if (shapes.TryGetValue(name, out var s))
+        {
+            return s;
+        }
+        var t = this[name];
+        return new TensorShape(t.ElementType, t.Dims);
+    }
+
+    public bool ContainsKey(string name) => tensors.ContainsKey(name);
+
+    public bool Contains(KeyValuePair<string, ITensor> item) => TryGetValue(item.Key, out var t) && ReferenceEquals(t, item.Value);
+
+    public bool TryGetValue(string name, [MaybeNullWhen(false)] out ITensor tensor)
+    {
+        if (tensors.TryGetValue(name, out var t))
+        {
+            tensor = t.Value;
+            return true;
+        }
+        tensor = null;
+        return false;
+    }
+
+    public bool Remove(string name) => shapes.Remove(name) | tensors.Remove(name);
+
+    public bool Remove(KeyValuePair<string, ITensor> item) => Contains(item) && Remove(item.Key);
+
+    public void Clear()
+    {
+        tensors.Clear();
+        shapes.Clear();
+    }
+
+    public void CopyTo(KeyValuePair<string, ITensor>[] array, int arrayIndex)
+    {
+        foreach (var kv in this)
+        {
+            array[arrayIndex++] = kv;
+        }
+    }
+
+    public IEnumerator<KeyValuePair<string, ITensor>> GetEnumerator() => tensors.Select(kv => new KeyValuePair<string, ITensor>(kv.Key, kv.Value.Value)).GetEnumerator();
+
+    IEnumerator IEnumerable.GetEnumerator() => GetEnumerator();
+
+    private void Add(string name, TensorShape shape, Lazy<ITensor> tensor)
+    {
+        tensors.Add(name, tensor);
+        shapes[name] = shape;
+    }
+    #endregion
+
+    #region Fields
+    private readonly Dictionary<string, Lazy<ITensor>> tensors = new Dictionary<string, Lazy<ITensor>>();
+
+    // The shapes of the initializers whose shape is known without converting them to tensors.
+    private readonly Dictionary<string, TensorShape> shapes = new Dictionary<string, TensorShape>();
+    #endregion
+}
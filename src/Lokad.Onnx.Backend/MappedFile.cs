@@ -0,0 +1,102 @@
+namespace Lokad.Onnx;
+
+using System;
+using System.IO;
+using System.IO.MemoryMappedFiles;
+
+/// <summary>
+/// A read-only file mapped into memory, like an ONNX model file or an external data file. The pages of the file are shared through the OS
+/// page cache by every process that maps the same file, and are only read from disk when they are first accessed. Tensors created over the
+/// memory of the file keep the mapping alive. Pages are mapped copy-on-write, so writing to such a tensor never changes the file.
+/// </summary>
+public unsafe class MappedFile : Runtime, IDisposable
+{
+    #region Constructors
+    public MappedFile(string path)
+    {
+        Path = System.IO.Path.GetFullPath(path);
+        Length = new FileInfo(Path).Length;
+        if (Length > 0)
+        {
+            var stream = new FileStream(Path, FileMode.Open, FileAccess.Read, FileShare.Read);
+            file = MemoryMappedFile.CreateFromFile(stream, null, 0, MemoryMappedFileAccess.CopyOnWrite, HandleInheritability.None, false);
+            view = file.CreateViewAccessor(0, 0, MemoryMappedFileAccess.CopyOnWrite);
+            view.SafeMemoryMappedViewHandle.AcquirePointer(ref pointer);
+            pointer += view.PointerOffset;
+        }
+        Debug("Mapped file {f} of length {l} bytes into memory.", Path, Length);
+    }
+    #endregion
+
+    #region Properties
+    public string Path { get; }
+
+    public long Length { get; }
+
+    public bool IsDisposed => disposed;
+
+    internal byte* Pointer => !disposed ? pointer : throw new ObjectDisposedException(Path);
+    #endregion
+
+    #region Methods
+    /// <summary>
+    /// Get a block of the mapped memory without copying it.
+    /// </summary>
+    public Memory<byte> GetMemory(long offset, int length)
+    {
+        if (offset < 0 || length < 0 || offset + length > Length)
+        {
+            throw new ArgumentOutOfRangeException(nameof(offset), $"The block of {length} bytes at offset {offset} is outside the file {Path} of length {Length} bytes.");
+        }
+        return length == 0 ? Memory<byte>.Empty : new MappedMemoryManager(this, Pointer + offset, length).Memory;
+    }
+
+    public void Dispose()
+    {
+        Dispose(true);
+        GC.SuppressFinalize(this);
+    }
+
+    protected virtual void Dispose(bool disposing)
+    {
+        if (disposed)
+        {
+            return;
+        }
+        disposed = true;
+        if (view is not null)
+        {
+            view.SafeMemoryMappedViewHandle.ReleasePointer();
+        }
+        if (disposing)
+        {
+            view?.Dispose();
+            file?.Dispose();
+        }
+    }
+
+    ~MappedFile() => Dispose(false);
+    #endregion
+
+    #region Fields
+    private readonly MemoryMappedFile? file;
+    private readonly MemoryMappedViewAccessor? view;
+    private readonly byte* pointer;
+    private bool disposed;
+    #endregion
+
+    #region Types
+    /// <summary>
+    /// Native memory that references the file it was mapped from, so the mapping is not released while the memory is in use.
+    /// </summary>
+    private class MappedMemoryManager : NativeMemoryManager<byte>
+    {
+        public MappedMemoryManager(MappedFile file, byte* pointer, int length) : base(pointer, length)
+        {
+            this.file = file;
+        }
+
+        private readonly MappedFile file;
+    }
+    #endregion
+}
@@ -2,6 +2,8 @@
 
 using System;
 using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
 using System.Linq;
 using System.Runtime.Versioning;
 using System.Text;
@@ -11,6 +13,12 @@ namespace Lokad.Onnx
 {
     public class Model : Runtime
     {
+        /// <summary>
+        /// If true, <see cref="Load(string)"/> maps the model file into memory and initializers with raw data reference the mapped pages of 
+        /// the file instead of copies of the data, so processes that load the same model share one copy of the weights in the page cache.
+        /// </summary>
+        public static bool MapModelFiles = true;
+
         public static ModelProto? Parse(string onnxInputFilePath)
         {
             var op = Begin("Parsing ONNX model file {f}", onnxInputFilePath);
@@ -27,53 +35,103 @@ namespace Lokad.Onnx
             return m;
         }
 
-        public static ComputationalGraph Load(ModelProto mp)
+        /// <summary>
+        /// Parse a model file mapped into memory. The raw data of graph initializers is not copied: the initializers are parsed as external
+        /// data located in the model file itself. Only the rest of the model has to fit in a protobuf message, so models with more than 2 GB
+        /// of weights can be parsed.
+        /// </summary>
+        public static unsafe ModelProto? Parse(MappedFile file)
+        {
+            var op = Begin("Parsing mapped ONNX model file {f}", file.Path);
+            using var stream = new MemoryStream();
+            var count = 0;
+            CopyWithoutRawData(file, 0, file.Length, 0, Path.GetFileName(file.Path), stream, ref count);
+            var m = ModelProto.Parser.ParseFrom(stream.ToArray());
+            op.Complete();
+            Debug("Raw data of {c} initializers references the mapped model file.", count);
+            return m;
+        }
+
+        /// <summary>
+        /// Create a computational graph from an ONNX model. 
+        /// </summary>
+        /// <param name="externalDataDirectory">The directory that external data locations are relative to. Defaults to the current directory.</param>
+        public static ComputationalGraph Load(ModelProto mp, string? externalDataDirectory = null) => 
+            Load(mp, externalDataDirectory ?? Directory.GetCurrentDirectory(), new Dictionary<string, MappedFile>());
+
+        private static ComputationalGraph Load(ModelProto mp, string externalDataDirectory, Dictionary<string, MappedFile> files)
         {
             Info("Model details: Name: {name}. Domain: {dom}. Model opsets: {o}. Producer name: {pn}. Producer version: {pv}. IR Version: {ir}. DocString: {ds}.", mp.Graph.Name, mp.Domain, mp.OpsetImport.Select(o => o.Domain + ":" + o.Version).JoinWithSpaces(), mp.ProducerName, mp.ProducerVersion, mp.IrVersion.ToString(), mp.Graph.DocString);
             var cop = Begin("Creating computational graph from ONNX model");
-            var graph = new ComputationalGraph();
-            graph.ModelFile = "<buffer>";
-            graph.Model = mp;
-            graph.Opset = mp.OpsetImport.ToDictionary(o => o.Domain, o => Convert.ToInt32(o.Version));
-            graph.MetadataProps = mp.MetadataProps.ToDictionary(p => p.Key, p => p.Value);
-            graph.Metadata["Name"] = mp.Graph.Name;
-            graph.Metadata["IrVersion"] = (OnnxSharp::Onnx.Version)mp.IrVersion;
-            graph.Metadata["DocString"] = mp.DocString;
-            graph.Metadata["Domain"] = mp.Domain;
-            graph.Metadata["ProducerName"] = mp.ProducerName;
-            graph.Metadata["ProducerVersion"] = mp.ProducerVersion;
-            var op = Begin("Converting {c} model initializer tensor protos to graph tensors", mp.Graph.Initializer.Count);
+            var graph = CreateGraph(mp);
+            // Initializers are converted to tensors on first use. Tensors with raw data wrap the bytes of the tensor proto without copying them.
             foreach (var i in mp.Graph.Initializer)
             {
-                graph.Initializers.Add(i.Name, i.ToTensor());
+                if (i.DataLocation == TensorProto.Types.DataLocation.External)
+                {
+                    var data = GetExternalData(i, externalDataDirectory, files);
+                    graph.Initializers.Add(i, () => i.ToTensor(data));
+                }
+                else
+                {
+                    graph.Initializers.Add(i);
+                }
             }
-            op.Complete();
-            op = Begin("Converting {c} model input and output tensor protos to graph tensors", mp.Graph.Input.Count + mp.Graph.Output.Count);
-            graph.Inputs = mp.Graph.Input.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
-            graph.Outputs = mp.Graph.Output.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
-            op.Complete();
-            op = Begin("Converting {c} model node protos to graph nodes", mp.Graph.Node.Count);
+            var op = Begin("Converting {c} model node protos to graph nodes", mp.Graph.Node.Count);
             foreach (var np in mp.Graph.Node)
             {
                 graph.Nodes.Add(np.ToNode(graph));
             }
             op.Complete();
+            if (!graph.IsTopologicallySorted())
+            {
+                Warn("The model nodes are not sorted topologically. Sorting {c} nodes.", graph.Nodes.Count);
+                graph.Nodes = graph.GetTopologicalOrder();
+            }
+            if (GraphOptimizer.Enabled)
+            {
+                GraphOptimizer.Optimize(graph);
+            }
             cop.Complete(); 
             return graph;
         }
 
-        public static ComputationalGraph? Load(string onnxInputFilePath)
+        public static ComputationalGraph? Load(string onnxInputFilePath) => Load(onnxInputFilePath, null);
+
+        /// <summary>
+        /// Create a computational graph from an ONNX model file.
+        /// </summary>
+        /// <param name="cache">If not null, the optimized graph is loaded from this cache if the model file was cached before, and is added 
+        /// to the cache otherwise.</param>
+        public static ComputationalGraph? Load(string onnxInputFilePath, ModelCache? cache)
         {
-            var mp = Parse(onnxInputFilePath);
+            var key = cache is not null ? cache.GetCachedKey(onnxInputFilePath) : "";
+            if (cache is not null && cache.TryLoad(key, onnxInputFilePath, out var cached))
+            {
+                return cached;
+            }
+            var files = new Dictionary<string, MappedFile>();
+            ModelProto? mp;
+            if (MapModelFiles)
+            {
+                var file = new MappedFile(onnxInputFilePath);
+                files.Add(file.Path, file);
+                mp = Parse(file);
+            }
+            else
+            {
+                mp = Parse(onnxInputFilePath);
+            }
             if (mp is null)
             {
                 Error("Could not parse {f} as ONNX model file.", onnxInputFilePath);
                 return null;
             }
-            var g = Load(mp);
+            var g = Load(mp, Path.GetDirectoryName(Path.GetFullPath(onnxInputFilePath))!, files);
             if (g is not null)
             {
                 g.ModelFile = onnxInputFilePath;
+                cache?.Save(key, g);
             }
             return g;
         }
@@ -89,5 +147,165 @@ namespace Lokad.Onnx
             Info("Model details: Name: {name}. Domain: {dom}. Producer name: {pn}. Producer version: {pv}. IR Version: {ir}. DocString: {ds}.", mp.Graph.Name, mp.Domain, mp.ProducerName, mp.ProducerVersion, mp.IrVersion.ToString(), mp.Graph.DocString);
             return Load(mp);
         }
+
+        /// <summary>
+        /// Create a graph with the metadata, inputs and outputs of an ONNX model, without nodes or initializers.
+        /// </summary>
+        internal static ComputationalGraph CreateGraph(ModelProto mp)
+        {
+            var graph = new ComputationalGraph();
+            graph.ModelFile = "<buffer>";
+            graph.Model = mp;
+            graph.Opset = mp.OpsetImport.ToDictionary(o => o.Domain, o => Convert.ToInt32(o.Version));
+            graph.MetadataProps = mp.MetadataProps.ToDictionary(p => p.Key, p => p.Value);
+            graph.Metadata["Name"] = mp.Graph.Name;
+            graph.Metadata["IrVersion"] = (OnnxSharp::Onnx.Version)mp.IrVersion;
+            graph.Metadata["DocString"] = mp.DocString;
+            graph.Metadata["Domain"] = mp.Domain;
+            graph.Metadata["ProducerName"] = mp.ProducerName;
+            graph.Metadata["ProducerVersion"] = mp.ProducerVersion;
+            var op = Begin("Converting {c} model input and output tensor protos to graph tensors", mp.Graph.Input.Count + mp.Graph.Output.Count);
+            graph.Inputs = mp.Graph.Input.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
+            graph.Outputs = mp.Graph.Output.ToDictionary(vp => vp.Name, vp => vp.ToTensor());
+            op.Complete();
+            return graph;
+        }
+
+        /// <summary>
+        /// Map the external data of an initializer, mapping each external data file once. Like the ONNX checker, only locations relative to 
+        /// the model directory that do not resolve outside of it are accepted, so a model cannot map arbitrary files on disk.
+        /// </summary>
+        private static Memory<byte> GetExternalData(TensorProto tp, string directory, Dictionary<string, MappedFile> files)
+        {
+            var entries = tp.ExternalData.ToDictionary(e => e.Key, e => e.Value);
+            if (!entries.TryGetValue("location", out var location))
+            {
+                throw new InvalidDataException($"The external data of initializer {tp.Name} does not have a location.");
+            }
+            if (Path.IsPathRooted(location))
+            {
+                throw new InvalidDataException($"The external data location {location} of initializer {tp.Name} is not a relative path.");
+            }
+            var root = Path.TrimEndingDirectorySeparator(Path.GetFullPath(directory)) + Path.DirectorySeparatorChar;
+            var path = Path.GetFullPath(Path.Combine(root, location));
+            if (!path.StartsWith(root, OperatingSystem.IsWindows() ? StringComparison.OrdinalIgnoreCase : StringComparison.Ordinal))
+            {
+                throw new InvalidDataException($"The external data location {location} of initializer {tp.Name} is outside of the model directory {directory}.");
+            }
+            if (!files.TryGetValue(path, out var file))
+            {
+                file = new MappedFile(path);
+                files.Add(path, file);
+            }
+            var offset = entries.TryGetValue("offset", out var o) ? long.Parse(o, CultureInfo.InvariantCulture) : 0L;
+            var length = entries.TryGetValue("length", out var l) ? long.Parse(l, CultureInfo.InvariantCulture) : file.Length - offset;
+            if (length > int.MaxValue)
+            {
+                throw new NotSupportedException($"The external data of initializer {tp.Name} is larger than 2 GB.");
+            }
+            return file.GetMemory(offset, (int) length);
+        }
+
+        /// <summary>
+        /// Copy the protobuf message at [start, end) of a mapped model file to a stream, replacing the raw data of graph initializers with 
+        /// external data that references the model file. Level 0 is the model, level 1 the graph and level 2 an initializer.
+        /// </summary>
+        private static unsafe void CopyWithoutRawData(MappedFile file, long start, long end, int level, string location, Stream s, ref int count)
+        {
+            var p = file.Pointer;
+            var pos = start;
+            var dataLocation = 0UL;
+            var hasRawData = false;
+            while (pos < end)
+            {
+                var fieldStart = pos;
+                var tag = ReadVarint(p, ref pos);
+                var field = tag >> 3;
+                var wireType = tag & 7;
+                var length = 0L;
+                switch (wireType)
+                {
+                    case 0: ReadVarint(p, ref pos); break;
+                    case 1: pos += 8; break;
+                    case 2: length = (long) ReadVarint(p, ref pos); break;
+                    case 5: pos += 4; break;
+                    default: throw new InvalidDataException($"Unsupported protobuf wire type {wireType} at offset {fieldStart} of {file.Path}.");
+                }
+                if (wireType == 2 && ((level == 0 && field == 7) || (level == 1 && field == 5)))
+                {
+                    using var ms = new MemoryStream();
+                    CopyWithoutRawData(file, pos, pos + length, level + 1, location, ms, ref count);
+                    WriteVarint(s, tag);
+                    WriteVarint(s, (ulong) ms.Length);
+                    ms.WriteTo(s);
+                }
+                else if (wireType == 2 && level == 2 && field == 9 && length > 0)
+                {
+                    WriteEntry(s, "location", location);
+                    WriteEntry(s, "offset", pos.ToString(CultureInfo.InvariantCulture));
+                    WriteEntry(s, "length", length.ToString(CultureInfo.InvariantCulture));
+                    hasRawData = true;
+                    count++;
+                }
+                else if (wireType == 0 && level == 2 && field == 14)
+                {
+                    var p2 = fieldStart;
+                    ReadVarint(p, ref p2);
+                    dataLocation = ReadVarint(p, ref p2);
+                }
+                else
+                {
+                    s.Write(new ReadOnlySpan<byte>(p + fieldStart, checked((int) (pos + length - fieldStart))));
+                }
+                pos += length;
+            }
+            if (level == 2 && (hasRawData || dataLocation != 0))
+            {
+                WriteVarint(s, (14 << 3) | 0);
+                WriteVarint(s, hasRawData ? (ulong) TensorProto.Types.DataLocation.External : dataLocation);
+            }
+        }
+
+        private static unsafe ulong ReadVarint(byte* p, ref long pos)
+        {
+            ulong value = 0;
+            for (int shift = 0; shift < 64; shift += 7)
+            {
+                var b = p[pos++];
+                value |= (ulong) (b & 0x7f) << shift;
+                if ((b & 0x80) == 0)
+                {
+                    return value;
+                }
+            }
+            throw new InvalidDataException($"Malformed protobuf varint at offset {pos}.");
+        }
+
+        private static void WriteVarint(Stream s, ulong value)
+        {
+            while (value >= 0x80)
+            {
+                s.WriteByte((byte) (value | 0x80));
+                value >>= 7;
+            }
+            s.WriteByte((byte) value);
+        }
+
+        // A StringStringEntryProto in the external_data field of a TensorProto.
+        private static void WriteEntry(Stream s, string key, string value)
+        {
+            using var entry = new MemoryStream();
+            var k = Encoding.UTF8.GetBytes(key);
+            var v = Encoding.UTF8.GetBytes(value);
+            WriteVarint(entry, (1 << 3) | 2);
+            WriteVarint(entry, (ulong) k.Length);
+            entry.Write(k);
+            WriteVarint(entry, (2 << 3) | 2);
+            WriteVarint(entry, (ulong) v.Length);
+            entry.Write(v);
+            WriteVarint(s, (13 << 3) | 2);
+            WriteVarint(s, (ulong) entry.Length);
+            entry.WriteTo(s);
+        }
     }
 }
@@ -0,0 +1,416 @@
+namespace Lokad.Onnx;
+
+using System;
+using System.Collections.Generic;
+using System.Diagnostics.CodeAnalysis;
+using System.IO;
+using System.Linq;
+using System.Security.Cryptography;
+using System.Text;
+
+using Google.Protobuf;
+
+/// <summary>
+/// An on-disk cache of loaded and optimized models, keyed by a hash of the model file contents. Loading a cached model skips parsing the node
+/// protos, converting node attributes and running the graph optimizer: the optimized nodes are read from a small graph file and the initializers
+/// are mapped from a flat weights file in which each tensor is aligned to <see cref="Alignment"/> bytes.
+/// </summary>
+public class ModelCache : Runtime
+{
+    #region Constructors
+    public ModelCache(string directory)
+    {
+        Directory = Path.GetFullPath(directory);
+        System.IO.Directory.CreateDirectory(Directory);
+    }
+    #endregion
+
+    #region Properties
+    public string Directory { get; }
+    #endregion
+
+    #region Methods
+    /// <summary>
+    /// Get the cache key of a model file from a hash of the file contents, the build of the backend and the graph optimizer settings, so cached
+    /// graphs are not reused by a backend that would optimize the model differently.
+    /// </summary>
+    public static string GetKey(string modelFile)
+    {
+        var op = Begin("Hashing model file {f}", modelFile);
+        using var hash = IncrementalHash.CreateHash(HashAlgorithmName.SHA256);
+        using (var stream = new FileStream(modelFile, FileMode.Open, FileAccess.Read, FileShare.Read, 1, FileOptions.SequentialScan))
+        {
+            var buffer = new byte[1 << 20];
+            int n;
+            while ((n = stream.Read(buffer, 0, buffer.Length)) > 0)
+            {
+                hash.AppendData(buffer, 0, n);
+            }
+        }
+        hash.AppendData(typeof(ModelCache).Assembly.ManifestModule.ModuleVersionId.ToByteArray());
+        hash.AppendData(BitConverter.GetBytes(GraphOptimizer.Enabled));
+        op.Complete();
+        return Convert.ToHexString(hash.GetHashAndReset());
+    }
+
+    /// <summary>
+    /// Get the cache key of a model file without hashing its contents when the file has not changed since the key was last computed. The key
+    /// is stored in an index file together with the full path, length and last write time of the model file, and the contents are only hashed
+    /// again when one of these changes.
+    /// </summary>
+    public string GetCachedKey(string modelFile)
+    {
+        var path = Path.GetFullPath(modelFile);
+        var info = new FileInfo(path);
+        var indexFile = IndexFile(path);
+        try
+        {
+            if (File.Exists(indexFile))
+            {
+                using var reader = new BinaryReader(File.OpenRead(indexFile), Encoding.UTF8);
+                if (reader.ReadString() == Magic && reader.ReadInt32() == FormatVersion && reader.ReadString() == path && reader.ReadInt64() == info.Length 
+                    && reader.ReadInt64() == info.LastWriteTimeUtc.Ticks)
+                {
+                    return reader.ReadString();
+                }
+            }
+        }
+        catch (Exception e) when (e is IOException or UnauthorizedAccessException)
+        {
+            Warn("Could not read the cache index file {f}: {m}", indexFile, e.Message);
+        }
+        var key = GetKey(path);
+        var indexTemp = indexFile + "." + Guid.NewGuid().ToString("N");
+        try
+        {
+            using (var writer = new BinaryWriter(new FileStream(indexTemp, FileMode.CreateNew, FileAccess.Write), Encoding.UTF8))
+            {
+                writer.Write(Magic);
+                writer.Write(FormatVersion);
+                writer.Write(path);
+                writer.Write(info.Length);
+                writer.Write(info.LastWriteTimeUtc.Ticks);
+                writer.Write(key);
+            }
+            File.Move(indexTemp, indexFile, true);
+        }
+        catch (Exception e) when (e is IOException or UnauthorizedAccessException)
+        {
+            Warn("Could not write the cache index file {f}: {m}", indexFile, e.Message);
+            File.Delete(indexTemp);
+        }
+        return key;
+    }
+
+    public bool Contains(string key) => File.Exists(GraphFile(key)) && File.Exists(WeightsFile(key));
+
+    /// <summary>
+    /// Load a cached graph. Initializers are mapped from the weights file and converted to tensors on first use.
+    /// </summary>
+    /// <returns>False if the graph is not in the cache, or if external data files of the model changed since it was cached.</returns>
+    public bool TryLoad(string key, string modelFile, [NotNullWhen(true)] out ComputationalGraph? graph)
+    {
+        graph = null;
+        if (!Contains(key))
+        {
+            return false;
+        }
+        var op = Begin("Loading cached graph {k} for model file {f}", key, modelFile);
+        try
+        {
+            using var reader = new BinaryReader(File.OpenRead(GraphFile(key)), Encoding.UTF8);
+            if (reader.ReadString() != Magic || reader.ReadInt32() != FormatVersion)
+            {
+                Warn("The cached graph {k} has an unsupported format.", key);
+                return false;
+            }
+            for (int i = reader.ReadInt32(); i > 0; i--)
+            {
+                var (path, length, time) = (reader.ReadString(), reader.ReadInt64(), reader.ReadInt64());
+                var info = new FileInfo(path);
+                if (!info.Exists || info.Length != length || info.LastWriteTimeUtc.Ticks != time)
+                {
+                    Info("The external data file {f} of the cached graph {k} has changed.", path, key);
+                    return false;
+                }
+            }
+            var g = Model.CreateGraph(ModelProto.Parser.ParseFrom(reader.ReadBytes(reader.ReadInt32())));
+            for (int i = reader.ReadInt32(); i > 0; i--)
+            {
+                var node = new Node()
+                {
+                    Name = reader.ReadString(),
+                    Op = (OpType) reader.ReadInt32(),
+                    Inputs = ReadStrings(reader),
+                    Outputs = ReadStrings(reader),
+                    Attributes = new Dictionary<string, object>()
+                };
+                node.ID = node.Name.GetHashCode();
+                for (int j = reader.ReadInt32(); j > 0; j--)
+                {
+                    node.Attributes.Add(reader.ReadString(), ReadAttribute(reader));
+                }
+                node.WeightedGraphNode = new Satsuma.Node(node.ID);
+                g.AddWeightedGraphNode(node);
+                g.Nodes.Add(node);
+            }
+            for (int i = reader.ReadInt32(); i > 0; i--)
+            {
+                g.IntermediateOutputs.Add(reader.ReadString(), null);
+            }
+            var weights = new MappedFile(WeightsFile(key));
+            for (int i = reader.ReadInt32(); i > 0; i--)
+            {
+                var name = reader.ReadString();
+                var elementType = (TensorElementType) reader.ReadInt32();
+                var dims = ReadInts(reader);
+                var data = weights.GetMemory(reader.ReadInt64(), reader.ReadInt32());
+                g.Initializers.Add(name, new TensorShape(elementType, dims), () =>
+                {
+                    var t = data.ToTensor(elementType, dims);
+                    t.Name = name;
+                    return t;
+                });
+            }
+            g.ModelFile = modelFile;
+            op.Complete();
+            Info("Loaded cached graph {k} with {n} nodes and {i} initializers.", key, g.Nodes.Count, g.Initializers.Count);
+            graph = g;
+            return true;
+        }
+        catch (Exception e) when (e is IOException or UnauthorizedAccessException or InvalidDataException or InvalidProtocolBufferException or NotSupportedException)
+        {
+            Warn("Could not load the cached graph {k}: {m}", key, e.Message);
+            return false;
+        }
+    }
+
+    /// <summary>
+    /// Add a loaded graph to the cache. Every initializer is converted to a tensor and written to the weights file.
+    /// </summary>
+    /// <returns>False if the graph could not be cached, e.g. because a node attribute has a type that cannot be cached.</returns>
+    public bool Save(string key, ComputationalGraph graph)
+    {
+        var op = Begin("Caching graph {k} with {n} nodes and {i} initializers", key, graph.Nodes.Count, graph.Initializers.Count);
+        var graphTemp = GraphFile(key) + "." + Guid.NewGuid().ToString("N");
+        var weightsTemp = WeightsFile(key) + "." + Guid.NewGuid().ToString("N");
+        try
+        {
+            var initializers = new List<(string Name, ITensor Tensor, long Offset, int Length)>();
+            using (var weights = new FileStream(weightsTemp, FileMode.CreateNew, FileAccess.Write))
+            {
+                foreach (var kv in graph.Initializers)
+                {
+                    weights.Write(new byte[(Alignment - weights.Position % Alignment) % Alignment]);
+                    var offset = weights.Position;
+                    var length = WriteTensorData(weights, kv.Value);
+                    initializers.Add((kv.Key, kv.Value, offset, length));
+                }
+            }
+            using (var writer = new BinaryWriter(new FileStream(graphTemp, FileMode.CreateNew, FileAccess.Write), Encoding.UTF8))
+            {
+                writer.Write(Magic);
+                writer.Write(FormatVersion);
+                var modelFile = Path.GetFullPath(graph.ModelFile);
+                var directory = Path.GetDirectoryName(modelFile)!;
+                var dependencies = graph.Model.Graph.Initializer
+                    .Where(i => i.DataLocation == TensorProto.Types.DataLocation.External)
+                    .Select(i => i.ExternalData.FirstOrDefault(e => e.Key == "location")?.Value)
+                    .OfType<string>()
+                    .Select(l => Path.GetFullPath(Path.Combine(directory, l)))
+                    .Where(p => p != modelFile)
+                    .Distinct()
+                    .ToArray();
+                writer.Write(dependencies.Length);
+                foreach (var d in dependencies)
+                {
+                    var info = new FileInfo(d);
+                    writer.Write(d);
+                    writer.Write(info.Length);
+                    writer.Write(info.LastWriteTimeUtc.Ticks);
+                }
+
+                // The model without nodes and initializers keeps the inputs, outputs and metadata of the model.
+                var mp = graph.Model.Clone();
+                mp.Graph.Node.Clear();
+                mp.Graph.Initializer.Clear();
+                var model = mp.ToByteArray();
+                writer.Write(model.Length);
+                writer.Write(model);
+                writer.Write(graph.Nodes.Count);
+                foreach (var node in graph.Nodes)
+                {
+                    writer.Write(node.Name);
+                    writer.Write((int) node.Op);
+                    WriteStrings(writer, node.Inputs);
+                    WriteStrings(writer, node.Outputs);
+                    var attributes = node.Attributes ?? new Dictionary<string, object>();
+                    writer.Write(attributes.Count);
+                    foreach (var a in attributes)
+                    {
+                        writer.Write(a.Key);
+                        WriteAttribute(writer, a.Value);
+                    }
+                }
+                writer.Write(graph.IntermediateOutputs.Count);
+                foreach (var name in graph.IntermediateOutputs.Keys)
+                {
+                    writer.Write(name);
+                }
+                writer.Write(initializers.Count);
+                foreach (var i in initializers)
+                {
+                    writer.Write(i.Name);
+                    writer.Write((int) i.Tensor.ElementType);
+                    WriteInts(writer, i.Tensor.Dims);
+                    writer.Write(i.Offset);
+                    writer.Write(i.Length);
+                }
+            }
+            // The graph file is moved last, so a cache entry is only visible once its weights file is complete.
+            File.Move(weightsTemp, WeightsFile(key), true);
+            File.Move(graphTemp, GraphFile(key), true);
+            op.Complete();
+            return true;
+        }
+        catch (Exception e) when (e is IOException or UnauthorizedAccessException or NotSupportedException or ArgumentException)
+        {
+            Warn("Could not cache graph {k}: {m}", key, e.Message);
+            File.Delete(graphTemp);
+            File.Delete(weightsTemp);
+            return false;
+        }
+    }
+
+    private string GraphFile(string key) => Path.Combine(Directory, key + ".graph");
+
+    private string WeightsFile(string key) => Path.Combine(Directory, key + ".weights");
+
+    /// <summary>
+    /// The index file of a model file is named after its full path, the build of the backend and the graph optimizer settings, like the keys 
+    /// it stores.
+    /// </summary>
+    private string IndexFile(string modelFile)
+    {
+        using var hash = IncrementalHash.CreateHash(HashAlgorithmName.SHA256);
+        hash.AppendData(Encoding.UTF8.GetBytes(modelFile));
+        hash.AppendData(typeof(ModelCache).Assembly.ManifestModule.ModuleVersionId.ToByteArray());
+        hash.AppendData(BitConverter.GetBytes(GraphOptimizer.Enabled));
+        return Path.Combine(Directory, Convert.ToHexString(hash.GetHashAndReset()) + ".index");
+    }
+
+    /// <summary>
+    /// Write the elements of a tensor in row-major order.
+    /// </summary>
+    /// <returns>The number of bytes written.</returns>
+    private static unsafe int WriteTensorData(Stream s, ITensor tensor)
+    {
+        using var buffer = PinnedTensorBuffer.Create(tensor);
+        var length = checked(buffer.Length * buffer.ElementSize);
+        s.Write(new ReadOnlySpan<byte>((void*) buffer.Pointer, length));
+        return length;
+    }
+
+    private static void WriteAttribute(BinaryWriter writer, object value)
+    {
+        switch (value)
+        {
+            case long l: writer.Write((byte) AttributeType.Int64); writer.Write(l); break;
+            case long[] ls: writer.Write((byte) AttributeType.Int64s); writer.Write(ls.Length); Array.ForEach(ls, writer.Write); break;
+            case int i: writer.Write((byte) AttributeType.Int32); writer.Write(i); break;
+            case int[] iss: writer.Write((byte) AttributeType.Int32s); WriteInts(writer, iss); break;
+            case float f: writer.Write((byte) AttributeType.Float); writer.Write(f); break;
+            case float[] fs: writer.Write((byte) AttributeType.Floats); writer.Write(fs.Length); Array.ForEach(fs, writer.Write); break;
+            case double d: writer.Write((byte) AttributeType.Double); writer.Write(d); break;
+            case string str: writer.Write((byte) AttributeType.String); writer.Write(str); break;
+            case string[] strs: writer.Write((byte) AttributeType.Strings); WriteStrings(writer, strs); break;
+            case ITensor t:
+                writer.Write((byte) AttributeType.Tensor);
+                writer.Write(t.Name ?? "");
+                writer.Write((int) t.ElementType);
+                WriteInts(writer, t.Dims);
+                using (var ms = new MemoryStream())
+                {
+                    WriteTensorData(ms, t);
+                    writer.Write((int) ms.Length);
+                    writer.Write(ms.GetBuffer(), 0, (int) ms.Length);
+                }
+                break;
+            default: throw new NotSupportedException($"Cannot cache a node attribute of type {value.GetType().Name}.");
+        }
+    }
+
+    private static object ReadAttribute(BinaryReader reader)
+    {
+        switch ((AttributeType) reader.ReadByte())
+        {
+            case AttributeType.Int64: return reader.ReadInt64();
+            case AttributeType.Int64s: return Enumerable.Range(0, reader.ReadInt32()).Select(_ => reader.ReadInt64()).ToArray();
+            case AttributeType.Int32: return reader.ReadInt32();
+            case AttributeType.Int32s: return ReadInts(reader);
+            case AttributeType.Float: return reader.ReadSingle();
+            case AttributeType.Floats: return Enumerable.Range(0, reader.ReadInt32()).Select(_ => reader.ReadSingle()).ToArray();
+            case AttributeType.Double: return reader.ReadDouble();
+            case AttributeType.String: return reader.ReadString();
+            case AttributeType.Strings: return ReadStrings(reader);
+            case AttributeType.Tensor:
+                var name = reader.ReadString();
+                var elementType = (TensorElementType) reader.ReadInt32();
+                var dims = ReadInts(reader);
+                var t = new Memory<byte>(reader.ReadBytes(reader.ReadInt32())).ToTensor(elementType, dims);
+                t.Name = name;
+                return t;
+            default: throw new InvalidDataException("Unknown node attribute type in cached graph.");
+        }
+    }
+
+    private static void WriteStrings(BinaryWriter writer, string[] values)
+    {
+        writer.Write(values.Length);
+        foreach (var v in values)
+        {
+            writer.Write(v);
+        }
+    }
+
+    private static string[] ReadStrings(BinaryReader reader) => Enumerable.Range(0, reader.ReadInt32()).Select(_ => reader.ReadString()).ToArray();
+
+    private static void WriteInts(BinaryWriter writer, int[] values)
+    {
+        writer.Write(values.Length);
+        foreach (var v in values)
+        {
+            writer.Write(v);
+        }
+    }
+
+    private static int[] ReadInts(BinaryReader reader) => Enumerable.Range(0, reader.ReadInt32()).Select(_ => reader.ReadInt32()).ToArray();
+    #endregion
+
+    #region Fields
+    /// <summary>
+    /// The alignment in bytes of each tensor in the weights file, so tensors mapped from the file can be read with aligned vector loads.
+    /// </summary>
+    public const int Alignment = 64;
+
+    private const string Magic = "LOKAD.ONNX.GRAPH";
+
+    private const int FormatVersion = 1;
+    #endregion
+
+    #region Types
+    private enum AttributeType : byte
+    {
+        Int64,
+        Int64s,
+        Int32,
+        Int32s,
+        Float,
+        Floats,
+        Double,
+        String,
+        Strings,
+        Tensor
+    }
+    #endregion
+}
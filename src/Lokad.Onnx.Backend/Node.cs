@@ -49,6 +49,8 @@ public partial struct Node
         }
     }
 
+    public float? Float(string name, float? d = null) => HasAttr<float>(name) ? Attr<float>(name) : HasAttr<double>(name) ? (float) Attr<double>(name) : d;
+
     public int RequiredInt(string name) => Int(name) ?? throw new ArgumentException($"The Int attribute {name} is required but was not found.");
 
     public int[]? Ints(string name)
@@ -78,30 +80,32 @@ public partial struct Node
     public ITensor? InputTensorOrAttr(ComputationalGraph graph, int index, string name) => index < Inputs.Length ? graph.GetInputTensor(Inputs[index]) : Attr<ITensor>(name);
 
     public OpResult Execute(ComputationalGraph graph, ExecutionProvider provider = ExecutionProvider.CPU)
+    {
+        var node = this;
+        return Execute(() => provider == ExecutionProvider.CPU ? node.ExecuteCPU(graph) : throw new NotSupportedException());
+    }
+
+    /// <summary>
+    /// Execute the node using a kernel bound ahead of time by <see cref="BindCPU(ComputationalGraph)"/>.
+    /// </summary>
+    public OpResult Execute(OpKernel kernel, ITensor?[] inputs) => Execute(() => kernel(inputs));
+
+    private OpResult Execute(Func<OpResult> op)
     {
         try
         {
-            if (provider == ExecutionProvider.CPU)
+            var r = op();
+            if (r.Status == OpStatus.Success && r.Outputs.Length != Outputs.Length)
             {
- 
-                var r = ExecuteCPU(graph);
-                
-                if (r.Status == OpStatus.Success && r.Outputs.Length != Outputs.Length)
-                {
-                    return Failure(Op, $"The operation returned {r.Outputs.Length} outputs but the graph node has {Outputs.Length} outputs.");
-                }
-                else
-                {
-                    for (int i = 0; i < r.Outputs.Length; i++)
-                    {
-                        r.Outputs[i].Name = this.Outputs[i];
-                    }
-                    return r;
-                }
+                return Failure(Op, $"The operation returned {r.Outputs.Length} outputs but the graph node has {Outputs.Length} outputs.");
             }
             else
             {
-                throw new NotSupportedException();
+                for (int i = 0; i < r.Outputs.Length; i++)
+                {
+                    r.Outputs[i].Name = this.Outputs[i];
+                }
+                return r;
             }
         }
         catch (ArgumentNullException ane)
@@ -141,6 +145,8 @@ public partial struct Node
 
         OpType.Erf => CPU.Erf(InputTensor(graph, 0)),
 
+        OpType.Gelu => CPU.Gelu(InputTensor(graph, 0), Attr<string>("approximate")),
+
         OpType.MaxPool => CPU.MaxPool(InputTensor(graph, 0), Attr<string>("auto_pad"), Attr<int?>("ceil_mode"), Ints("dilations"), Ints("kernel_shape"), Ints("pads"), Attr<int?>("storage_order"), Ints("strides")),
 
         OpType.MatMul => CPU.MatMul(InputTensor(graph, 0), InputTensor(graph, 1)),
@@ -177,7 +183,231 @@ public partial struct Node
 
         OpType.Softmax => CPU.Softmax(InputTensor(graph, 0), Int("axis")),
 
+        OpType.LayerNormalization => CPU.LayerNormalization(InputTensor(graph, 0), InputTensor(graph, 1), InputTensor(graph, 2), Int("axis"), Float("epsilon"), Outputs.Length),
+
+        OpType.MatMulAdd => CPU.MatMulAdd(InputTensor(graph, 0), InputTensor(graph, 1), InputTensor(graph, 2)),
+
         _ => NotSupported(Op)
     };
+
+    /// <summary>
+    /// Bind the CPU kernel for this node ahead of execution. Attributes are read and converted once here instead of on every 
+    /// execution. The returned kernel takes the node input tensors in the same order as <see cref="Inputs"/>.
+    /// </summary>
+    public OpKernel BindCPU(ComputationalGraph graph)
+    {
+        var op = Op;
+        switch (Op)
+        {
+            case OpType.Reshape:
+                {
+                    var allow_zero = Attr<bool?>("allow_zero");
+                    return x => CPU.Reshape(In(x, 0), In(x, 1), allow_zero);
+                }
+            case OpType.Add: return x => CPU.Add(In(x, 0), In(x, 1));
+            case OpType.Sub: return x => CPU.Sub(In(x, 0), In(x, 1));
+            case OpType.Mul: return x => CPU.Mul(In(x, 0), In(x, 1));
+            case OpType.Div: return x => CPU.Div(In(x, 0), In(x, 1));
+            case OpType.Pow: return x => CPU.Pow(In(x, 0), In(x, 1));
+            case OpType.Sqrt: return x => CPU.Sqrt(In(x, 0));
+            case OpType.Conv:
+                {
+                    var auto_pad = Attr<string>("auto_pad");
+                    var dilations = Attr<int[]>("dilations");
+                    var group = Attr<int?>("group");
+                    var kernel_shape = Attr<int[]>("kernel_shape");
+                    var pads = Attr<int[]>("pads");
+                    var strides = Attr<int[]>("strides");
+                    return x => CPU.Conv(In(x, 0), In(x, 1), In(x, 2), auto_pad, dilations, group, kernel_shape, pads, strides);
+                }
+            case OpType.Relu: return x => CPU.Relu(In(x, 0));
+            case OpType.Erf: return x => CPU.Erf(In(x, 0));
+            case OpType.Gelu:
+                {
+                    var approximate = Attr<string>("approximate");
+                    return x => CPU.Gelu(In(x, 0), approximate);
+                }
+            case OpType.MaxPool:
+                {
+                    var auto_pad = Attr<string>("auto_pad");
+                    var ceil_mode = Attr<int?>("ceil_mode");
+                    var dilations = Ints("dilations");
+                    var kernel_shape = Ints("kernel_shape");
+                    var pads = Ints("pads");
+                    var storage_order = Attr<int?>("storage_order");
+                    var strides = Ints("strides");
+                    return x => CPU.MaxPool(In(x, 0), auto_pad, ceil_mode, dilations, kernel_shape, pads, storage_order, strides);
+                }
+            case OpType.MatMul: return x => CPU.MatMul(In(x, 0), In(x, 1));
+            case OpType.Transpose:
+                {
+                    var perm = Ints("perm");
+                    return x => CPU.Transpose(In(x, 0), perm);
+                }
+            case OpType.Constant:
+                {
+                    var value = OneOfAttr("sparse_value", "value", "value_float", "value_floats", "value_int", "value_ints", "value_string", "value_strings");
+                    return x => CPU.Constant(value);
+                }
+            case OpType.Cast:
+                {
+                    var to = RequiredInt("to");
+                    return x => CPU.Cast(In(x, 0), to);
+                }
+            case OpType.Concat:
+                {
+                    var axis = RequiredInt("axis");
+                    return x => CPU.Concat(x!, axis);
+                }
+            case OpType.Shape:
+                {
+                    var start = Int("start");
+                    var end = Int("end");
+                    return x => CPU.Shape(In(x, 0), start, end);
+                }
+            case OpType.Gather:
+                {
+                    var axis = Int("axis");
+                    return x => CPU.Gather(In(x, 0), In(x, 1), axis);
+                }
+            case OpType.Slice: return x => CPU.Slice(In(x, 0), In(x, 1), In(x, 2), In(x, 3), In(x, 4));
+            case OpType.Unsqueeze:
+                if (graph.OpsetVersion() >= 13)
+                {
+                    return x => CPU.Unsqueeze(In(x, 0), In(x, 1));
+                }
+                else
+                {
+                    var axes = RequiredInts("axes");
+                    return x => CPU.Unsqueeze(In(x, 0), axes);
+                }
+            case OpType.ReduceSum:
+                {
+                    var keepdims = Int("keepdims");
+                    var noop_with_empty_axes = Int("noop_with_empty_axes");
+                    return x => CPU.ReduceSum(In(x, 0), In(x, 1), keepdims, noop_with_empty_axes);
+                }
+            case OpType.ReduceMean:
+                {
+                    var keepdims = Int("keepdims");
+                    var noop_with_empty_axes = Int("noop_with_empty_axes");
+                    if (graph.OpsetVersion() >= 13)
+                    {
+                        return x => CPU.ReduceMean(In(x, 0), In(x, 1), keepdims, noop_with_empty_axes);
+                    }
+                    else
+                    {
+                        var axes = RequiredInts("axes").ToTensor<int>();
+                        return x => CPU.ReduceMean(In(x, 0), axes, keepdims, noop_with_empty_axes);
+                    }
+                }
+            case OpType.ReduceMax:
+                {
+                    var keepdims = Int("keepdims");
+                    return x => CPU.ReduceMax(In(x, 0), In(x, 1), keepdims);
+                }
+            case OpType.Softmax:
+                {
+                    var axis = Int("axis");
+                    return x => CPU.Softmax(In(x, 0), axis);
+                }
+            case OpType.LayerNormalization:
+                {
+                    var axis = Int("axis");
+                    var epsilon = Float("epsilon");
+                    var outputs = Outputs.Length;
+                    return x => CPU.LayerNormalization(In(x, 0), In(x, 1), In(x, 2), axis, epsilon, outputs);
+                }
+            case OpType.MatMulAdd: return x => CPU.MatMulAdd(In(x, 0), In(x, 1), In(x, 2));
+            default: return x => NotSupported(op);
+        }
+    }
+
+    /// <summary>
+    /// Bind a CPU kernel for this node that writes its output to the buffer of the input at <paramref name="input"/> when it can, or null
+    /// if the op cannot execute in place. The caller must ensure the input is dead after this node executes.
+    /// </summary>
+    public OpKernel? BindCPUInPlace(ComputationalGraph graph, int input)
+    {
+        if (input < 0 || input >= Inputs.Length || !CanExecuteInPlace(Op, input))
+        {
+            return null;
+        }
+        switch (Op)
+        {
+            case OpType.Add: return x => CPU.Add(In(x, 0), In(x, 1), In(x, input));
+            case OpType.Sub: return x => CPU.Sub(In(x, 0), In(x, 1), In(x, input));
+            case OpType.Mul: return x => CPU.Mul(In(x, 0), In(x, 1), In(x, input));
+            case OpType.Div: return x => CPU.Div(In(x, 0), In(x, 1), In(x, input));
+            case OpType.Pow: return x => CPU.Pow(In(x, 0), In(x, 1), In(x, input));
+            case OpType.Sqrt: return x => CPU.Sqrt(In(x, 0), In(x, 0));
+            case OpType.Relu: return x => CPU.Relu(In(x, 0), In(x, 0));
+            case OpType.Erf: return x => CPU.Erf(In(x, 0), In(x, 0));
+            case OpType.Gelu:
+                {
+                    var approximate = Attr<string>("approximate");
+                    return x => CPU.Gelu(In(x, 0), approximate, In(x, 0));
+                }
+            case OpType.Cast:
+                {
+                    var to = RequiredInt("to");
+                    return x => CPU.Cast(In(x, 0), to, In(x, 0));
+                }
+            default: return null;
+        }
+    }
+
+    /// <summary>
+    /// Bind a CPU kernel for this node that writes its first output to a destination tensor passed on each execution, like a caller-provided
+    /// output buffer, or null if the op always allocates its output. The kernel allocates the output as usual when the destination does not 
+    /// have the type and shape of the output, and the destination must not share its buffer with an input.
+    /// </summary>
+    public OpDestinationKernel? BindCPUToDestination(ComputationalGraph graph)
+    {
+        switch (Op)
+        {
+            case OpType.Add: return (x, d) => CPU.Add(In(x, 0), In(x, 1), d);
+            case OpType.Sub: return (x, d) => CPU.Sub(In(x, 0), In(x, 1), d);
+            case OpType.Mul: return (x, d) => CPU.Mul(In(x, 0), In(x, 1), d);
+            case OpType.Div: return (x, d) => CPU.Div(In(x, 0), In(x, 1), d);
+            case OpType.Pow: return (x, d) => CPU.Pow(In(x, 0), In(x, 1), d);
+            case OpType.Sqrt: return (x, d) => CPU.Sqrt(In(x, 0), d);
+            case OpType.Relu: return (x, d) => CPU.Relu(In(x, 0), d);
+            case OpType.Erf: return (x, d) => CPU.Erf(In(x, 0), d);
+            case OpType.Gelu:
+                {
+                    var approximate = Attr<string>("approximate");
+                    return (x, d) => CPU.Gelu(In(x, 0), approximate, d);
+                }
+            case OpType.MatMul: return (x, d) => CPU.MatMul(In(x, 0), In(x, 1), d);
+            case OpType.MatMulAdd: return (x, d) => CPU.MatMulAdd(In(x, 0), In(x, 1), In(x, 2), d);
+            case OpType.Softmax:
+                {
+                    var axis = Int("axis");
+                    return (x, d) => CPU.Softmax(In(x, 0), axis, d);
+                }
+            case OpType.LayerNormalization:
+                {
+                    var axis = Int("axis");
+                    var epsilon = Float("epsilon");
+                    var outputs = Outputs.Length;
+                    return (x, d) => CPU.LayerNormalization(In(x, 0), In(x, 1), In(x, 2), axis, epsilon, outputs, d);
+                }
+            default: return null;
+        }
+    }
+
+    /// <summary>
+    /// True if the kernel of an op can write its output to the buffer of the input at <paramref name="input"/>, when that input has the shape
+    /// and type of the output.
+    /// </summary>
+    public static bool CanExecuteInPlace(OpType op, int input) => op switch
+    {
+        OpType.Add or OpType.Sub or OpType.Mul or OpType.Div or OpType.Pow => input == 0 || input == 1,
+        OpType.Sqrt or OpType.Relu or OpType.Erf or OpType.Gelu or OpType.Cast => input == 0,
+        _ => false
+    };
+
+    private static ITensor? In(ITensor?[] inputs, int index) => index < inputs.Length ? inputs[index] : null;
 }
 
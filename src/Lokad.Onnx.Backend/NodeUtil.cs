@@ -21,19 +21,24 @@ namespace Lokad.Onnx
             }
         }
 
+        /// <summary>
+        /// Convert a model node proto to a graph node without adding it to a graph.
+        /// </summary>
+        public static Node ToNode(this NodeProto np) => new Node()
+        {
+            Name = np.Name,
+            ID = np.Name.GetHashCode(),
+            WeightedGraphNode = new Satsuma.Node(np.Name.GetHashCode()),
+            Attributes = np.Attribute.ToDictionary(k => k.Name, v => v.Value()),
+            Op = (OpType) Enum.Parse(typeof(OpType), np.OpType),
+            Inputs = np.Input.ToArray(),
+            Outputs = np.Output.ToArray()
+        };
+
         public static Node ToNode(this NodeProto np, ComputationalGraph graph)
         {
             Runtime.Debug("Converting model node proto {npn} with op type {npot} and inputs {npi} and outputs {npot} and attributes [{npa}] to graph node.", np.Name, np.OpType, np.Input, np.Output, np.Attribute.Select(a => a.Name));
-            var node = new Node()
-            {
-                Name = np.Name,
-                ID = np.Name.GetHashCode(),
-                WeightedGraphNode = new Satsuma.Node(np.Name.GetHashCode()),
-                Attributes = np.Attribute.ToDictionary(k => k.Name, v => v.Value()),
-                Op = (OpType) Enum.Parse(typeof(OpType), np.OpType),
-                Inputs = np.Input.ToArray(),
-                Outputs = np.Output.ToArray()
-            };
+            var node = np.ToNode();
             foreach (var o in node.Outputs)
             {
                 if (!graph.Outputs.ContainsKey(o) && !graph.IntermediateOutputs.ContainsKey(o))
@@ -41,18 +46,7 @@ namespace Lokad.Onnx
                     graph.IntermediateOutputs.Add(o, null);
                 }
             }
-            graph.WeightedDirectedGraph.AddNode(node.Name);
-            foreach (var n in graph.Nodes)
-            { 
-                foreach (var i in node.Inputs)
-                {
-                    if (n.Outputs.Contains(i))
-                    {
-                        graph.WeightedDirectedGraph.AddArc(n.WeightedGraphNode, node.WeightedGraphNode, Satsuma.Directedness.Directed, label: i);
-                        Runtime.Debug("Node {dest} has predecessor {src}.", node.Name, n.Name);
-                    }
-                }
-            }
+            graph.AddWeightedGraphNode(node);
             return node;   
         }
     }
@@ -0,0 +1,452 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+
+/// <summary>
+/// The element type and concrete shape of a graph tensor, as inferred for one set of graph input shapes.
+/// </summary>
+public class TensorShape
+{
+    #region Constructors
+    public TensorShape(TensorElementType elementType, int[] dims)
+    {
+        ElementType = elementType;
+        Dims = dims;
+        Strides = ArrayUtilities.GetStrides(dims);
+        Length = dims.Aggregate(1, (p, d) => p * d);
+    }
+    #endregion
+
+    #region Properties
+    public TensorElementType ElementType { get; }
+
+    public int[] Dims { get; }
+
+    /// <summary>
+    /// The strides of a dense row-major buffer with this shape.
+    /// </summary>
+    public int[] Strides { get; }
+
+    /// <summary>
+    /// The number of elements in a dense buffer with this shape.
+    /// </summary>
+    public int Length { get; }
+
+    public int Rank => Dims.Length;
+    #endregion
+
+    #region Methods
+    public override string ToString() => $"{ElementType.ToString().ToLower()}:{Dims.Select(d => d.ToString()).JoinWith("x")}";
+    #endregion
+}
+
+/// <summary>
+/// Static shape inference. Propagates the concrete shapes of the graph inputs through the graph nodes so the shape of every tensor is known
+/// before execution. Tensors that only depend on shapes, like the outputs of Shape nodes and the Gather, Unsqueeze and Concat nodes that build
+/// Reshape targets from them, are also evaluated, so their values are known for a given set of input shapes.
+/// </summary>
+public class ShapeInference : Runtime
+{
+    #region Methods
+    /// <summary>
+    /// Infer the shape of the graph tensors for the given graph input shapes.
+    /// </summary>
+    /// <param name="inputShapes">The shapes of graph inputs. Graph inputs not in the dictionary use the shape of their initializer or their
+    /// declared shape if it has no symbolic dimensions.</param>
+    /// <param name="values">The tensors whose values are known at compile time, which includes the constant initializers read to evaluate 
+    /// nodes or to infer their output shapes.</param>
+    /// <param name="nodes">The nodes whose output shapes are inferred, in execution order, or null for all the graph nodes.</param>
+    /// <returns>The shape of each tensor that could be inferred. Tensors downstream of an op without a shape function are not included.</returns>
+    public static Dictionary<string, TensorShape> InferShapes(ComputationalGraph graph, IReadOnlyDictionary<string, int[]> inputShapes, out Dictionary<string, ITensor> values,
+        IReadOnlyList<Node>? nodes = null)
+    {
+        nodes ??= graph.Nodes;
+        var op = Begin("Inferring tensor shapes of graph with {c} nodes for input shapes {s}", nodes.Count, ShapeKey(inputShapes));
+        var shapes = new Dictionary<string, TensorShape>();
+        var known = new Dictionary<string, ITensor>();
+        // The shapes of initializers are read without converting them to tensors. A constant initializer is only converted when a node is 
+        // evaluated at compile time or its shape function reads the value, so the weights are not loaded to infer shapes.
+        var constants = new HashSet<string>();
+        foreach (var name in nodes.SelectMany(n => n.Inputs).Where(n => !string.IsNullOrEmpty(n) && graph.Initializers.ContainsKey(n)).Distinct())
+        {
+            shapes[name] = graph.Initializers.GetShape(name);
+            if (GraphOptimizer.IsConstant(graph, name))
+            {
+                constants.Add(name);
+            }
+        }
+        ITensor? Value(string name, bool load)
+        {
+            if (known.TryGetValue(name, out var t))
+            {
+                return t;
+            }
+            else if (load && constants.Contains(name))
+            {
+                return known[name] = graph.Initializers[name];
+            }
+            else
+            {
+                return null;
+            }
+        }
+        foreach (var vp in graph.Model.Graph.Input)
+        {
+            var type = (TensorElementType) vp.Type.TensorType.ElemType;
+            var dims = vp.Type.TensorType.Shape.Dim;
+            if (inputShapes.TryGetValue(vp.Name, out var s))
+            {
+                shapes[vp.Name] = new TensorShape(type, s);
+            }
+            else if (!shapes.ContainsKey(vp.Name) && dims.All(d => d.ValueCase == TensorShapeProto.Types.Dimension.ValueOneofCase.DimValue && d.DimValue > 0))
+            {
+                shapes[vp.Name] = new TensorShape(type, dims.Select(d => Convert.ToInt32(d.DimValue)).ToArray());
+            }
+        }
+
+        int inferred = 0, evaluated = 0;
+        foreach (var node in nodes)
+        {
+            var x = node.Inputs.Select(n => !string.IsNullOrEmpty(n) && shapes.TryGetValue(n, out var s) ? s : null).ToArray();
+            if (node.Inputs.Where((n, i) => !string.IsNullOrEmpty(n) && x[i] is null).Any())
+            {
+                continue;
+            }
+            var evaluate = node.Op != OpType.Shape && node.Inputs.All(n => string.IsNullOrEmpty(n) || known.ContainsKey(n) || constants.Contains(n))
+                && x.Sum(s => s?.Length ?? 0) <= MaxEvaluatedLength;
+            var v = node.Inputs.Select((n, i) => string.IsNullOrEmpty(n) ? null : Value(n, evaluate || ReadsValue(node.Op, i))).ToArray();
+            var outputs = TryEvaluate(graph, node, x, v);
+            if (outputs is not null)
+            {
+                for (int i = 0; i < outputs.Length; i++)
+                {
+                    shapes[node.Outputs[i]] = new TensorShape(outputs[i].ElementType, outputs[i].Dims);
+                    known[node.Outputs[i]] = outputs[i];
+                }
+                evaluated++;
+                continue;
+            }
+            TensorShape[]? y;
+            try
+            {
+                y = InferShapes(graph, node, x!, v);
+            }
+            catch (Exception e)
+            {
+                Debug("Could not infer the output shapes of node {n} with op {op}: {m}", node.Name, node.Op, e.Message);
+                y = null;
+            }
+            if (y is null)
+            {
+                Debug("Could not infer the output shapes of node {n} with op {op} for input shapes {s}.", node.Name, node.Op, x.Select(s => s?.ToString() ?? "").JoinWith(", "));
+                continue;
+            }
+            for (int i = 0; i < y.Length && i < node.Outputs.Length; i++)
+            {
+                if (!string.IsNullOrEmpty(node.Outputs[i]))
+                {
+                    shapes[node.Outputs[i]] = y[i];
+                }
+            }
+            inferred++;
+        }
+        values = known;
+        op.Complete();
+        Info("Inferred output shapes of {i} node(s) and evaluated {e} node(s) that only depend on input shapes. {u} node(s) have unknown output shapes.",
+            inferred, evaluated, nodes.Count - inferred - evaluated);
+        return shapes;
+    }
+
+    /// <summary>
+    /// A string that identifies a set of input shapes, used as the key of specialized execution plans.
+    /// </summary>
+    public static string ShapeKey(IReadOnlyDictionary<string, int[]> shapes) =>
+        shapes.OrderBy(kv => kv.Key, StringComparer.Ordinal).Select(kv => kv.Key + ":" + kv.Value.Select(d => d.ToString()).JoinWith("x")).JoinWith(",");
+
+    /// <summary>
+    /// True if the shape function of an op reads the value of the input at <paramref name="input"/>, like the shape input of a Reshape.
+    /// </summary>
+    private static bool ReadsValue(OpType op, int input) => input > 0 && 
+        op is OpType.Reshape or OpType.Unsqueeze or OpType.ReduceSum or OpType.ReduceMean or OpType.ReduceMax or OpType.Slice;
+
+    /// <summary>
+    /// Compute the outputs of a node whose value only depends on the shapes of its inputs or on small constant inputs.
+    /// </summary>
+    private static ITensor[]? TryEvaluate(ComputationalGraph graph, Node node, TensorShape?[] x, ITensor?[] v)
+    {
+        if (node.Op == OpType.Shape)
+        {
+            var rank = x[0]!.Rank;
+            var start = ArrayUtilities.Clamp(ArrayUtilities.HandleNegativeAxisOrIndex(rank, node.Int("start") ?? 0), 0, rank);
+            var end = ArrayUtilities.Clamp(ArrayUtilities.HandleNegativeAxisOrIndex(rank, node.Int("end") ?? rank), 0, rank);
+            return new ITensor[] { DenseTensor<long>.OfValues(x[0]!.Dims[start..end].Select(d => (long) d).ToArray()) };
+        }
+        for (int i = 0; i < v.Length; i++)
+        {
+            if (!string.IsNullOrEmpty(node.Inputs[i]) && v[i] is null)
+            {
+                return null;
+            }
+        }
+        if (v.Sum(t => t?.Length ?? 0) > MaxEvaluatedLength || GraphOptimizer.NonDeterministicOps.Contains(node.Op) || !CPUExecutionProvider.SupportsOp(node.Op))
+        {
+            return null;
+        }
+        OpKernel kernel;
+        try
+        {
+            kernel = node.BindCPU(graph);
+        }
+        catch (Exception)
+        {
+            return null;
+        }
+        var r = node.Execute(kernel, v);
+        return r.Status == OpStatus.Success && r.Outputs.Length == node.Outputs.Length ? r.Outputs : null;
+    }
+
+    /// <summary>
+    /// The shape functions of the ops supported by the CPU execution provider. The shapes are computed the same way as the kernels compute
+    /// their output shapes.
+    /// </summary>
+    private static TensorShape[]? InferShapes(ComputationalGraph graph, Node node, TensorShape[] x, ITensor?[] v)
+    {
+        TensorShape[] One(TensorElementType type, int[] dims) => new[] { new TensorShape(type, dims) };
+        switch (node.Op)
+        {
+            case OpType.Add:
+            case OpType.Sub:
+            case OpType.Mul:
+            case OpType.Div:
+            case OpType.Pow:
+                return BroadcastShape(x[0].Dims, x[1].Dims) is int[] b ? One(x[0].ElementType, b) : null;
+
+            case OpType.Relu:
+            case OpType.Sqrt:
+            case OpType.Erf:
+            case OpType.Gelu:
+            case OpType.Softmax:
+                return One(x[0].ElementType, x[0].Dims);
+
+            case OpType.Cast:
+                return One((TensorElementType) node.RequiredInt("to"), x[0].Dims);
+
+            case OpType.MatMul:
+            case OpType.MatMulAdd:
+                return MatMulShape(x[0].Dims, x[1].Dims) is int[] m ? One(x[0].ElementType, m) : null;
+
+            case OpType.Conv:
+                {
+                    if (x[0].Rank != 4 || x[1].Rank != 4) return null;
+                    var kernel_shape = node.Attr<int[]>("kernel_shape") ?? new[] { x[1].Dims[2], x[1].Dims[3] };
+                    var hw = Conv2DShape(x[0].Dims, kernel_shape, node.Attr<string>("auto_pad"), node.Attr<int[]>("pads"), node.Attr<int[]>("strides") ?? new[] { 1, 1 },
+                        node.Attr<int[]>("dilations"));
+                    return hw is null ? null : One(x[0].ElementType, new[] { x[0].Dims[0], x[1].Dims[0], hw[0], hw[1] });
+                }
+
+            case OpType.MaxPool:
+                {
+                    var kernel_shape = node.Ints("kernel_shape");
+                    if (x[0].Rank != 4 || kernel_shape is null) return null;
+                    var hw = Conv2DShape(x[0].Dims, kernel_shape, node.Attr<string>("auto_pad"), node.Ints("pads"), node.Ints("strides") ?? kernel_shape, node.Ints("dilations"));
+                    return hw is null ? null : One(x[0].ElementType, new[] { x[0].Dims[0], x[0].Dims[1], hw[0], hw[1] });
+                }
+
+            case OpType.Transpose:
+                {
+                    var perm = node.Ints("perm") ?? Enumerable.Range(0, x[0].Rank).Reverse().ToArray();
+                    return One(x[0].ElementType, perm.Select(p => x[0].Dims[p]).ToArray());
+                }
+
+            case OpType.Reshape:
+                {
+                    if (v[1] is not Tensor<long> shape) return null;
+                    return ReshapeShape(x[0], shape.ToArray(), node.Int("allow_zero") == 1) is int[] r ? One(x[0].ElementType, r) : null;
+                }
+
+            case OpType.Concat:
+                {
+                    var axis = ArrayUtilities.HandleNegativeAxisOrIndex(x[0].Rank, node.RequiredInt("axis"));
+                    var dims = (int[]) x[0].Dims.Clone();
+                    dims[axis] = x.Sum(s => s.Dims[axis]);
+                    return One(x[0].ElementType, dims);
+                }
+
+            case OpType.Gather:
+                {
+                    var axis = ArrayUtilities.HandleNegativeAxisOrIndex(x[0].Rank, node.Int("axis") ?? 0);
+                    return One(x[0].ElementType, x[0].Dims[..axis].Concat(x[1].Dims).Concat(x[0].Dims[(axis + 1)..]).ToArray());
+                }
+
+            case OpType.Unsqueeze:
+                {
+                    var axes = node.Ints("axes") ?? (v.Length > 1 && v[1] is ITensor a ? ToInts(a) : null);
+                    if (axes is null) return null;
+                    var rank = x[0].Rank + axes.Length;
+                    var unsqueezed = axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(rank, a)).ToHashSet();
+                    var dims = new int[rank];
+                    for (int i = 0, j = 0; i < rank; i++)
+                    {
+                        dims[i] = unsqueezed.Contains(i) ? 1 : x[0].Dims[j++];
+                    }
+                    return One(x[0].ElementType, dims);
+                }
+
+            case OpType.ReduceSum:
+            case OpType.ReduceMean:
+            case OpType.ReduceMax:
+                {
+                    var axes = node.Ints("axes") ?? (v.Length > 1 && v[1] is ITensor a ? ToInts(a) : null);
+                    if (axes is null && v.Length > 1 && !string.IsNullOrEmpty(node.Inputs[1])) return null;
+                    if (axes is null || axes.Length == 0)
+                    {
+                        if (node.Int("noop_with_empty_axes") == 1) return One(x[0].ElementType, x[0].Dims);
+                        axes = Enumerable.Range(0, x[0].Rank).ToArray();
+                    }
+                    var reduced = axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(x[0].Rank, a)).ToHashSet();
+                    var keepdims = (node.Int("keepdims") ?? 1) == 1;
+                    var dims = x[0].Dims.Select((d, i) => reduced.Contains(i) ? (keepdims ? 1 : -1) : d).Where(d => d != -1).ToArray();
+                    return One(x[0].ElementType, dims);
+                }
+
+            case OpType.LayerNormalization:
+                {
+                    var axis = ArrayUtilities.HandleNegativeAxisOrIndex(x[0].Rank, node.Int("axis") ?? -1);
+                    var stats = x[0].Dims.Select((d, i) => i < axis ? d : 1).ToArray();
+                    return new[] { new TensorShape(x[0].ElementType, x[0].Dims), new TensorShape(TensorElementType.Float, stats), new TensorShape(TensorElementType.Float, stats) };
+                }
+
+            case OpType.Slice:
+                {
+                    if (v[1] is null || v[2] is null || v.Length > 3 && !string.IsNullOrEmpty(node.Inputs[3]) && v[3] is null
+                        || v.Length > 4 && !string.IsNullOrEmpty(node.Inputs[4]) && v[4] is null)
+                    {
+                        return null;
+                    }
+                    var starts = ToInts(v[1]!);
+                    var ends = ToInts(v[2]!);
+                    var axes = v.Length > 3 && v[3] is ITensor a ? ToInts(a) : Enumerable.Range(0, starts.Length).ToArray();
+                    var steps = v.Length > 4 && v[4] is ITensor s ? ToInts(s) : Enumerable.Repeat(1, starts.Length).ToArray();
+                    var dims = (int[]) x[0].Dims.Clone();
+                    for (int i = 0; i < starts.Length; i++)
+                    {
+                        var axis = ArrayUtilities.HandleNegativeAxisOrIndex(x[0].Rank, axes[i]);
+                        var d = x[0].Dims[axis];
+                        var step = steps[i];
+                        var start = starts[i] < 0 ? starts[i] + d : starts[i];
+                        var end = ends[i] < 0 ? ends[i] + d : ends[i];
+                        start = step > 0 ? ArrayUtilities.Clamp(start, 0, d) : ArrayUtilities.Clamp(start, 0, d - 1);
+                        end = step > 0 ? ArrayUtilities.Clamp(end, 0, d) : ArrayUtilities.Clamp(end, -1, d - 1);
+                        dims[axis] = Math.Max(0, step > 0 ? (end - start + step - 1) / step : (start - end - step - 1) / -step);
+                    }
+                    return One(x[0].ElementType, dims);
+                }
+
+            default:
+                return null;
+        }
+    }
+
+    /// <summary>
+    /// The multidirectional broadcast shape of two shapes, or null if the shapes are not compatible.
+    /// </summary>
+    private static int[]? BroadcastShape(int[] x, int[] y)
+    {
+        var rank = Math.Max(x.Length, y.Length);
+        var b = new int[rank];
+        for (int i = 1; i <= rank; i++)
+        {
+            var dx = i <= x.Length ? x[^i] : 1;
+            var dy = i <= y.Length ? y[^i] : 1;
+            if (dx != dy && dx != 1 && dy != 1)
+            {
+                return null;
+            }
+            b[^i] = dx == 1 ? dy : dx;
+        }
+        return b;
+    }
+
+    /// <summary>
+    /// The shape of the matrix product of two tensors with numpy semantics.
+    /// </summary>
+    internal static int[]? MatMulShape(int[] a, int[] b)
+    {
+        if (a.Length == 0 || b.Length == 0)
+        {
+            return null;
+        }
+        var _a = a.Length == 1 ? new[] { 1, a[0] } : a;
+        var _b = b.Length == 1 ? new[] { b[0], 1 } : b;
+        if (_a[^1] != _b[^2] || BroadcastShape(_a[..^2], _b[..^2]) is not int[] batch)
+        {
+            return null;
+        }
+        var dims = batch.ToList();
+        if (a.Length > 1) dims.Add(_a[^2]);
+        if (b.Length > 1) dims.Add(_b[^1]);
+        return dims.ToArray();
+    }
+
+    /// <summary>
+    /// The output height and width of a 2D convolution or pooling, with the padding modes of the CPU kernels.
+    /// </summary>
+    private static int[]? Conv2DShape(int[] x, int[] kernel_shape, string? auto_pad, int[]? pads, int[] strides, int[]? dilations)
+    {
+        var padmode = MathOps.PadType.Valid;
+        int? padvalue = null;
+        switch (auto_pad)
+        {
+            case "SAME_UPPER": padmode = MathOps.PadType.SameUpper; break;
+            case "SAME_LOWER": padmode = MathOps.PadType.SameLower; break;
+            case "NOTSET":
+                if (pads is null || !pads.All(p => p == pads[0])) return null;
+                padmode = MathOps.PadType.Value;
+                padvalue = pads[0];
+                break;
+        }
+        dilations ??= new[] { 1, 1 };
+        return MathOps.GetConv2DOutputInfo(padmode, x[2], x[3], strides[0], strides[1], MathOps.GetConv2DEffectiveFilterSize(kernel_shape[0], dilations[0]),
+            MathOps.GetConv2DEffectiveFilterSize(kernel_shape[1], dilations[1]), padvalue).Shape;
+    }
+
+    /// <summary>
+    /// The shape of a reshaped tensor, resolving 0 and -1 in the target shape like <see cref="Tensor{T}.Reshape(Tensor{T}, Tensor{long}, bool)"/>.
+    /// </summary>
+    private static int[]? ReshapeShape(TensorShape x, long[] shape, bool allowZero)
+    {
+        var dims = new int[shape.Length];
+        int unknown = -1, size = 1;
+        for (int i = 0; i < shape.Length; i++)
+        {
+            if (shape[i] == -1)
+            {
+                unknown = i;
+                continue;
+            }
+            dims[i] = shape[i] == 0 && !allowZero ? x.Dims[i] : Convert.ToInt32(shape[i]);
+            size *= dims[i];
+        }
+        if (unknown != -1)
+        {
+            if (size == 0) return null;
+            dims[unknown] = x.Length / size;
+            size *= dims[unknown];
+        }
+        return size == x.Length ? dims : null;
+    }
+
+    private static int[] ToInts(ITensor t) => 
+        Enumerable.Range(0, (int) t.Length).Select(i => (int) Math.Clamp(Convert.ToInt64(t.GetValue(i)), int.MinValue, int.MaxValue)).ToArray();
+    #endregion
+
+    #region Fields
+    /// <summary>
+    /// The maximum total number of elements in the constant inputs of a node evaluated during shape inference. Shape computations only
+    /// involve tiny tensors, larger constant subgraphs are folded once by <see cref="GraphOptimizer.FoldConstants(ComputationalGraph)"/>.
+    /// </summary>
+    private const int MaxEvaluatedLength = 1 << 12;
+    #endregion
+}
@@ -31,8 +31,16 @@ namespace Lokad.Onnx
             }
         }  
         
+        /// <summary>
+        /// Convert a tensor proto to a tensor. If the tensor proto has raw data, the tensor reinterprets the raw data bytes owned by the 
+        /// tensor proto without copying them. The bytes of a tensor proto are immutable so the tensor is read-only.
+        /// </summary>
         public static ITensor ToTensor(this TensorProto tp)
         {
+            if (tp.RawData.Length > 0)
+            {
+                return tp.ToTensor(tp.RawData.Memory);
+            }
             switch ((TensorElementType) tp.DataType)
             {
                 case TensorElementType.Bool: return new DenseTensor<bool>(memory: (bool[]) tp.GetTensorData(), tp.Dims.Select(d => Convert.ToInt32(d)).ToArray()) { Name = tp.Name };
@@ -54,6 +62,70 @@ namespace Lokad.Onnx
             }
         }
 
+        /// <summary>
+        /// Create a tensor with the element type and dimensions of a tensor proto that reinterprets a block of little-endian bytes as its 
+        /// elements without copying them.
+        /// </summary>
+        public static ITensor ToTensor(this TensorProto tp, Memory<byte> data)
+        {
+            var t = data.ToTensor((TensorElementType) tp.DataType, tp.Dims.Select(d => Convert.ToInt32(d)).ToArray());
+            t.Name = tp.Name;
+            return t;
+        }
+
+        /// <summary>
+        /// Create a read-only tensor with the element type and dimensions of a tensor proto that reinterprets a block of little-endian bytes 
+        /// as its elements without copying them.
+        /// </summary>
+        public static ITensor ToTensor(this TensorProto tp, ReadOnlyMemory<byte> data)
+        {
+            var t = data.ToTensor((TensorElementType) tp.DataType, tp.Dims.Select(d => Convert.ToInt32(d)).ToArray());
+            t.Name = tp.Name;
+            return t;
+        }
+
+        /// <summary>
+        /// Create a tensor that reinterprets a block of little-endian bytes as its elements without copying them.
+        /// </summary>
+        public static ITensor ToTensor(this Memory<byte> data, TensorElementType elementType, int[] dims) => elementType switch
+        {
+            TensorElementType.Bool => DenseTensor<bool>.OfBytes(data, dims),
+            TensorElementType.Int8 => DenseTensor<sbyte>.OfBytes(data, dims),
+            TensorElementType.UInt8 => DenseTensor<byte>.OfBytes(data, dims),
+            TensorElementType.Int16 => DenseTensor<short>.OfBytes(data, dims),
+            TensorElementType.UInt16 => DenseTensor<ushort>.OfBytes(data, dims),
+            TensorElementType.Int32 => DenseTensor<int>.OfBytes(data, dims),
+            TensorElementType.UInt32 => DenseTensor<uint>.OfBytes(data, dims),
+            TensorElementType.Int64 => DenseTensor<long>.OfBytes(data, dims),
+            TensorElementType.UInt64 => DenseTensor<ulong>.OfBytes(data, dims),
+            TensorElementType.Float => DenseTensor<float>.OfBytes(data, dims),
+            TensorElementType.Double => DenseTensor<double>.OfBytes(data, dims),
+            TensorElementType.Float16 => DenseTensor<Float16>.OfBytes(data, dims),
+            TensorElementType.BFloat16 => DenseTensor<BFloat16>.OfBytes(data, dims),
+            _ => throw new ArgumentException($"Cannot create a tensor of element type {elementType} from raw data.")
+        };
+
+        /// <summary>
+        /// Create a read-only tensor that reinterprets a block of little-endian bytes as its elements without copying them.
+        /// </summary>
+        public static ITensor ToTensor(this ReadOnlyMemory<byte> data, TensorElementType elementType, int[] dims) => elementType switch
+        {
+            TensorElementType.Bool => DenseTensor<bool>.OfReadOnlyBytes(data, dims),
+            TensorElementType.Int8 => DenseTensor<sbyte>.OfReadOnlyBytes(data, dims),
+            TensorElementType.UInt8 => DenseTensor<byte>.OfReadOnlyBytes(data, dims),
+            TensorElementType.Int16 => DenseTensor<short>.OfReadOnlyBytes(data, dims),
+            TensorElementType.UInt16 => DenseTensor<ushort>.OfReadOnlyBytes(data, dims),
+            TensorElementType.Int32 => DenseTensor<int>.OfReadOnlyBytes(data, dims),
+            TensorElementType.UInt32 => DenseTensor<uint>.OfReadOnlyBytes(data, dims),
+            TensorElementType.Int64 => DenseTensor<long>.OfReadOnlyBytes(data, dims),
+            TensorElementType.UInt64 => DenseTensor<ulong>.OfReadOnlyBytes(data, dims),
+            TensorElementType.Float => DenseTensor<float>.OfReadOnlyBytes(data, dims),
+            TensorElementType.Double => DenseTensor<double>.OfReadOnlyBytes(data, dims),
+            TensorElementType.Float16 => DenseTensor<Float16>.OfReadOnlyBytes(data, dims),
+            TensorElementType.BFloat16 => DenseTensor<BFloat16>.OfReadOnlyBytes(data, dims),
+            _ => throw new ArgumentException($"Cannot create a tensor of element type {elementType} from raw data.")
+        };
+
         public static ITensor ToTensor(this ValueInfoProto vp)
         {
             if (vp.Type.ValueCase != TypeProto.ValueOneofCase.TensorType)
@@ -1,11 +1,22 @@
 ﻿namespace Lokad.Onnx;
 
+using System;
+
 public static class HardwareConfig
 {
     public static bool UseSimd { get; set; } = true;
 
     public static bool UseIntrinsics { get; set; } = false;
 
+    /// <summary>
+    /// The maximum number of threads a single operation like a matrix multiplication may use. Set to 1 to run all kernels on the calling thread.
+    /// </summary>
+    public static int IntraOpThreads
+    {
+        get => intraOpThreads;
+        set => intraOpThreads = value >= 1 ? value : throw new ArgumentOutOfRangeException(nameof(IntraOpThreads), "The number of threads must be at least 1.");
+    }
+
     public static void EnableIntrinsics()
     {
         UseSimd = true;
@@ -17,5 +28,7 @@ public static class HardwareConfig
         UseSimd = true;
         UseIntrinsics = false;
     }
+
+    private static int intraOpThreads = Environment.ProcessorCount;
 }
 
@@ -196,4 +196,7 @@ public enum OpType
     Softplus,
     Softsign,
     ThresholdedRelu,
+
+    // Ops created by graph optimizations that fuse patterns of standard ops.
+    MatMulAdd,
 }
@@ -21,22 +21,39 @@ namespace Lokad.Onnx
 
     public record NodeProfile { public long NodeId; public OpType Op; public Stack<OpProfile> OpsProfile = new Stack<OpProfile>(); }
 
+    /// <summary>
+    /// Profiles the execution of graph nodes. Profiles are recorded per thread so graphs executing concurrently on different threads 
+    /// each see only the profile of their own nodes.
+    /// </summary>
     public class Profiler
     {
         #region Fields
-        private static Stopwatch timer = new Stopwatch();
+        [ThreadStatic]
+        private static Stopwatch? timer;
 
-        public static bool Enabled = false;
+        [ThreadStatic]
+        private static Stack<NodeProfile>? profile;
 
-        public static Stack<NodeProfile> Profile = new Stack<NodeProfile>();
+        public static bool Enabled = false;
         #endregion
 
         #region Properties
+        /// <summary>
+        /// The node profiles recorded on the current thread.
+        /// </summary>
+        public static Stack<NodeProfile> Profile
+        {
+            get => profile ??= new Stack<NodeProfile>();
+            set => profile = value;
+        }
+
+        private static Stopwatch Timer => timer ??= new Stopwatch();
+
         public static NodeProfile CurrentNodeProfile => Profile.Peek();
         
         public static OpProfile CurrentOpProfile => CurrentNodeProfile.OpsProfile.Peek();
 
-        public static bool Running => timer.IsRunning;
+        public static bool Running => Timer.IsRunning;
         #endregion
 
         #region Methods
@@ -46,9 +63,9 @@ namespace Lokad.Onnx
 
             if (Running)
             {
-                timer.Stop();
-                CurrentOpProfile.Time = timer.Elapsed;
-                timer.Reset();
+                Timer.Stop();
+                CurrentOpProfile.Time = Timer.Elapsed;
+                Timer.Reset();
             }
         }
 
@@ -60,7 +77,7 @@ namespace Lokad.Onnx
             AddTimeIfTimerRunning();
             Profile.Push(new NodeProfile() { NodeId = id, Op = op });
             CurrentNodeProfile.OpsProfile.Push(new OpProfile() { Stage = OpStage.GraphOrchestration, Time = TimeSpan.Zero });
-            timer.Start();
+            Timer.Start();
         }
 
         [MethodImpl(MethodImplOptions.AggressiveInlining)]
@@ -74,7 +91,7 @@ namespace Lokad.Onnx
 
             AddTimeIfTimerRunning();
             CurrentNodeProfile.OpsProfile.Push(new OpProfile() { Stage = stage, Time = TimeSpan.Zero });
-            timer.Start();  
+            Timer.Start();  
         }
 
         //[MethodImpl(MethodImplOptions.AggressiveInlining)]
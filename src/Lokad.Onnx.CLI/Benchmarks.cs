@@ -2,6 +2,7 @@
 
 using System;
 using System.Buffers;
+using System.Collections.Generic;
 using System.IO;
 using System.Linq;
 using System.Text.Json;
@@ -102,14 +103,42 @@ public class TensorMatMulBenchmarks : Runtime
         t_3_4_384_384_b = Tensor<float>.Rand(3, 4, 384, 384);
     }
 
+    /// <summary>
+    /// The number of threads matrix multiplication may use, doubling from 1 up to the number of cores.
+    /// </summary>
+    [ParamsSource(nameof(ThreadCounts))]
+    public int Threads { get; set; } = 1;
+
+    public static IEnumerable<int> ThreadCounts()
+    {
+        int t = 1;
+        for (; t < Environment.ProcessorCount; t *= 2)
+        {
+            yield return t;
+        }
+        yield return Environment.ProcessorCount;
+    }
+
     [IterationSetup(Targets = ["MatMul_simd", "MatMul2_simd", "MatMul3_simd", "MatMul4_simd"])]
-    public void EnableSimd() => HardwareConfig.EnableSimdOnly();
+    public void EnableSimd()
+    {
+        HardwareConfig.EnableSimdOnly();
+        HardwareConfig.IntraOpThreads = Threads;
+    }
 
     [IterationSetup(Targets = ["MatMul_simd_intrinsics", "MatMul2_simd_intrinsics", "MatMul3_simd_intrinsics", "MatMul4_simd_intrinsics"])]
-    public void EnableIntrinsics() => HardwareConfig.EnableIntrinsics();
+    public void EnableIntrinsics()
+    {
+        HardwareConfig.EnableIntrinsics();
+        HardwareConfig.IntraOpThreads = Threads;
+    }
 
     [IterationSetup(Targets = ["MatMul", "MatMul2", "MatMul3", "MatMul4"])]
-    public void DisableSimd() => HardwareConfig.UseSimd = false;
+    public void DisableSimd()
+    {
+        HardwareConfig.UseSimd = false;
+        HardwareConfig.IntraOpThreads = Threads;
+    }
    
     [Benchmark(Description = "Matrix multiply 2 384x384 tensors", Baseline = true)]
     [BenchmarkCategory("384x384")]
@@ -303,6 +332,155 @@ public class TensorIndexingBenchmarks : Runtime
     #endregion
 }
 
+[InProcess]
+[MemoryDiagnoser]
+[IterationsColumn]
+[GroupBenchmarksBy(BenchmarkLogicalGroupRule.ByCategory)]
+[Orderer(methodOrderPolicy: BenchmarkDotNet.Order.MethodOrderPolicy.Declared)]
+public class TensorReductionBenchmarks : Runtime
+{
+    [GlobalSetup]
+    public void Setup()
+    {
+        t_384_1536 = Tensor<float>.Rand(384, 1536);
+        t_1536_384 = Tensor<float>.Rand(1536, 384);
+        t_16_384_384 = Tensor<float>.Rand(16, 384, 384);
+        t_3_4_384_384 = Tensor<float>.Rand(3, 4, 384, 384);
+    }
+
+    /// <summary>
+    /// The number of threads a reduction may use, doubling from 1 up to the number of cores.
+    /// </summary>
+    [ParamsSource(nameof(ThreadCounts))]
+    public int Threads { get; set; } = 1;
+
+    public static IEnumerable<int> ThreadCounts() => TensorMatMulBenchmarks.ThreadCounts();
+
+    [IterationSetup]
+    public void IterationSetup()
+    {
+        HardwareConfig.EnableSimdOnly();
+        HardwareConfig.IntraOpThreads = Threads;
+    }
+
+    [Benchmark(Description = "Sum the innermost axis of a 384x1536 tensor", Baseline = true)]
+    [BenchmarkCategory("inner")]
+    public void ReduceSumInner() => Tensor<float>.ReduceSum(t_384_1536, axis_1);
+
+    [Benchmark(Description = "Max of the innermost axis of a 384x1536 tensor")]
+    [BenchmarkCategory("inner")]
+    public void ReduceMaxInner() => Tensor<float>.ReduceMax(t_384_1536, axis_1);
+
+    [Benchmark(Description = "Mean of the innermost axis of a 384x1536 tensor")]
+    [BenchmarkCategory("inner")]
+    public void ReduceMeanInner() => Tensor<float>.ReduceMean(t_384_1536, axis_1);
+
+    [Benchmark(Description = "Sum the outermost axis of a 1536x384 tensor", Baseline = true)]
+    [BenchmarkCategory("outer")]
+    public void ReduceSumOuter() => Tensor<float>.ReduceSum(t_1536_384, axis_0);
+
+    [Benchmark(Description = "Max of the outermost axis of a 1536x384 tensor")]
+    [BenchmarkCategory("outer")]
+    public void ReduceMaxOuter() => Tensor<float>.ReduceMax(t_1536_384, axis_0);
+
+    [Benchmark(Description = "Sum the middle axis of a 16x384x384 tensor", Baseline = true)]
+    [BenchmarkCategory("middle")]
+    public void ReduceSumMiddle() => Tensor<float>.ReduceSum(t_16_384_384, axis_1);
+
+    [Benchmark(Description = "Sum the first and last axes of a 16x384x384 tensor")]
+    [BenchmarkCategory("middle")]
+    public void ReduceSumOuterInner() => Tensor<float>.ReduceSum(t_16_384_384, axes_0_2);
+
+    [Benchmark(Description = "Sum all the elements of a 3x4x384x384 tensor", Baseline = true)]
+    [BenchmarkCategory("all")]
+    public void ReduceSumAll() => Tensor<float>.ReduceSum(t_3_4_384_384);
+
+    #region Fields
+    Tensor<float> t_384_1536 = Tensor<float>.Zeros(0);
+    Tensor<float> t_1536_384 = Tensor<float>.Zeros(0);
+    Tensor<float> t_16_384_384 = Tensor<float>.Zeros(0);
+    Tensor<float> t_3_4_384_384 = Tensor<float>.Zeros(0);
+    Tensor<int> axis_0 = new int[] { 0 }.ToTensor<int>();
+    Tensor<int> axis_1 = new int[] { 1 }.ToTensor<int>();
+    Tensor<int> axes_0_2 = new int[] { 0, 2 }.ToTensor<int>();
+    #endregion
+}
+
+[InProcess]
+[MemoryDiagnoser]
+[IterationsColumn]
+[GroupBenchmarksBy(BenchmarkLogicalGroupRule.ByCategory)]
+[Orderer(methodOrderPolicy: BenchmarkDotNet.Order.MethodOrderPolicy.Declared)]
+public class TensorTransposeBenchmarks : Runtime
+{
+    [GlobalSetup]
+    public void Setup()
+    {
+        t_1_384_12_64 = Tensor<float>.Rand(1, 384, 12, 64);
+        t_16_384_384 = Tensor<float>.Rand(16, 384, 384);
+        t_2048_2048 = Tensor<float>.Rand(2048, 2048);
+        t_12_384_64_q = Tensor<float>.Rand(12, 384, 64);
+        t_12_384_64_k = Tensor<float>.Rand(12, 384, 64);
+    }
+
+    /// <summary>
+    /// The number of threads a transpose may use, doubling from 1 up to the number of cores.
+    /// </summary>
+    [ParamsSource(nameof(ThreadCounts))]
+    public int Threads { get; set; } = 1;
+
+    public static IEnumerable<int> ThreadCounts() => TensorMatMulBenchmarks.ThreadCounts();
+
+    [Params(false, true)]
+    public bool Intrinsics { get; set; }
+
+    [IterationSetup]
+    public void IterationSetup()
+    {
+        if (Intrinsics)
+        {
+            HardwareConfig.EnableIntrinsics();
+        }
+        else
+        {
+            HardwareConfig.EnableSimdOnly();
+        }
+        HardwareConfig.IntraOpThreads = Threads;
+    }
+
+    [Benchmark(Description = "Split a 1x384x12x64 tensor into attention heads", Baseline = true)]
+    [BenchmarkCategory("heads")]
+    public void TransposeHeads() => Tensor<float>.Transpose(t_1_384_12_64, new int[] { 0, 2, 1, 3 }).ToDenseTensor();
+
+    [Benchmark(Description = "Split a 1x384x12x64 tensor into transposed attention heads")]
+    [BenchmarkCategory("heads")]
+    public void TransposeHeadsKeys() => Tensor<float>.Transpose(t_1_384_12_64, new int[] { 0, 2, 3, 1 }).ToDenseTensor();
+
+    [Benchmark(Description = "Transpose the matrices of a 16x384x384 tensor", Baseline = true)]
+    [BenchmarkCategory("batched")]
+    public void TransposeBatched() => Tensor<float>.Transpose(t_16_384_384, new int[] { 0, 2, 1 }).ToDenseTensor();
+
+    [Benchmark(Description = "Transpose a 2048x2048 matrix", Baseline = true)]
+    [BenchmarkCategory("matrix")]
+    public void TransposeMatrix() => Tensor<float>.Transpose(t_2048_2048).ToDenseTensor();
+
+    [Benchmark(Description = "Multiply 12x384x64 attention queries by a copy of the transposed keys", Baseline = true)]
+    [BenchmarkCategory("keys")]
+    public void MatMulTransposedKeysCopy() => Tensor<float>.MatMul(t_12_384_64_q, Tensor<float>.Transpose(t_12_384_64_k, new int[] { 0, 2, 1 }).ToDenseTensor());
+
+    [Benchmark(Description = "Multiply 12x384x64 attention queries by a strided view of the transposed keys")]
+    [BenchmarkCategory("keys")]
+    public void MatMulTransposedKeys() => Tensor<float>.MatMul(t_12_384_64_q, Tensor<float>.Transpose(t_12_384_64_k, new int[] { 0, 2, 1 }));
+
+    #region Fields
+    Tensor<float> t_1_384_12_64 = Tensor<float>.Zeros(0);
+    Tensor<float> t_16_384_384 = Tensor<float>.Zeros(0);
+    Tensor<float> t_2048_2048 = Tensor<float>.Zeros(0);
+    Tensor<float> t_12_384_64_q = Tensor<float>.Zeros(0);
+    Tensor<float> t_12_384_64_k = Tensor<float>.Zeros(0);
+    #endregion
+}
+
 [InProcess]
 [MemoryDiagnoser]
 [IterationsColumn]
@@ -581,6 +759,20 @@ internal class Benchmarks : Runtime
         BenchmarkRunner.Run<TensorIndexingBenchmarks>(DefaultConfig.Instance, args);
     }
 
+    internal static void RunReduce(string[] args)
+    {
+        Info("Running tensor reduction benchmark...");
+        Info("SIMD vector size: {v} bits.", System.Numerics.Vector<int>.Count * 4 * 8);
+        BenchmarkRunner.Run<TensorReductionBenchmarks>(DefaultConfig.Instance, args);
+    }
+
+    internal static void RunTranspose(string[] args)
+    {
+        Info("Running tensor transpose benchmark...");
+        Info("SIMD vector size: {v} bits.", System.Numerics.Vector<int>.Count * 4 * 8);
+        BenchmarkRunner.Run<TensorTransposeBenchmarks>(DefaultConfig.Instance, args);
+    }
+
     internal static void RunMatMul2D(string[] args)
     {
         Info("Running matmul core benchmark...");
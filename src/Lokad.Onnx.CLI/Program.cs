@@ -305,6 +305,14 @@ class Program : Runtime
                     Benchmarks.RunIndexing(args);
                     ExitWithSuccess();
                     break;
+                case "reduce":
+                    Benchmarks.RunReduce(args);
+                    ExitWithSuccess();
+                    break;
+                case "transpose":
+                    Benchmarks.RunTranspose(args);
+                    ExitWithSuccess();
+                    break;
                 default:
                     Error("Unknown benchmark: {b}.", bo.BenchmarkId);
                     Exit(ExitResult.INVALID_OPTIONS);
@@ -12,6 +12,8 @@ public class Graph : Runtime
 {
     public static ComputationalGraph? Load(string filepath) => Model.Load(filepath);
 
+    public static ComputationalGraph? Load(string filepath, string cacheDirectory) => Model.Load(filepath, new ModelCache(cacheDirectory));
+
     public static ComputationalGraph? Load(byte[] buffer) => Model.Load(buffer);
 
     public static ITensor[]? GetInputTensorsFromFileArgs(IEnumerable<string> args, bool saveInput = false) => Data.GetInputTensorsFromFileArgs(args, saveInput);
@@ -9,10 +9,14 @@ public class Tensors
     
     public static ITensor MakeTensor<T>(T[] data, int[] dims) where T : unmanaged => new DenseTensor<T>(data, dims);
 
+    public static ITensor MakeTensorFromPointer<T>(long pointer, int[] dims) where T : unmanaged => DenseTensor<T>.OfNativeMemory(new IntPtr(pointer), dims);
+
     public static ITensor MakeEmptyTensor<T>(int[] dims) where T : unmanaged => new DenseTensor<T>(dims);
 
     public static ITensor MakeScalar<T>(T val) where T : unmanaged => DenseTensor<T>.Scalar(val);
 
+    public static PinnedTensorBuffer PinTensor(ITensor t) => PinnedTensorBuffer.Create(t);
+
     public static ITensor Ones<T>(int[] dims) where T : unmanaged => Tensor<T>.Ones(dims);
 
     public static ITensor ARange(int start, int end, int step = 1) => Tensor<int>.Arange(start, end, step);
@@ -295,6 +295,28 @@ namespace Lokad.Onnx
         [MethodImpl(MethodImplOptions.AggressiveOptimization | MethodImplOptions.AggressiveInlining)]
         public static bool CheckNoRepeatedDims(int[] dims) => dims.Length == dims.Distinct().Count();
 
+        /// <summary>
+        /// Get the shape of the result of multidirectional (numpy-style) broadcasting of two shapes, without creating any tensor.
+        /// </summary>
+        /// <returns>False if the shapes cannot be broadcast together.</returns>
+        public static bool TryGetBroadcastShape(ReadOnlySpan<int> x, ReadOnlySpan<int> y, out int[] shape)
+        {
+            var rank = Math.Max(x.Length, y.Length);
+            shape = new int[rank];
+            for (int i = 0; i < rank; i++)
+            {
+                var dx = i < rank - x.Length ? 1 : x[i - rank + x.Length];
+                var dy = i < rank - y.Length ? 1 : y[i - rank + y.Length];
+                if (dx != dy && dx != 1 && dy != 1)
+                {
+                    shape = null;
+                    return false;
+                }
+                shape[i] = dx == 1 ? dy : dx;
+            }
+            return true;
+        }
+
         
         public static int Clamp(int value, int min, int max)
         {
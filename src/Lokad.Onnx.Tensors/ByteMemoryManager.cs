@@ -0,0 +1,72 @@
+namespace Lokad.Onnx;
+
+using System;
+using System.Buffers;
+using System.Runtime.CompilerServices;
+using System.Runtime.InteropServices;
+
+/// <summary>
+/// A <see cref="MemoryManager{T}"/> that reinterprets a block of bytes as elements of <typeparamref name="T"/> without copying it,
+/// e.g. the little-endian raw data of a tensor in a serialized model. Writes through the memory change the underlying bytes.
+/// </summary>
+/// <typeparam name="T">The element type the bytes are reinterpreted as.</typeparam>
+public unsafe class ByteMemoryManager<T> : MemoryManager<T> where T : unmanaged
+{
+    #region Constructors
+    public ByteMemoryManager(Memory<byte> bytes)
+    {
+        if (bytes.Length % sizeof(T) != 0)
+        {
+            throw new ArgumentException($"The length of the memory ({bytes.Length} bytes) is not a multiple of the size of {typeof(T).Name} ({sizeof(T)} bytes).", nameof(bytes));
+        }
+        this.bytes = bytes;
+    }
+    #endregion
+
+    #region Properties
+    public Memory<byte> Bytes => bytes;
+
+    public int Length => bytes.Length / sizeof(T);
+    #endregion
+
+    #region Methods
+    public override Span<T> GetSpan() => MemoryMarshal.Cast<byte, T>(bytes.Span);
+
+    public override MemoryHandle Pin(int elementIndex = 0)
+    {
+        if (elementIndex < 0 || elementIndex > Length)
+        {
+            throw new ArgumentOutOfRangeException(nameof(elementIndex));
+        }
+        lock (pinLock)
+        {
+            if (pins++ == 0)
+            {
+                handle = bytes.Pin();
+            }
+            return new MemoryHandle((byte*) handle.Pointer + (long) elementIndex * sizeof(T), default, this);
+        }
+    }
+
+    public override void Unpin()
+    {
+        lock (pinLock)
+        {
+            if (pins > 0 && --pins == 0)
+            {
+                handle.Dispose();
+            }
+        }
+    }
+
+    // The bytes are owned by the caller so there is nothing to release.
+    protected override void Dispose(bool disposing) {}
+    #endregion
+
+    #region Fields
+    protected readonly Memory<byte> bytes;
+    private readonly object pinLock = new object();
+    private MemoryHandle handle;
+    private int pins;
+    #endregion
+}
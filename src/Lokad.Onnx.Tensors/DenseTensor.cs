@@ -28,11 +28,17 @@ namespace Lokad.Onnx
     /// <typeparam name="T">
     /// Type contained within the Tensor. Typically a value type such as int, double, float, etc.
     /// </typeparam>
-    public unsafe class DenseTensor<T> : Tensor<T> where T :  unmanaged
+    public unsafe class DenseTensor<T> : Tensor<T>, IArenaTensor where T :  unmanaged
     {
         #region Fields
         protected readonly ArraySegment<T> arr;
         protected readonly Memory<T> memory;
+        private bool readOnly;
+        // Where the elements of a tensor whose memory is not a managed array of T are, so element access does not go through the span 
+        // of a memory manager: a pointer to native memory, which is never moved, or a managed byte array and the offset of the first element.
+        private readonly T* pointer;
+        private readonly byte[]? bytes;
+        private readonly int bytesOffset;
         #endregion
 
         #region Properties
@@ -40,6 +46,14 @@ namespace Lokad.Onnx
         /// Memory storing backing values of this tensor.
         /// </summary>
         public Memory<T> Buffer => memory;
+
+        Array? IArenaTensor.BackingArray => arr.Array;
+
+        /// <summary>
+        /// True if the tensor wraps memory that must not be written, e.g. the raw data of a tensor proto. Setting an element of the 
+        /// tensor throws and ops never write their output to its buffer.
+        /// </summary>
+        public override bool IsReadOnly => readOnly;
         #endregion
 
         #region Constructors
@@ -78,7 +92,8 @@ namespace Lokad.Onnx
         /// <param name="length">Size of the 1-dimensional tensor</param>
         public DenseTensor(int length) : base(length)
         {
-            memory = new T[length];
+            arr = new T[length];
+            memory = arr;
         }
 
         /// <summary>
@@ -95,12 +110,13 @@ namespace Lokad.Onnx
         /// </param>
         public DenseTensor(ReadOnlySpan<int> dimensions, bool reverseStride = false) : base(dimensions, reverseStride)
         {
-            arr = new T[Length];
+            arr = TensorArena.Current is TensorArena arena ? new ArraySegment<T>(arena.Rent<T>((int) Length), 0, (int) Length) : new T[Length];
             memory = arr;
         }
 
         /// <summary>
         /// Constructs a new DenseTensor of the specified dimensions, wrapping existing backing memory for the contents.
+        /// The memory does not need to be backed by a managed array e.g. it can come from a <see cref="NativeMemoryManager{T}"/>.
         /// </summary>
         /// <param name="memory"></param>
         /// <param name="dimensions">
@@ -114,7 +130,25 @@ namespace Lokad.Onnx
         public DenseTensor(Memory<T> memory, ReadOnlySpan<int> dimensions, bool reverseStride = false) 
             : base(dimensions, reverseStride)
         {
-            if (!MemoryMarshal.TryGetArray<T>(memory, out arr)) throw new InvalidOperationException();
+            if (!MemoryMarshal.TryGetArray<T>(memory, out arr))
+            {
+                if (MemoryMarshal.TryGetMemoryManager<T, NativeMemoryManager<T>>(memory, out var native, out var start, out _))
+                {
+                    pointer = native.Pointer + start;
+                }
+                else if (MemoryMarshal.TryGetMemoryManager<T, ByteMemoryManager<T>>(memory, out var reinterpreted, out start, out _))
+                {
+                    if (MemoryMarshal.TryGetMemoryManager<byte, NativeMemoryManager<byte>>(reinterpreted.Bytes, out var nativeBytes, out var byteStart, out _))
+                    {
+                        pointer = (T*) (nativeBytes.Pointer + byteStart) + start;
+                    }
+                    else if (MemoryMarshal.TryGetArray<byte>(reinterpreted.Bytes, out var segment))
+                    {
+                        bytes = segment.Array;
+                        bytesOffset = segment.Offset + start * sizeof(T);
+                    }
+                }
+            }
             this.memory = memory;
 
             if (Length != memory.Length)
@@ -136,7 +170,7 @@ namespace Lokad.Onnx
         [MethodImpl(MethodImplOptions.AggressiveOptimization | MethodImplOptions.AggressiveInlining)]
         public override T GetValue(int index)
         {
-            return arr[index];   
+            return arr.Array is not null ? arr[index] : GetMemoryValue(index);
         }
 
         /// <summary>
@@ -148,7 +182,58 @@ namespace Lokad.Onnx
         [MethodImpl(MethodImplOptions.AggressiveOptimization | MethodImplOptions.AggressiveInlining)]
         public override void SetValue(int index, T value)
         {
-            arr[index] = value;
+            if (readOnly)
+            {
+                throw new InvalidOperationException("Cannot set an element of a read-only tensor.");
+            }
+            else if (arr.Array is not null)
+            {
+                arr[index] = value;
+            }
+            else
+            {
+                SetMemoryValue(index, value);
+            }
+        }
+
+        private T GetMemoryValue(int index)
+        {
+            if ((uint) index >= (uint) memory.Length)
+            {
+                throw new IndexOutOfRangeException();
+            }
+            else if (pointer != null)
+            {
+                return pointer[index];
+            }
+            else if (bytes is not null)
+            {
+                return Unsafe.ReadUnaligned<T>(ref bytes[bytesOffset + index * sizeof(T)]);
+            }
+            else
+            {
+                return memory.Span[index];
+            }
+        }
+
+        private void SetMemoryValue(int index, T value)
+        {
+            if ((uint) index >= (uint) memory.Length)
+            {
+                throw new IndexOutOfRangeException();
+            }
+            else if (pointer != null)
+            {
+                pointer[index] = value;
+            }
+            else if (bytes is not null)
+            {
+                Unsafe.WriteUnaligned(ref bytes[bytesOffset + index * sizeof(T)], value);
+            }
+            else
+            {
+                memory.Span[index] = value;
+            }
         }
 
         /// <summary>
@@ -238,12 +323,23 @@ namespace Lokad.Onnx
                 throw new ArgumentException($"Cannot reshape array due to mismatch in lengths, currently {Length} would become {newSize}.", nameof(dimensions));
             }
 
-            return new DenseTensor<T>(Buffer, dimensions, IsReversedStride);
+            return Alias(0, dimensions, IsReversedStride);
         }
 
+        /// <summary>
+        /// Create a tensor over the elements of the buffer of this tensor that start at <paramref name="offset"/>, which is read-only if this 
+        /// tensor is.
+        /// </summary>
+        internal DenseTensor<T> Alias(int offset, ReadOnlySpan<int> dimensions, bool reverseStride = false) => 
+            new DenseTensor<T>(memory.Slice(offset, ArrayUtilities.ComputeOffsetForReduction(dimensions)), dimensions, reverseStride) { readOnly = readOnly };
+
         protected override void CopyFrom(Tensor<T> from)
         {
-            if (from is DenseTensor<T> d)
+            if (from is DenseTensor<T> dt && dt.IsReversedStride == IsReversedStride && dt.Length == Length)
+            {
+                dt.Buffer.Span.CopyTo(memory.Span);
+            }
+            else if (from is DenseTensor<T> d)
             {
                 var handle = memory.Pin();
                 var handle2 = d.memory.Pin();
@@ -267,6 +363,23 @@ namespace Lokad.Onnx
 
         public override DenseTensor<T> ToDenseTensor() => this;
 
+        /// <summary>
+        /// Converts the elements of this tensor to <typeparamref name="U"/> in its own buffer, which is reinterpreted as elements of 
+        /// <typeparamref name="U"/>. The returned tensor shares the buffer, so the values of this tensor are overwritten.
+        /// </summary>
+        /// <typeparam name="U">The element type to convert to, which must have the size of <typeparamref name="T"/>.</typeparam>
+        public DenseTensor<U> CastInPlace<U>() where U : unmanaged
+        {
+            var target = new ReinterpretMemoryManager<T, U>(memory).Memory;
+            var s = memory.Span;
+            var t = target.Span;
+            for (int i = 0; i < s.Length; i++)
+            {
+                t[i] = (U) Convert.ChangeType(s[i], typeof(U));
+            }
+            return new DenseTensor<U>(target, dimensions, IsReversedStride);
+        }
+
         public static DenseTensor<T> OfShape(params int[] dims) => new DenseTensor<T>((ReadOnlySpan<int>) dims);
         #endregion
 
@@ -274,6 +387,47 @@ namespace Lokad.Onnx
         public static DenseTensor<T> OfValues(Array data) => data.ToTensor<T>();
 
         public static DenseTensor<T> Scalar(T value) => new DenseTensor<T>(new T[1] { value }, Array.Empty<int>());
+
+        /// <summary>
+        /// Creates a DenseTensor over a block of native memory without copying it. The caller owns the memory and must keep 
+        /// it alive and unmoved for the lifetime of the tensor.
+        /// </summary>
+        /// <param name="pointer">Pointer to the first element of a C-contiguous (row-major) buffer.</param>
+        /// <param name="dims">The dimensions of the tensor.</param>
+        public static DenseTensor<T> OfNativeMemory(IntPtr pointer, int[] dims)
+        {
+            var manager = new NativeMemoryManager<T>(pointer, ArrayUtilities.ComputeOffsetForReduction(dims));
+            return new DenseTensor<T>(manager.Memory, dims);
+        }
+
+        /// <summary>
+        /// Creates a DenseTensor that reinterprets a block of little-endian bytes as its elements without copying them.
+        /// The tensor shares the bytes, so writes to the tensor change them.
+        /// </summary>
+        /// <param name="bytes">The C-contiguous (row-major) elements of the tensor.</param>
+        /// <param name="dims">The dimensions of the tensor.</param>
+        public static DenseTensor<T> OfBytes(Memory<byte> bytes, int[] dims)
+        {
+            if (!BitConverter.IsLittleEndian)
+            {
+                throw new PlatformNotSupportedException("Reinterpreting little-endian tensor data requires a little-endian platform.");
+            }
+            var manager = new ByteMemoryManager<T>(bytes);
+            return new DenseTensor<T>(manager.Memory, dims);
+        }
+
+        /// <summary>
+        /// Creates a read-only DenseTensor that reinterprets a block of little-endian bytes as its elements without copying them.
+        /// See <see cref="IsReadOnly"/>.
+        /// </summary>
+        /// <param name="bytes">The C-contiguous (row-major) elements of the tensor.</param>
+        /// <param name="dims">The dimensions of the tensor.</param>
+        public static DenseTensor<T> OfReadOnlyBytes(ReadOnlyMemory<byte> bytes, int[] dims)
+        {
+            var t = OfBytes(MemoryMarshal.AsMemory(bytes), dims);
+            t.readOnly = true;
+            return t;
+        }
         #endregion
     }
 }
@@ -38,6 +38,8 @@ namespace Lokad.Onnx
 
         Array ToArray();
 
+        void CopyTo(ITensor destination);
+
         ITensor PadLeft() => InsertDim(0);
         
         object this[params int[] indices]
@@ -56,6 +58,12 @@ namespace Lokad.Onnx
 
         void SetValue(int index, object value); 
 
+        /// <summary>
+        /// True if <paramref name="x"/> and <paramref name="y"/> are backed by the same managed array, e.g. a tensor and a reshape of it.
+        /// </summary>
+        static bool SharesArray(ITensor x, ITensor y) => 
+            x is IArenaTensor ax && ax.BackingArray is Array a && y is IArenaTensor ay && ReferenceEquals(a, ay.BackingArray);
+
         static void ThrowIfDifferentElementTypes(params ITensor[] tensors) => Array.ForEach(tensors, tensor =>
         {
             if (tensor.ElementType != tensors[0].ElementType) throw new ArgumentException("All tensors must have the same element type.");
@@ -169,6 +177,12 @@ namespace Lokad.Onnx
             return output;
         }
 
+        /// <summary>
+        /// Convert the elements of this tensor to <typeparamref name="U"/> in its own buffer, overwriting its values, or return null 
+        /// if the tensor is not dense or its elements do not have the size of <typeparamref name="U"/>.
+        /// </summary>
+        ITensor? CastInPlace<U>() where U : unmanaged;
+
         ITensor ConvertToInt32() 
         {
             Profiler.StartOpStage(OpStage.Cast);
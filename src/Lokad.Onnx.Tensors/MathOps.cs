@@ -4,11 +4,47 @@ using System.Runtime.Intrinsics.X86;
 using System.Runtime.InteropServices;
 using System.Runtime.Intrinsics;
 using System.Diagnostics;
+using System.Runtime.CompilerServices;
+using System.Threading.Tasks;
 
 namespace Lokad.Onnx;
 
 public class MathOps
 {
+    /// <summary>
+    /// The number of rows of A in a tile of a blocked matrix multiplication.
+    /// </summary>
+    public const int GemmBlockM = 64;
+
+    /// <summary>
+    /// The length of the inner dimension packed at a time in a blocked matrix multiplication.
+    /// </summary>
+    public const int GemmBlockN = 256;
+
+    /// <summary>
+    /// The number of columns of B in a tile of a blocked matrix multiplication.
+    /// </summary>
+    public const int GemmBlockK = 128;
+
+    /// <summary>
+    /// The number of elements of a softmax row that share a running maximum, or the number of columns processed together for other axes.
+    /// </summary>
+    public const int SoftmaxBlock = 256;
+
+    // Coefficients of the numerator and denominator polynomials of ErfRational.
+    private const float ErfAlpha1 = -1.60960333262415e-02f;
+    private const float ErfAlpha3 = -2.95459980854025e-03f;
+    private const float ErfAlpha5 = -7.34990630326855e-04f;
+    private const float ErfAlpha7 = -5.69250639462346e-05f;
+    private const float ErfAlpha9 = -2.10102402082508e-06f;
+    private const float ErfAlpha11 = 2.77068142495902e-08f;
+    private const float ErfAlpha13 = -2.72614225801306e-10f;
+    private const float ErfBeta0 = -1.42647390514189e-02f;
+    private const float ErfBeta2 = -7.37332916720468e-03f;
+    private const float ErfBeta4 = -1.68282697438203e-03f;
+    private const float ErfBeta6 = -2.13374055278905e-04f;
+    private const float ErfBeta8 = -1.45660718464996e-05f;
+
     public struct PadInfo
     {
         public int h;
@@ -536,7 +572,7 @@ public class MathOps
         for (int i = 0; i < M; i += 2)
         {
             var Ap1 = A + i * N;
-            var Ap2 = A + N;
+            var Ap2 = Ap1 + N;
 
             var Cp1 = C + i * K;
             var Cp2 = Cp1 + K;
@@ -633,6 +669,220 @@ public class MathOps
             }
         }
     }
+
+    /// <summary>
+    /// Cache-blocked matrix multiplication over a batch of matrices, partitioned into tiles of the result that are executed in parallel. 
+    /// Each tile multiplies a block of <see cref="GemmBlockM"/> rows of A with a block of <see cref="GemmBlockK"/> columns of B, walking the 
+    /// inner dimension in steps of <see cref="GemmBlockN"/>. For each step the block of B is packed into contiguous panels one vector wide 
+    /// so the micro-kernel streams through it sequentially while keeping the accumulators of 4 rows of C in registers.
+    /// </summary>
+    /// <param name="M">A rows.</param>
+    /// <param name="N">A columns.</param>
+    /// <param name="K">B columns.</param>
+    /// <param name="A">Left matrices.</param>
+    /// <param name="B">Right matrices.</param>
+    /// <param name="C">Result matrices.</param>
+    /// <param name="aOffsets">The offset of each left matrix in the batch from <paramref name="A"/>.</param>
+    /// <param name="bOffsets">The offset of each right matrix in the batch from <paramref name="B"/>.</param>
+    /// <param name="cOffsets">The offset of each result matrix in the batch from <paramref name="C"/>.</param>
+    /// <param name="threads">The maximum number of threads to use.</param>
+    public unsafe static void mm_blocked_parallel(int M,
+                          int N,
+                          int K,
+                          float* A,
+                          float* B,
+                          float* C,
+                          int[] aOffsets,
+                          int[] bOffsets,
+                          int[] cOffsets,
+                          int threads) => mm_blocked_parallel(M, N, K, A, B, C, aOffsets, bOffsets, cOffsets, N, K, 1, threads);
+
+    /// <summary>
+    /// Cache-blocked matrix multiplication over a batch of matrices where the rows of A and the rows and columns of B are read with
+    /// the given strides, so that a transposed or sliced view of B is multiplied without copying it first. The elements of each row of A
+    /// must be contiguous.
+    /// </summary>
+    /// <param name="aRowStride">The distance between the rows of each left matrix.</param>
+    /// <param name="bRowStride">The distance between the rows of each right matrix.</param>
+    /// <param name="bColStride">The distance between the columns of each right matrix.</param>
+    public unsafe static void mm_blocked_parallel(int M,
+                          int N,
+                          int K,
+                          float* A,
+                          float* B,
+                          float* C,
+                          int[] aOffsets,
+                          int[] bOffsets,
+                          int[] cOffsets,
+                          int aRowStride,
+                          int bRowStride,
+                          int bColStride,
+                          int threads)
+    {
+        if (aOffsets.Length != bOffsets.Length || aOffsets.Length != cOffsets.Length)
+            throw new ArgumentException("The number of offsets for each matrix in the batch must be the same.");
+
+        var rowTiles = (M + GemmBlockM - 1) / GemmBlockM;
+        var colTiles = (K + GemmBlockK - 1) / GemmBlockK;
+        var tiles = rowTiles * colTiles;
+        var work = aOffsets.Length * tiles;
+        if (threads <= 1 || work <= 1)
+        {
+            for (int w = 0; w < work; w++)
+            {
+                var b = w / tiles;
+                mm_blocked_tile(M, N, K, A + aOffsets[b], B + bOffsets[b], C + cOffsets[b], aRowStride, bRowStride, bColStride, w % tiles, colTiles);
+            }
+        }
+        else
+        {
+            // Pointers can't be captured by the lambda so pass the addresses instead.
+            nint a = (nint)A, bb = (nint)B, c = (nint)C;
+            Parallel.For(0, work, new ParallelOptions() { MaxDegreeOfParallelism = threads }, w =>
+            {
+                var b = w / tiles;
+                mm_blocked_tile(M, N, K, (float*)a + aOffsets[b], (float*)bb + bOffsets[b], (float*)c + cOffsets[b], aRowStride, bRowStride, bColStride, w % tiles, colTiles);
+            });
+        }
+    }
+
+    /// <summary>
+    /// Cache-blocked matrix multiplication partitioned into tiles of the result that are executed in parallel.
+    /// </summary>
+    /// <param name="M">A rows.</param>
+    /// <param name="N">A columns.</param>
+    /// <param name="K">B columns.</param>
+    /// <param name="A">Left matrix.</param>
+    /// <param name="B">Right matrix.</param>
+    /// <param name="C">Result matrix.</param>
+    /// <param name="threads">The maximum number of threads to use.</param>
+    public unsafe static void mm_blocked_parallel(int M,
+                          int N,
+                          int K,
+                          float* A,
+                          float* B,
+                          float* C,
+                          int threads) => mm_blocked_parallel(M, N, K, A, B, C, zeroOffset, zeroOffset, zeroOffset, threads);
+
+    private unsafe static void mm_blocked_tile(int M, int N, int K, float* A, float* B, float* C, int aRowStride, int bRowStride, int bColStride, int tile, int colTiles)
+    {
+        var V = Vector<float>.Count;
+        var i0 = (tile / colTiles) * GemmBlockM;
+        var j0 = (tile % colTiles) * GemmBlockK;
+        var mc = Math.Min(GemmBlockM, M - i0);
+        var kc = Math.Min(GemmBlockK, K - j0);
+        var panels = (kc + V - 1) / V;
+        var packSize = panels * V * GemmBlockN;
+        if (gemmPackBuffer is null || gemmPackBuffer.Length < packSize)
+        {
+            gemmPackBuffer = new float[packSize];
+        }
+
+        fixed (float* packed = gemmPackBuffer)
+        {
+            for (int p0 = 0; p0 < N; p0 += GemmBlockN)
+            {
+                var nc = Math.Min(GemmBlockN, N - p0);
+
+                // Pack B[p0..p0 + nc, j0..j0 + kc] into panels of V columns, padding the last panel with zeros.
+                for (int jp = 0; jp < panels; jp++)
+                {
+                    var Pp = packed + jp * nc * V;
+                    var w = Math.Min(V, kc - jp * V);
+                    for (int p = 0; p < nc; p++)
+                    {
+                        var Bp = B + (p0 + p) * bRowStride + (j0 + jp * V) * bColStride;
+                        var Pr = Pp + p * V;
+                        if (bColStride == 1)
+                        {
+                            for (int l = 0; l < w; l++)
+                            {
+                                Pr[l] = Bp[l];
+                            }
+                        }
+                        else
+                        {
+                            for (int l = 0; l < w; l++)
+                            {
+                                Pr[l] = Bp[l * bColStride];
+                            }
+                        }
+                        for (int l = w; l < V; l++)
+                        {
+                            Pr[l] = 0.0f;
+                        }
+                    }
+                }
+
+                for (int jp = 0; jp < panels; jp++)
+                {
+                    var Pp = packed + jp * nc * V;
+                    var w = Math.Min(V, kc - jp * V);
+                    var Ap = A + i0 * aRowStride + p0;
+                    var Cp = C + i0 * K + j0 + jp * V;
+                    int i = 0;
+                    if (w == V)
+                    {
+                        for (; i + 4 <= mc; i += 4)
+                        {
+                            var a0 = Ap + i * aRowStride;
+                            var a1 = a0 + aRowStride;
+                            var a2 = a1 + aRowStride;
+                            var a3 = a2 + aRowStride;
+                            var c0 = (Vector<float>*)(Cp + i * K);
+                            var c1 = (Vector<float>*)(Cp + (i + 1) * K);
+                            var c2 = (Vector<float>*)(Cp + (i + 2) * K);
+                            var c3 = (Vector<float>*)(Cp + (i + 3) * K);
+                            Vector<float> s0 = *c0, s1 = *c1, s2 = *c2, s3 = *c3;
+                            var Pv = (Vector<float>*)Pp;
+                            for (int p = 0; p < nc; p++)
+                            {
+                                var bv = Pv[p];
+                                s0 += new Vector<float>(a0[p]) * bv;
+                                s1 += new Vector<float>(a1[p]) * bv;
+                                s2 += new Vector<float>(a2[p]) * bv;
+                                s3 += new Vector<float>(a3[p]) * bv;
+                            }
+                            *c0 = s0;
+                            *c1 = s1;
+                            *c2 = s2;
+                            *c3 = s3;
+                        }
+                        for (; i < mc; i++)
+                        {
+                            var a0 = Ap + i * aRowStride;
+                            var c0 = (Vector<float>*)(Cp + i * K);
+                            var s0 = *c0;
+                            var Pv = (Vector<float>*)Pp;
+                            for (int p = 0; p < nc; p++)
+                            {
+                                s0 += new Vector<float>(a0[p]) * Pv[p];
+                            }
+                            *c0 = s0;
+                        }
+                    }
+                    else
+                    {
+                        for (; i < mc; i++)
+                        {
+                            var a0 = Ap + i * aRowStride;
+                            var c0 = Cp + i * K;
+                            for (int l = 0; l < w; l++)
+                            {
+                                var s = c0[l];
+                                for (int p = 0; p < nc; p++)
+                                {
+                                    s += a0[p] * Pp[p * V + l];
+                                }
+                                c0[l] = s;
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+
     /// <summary>
     /// Image to column conversion.
     /// </summary>
@@ -985,6 +1235,350 @@ public class MathOps
         Marshal.FreeCoTaskMem((IntPtr)buf);
     }
 
+    /// <summary>
+    /// Softmax over a contiguous row in two passes. The first pass computes the maximum of each block of the row and keeps an online sum 
+    /// of exponentials relative to the running maximum, writing the exponentials to the output. The second pass rescales each block from 
+    /// its running maximum to the row maximum and normalizes by the sum, so each element is exponentiated only once.
+    /// </summary>
+    /// <param name="x">Input row.</param>
+    /// <param name="y">Output row.</param>
+    /// <param name="n">Row length.</param>
+    public unsafe static void Softmax(float* x, float* y, int n)
+    {
+        if (n == 0) return;
+        var blocks = (n + SoftmaxBlock - 1) / SoftmaxBlock;
+        var blockMax = blocks <= 256 ? stackalloc float[blocks] : new float[blocks];
+        float m = float.NegativeInfinity, s = 0.0f;
+        for (int b = 0; b < blocks; b++)
+        {
+            var start = b * SoftmaxBlock;
+            var end = Math.Min(start + SoftmaxBlock, n);
+            var bm = Max(x + start, end - start);
+            if (bm > m)
+            {
+                s *= MathF.Exp(m - bm);
+                m = bm;
+            }
+            if (m == float.NegativeInfinity)
+            {
+                // All the elements so far are -inf and contribute 0 to the sum, but exp(-inf - -inf) would be NaN.
+                new Span<float>(y + start, end - start).Clear();
+            }
+            else
+            {
+                for (int i = start; i < end; i++)
+                {
+                    var e = MathF.Exp(x[i] - m);
+                    y[i] = e;
+                    s += e;
+                }
+            }
+            blockMax[b] = m;
+        }
+        for (int b = 0; b < blocks; b++)
+        {
+            var start = b * SoftmaxBlock;
+            var end = Math.Min(start + SoftmaxBlock, n);
+            if (blockMax[b] == m)
+            {
+                Divide(y + start, end - start, s);
+            }
+            else
+            {
+                Multiply(y + start, end - start, MathF.Exp(blockMax[b] - m) / s);
+            }
+        }
+    }
+
+    /// <summary>
+    /// Softmax over an axis that is not the innermost axis, for a group of adjacent columns. Element j of column c is at offset
+    /// j * <paramref name="stride"/> + c, so the maximum, the sum and the normalization are computed across columns.
+    /// </summary>
+    /// <param name="x">Input.</param>
+    /// <param name="y">Output.</param>
+    /// <param name="n">Length of the softmax axis.</param>
+    /// <param name="stride">Stride of the softmax axis.</param>
+    /// <param name="width">Number of columns, at most <see cref="SoftmaxBlock"/>.</param>
+    public unsafe static void Softmax(float* x, float* y, int n, int stride, int width)
+    {
+        if (width > SoftmaxBlock)
+            throw new ArgumentException(nameof(width));
+
+        var m = stackalloc float[width];
+        var s = stackalloc float[width];
+        new Span<float>(m, width).Fill(float.NegativeInfinity);
+        new Span<float>(s, width).Clear();
+        for (int j = 0; j < n; j++)
+        {
+            Max(m, x + j * stride, width);
+        }
+        for (int j = 0; j < n; j++)
+        {
+            var xr = x + j * stride;
+            var yr = y + j * stride;
+            for (int c = 0; c < width; c++)
+            {
+                var e = MathF.Exp(xr[c] - m[c]);
+                yr[c] = e;
+                s[c] += e;
+            }
+        }
+        for (int j = 0; j < n; j++)
+        {
+            Divide(y + j * stride, s, width);
+        }
+    }
+
+    // The SIMD loops of the softmax kernels are kept out of line: calling MathF.Exp after 256-bit vector instructions in the same method 
+    // incurs an AVX to SSE transition penalty on every call.
+    [MethodImpl(MethodImplOptions.NoInlining)]
+    private unsafe static float Max(float* x, int n)
+    {
+        var V = Vector<float>.Count;
+        var m = float.NegativeInfinity;
+        int i = 0;
+        if (n >= V)
+        {
+            var mv = *(Vector<float>*)x;
+            for (i = V; i <= n - V; i += V)
+            {
+                mv = Vector.Max(mv, *(Vector<float>*)(x + i));
+            }
+            for (int l = 0; l < V; l++)
+            {
+                m = MathF.Max(m, mv[l]);
+            }
+        }
+        for (; i < n; i++)
+        {
+            m = MathF.Max(m, x[i]);
+        }
+        return m;
+    }
+
+    [MethodImpl(MethodImplOptions.NoInlining)]
+    private unsafe static void Max(float* m, float* x, int n)
+    {
+        var V = Vector<float>.Count;
+        int i = 0;
+        for (; i <= n - V; i += V)
+        {
+            *(Vector<float>*)(m + i) = Vector.Max(*(Vector<float>*)(m + i), *(Vector<float>*)(x + i));
+        }
+        for (; i < n; i++)
+        {
+            m[i] = MathF.Max(m[i], x[i]);
+        }
+    }
+
+    [MethodImpl(MethodImplOptions.NoInlining)]
+    private unsafe static void Multiply(float* y, int n, float f)
+    {
+        var V = Vector<float>.Count;
+        var fv = new Vector<float>(f);
+        int i = 0;
+        for (; i <= n - V; i += V)
+        {
+            *(Vector<float>*)(y + i) = *(Vector<float>*)(y + i) * fv;
+        }
+        for (; i < n; i++)
+        {
+            y[i] *= f;
+        }
+    }
+
+    [MethodImpl(MethodImplOptions.NoInlining)]
+    private unsafe static void Divide(float* y, int n, float d)
+    {
+        var V = Vector<float>.Count;
+        var dv = new Vector<float>(d);
+        int i = 0;
+        for (; i <= n - V; i += V)
+        {
+            *(Vector<float>*)(y + i) = *(Vector<float>*)(y + i) / dv;
+        }
+        for (; i < n; i++)
+        {
+            y[i] /= d;
+        }
+    }
+
+    [MethodImpl(MethodImplOptions.NoInlining)]
+    private unsafe static void Divide(float* y, float* d, int n)
+    {
+        var V = Vector<float>.Count;
+        int i = 0;
+        for (; i <= n - V; i += V)
+        {
+            *(Vector<float>*)(y + i) = *(Vector<float>*)(y + i) / *(Vector<float>*)(d + i);
+        }
+        for (; i < n; i++)
+        {
+            y[i] /= d[i];
+        }
+    }
+
+    /// <summary>
+    /// Layer normalization of a contiguous row in two passes: the first pass computes the mean, the second the variance from the deviations 
+    /// to the mean, which is more accurate than accumulating the sum of squares in the same pass. The row is then scaled and shifted.
+    /// </summary>
+    /// <param name="x">Input row.</param>
+    /// <param name="y">Output row.</param>
+    /// <param name="n">Row length.</param>
+    /// <param name="scale">Scale of each element of the row.</param>
+    /// <param name="bias">Bias of each element of the row, or null.</param>
+    /// <param name="epsilon">Added to the variance to avoid dividing by zero.</param>
+    /// <param name="mean">Receives the mean of the row.</param>
+    /// <param name="invStdDev">Receives the inverse standard deviation of the row.</param>
+    public unsafe static void LayerNorm(float* x, float* y, int n, float* scale, float* bias, float epsilon, float* mean, float* invStdDev)
+    {
+        var V = Vector<float>.Count;
+        var sv = Vector<float>.Zero;
+        int i = 0;
+        for (; i <= n - V; i += V)
+        {
+            sv += *(Vector<float>*)(x + i);
+        }
+        var sum = Vector.Sum(sv);
+        for (; i < n; i++)
+        {
+            sum += x[i];
+        }
+        var m = sum / n;
+
+        var mv = new Vector<float>(m);
+        var qv = Vector<float>.Zero;
+        for (i = 0; i <= n - V; i += V)
+        {
+            var d = *(Vector<float>*)(x + i) - mv;
+            qv += d * d;
+        }
+        var q = Vector.Sum(qv);
+        for (; i < n; i++)
+        {
+            var d = x[i] - m;
+            q += d * d;
+        }
+        var r = 1.0f / MathF.Sqrt(q / n + epsilon);
+
+        var rv = new Vector<float>(r);
+        if (bias is null)
+        {
+            for (i = 0; i <= n - V; i += V)
+            {
+                *(Vector<float>*)(y + i) = (*(Vector<float>*)(x + i) - mv) * rv * *(Vector<float>*)(scale + i);
+            }
+            for (; i < n; i++)
+            {
+                y[i] = (x[i] - m) * r * scale[i];
+            }
+        }
+        else
+        {
+            for (i = 0; i <= n - V; i += V)
+            {
+                *(Vector<float>*)(y + i) = (*(Vector<float>*)(x + i) - mv) * rv * *(Vector<float>*)(scale + i) + *(Vector<float>*)(bias + i);
+            }
+            for (; i < n; i++)
+            {
+                y[i] = (x[i] - m) * r * scale[i] + bias[i];
+            }
+        }
+        *mean = m;
+        *invStdDev = r;
+    }
+
+    /// <summary>
+    /// The error function, using the rational approximation of Eigen's generic_fast_erf_float: an odd polynomial over an even polynomial
+    /// of x on [-4, 4], outside of which erf is ±1 in single precision. The maximum absolute error is about 1e-7 and no exponential
+    /// is needed, so the same approximation can be evaluated on vectors.
+    /// </summary>
+    public static float ErfRational(float x)
+    {
+        x = Math.Clamp(x, -4.0f, 4.0f);
+        var x2 = x * x;
+        var p = x2 * ErfAlpha13 + ErfAlpha11;
+        p = x2 * p + ErfAlpha9;
+        p = x2 * p + ErfAlpha7;
+        p = x2 * p + ErfAlpha5;
+        p = x2 * p + ErfAlpha3;
+        p = x2 * p + ErfAlpha1;
+        var q = x2 * ErfBeta8 + ErfBeta6;
+        q = x2 * q + ErfBeta4;
+        q = x2 * q + ErfBeta2;
+        q = x2 * q + ErfBeta0;
+        return x * p / q;
+    }
+
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
+    public static Vector<float> ErfRational(Vector<float> x)
+    {
+        x = Vector.Min(Vector.Max(x, new Vector<float>(-4.0f)), new Vector<float>(4.0f));
+        var x2 = x * x;
+        var p = x2 * new Vector<float>(ErfAlpha13) + new Vector<float>(ErfAlpha11);
+        p = x2 * p + new Vector<float>(ErfAlpha9);
+        p = x2 * p + new Vector<float>(ErfAlpha7);
+        p = x2 * p + new Vector<float>(ErfAlpha5);
+        p = x2 * p + new Vector<float>(ErfAlpha3);
+        p = x2 * p + new Vector<float>(ErfAlpha1);
+        var q = x2 * new Vector<float>(ErfBeta8) + new Vector<float>(ErfBeta6);
+        q = x2 * q + new Vector<float>(ErfBeta4);
+        q = x2 * q + new Vector<float>(ErfBeta2);
+        q = x2 * q + new Vector<float>(ErfBeta0);
+        return x * p / q;
+    }
+
+    /// <summary>
+    /// The error function of each element of <paramref name="x"/>.
+    /// </summary>
+    public unsafe static void Erf(float* x, float* y, int n)
+    {
+        var V = Vector<float>.Count;
+        int i = 0;
+        for (; i <= n - V; i += V)
+        {
+            *(Vector<float>*)(y + i) = ErfRational(*(Vector<float>*)(x + i));
+        }
+        for (; i < n; i++)
+        {
+            y[i] = ErfRational(x[i]);
+        }
+    }
+
+    /// <summary>
+    /// The Gaussian error linear unit 0.5 * x * (1 + erf(x / sqrt(2))) of each element of <paramref name="x"/>.
+    /// </summary>
+    public unsafe static void Gelu(float* x, float* y, int n)
+    {
+        var V = Vector<float>.Count;
+        var half = new Vector<float>(0.5f);
+        var rsqrt2 = new Vector<float>(1.0f / MathF.Sqrt(2.0f));
+        int i = 0;
+        for (; i <= n - V; i += V)
+        {
+            var v = *(Vector<float>*)(x + i);
+            *(Vector<float>*)(y + i) = half * v * (Vector<float>.One + ErfRational(v * rsqrt2));
+        }
+        for (; i < n; i++)
+        {
+            y[i] = 0.5f * x[i] * (1.0f + ErfRational(x[i] * (1.0f / MathF.Sqrt(2.0f))));
+        }
+    }
+
+    /// <summary>
+    /// The tanh approximation 0.5 * x * (1 + tanh(sqrt(2 / pi) * (x + 0.044715 * x^3))) of the Gaussian error linear unit of each element 
+    /// of <paramref name="x"/>.
+    /// </summary>
+    public unsafe static void GeluTanh(float* x, float* y, int n)
+    {
+        var c = MathF.Sqrt(2.0f / MathF.PI);
+        for (int i = 0; i < n; i++)
+        {
+            var v = x[i];
+            y[i] = 0.5f * v * (1.0f + MathF.Tanh(c * (v + 0.044715f * v * v * v)));
+        }
+    }
+
     // From: https://www.johndcook.com/blog/2009/01/19/stand-alone-error-function-erf/
     public static float Erf(float x)
     {
@@ -1339,4 +1933,9 @@ public class MathOps
         else
             return r / x - 1.0f;
     }
+
+    private static readonly int[] zeroOffset = new int[] { 0 };
+
+    [ThreadStatic]
+    private static float[]? gemmPackBuffer;
 }
@@ -0,0 +1,61 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Buffers;
+
+/// <summary>
+/// A <see cref="MemoryManager{T}"/> over a block of unmanaged memory that is owned by someone else, e.g. the data
+/// buffer of a numpy array. The memory is not copied or freed: the owner must keep it alive and unmoved for as long
+/// as any <see cref="Memory{T}"/> or tensor created from this manager is in use.
+/// </summary>
+/// <typeparam name="T">The element type of the native memory.</typeparam>
+public unsafe class NativeMemoryManager<T> : MemoryManager<T> where T : unmanaged
+{
+    #region Constructors
+    public NativeMemoryManager(T* pointer, int length)
+    {
+        if (pointer == null && length > 0)
+        {
+            throw new ArgumentNullException(nameof(pointer));
+        }
+        if (length < 0)
+        {
+            throw new ArgumentOutOfRangeException(nameof(length), "The length of native memory cannot be negative.");
+        }
+        this.pointer = pointer;
+        this.length = length;
+    }
+
+    public NativeMemoryManager(IntPtr pointer, int length) : this((T*) pointer.ToPointer(), length) {}
+    #endregion
+
+    #region Properties
+    public T* Pointer => pointer;
+
+    public int Length => length;
+    #endregion
+
+    #region Methods
+    public override Span<T> GetSpan() => new Span<T>(pointer, length);
+
+    public override MemoryHandle Pin(int elementIndex = 0)
+    {
+        if (elementIndex < 0 || elementIndex > length)
+        {
+            throw new ArgumentOutOfRangeException(nameof(elementIndex));
+        }
+        return new MemoryHandle(pointer + elementIndex);
+    }
+
+    // The memory is never moved by the GC so there is nothing to unpin.
+    public override void Unpin() {}
+
+    // The memory is owned by the caller so there is nothing to release.
+    protected override void Dispose(bool disposing) {}
+    #endregion
+
+    #region Fields
+    protected readonly T* pointer;
+    protected readonly int length;
+    #endregion
+}
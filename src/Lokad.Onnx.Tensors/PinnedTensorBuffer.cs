@@ -0,0 +1,99 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Buffers;
+using System.Runtime.InteropServices;
+
+/// <summary>
+/// Pins the backing buffer of a dense tensor so that its contents can be read or written through a raw pointer, e.g.
+/// by exposing it to numpy without copying. The tensor is kept alive and its buffer pinned until the handle is disposed.
+/// </summary>
+public unsafe sealed class PinnedTensorBuffer : IDisposable
+{
+    #region Constructors
+    private PinnedTensorBuffer(ITensor tensor, MemoryHandle handle, int length, int elementSize, bool isManaged)
+    {
+        this.Tensor = tensor;
+        this.handle = handle;
+        this.Pointer = (long) handle.Pointer;
+        this.Length = length;
+        this.ElementSize = elementSize;
+        this.IsManaged = isManaged;
+    }
+    #endregion
+
+    #region Properties
+    /// <summary>
+    /// The dense tensor whose buffer is pinned. If the tensor passed to <see cref="Create(ITensor)"/> was not a
+    /// <see cref="DenseTensor{T}"/>, or had reversed strides, this is a row-major dense copy of it.
+    /// </summary>
+    public ITensor Tensor { get; }
+
+    public long Pointer { get; }
+
+    public int Length { get; }
+
+    public int ElementSize { get; }
+
+    /// <summary>
+    /// True if the buffer belongs to a managed array, false if the tensor wraps memory owned by someone else.
+    /// </summary>
+    public bool IsManaged { get; }
+
+    public int[] Dims => Tensor.Dims;
+
+    public TensorElementType ElementType => Tensor.ElementType;
+
+    public Type PrimitiveType => Tensor.PrimitiveType;
+
+    public bool IsDisposed => disposed;
+    #endregion
+
+    #region Methods
+    public static PinnedTensorBuffer Create(ITensor tensor) => tensor.ElementType switch
+    {
+        TensorElementType.Bool => Create((Tensor<bool>) tensor),
+        TensorElementType.UInt8 => Create((Tensor<byte>) tensor),
+        TensorElementType.Int8 => Create((Tensor<sbyte>) tensor),
+        TensorElementType.UInt16 => Create((Tensor<ushort>) tensor),
+        TensorElementType.Int16 => Create((Tensor<short>) tensor),
+        TensorElementType.UInt32 => Create((Tensor<uint>) tensor),
+        TensorElementType.Int32 => Create((Tensor<int>) tensor),
+        TensorElementType.UInt64 => Create((Tensor<ulong>) tensor),
+        TensorElementType.Int64 => Create((Tensor<long>) tensor),
+        TensorElementType.Float => Create((Tensor<float>) tensor),
+        TensorElementType.Double => Create((Tensor<double>) tensor),
+        _ => throw new NotSupportedException($"Cannot pin the buffer of a tensor with element type {tensor.ElementType}.")
+    };
+
+    public static PinnedTensorBuffer Create<T>(Tensor<T> tensor) where T : unmanaged
+    {
+        var dense = tensor.ToDenseTensor();
+        if (dense.IsReversedStride)
+        {
+            // Consumers of the pointer expect C order, so the elements are copied in row-major order.
+            var copy = DenseTensor<T>.OfShape(dense.dimensions);
+            foreach (var index in dense.GetDimensionsIterator())
+            {
+                copy[index] = dense[index];
+            }
+            dense = copy;
+        }
+        return new PinnedTensorBuffer(dense, dense.Buffer.Pin(), dense.Buffer.Length, sizeof(T), MemoryMarshal.TryGetArray<T>(dense.Buffer, out _));
+    }
+
+    public void Dispose()
+    {
+        if (!disposed)
+        {
+            handle.Dispose();
+            disposed = true;
+        }
+    }
+    #endregion
+
+    #region Fields
+    private MemoryHandle handle;
+    private bool disposed;
+    #endregion
+}
@@ -0,0 +1,55 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Buffers;
+using System.Runtime.CompilerServices;
+using System.Runtime.InteropServices;
+
+/// <summary>
+/// A <see cref="MemoryManager{T}"/> that reinterprets a block of memory holding elements of <typeparamref name="TFrom"/> as elements of 
+/// <typeparamref name="TTo"/> of the same size without copying it, e.g. to convert the elements of a tensor to another type in its own 
+/// buffer. Writes through the memory change the underlying memory.
+/// </summary>
+/// <typeparam name="TFrom">The element type of the underlying memory.</typeparam>
+/// <typeparam name="TTo">The element type the memory is reinterpreted as.</typeparam>
+public class ReinterpretMemoryManager<TFrom, TTo> : MemoryManager<TTo> where TFrom : unmanaged where TTo : unmanaged
+{
+    #region Constructors
+    public ReinterpretMemoryManager(Memory<TFrom> memory)
+    {
+        if (Unsafe.SizeOf<TFrom>() != Unsafe.SizeOf<TTo>())
+        {
+            throw new ArgumentException($"Cannot reinterpret elements of {typeof(TFrom).Name} ({Unsafe.SizeOf<TFrom>()} bytes) as {typeof(TTo).Name} ({Unsafe.SizeOf<TTo>()} bytes).", nameof(memory));
+        }
+        this.memory = memory;
+    }
+    #endregion
+
+    #region Properties
+    public Memory<TFrom> Source => memory;
+    #endregion
+
+    #region Methods
+    public override Span<TTo> GetSpan() => MemoryMarshal.Cast<TFrom, TTo>(memory.Span);
+
+    // Elements of both types have the same size so an element index of the reinterpreted memory is an element index of the underlying memory.
+    // The handle unpins the underlying memory when it is disposed.
+    public override MemoryHandle Pin(int elementIndex = 0)
+    {
+        if (elementIndex < 0 || elementIndex > memory.Length)
+        {
+            throw new ArgumentOutOfRangeException(nameof(elementIndex));
+        }
+        return memory.Slice(elementIndex).Pin();
+    }
+
+    public override void Unpin() {}
+
+    // The memory is owned by the caller so there is nothing to release.
+    protected override void Dispose(bool disposing) {}
+    #endregion
+
+    #region Fields
+    private readonly Memory<TFrom> memory;
+    #endregion
+}
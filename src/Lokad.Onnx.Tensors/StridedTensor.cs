@@ -0,0 +1,296 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Numerics;
+using System.Runtime.CompilerServices;
+
+/// <summary>
+/// A view of the buffer of a row-major dense tensor with an offset and an arbitrary stride for each dimension, which may be 0 or negative.
+/// Transposing, slicing or inserting dimensions in a view only computes new strides, so these operations don't copy any element. Kernels
+/// that can read their operands through strides consume a view directly and other kernels copy it with <see cref="ToDenseTensor"/>.
+/// Writing to a view writes to the buffer of the source tensor.
+/// </summary>
+public class StridedTensor<T> : Tensor<T>, IArenaTensor where T : unmanaged
+{
+    #region Constructor
+    public StridedTensor(DenseTensor<T> source, int offset, ReadOnlySpan<int> dimensions, int[] viewStrides) :
+        base(dimensions, false)
+    {
+        if (source.IsReversedStride)
+        {
+            throw new ArgumentException(nameof(source), "The source of a strided view cannot have reversed strides.");
+        }
+        if (viewStrides.Length != dimensions.Length)
+        {
+            throw new ArgumentException(nameof(viewStrides), "The number of strides must be the number of dimensions.");
+        }
+        this.source = source;
+        this.offset = offset;
+        this.viewStrides = viewStrides;
+    }
+    #endregion
+
+    #region Properties
+    /// <summary>
+    /// The memory of the source tensor. The element at index 0 of the view is at <see cref="offset"/>.
+    /// </summary>
+    public Memory<T> Buffer => source.Buffer;
+
+    /// <summary>
+    /// True if the elements of the view are laid out in row-major order in a contiguous block of the source buffer.
+    /// </summary>
+    public bool IsContiguous
+    {
+        get
+        {
+            var stride = 1;
+            for (int i = Rank - 1; i >= 0; i--)
+            {
+                if (dimensions[i] == 1)
+                {
+                    continue;
+                }
+                if (viewStrides[i] != stride)
+                {
+                    return false;
+                }
+                stride *= dimensions[i];
+            }
+            return true;
+        }
+    }
+
+    Array? IArenaTensor.BackingArray => ((IArenaTensor) source).BackingArray;
+    #endregion
+
+    #region Methods
+    /// <summary>
+    /// Create a view of all the elements of a row-major dense tensor or of another view.
+    /// </summary>
+    public static StridedTensor<T> Of(Tensor<T> t) => t switch
+    {
+        StridedTensor<T> st => st,
+        DenseTensor<T> { IsReversedStride: false } dt => new StridedTensor<T>(dt, 0, dt.dimensions, dt.strides.Copy()),
+        _ => throw new ArgumentException(nameof(t), "Only row-major dense tensors can be viewed with strides.")
+    };
+
+    /// <summary>
+    /// True if a view of a tensor can be created without copying it.
+    /// </summary>
+    public static bool CanView(Tensor<T> t) => t is StridedTensor<T> or DenseTensor<T> { IsReversedStride: false };
+
+    /// <summary>
+    /// A view with the dimensions permuted by <paramref name="perm"/>, so dimension i of the view is dimension perm[i] of this view.
+    /// </summary>
+    public StridedTensor<T> Transpose(int[] perm) =>
+        new StridedTensor<T>(source, offset, perm.Select(p => dimensions[p]).ToArray(), perm.Select(p => viewStrides[p]).ToArray());
+
+    /// <summary>
+    /// A view of a slice along each dimension. A slice that is a single index removes its dimension.
+    /// </summary>
+    public StridedTensor<T> Slice(SliceDef[] slices)
+    {
+        var o = offset;
+        var dims = new List<int>(Rank);
+        var vs = new List<int>(Rank);
+        for (int i = 0; i < Rank; i++)
+        {
+            if (slices[i].IsIndex)
+            {
+                o += slices[i].Start * viewStrides[i];
+                continue;
+            }
+            dims.Add(slices[i].Count);
+            vs.Add(viewStrides[i] * slices[i].Step);
+            if (slices[i].Count > 0)
+            {
+                o += slices[i].Start * viewStrides[i];
+            }
+        }
+        return new StridedTensor<T>(source, o, dims.ToArray(), vs.ToArray());
+    }
+
+    /// <summary>
+    /// If the elements of the view are a contiguous row-major block of the source buffer in some order of the dimensions, get that block
+    /// as a dense tensor and the permutation of its dimensions that gives this view. Operations that don't depend on the order of the
+    /// elements in memory can then be applied to the dense tensor.
+    /// </summary>
+    public bool TryGetPermutedDense(out DenseTensor<T> dense, out int[] perm)
+    {
+        var order = Enumerable.Range(0, Rank).OrderByDescending(i => dimensions[i] == 1 ? int.MaxValue : viewStrides[i]).ToArray();
+        var stride = 1;
+        for (int j = Rank - 1; j >= 0; j--)
+        {
+            var i = order[j];
+            if (dimensions[i] != 1 && viewStrides[i] != stride)
+            {
+                dense = null;
+                perm = null;
+                return false;
+            }
+            stride *= dimensions[i];
+        }
+        dense = source.Alias(offset, order.Select(i => dimensions[i]).ToArray());
+        perm = new int[Rank];
+        for (int j = 0; j < Rank; j++)
+        {
+            perm[order[j]] = j;
+        }
+        return true;
+    }
+
+    #region Tensor<T> members
+    public override T this[ReadOnlySpan<int> indices]
+    {
+        [MethodImpl(MethodImplOptions.AggressiveOptimization | MethodImplOptions.AggressiveInlining)]
+        get => source.GetValue(offset + ArrayUtilities.GetIndex(viewStrides, indices));
+
+        [MethodImpl(MethodImplOptions.AggressiveOptimization | MethodImplOptions.AggressiveInlining)]
+        set => source.SetValue(offset + ArrayUtilities.GetIndex(viewStrides, indices), value);
+    }
+
+    [MethodImpl(MethodImplOptions.AggressiveInlining | MethodImplOptions.AggressiveOptimization)]
+    public override T GetValue(int index) => source.GetValue(GetSourceIndex(index));
+
+    [MethodImpl(MethodImplOptions.AggressiveInlining | MethodImplOptions.AggressiveOptimization)]
+    public override void SetValue(int index, T value) => source.SetValue(GetSourceIndex(index), value);
+
+    /// <summary>
+    /// Copy the elements of the view to a new dense tensor.
+    /// </summary>
+    public override DenseTensor<T> ToDenseTensor()
+    {
+        var output = DenseTensor<T>.OfShape(dimensions);
+        if (Length > 0)
+        {
+            CopyStrided(source.Buffer, offset, dimensions, viewStrides, output.Buffer);
+        }
+        return output;
+    }
+
+    public override Tensor<T> Clone() => ToDenseTensor();
+
+    /// <summary>
+    /// Apply a vectorized operation to a dense copy of the view, which is faster than reading each element through the strides.
+    /// </summary>
+    public override void VectorizedApply(Func<Vector<T>, Vector<T>> op, Func<T, T> sop, Tensor<T> destination) =>
+        ToDenseTensor().VectorizedApply(op, sop, destination);
+
+    public override Tensor<TResult> CloneEmpty<TResult>(ReadOnlySpan<int> dimensions) => new DenseTensor<TResult>(dimensions);
+
+    /// <summary>
+    /// Reshape the view without copying if the new dimensions can be expressed with strides over the same elements, for instance if only
+    /// dimensions of size 1 are inserted or removed, or if the view is contiguous. Otherwise the view is copied to a dense tensor first.
+    /// </summary>
+    public override Tensor<T> Reshape(ReadOnlySpan<int> dims)
+    {
+        var newSize = ArrayUtilities.ComputeOffsetForReduction(dims);
+        if (newSize != Length)
+        {
+            throw new ArgumentException($"Cannot reshape array due to mismatch in lengths, currently {Length} would become {newSize}.", nameof(dims));
+        }
+        else if (IsContiguous)
+        {
+            return source.Alias(offset, dims);
+        }
+        else if (Length > 0 && TryGetReshapeStrides(dims, out var vs))
+        {
+            return new StridedTensor<T>(source, offset, dims, vs);
+        }
+        else
+        {
+            return ToDenseTensor().Reshape(dims);
+        }
+    }
+
+    public override Tensor<T> InsertDim(int dim)
+    {
+        if (dim >= Rank) throw new IndexOutOfRangeException(nameof(dim));
+        var dims = dimensions.ToList();
+        dims.Insert(dim, 1);
+        var vs = viewStrides.ToList();
+        vs.Insert(dim, 0);
+        return new StridedTensor<T>(source, offset, dims.ToArray(), vs.ToArray());
+    }
+
+    public override Tensor<T> RemoveDim(int dim)
+    {
+        if (dim >= Rank) throw new IndexOutOfRangeException(nameof(dim));
+        if (dimensions[dim] != 1) throw new ArgumentException(nameof(dim), $"Can only remove a dimension of size 1. Dimension {dim} has size {dimensions[dim]}.");
+        var dims = dimensions.ToList();
+        dims.RemoveAt(dim);
+        var vs = viewStrides.ToList();
+        vs.RemoveAt(dim);
+        return new StridedTensor<T>(source, offset, dims.ToArray(), vs.ToArray());
+    }
+
+    /// <summary>
+    /// Broadcast a dimension of a dense copy of the view, since a <see cref="BroadcastedTensor{T}"/> indexes its source with row-major strides.
+    /// </summary>
+    public override BroadcastedTensor<T> BroadcastDim(int dim, int size) => ToDenseTensor().BroadcastDim(dim, size);
+    #endregion
+
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
+    private int GetSourceIndex(int index)
+    {
+        var i = offset;
+        for (int d = 0; d < Rank; d++)
+        {
+            i += (index / strides[d]) * viewStrides[d];
+            index %= strides[d];
+        }
+        return i;
+    }
+
+    /// <summary>
+    /// Compute the strides of a view with new dimensions over the same elements, in the way numpy reshapes arrays without copying. Each group
+    /// of new dimensions must split a group of old dimensions that are contiguous with each other.
+    /// </summary>
+    private bool TryGetReshapeStrides(ReadOnlySpan<int> dims, out int[] vs)
+    {
+        var olddims = Enumerable.Range(0, Rank).Where(i => dimensions[i] != 1).Select(i => dimensions[i]).ToArray();
+        var oldstrides = Enumerable.Range(0, Rank).Where(i => dimensions[i] != 1).Select(i => viewStrides[i]).ToArray();
+        vs = new int[dims.Length];
+        int oi = 0, oj = 1, ni = 0, nj = 1;
+        while (ni < dims.Length && oi < olddims.Length)
+        {
+            var np = dims[ni];
+            var op = olddims[oi];
+            while (np != op)
+            {
+                if (np < op)
+                {
+                    np *= dims[nj++];
+                }
+                else
+                {
+                    op *= olddims[oj++];
+                }
+            }
+            for (int ok = oi; ok < oj - 1; ok++)
+            {
+                if (oldstrides[ok] != olddims[ok + 1] * oldstrides[ok + 1])
+                {
+                    return false;
+                }
+            }
+            vs[nj - 1] = oldstrides[oj - 1];
+            for (int nk = nj - 1; nk > ni; nk--)
+            {
+                vs[nk - 1] = vs[nk] * dims[nk];
+            }
+            ni = nj++;
+            oi = oj++;
+        }
+        return true;
+    }
+    #endregion
+
+    #region Fields
+    public readonly DenseTensor<T> source;
+    public readonly int offset;
+    public readonly int[] viewStrides;
+    #endregion
+}
@@ -1192,10 +1192,9 @@ namespace Lokad.Onnx
         public bool IsFixedSize => true;
 
         /// <summary>
-        /// Tensor is not readonly
+        /// True if the elements of the tensor cannot be changed.
         /// </summary>
-        /// <value>always false</value>
-        public bool IsReadOnly => false;
+        public virtual bool IsReadOnly => false;
 
         int IList.Add(object value)
         {
@@ -1745,6 +1744,8 @@ namespace Lokad.Onnx
 
         ITensor ITensor.CloneEmpty<U>() => CloneEmpty<U>();
 
+        ITensor? ITensor.CastInPlace<U>() => this is DenseTensor<T> { IsReadOnly: false } d && Unsafe.SizeOf<T>() == Unsafe.SizeOf<U>() ? d.CastInPlace<U>() : null;
+
         ITensor ITensor.Reshape(int[] shape) => this.Reshape(shape);
 
         ITensor ITensor.InsertDim(int dim) => this.InsertDim(dim);
@@ -1778,6 +1779,19 @@ namespace Lokad.Onnx
         ITensor ITensor.Slice(string indices) => new TensorSlice<T>(this, ExpandEllipsis(SliceIndex.ParseSlices(indices)));
 
         Array ITensor.ToArray() => this.ToArray();
+
+        void ITensor.CopyTo(ITensor destination)
+        {
+            if (destination is not Tensor<T> dest)
+            {
+                throw new ArgumentException($"The destination tensor must have element type {ElementType}, not {destination.ElementType}.", nameof(destination));
+            }
+            if (!dimensions.SequenceEqual(dest.dimensions))
+            {
+                throw new ArgumentException("The shape of the destination tensor is not the same as this tensor.", nameof(destination));
+            }
+            dest.CopyFrom(this);
+        }
         /*
         {
             var a = Array.CreateInstance(this.PrimitiveType, this.dimensions);
@@ -1977,6 +1991,7 @@ namespace Lokad.Onnx
         {
             DenseTensor<T> dt => dt.Buffer,
             BroadcastedTensor<T> bt => bt.source.Storage,
+            StridedTensor<T> st => st.Buffer,
             TensorSlice<T> ts => ts.parent.Storage,
             CompressedSparseTensor<T> cst => cst.Values,
             _ => throw new NotImplementedException("Storage property not implemented for this tensor type.")
@@ -1987,6 +2002,7 @@ namespace Lokad.Onnx
         {
             DenseTensor<T> dt => ArrayUtilities.GetIndex(dt.strides, indices),
             BroadcastedTensor<T> bt => ArrayUtilities.GetIndex(bt.effectiveStrides, indices),
+            StridedTensor<T> st => st.offset + ArrayUtilities.GetIndex(st.viewStrides, indices),
             TensorSlice<T> ts => ts.GetOffset(indices),
             CompressedSparseTensor<T> cst => ArrayUtilities.GetIndex(cst.strides, indices),
             _ => throw new NotSupportedException("GetStorageIndex method not implemented for this tensor type.")
@@ -0,0 +1,263 @@
+﻿namespace Lokad.Onnx;
+
+using System;
+using System.Collections.Generic;
+using System.Runtime.CompilerServices;
+using System.Threading;
+
+/// <summary>
+/// Implemented by tensors that own a managed backing array which may have been rented from a <see cref="TensorArena"/>.
+/// </summary>
+internal interface IArenaTensor
+{
+    Array? BackingArray { get; }
+}
+
+/// <summary>
+/// A pooled allocator for the backing arrays of <see cref="DenseTensor{T}"/>. Arrays are kept in power-of-2 size buckets per element type.
+/// While an arena is active on a thread every new DenseTensor created on that thread rents its buffer from the arena. Buffers are returned
+/// explicitly, either when the owner knows a tensor is dead or at the end of a node execution for temporaries that did not escape into
+/// a node output. Repeated inference on the same shapes then reaches a steady state where almost all tensor buffers are reused.
+/// </summary>
+public class TensorArena
+{
+    #region Constructors
+    public TensorArena(int maxArraysPerBucket = 32)
+    {
+        this.maxArraysPerBucket = maxArraysPerBucket;
+    }
+    #endregion
+
+    #region Properties
+    /// <summary>
+    /// The arena active on the current thread, if any.
+    /// </summary>
+    public static TensorArena? Current => current;
+
+    public long Requests => requests;
+
+    public long Hits => hits;
+
+    public double HitRate => requests == 0 ? 0.0 : (double) hits / requests;
+
+    public long BytesAllocated => bytesAllocated;
+
+    public long BytesReused => bytesReused;
+
+    public long Returns => returns;
+    #endregion
+
+    #region Methods
+    /// <summary>
+    /// Make this arena the current arena of the calling thread until the returned scope is disposed.
+    /// </summary>
+    public Scope Activate()
+    {
+        var scope = new Scope(current);
+        current = this;
+        return scope;
+    }
+
+    /// <summary>
+    /// Rent a zeroed array with at least <paramref name="length"/> elements.
+    /// </summary>
+    public unsafe T[] Rent<T>(int length) where T : unmanaged
+    {
+        if (length == 0)
+        {
+            return Array.Empty<T>();
+        }
+        var size = BucketSize(length);
+        lock (sync)
+        {
+            requests++;
+            if (buckets.TryGetValue((typeof(T), size), out var bucket) && bucket.Count > 0)
+            {
+                var a = (T[]) bucket.Pop();
+                Array.Clear(a, 0, length);
+                hits++;
+                bytesReused += (long) length * sizeof(T);
+                refCounts[a] = 0;
+                rentedInNode.Value?.Add(a);
+                return a;
+            }
+            else
+            {
+                var a = new T[size];
+                bytesAllocated += (long) size * sizeof(T);
+                refCounts[a] = 0;
+                rentedInNode.Value?.Add(a);
+                return a;
+            }
+        }
+    }
+
+    /// <summary>
+    /// Start tracking the arrays rented during the execution of a graph node. Nodes executing concurrently on different threads are 
+    /// tracked separately.
+    /// </summary>
+    public void BeginNode()
+    {
+        rentedInNode.Value = new List<Array>();
+    }
+
+    /// <summary>
+    /// Finish the execution of a graph node. Each dense output retains its backing array. If an output is not dense it may reference
+    /// the buffers of the node inputs or of temporaries, so those buffers escape and are never returned to the arena. All other
+    /// arrays rented during the node execution are dead temporaries and are returned to the arena.
+    /// </summary>
+    public void EndNode(ITensor?[] inputs, ITensor[] outputs)
+    {
+        lock (sync)
+        {
+            var rented = rentedInNode.Value ?? new List<Array>();
+            rentedInNode.Value = null;
+            bool escapes = false;
+            foreach (var o in outputs)
+            {
+                if (o is IArenaTensor at && at.BackingArray is Array a)
+                {
+                    Retain(a);
+                }
+                else
+                {
+                    escapes = true;
+                }
+            }
+            if (escapes)
+            {
+                foreach (var i in inputs)
+                {
+                    if (i is IArenaTensor at && at.BackingArray is Array a && refCounts.ContainsKey(a))
+                    {
+                        escaped.Add(a);
+                    }
+                }
+                foreach (var a in rented)
+                {
+                    escaped.Add(a);
+                }
+            }
+            foreach (var a in rented)
+            {
+                if (refCounts.TryGetValue(a, out var c) && c == 0)
+                {
+                    Return(a);
+                }
+            }
+        }
+    }
+
+    /// <summary>
+    /// Release a reference to a tensor that is dead. When no other live tensor references the backing array the array is returned to the arena.
+    /// </summary>
+    public void Release(ITensor tensor)
+    {
+        if (tensor is IArenaTensor at && at.BackingArray is Array a)
+        {
+            lock (sync)
+            {
+                if (refCounts.TryGetValue(a, out var c))
+                {
+                    if (c <= 1)
+                    {
+                        Return(a);
+                    }
+                    else
+                    {
+                        refCounts[a] = c - 1;
+                    }
+                }
+            }
+        }
+    }
+
+    /// <summary>
+    /// Stop tracking all outstanding arrays, e.g. at the end of a graph execution. Arrays still referenced by live tensors like
+    /// graph outputs are left to the garbage collector.
+    /// </summary>
+    public void EndRun()
+    {
+        lock (sync)
+        {
+            refCounts.Clear();
+            escaped.Clear();
+            rentedInNode.Value = null;
+        }
+    }
+
+    /// <summary>
+    /// Drop all pooled arrays and reset the counters.
+    /// </summary>
+    public void Clear()
+    {
+        lock (sync)
+        {
+            buckets.Clear();
+            refCounts.Clear();
+            escaped.Clear();
+            rentedInNode.Value = null;
+            requests = hits = bytesAllocated = bytesReused = returns = 0;
+        }
+    }
+
+    public override string ToString() => $"{Requests} requests, {Hits} hits ({HitRate:P1}), {BytesReused} bytes reused, {BytesAllocated} bytes allocated, {Returns} returns";
+
+    private void Retain(Array a)
+    {
+        if (refCounts.TryGetValue(a, out var c))
+        {
+            refCounts[a] = c + 1;
+        }
+    }
+
+    private void Return(Array a)
+    {
+        refCounts.Remove(a);
+        if (escaped.Contains(a))
+        {
+            return;
+        }
+        var key = (a.GetType().GetElementType()!, a.Length);
+        if (!buckets.TryGetValue(key, out var bucket))
+        {
+            bucket = new Stack<Array>();
+            buckets.Add(key, bucket);
+        }
+        if (bucket.Count < maxArraysPerBucket)
+        {
+            bucket.Push(a);
+            returns++;
+        }
+    }
+
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
+    private static int BucketSize(int length) => length <= 16 ? 16 : length > (1 << 30) ? length : (int) System.Numerics.BitOperations.RoundUpToPowerOf2((uint) length);
+    #endregion
+
+    #region Types
+    public readonly struct Scope : IDisposable
+    {
+        internal Scope(TensorArena? previous)
+        {
+            this.previous = previous;
+        }
+
+        public void Dispose() => current = previous;
+
+        private readonly TensorArena? previous;
+    }
+    #endregion
+
+    #region Fields
+    [ThreadStatic]
+    private static TensorArena? current;
+    private readonly object sync = new object();
+    private readonly int maxArraysPerBucket;
+    private readonly Dictionary<(Type, int), Stack<Array>> buckets = new Dictionary<(Type, int), Stack<Array>>();
+    private readonly Dictionary<Array, int> refCounts = new Dictionary<Array, int>(ReferenceEqualityComparer.Instance);
+    private readonly HashSet<Array> escaped = new HashSet<Array>(ReferenceEqualityComparer.Instance);
+    private readonly ThreadLocal<List<Array>?> rentedInNode = new ThreadLocal<List<Array>?>();
+    private long requests, hits, bytesAllocated, bytesReused, returns;
+    #endregion
+}
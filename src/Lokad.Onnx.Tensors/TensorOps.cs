@@ -8,6 +8,7 @@ using System.Numerics;
 using System.Runtime.InteropServices;
 using System.Runtime.Intrinsics.X86;
 using System.Runtime.CompilerServices;
+using System.Threading.Tasks;
 
 using static Lokad.Onnx.MathOps;
 using static Lokad.Onnx.Profiler;
@@ -65,6 +66,24 @@ where T : unmanaged
         return output;
     }
 
+    /// <summary>
+    /// Apply a unary operation to each element and write the results to <paramref name="destination"/>, or to a new tensor if it is null.
+    /// The destination can be this tensor itself.
+    /// </summary>
+    private Tensor<T> ApplyTo(Func<T, T> op, Tensor<T>? destination)
+    {
+        destination ??= CloneEmpty();
+        Apply(op, destination);
+        return destination;
+    }
+
+    private Tensor<T> VectorizedApplyTo(Func<Vector<T>, Vector<T>> op, Func<T, T> sop, Tensor<T>? destination)
+    {
+        destination ??= CloneEmpty();
+        VectorizedApply(op, sop, destination);
+        return destination;
+    }
+
     public virtual void Apply(Func<T, T, T> op, Tensor<T> tensor2, Tensor<T> destination)
     {
         if (this.Length > tensor2.Length)
@@ -122,6 +141,245 @@ where T : unmanaged
         return output;
     }
 
+    /// <summary>
+    /// Apply a binary operation to the elements of two tensors with multidirectional (numpy-style) broadcasting. Broadcast operands are
+    /// not copied: their elements are read in place through zero strides along the broadcast dimensions. Adjacent dimensions that are
+    /// contiguous in both operands are merged, and the innermost loop runs over rows where each operand is either a contiguous block of
+    /// elements or a single element splatted into a vector.
+    /// </summary>
+    /// <param name="op">The vectorized operation, or null if the operation has no vectorized form.</param>
+    /// <param name="sop">The scalar operation.</param>
+    /// <param name="destination">If not null, a dense tensor with the broadcast shape that the results are written to instead of a new tensor.
+    /// The destination can be one of the operands, since each output element only depends on the operand elements at the same position.</param>
+    public static Tensor<T> BroadcastApply(Tensor<T> x, Tensor<T> y, Func<Vector<T>, Vector<T>, Vector<T>>? op, Func<T, T, T> sop, Tensor<T>? destination = null)
+    {
+        StartOpStage(OpStage.Broadcast);
+        if (!ArrayUtilities.TryGetBroadcastShape(x.dimensions, y.dimensions, out var dims))
+        {
+            throw new ArgumentException($"The shapes [{string.Join(",", x.dimensions)}] and [{string.Join(",", y.dimensions)}] cannot be broadcast together.");
+        }
+        if (destination is not null && (destination is not DenseTensor<T> { IsReversedStride: false } || !destination.dimensions.AsSpan().SequenceEqual(dims)))
+        {
+            throw new ArgumentException(nameof(destination), $"The destination tensor must be a dense tensor with the broadcast shape [{string.Join(",", dims)}].");
+        }
+        if (!TryGetStridedStorage(x, out var xs, out var xOffset, out var xStrides) || !TryGetStridedStorage(y, out var ys, out var yOffset, out var yStrides))
+        {
+            // Tensors with reversed strides are broadcast and combined element by element.
+            Broadcast(x, y, out var bx, out var by);
+            if (destination is null)
+            {
+                return op is not null ? bx.VectorizedApply(op, sop, by) : bx.Apply(sop, by);
+            }
+            if (op is not null)
+            {
+                bx.VectorizedApply(op, sop, by, destination);
+            }
+            else
+            {
+                bx.Apply(sop, by, destination);
+            }
+            return destination;
+        }
+
+        // Remove dimensions of size 1, then merge each dimension into the next inner one when both operands step over it contiguously.
+        var rank = dims.Length;
+        var cdims = new List<int>(rank);
+        var cx = new List<int>(rank);
+        var cy = new List<int>(rank);
+        for (int i = 0; i < rank; i++)
+        {
+            if (dims[i] == 1)
+            {
+                continue;
+            }
+            var sx = GetBroadcastStride(x.dimensions, xStrides, rank, i);
+            var sy = GetBroadcastStride(y.dimensions, yStrides, rank, i);
+            var last = cdims.Count - 1;
+            if (last >= 0 && cx[last] == sx * dims[i] && cy[last] == sy * dims[i])
+            {
+                cdims[last] *= dims[i];
+                cx[last] = sx;
+                cy[last] = sy;
+            }
+            else
+            {
+                cdims.Add(dims[i]);
+                cx.Add(sx);
+                cy.Add(sy);
+            }
+        }
+        if (cdims.Count == 0)
+        {
+            cdims.Add(1);
+            cx.Add(0);
+            cy.Add(0);
+        }
+
+        var output = (DenseTensor<T>?) destination ?? DenseTensor<T>.OfShape(dims);
+        var length = (int) output.Length;
+        if (length == 0)
+        {
+            return output;
+        }
+        StartOpStage(OpStage.Math);
+        var k = cdims.Count;
+        var n = cdims[k - 1];
+        var xScalar = cx[k - 1] == 0;
+        var yScalar = cy[k - 1] == 0;
+        var strided = !(xScalar || cx[k - 1] == 1) || !(yScalar || cy[k - 1] == 1);
+        var rows = length / n;
+        var outer = cdims.Take(k - 1).ToArray();
+        var outerX = cx.Take(k - 1).ToArray();
+        var outerY = cy.Take(k - 1).ToArray();
+        var zs = output.Buffer;
+
+        void ApplyRows(int start, int end)
+        {
+            // The position of the first row in the outer dimensions, which is then advanced like an odometer.
+            var index = new int[outer.Length];
+            int xo = xOffset, yo = yOffset;
+            for (int d = outer.Length - 1, r = start; d >= 0; d--)
+            {
+                index[d] = r % outer[d];
+                r /= outer[d];
+                xo += index[d] * outerX[d];
+                yo += index[d] * outerY[d];
+            }
+            var _xs = xs.Span;
+            var _ys = ys.Span;
+            var _zs = zs.Span;
+            for (int row = start; row < end; row++)
+            {
+                if (strided)
+                {
+                    BroadcastApplyStridedRow(sop, _xs, xo, cx[k - 1], _ys, yo, cy[k - 1], _zs.Slice(row * n, n));
+                }
+                else
+                {
+                    BroadcastApplyRow(op, sop, _xs.Slice(xo, xScalar ? 1 : n), xScalar, _ys.Slice(yo, yScalar ? 1 : n), yScalar, _zs.Slice(row * n, n));
+                }
+                for (int d = outer.Length - 1; d >= 0; d--)
+                {
+                    xo += outerX[d];
+                    yo += outerY[d];
+                    if (++index[d] < outer[d])
+                    {
+                        break;
+                    }
+                    xo -= outerX[d] * outer[d];
+                    yo -= outerY[d] * outer[d];
+                    index[d] = 0;
+                }
+            }
+        }
+
+        var rowsPerChunk = Math.Max(1, ElementwiseChunk / n);
+        var chunks = (rows + rowsPerChunk - 1) / rowsPerChunk;
+        if (HardwareConfig.IntraOpThreads > 1 && chunks > 1)
+        {
+            Parallel.For(0, chunks, new ParallelOptions() { MaxDegreeOfParallelism = HardwareConfig.IntraOpThreads }, c =>
+                ApplyRows(c * rowsPerChunk, Math.Min(rows, (c + 1) * rowsPerChunk)));
+        }
+        else
+        {
+            ApplyRows(0, rows);
+        }
+        return output;
+    }
+
+    /// <summary>
+    /// Apply a binary operation to one row of a broadcast, where each operand is either a row of the same length as the output or a single element.
+    /// </summary>
+    private static void BroadcastApplyRow(Func<Vector<T>, Vector<T>, Vector<T>>? op, Func<T, T, T> sop, ReadOnlySpan<T> x, bool xScalar, ReadOnlySpan<T> y, bool yScalar, Span<T> z)
+    {
+        var n = z.Length;
+        var V = Vector<T>.Count;
+        int i = 0;
+        if (op is not null && HardwareConfig.UseSimd && n >= V)
+        {
+            if (xScalar && yScalar)
+            {
+                z.Fill(sop(x[0], y[0]));
+                return;
+            }
+            else if (yScalar)
+            {
+                var yv = new Vector<T>(y[0]);
+                for (; i <= n - V; i += V)
+                {
+                    op(new Vector<T>(x.Slice(i)), yv).CopyTo(z.Slice(i));
+                }
+            }
+            else if (xScalar)
+            {
+                var xv = new Vector<T>(x[0]);
+                for (; i <= n - V; i += V)
+                {
+                    op(xv, new Vector<T>(y.Slice(i))).CopyTo(z.Slice(i));
+                }
+            }
+            else
+            {
+                for (; i <= n - V; i += V)
+                {
+                    op(new Vector<T>(x.Slice(i)), new Vector<T>(y.Slice(i))).CopyTo(z.Slice(i));
+                }
+            }
+        }
+        for (; i < n; i++)
+        {
+            z[i] = sop(xScalar ? x[0] : x[i], yScalar ? y[0] : y[i]);
+        }
+    }
+
+    /// <summary>
+    /// Apply a binary operation to one row of a broadcast where an operand is read with a stride other than 0 or 1, as in a transposed view.
+    /// The offsets of the operands are from the start of their storage since a stride can be negative.
+    /// </summary>
+    private static void BroadcastApplyStridedRow(Func<T, T, T> sop, ReadOnlySpan<T> x, int xo, int xstride, ReadOnlySpan<T> y, int yo, int ystride, Span<T> z)
+    {
+        for (int i = 0; i < z.Length; i++)
+        {
+            z[i] = sop(x[xo + i * xstride], y[yo + i * ystride]);
+        }
+    }
+
+    /// <summary>
+    /// Get the storage, offset and strides of a row-major dense tensor, of a strided view or of a broadcast view of a dense tensor, without copying.
+    /// Other tensors are copied to a dense tensor first.
+    /// </summary>
+    /// <returns>False if the tensor has reversed strides.</returns>
+    private static bool TryGetStridedStorage(Tensor<T> t, out Memory<T> storage, out int offset, out int[] strides)
+    {
+        offset = 0;
+        if (t is BroadcastedTensor<T> bt && bt.source is DenseTensor<T> bs && !bs.IsReversedStride)
+        {
+            storage = bs.Buffer;
+            strides = bt.effectiveStrides;
+            return true;
+        }
+        else if (t is StridedTensor<T> st)
+        {
+            storage = st.Buffer;
+            offset = st.offset;
+            strides = st.viewStrides;
+            return true;
+        }
+        var dt = t is DenseTensor<T> d ? d : t.ToDenseTensor();
+        storage = dt.Buffer;
+        strides = dt.strides;
+        return !dt.IsReversedStride;
+    }
+
+    /// <summary>
+    /// The stride of an operand along dimension <paramref name="i"/> of a broadcast of rank <paramref name="rank"/>, which is 0 if the operand is broadcast along it.
+    /// </summary>
+    private static int GetBroadcastStride(int[] dims, int[] strides, int rank, int i)
+    {
+        var j = i - rank + dims.Length;
+        return j < 0 || dims[j] == 1 ? 0 : strides[j];
+    }
+
     public virtual T Accumulate(Func<T, T, T> op, T state)
     {
         var result = state;
@@ -232,67 +490,67 @@ where T : unmanaged
 
     public static bool BroadcastShape(Tensor<T> x, Tensor<T> y, out int[] b) => BroadcastShape(x.Dimensions, y.Dimensions, out b);
 
-    public static Tensor<byte> Add(Tensor<byte> x, Tensor<byte> y) => x.VectorizedApply((l, r) => (l + r), (l, r) => (byte) (l + r), y);
+    public static Tensor<byte> Add(Tensor<byte> x, Tensor<byte> y, Tensor<byte>? destination = null) => Tensor<byte>.BroadcastApply(x, y, (l, r) => (l + r), (l, r) => (byte) (l + r), destination);
 
     public static Tensor<byte> Add(Tensor<byte> x, byte y) => x.Apply(l => (byte)(l + y));
 
-    public static Tensor<int> Add(Tensor<int> x, Tensor<int> y) => x.VectorizedApply((l, r) => l + r, (l, r) => l + r, y);
+    public static Tensor<int> Add(Tensor<int> x, Tensor<int> y, Tensor<int>? destination = null) => Tensor<int>.BroadcastApply(x, y, (l, r) => l + r, (l, r) => l + r, destination);
 
     public static Tensor<int> Add(Tensor<int> x, int y) => x.VectorizedApply(l => l + new Vector<int>(y), l => l + y);
 
-    public static Tensor<float> Add(Tensor<float> x, Tensor<float> y) => x.VectorizedApply((l, r) => l + r, (l, r) => l + r, y);
+    public static Tensor<float> Add(Tensor<float> x, Tensor<float> y, Tensor<float>? destination = null) => Tensor<float>.BroadcastApply(x, y, (l, r) => l + r, (l, r) => l + r, destination);
 
     public static Tensor<float> Add(Tensor<float> x, float y) => x.VectorizedApply(l => l + new Vector<float>(y), l => l + y);
 
-    public static Tensor<double> Add(Tensor<double> x, Tensor<double> y) => x.VectorizedApply((l, r) => l + r, (l, r) => l + r, y);
+    public static Tensor<double> Add(Tensor<double> x, Tensor<double> y, Tensor<double>? destination = null) => Tensor<double>.BroadcastApply(x, y, (l, r) => l + r, (l, r) => l + r, destination);
 
     public static Tensor<double> Add(Tensor<double> x, double y) => x.VectorizedApply(l => l + new Vector<double>(y), l => l + y);
 
-    public static Tensor<byte> Subtract(Tensor<byte> x, Tensor<byte> y) => x.VectorizedApply((l, r) => (l - r), (l, r) => (byte)(l - r), y);
+    public static Tensor<byte> Subtract(Tensor<byte> x, Tensor<byte> y, Tensor<byte>? destination = null) => Tensor<byte>.BroadcastApply(x, y, (l, r) => (l - r), (l, r) => (byte)(l - r), destination);
 
     public static Tensor<byte> Subtract(Tensor<byte> x, byte y) => x.Apply(l => (byte)(l - y));
 
-    public static Tensor<int> Subtract(Tensor<int> x, Tensor<int> y) => x.VectorizedApply((l, r) => l - r, (l, r) => l - r, y);
+    public static Tensor<int> Subtract(Tensor<int> x, Tensor<int> y, Tensor<int>? destination = null) => Tensor<int>.BroadcastApply(x, y, (l, r) => l - r, (l, r) => l - r, destination);
 
     public static Tensor<int> Subtract(Tensor<int> x, int y) => x.VectorizedApply(l => l - new Vector<int>(y), l => l - y);
 
-    public static Tensor<float> Subtract(Tensor<float> x, Tensor<float> y) => x.VectorizedApply((l, r) => l - r, (l, r) => l - r, y);
+    public static Tensor<float> Subtract(Tensor<float> x, Tensor<float> y, Tensor<float>? destination = null) => Tensor<float>.BroadcastApply(x, y, (l, r) => l - r, (l, r) => l - r, destination);
 
     public static Tensor<float> Subtract(Tensor<float> x, float y) => x.VectorizedApply(l => l - new Vector<float>(y), l => l - y);
 
-    public static Tensor<double> Subtract(Tensor<double> x, Tensor<double> y) => x.VectorizedApply((l, r) => l - r, (l, r) => l - r, y);
+    public static Tensor<double> Subtract(Tensor<double> x, Tensor<double> y, Tensor<double>? destination = null) => Tensor<double>.BroadcastApply(x, y, (l, r) => l - r, (l, r) => l - r, destination);
 
     public static Tensor<double> Subtract(Tensor<double> x, double y) => x.VectorizedApply(l => l - new Vector<double>(y), l => l - y);
 
-    public static Tensor<byte> Multiply(Tensor<byte> x, Tensor<byte> y) => x.VectorizedApply((l, r) => (l * r), (l, r) => (byte)(l * r), y);
+    public static Tensor<byte> Multiply(Tensor<byte> x, Tensor<byte> y, Tensor<byte>? destination = null) => Tensor<byte>.BroadcastApply(x, y, (l, r) => (l * r), (l, r) => (byte)(l * r), destination);
 
     public static Tensor<byte> Multiply(Tensor<byte> x, byte y) => x.Apply(l => (byte)(l * y));
 
-    public static Tensor<int> Multiply(Tensor<int> x, Tensor<int> y) => x.VectorizedApply((l, r) => l * r, (l, r) => l * r, y);
+    public static Tensor<int> Multiply(Tensor<int> x, Tensor<int> y, Tensor<int>? destination = null) => Tensor<int>.BroadcastApply(x, y, (l, r) => l * r, (l, r) => l * r, destination);
 
     public static Tensor<int> Multiply(Tensor<int> x, int y) => x.VectorizedApply(l => l * new Vector<int>(y), l => l * y);
 
-    public static Tensor<float> Multiply(Tensor<float> x, Tensor<float> y) => x.VectorizedApply((l, r) => l * r, (l, r) => l * r, y);
+    public static Tensor<float> Multiply(Tensor<float> x, Tensor<float> y, Tensor<float>? destination = null) => Tensor<float>.BroadcastApply(x, y, (l, r) => l * r, (l, r) => l * r, destination);
 
     public static Tensor<float> Multiply(Tensor<float> x, float y) => x.VectorizedApply(l => l * new Vector<float>(y), l => l * y);
 
-    public static Tensor<double> Multiply(Tensor<double> x, Tensor<double> y) => x.VectorizedApply((l, r) => l * r, (l, r) => l * r, y);
+    public static Tensor<double> Multiply(Tensor<double> x, Tensor<double> y, Tensor<double>? destination = null) => Tensor<double>.BroadcastApply(x, y, (l, r) => l * r, (l, r) => l * r, destination);
 
     public static Tensor<double> Multiply(Tensor<double> x, double y) => x.VectorizedApply(l => l * new Vector<double>(y), l => l * y);
 
-    public static Tensor<byte> Divide(Tensor<byte> x, Tensor<byte> y) => x.VectorizedApply((l, r) => (l / r), (l, r) => (byte)(l / r), y);
+    public static Tensor<byte> Divide(Tensor<byte> x, Tensor<byte> y, Tensor<byte>? destination = null) => Tensor<byte>.BroadcastApply(x, y, (l, r) => (l / r), (l, r) => (byte)(l / r), destination);
 
     public static Tensor<byte> Divide(Tensor<byte> x, byte y) => x.Apply(l => (byte)(l / y));
 
-    public static Tensor<int> Divide(Tensor<int> x, Tensor<int> y) => x.VectorizedApply((l, r) => l / r, (l, r) => l / r, y);
+    public static Tensor<int> Divide(Tensor<int> x, Tensor<int> y, Tensor<int>? destination = null) => Tensor<int>.BroadcastApply(x, y, (l, r) => l / r, (l, r) => l / r, destination);
 
     public static Tensor<int> Divide(Tensor<int> x, int y) => x.VectorizedApply(l => l / new Vector<int>(y), l => l / y);
 
-    public static Tensor<float> Divide(Tensor<float> x, Tensor<float> y) => x.VectorizedApply((l, r) => l / r, (l, r) => l / r, y);
+    public static Tensor<float> Divide(Tensor<float> x, Tensor<float> y, Tensor<float>? destination = null) => Tensor<float>.BroadcastApply(x, y, (l, r) => l / r, (l, r) => l / r, destination);
 
     public static Tensor<float> Divide(Tensor<float> x, float y) => x.VectorizedApply(l => l / new Vector<float>(y), l => l / y);
 
-    public static Tensor<double> Divide(Tensor<double> x, Tensor<double> y) => x.VectorizedApply((l, r) => l / r, (l, r) => l / r, y);
+    public static Tensor<double> Divide(Tensor<double> x, Tensor<double> y, Tensor<double>? destination = null) => Tensor<double>.BroadcastApply(x, y, (l, r) => l / r, (l, r) => l / r, destination);
 
     public static Tensor<double> Divide(Tensor<double> x, double y) => x.VectorizedApply(l => l / new Vector<double>(y), l => l / y);
 
@@ -300,9 +558,9 @@ where T : unmanaged
 
     public static Tensor<double> Negate(Tensor<double> x) => x.VectorizedApply(Vector.Negate, l => -l);
 
-    public static Tensor<float> Pow(Tensor<float> x, Tensor<float> y) => x.Apply(MathF.Pow, y);
+    public static Tensor<float> Pow(Tensor<float> x, Tensor<float> y, Tensor<float>? destination = null) => Tensor<float>.BroadcastApply(x, y, null, MathF.Pow, destination);
 
-    public static Tensor<double> Pow(Tensor<double> x, Tensor<double> y) => x.Apply(Math.Pow, y);
+    public static Tensor<double> Pow(Tensor<double> x, Tensor<double> y, Tensor<double>? destination = null) => Tensor<double>.BroadcastApply(x, y, null, Math.Pow, destination);
 
     public static Tensor<float> Square(Tensor<float> x) => x.Apply(l => l * l);
 
@@ -312,9 +570,9 @@ where T : unmanaged
 
     public static Tensor<double> Abs(Tensor<double> x) => x.Apply(l => l >= 0.0 ? l : -l);
 
-    public static Tensor<float> Sqrt(Tensor<float> x) => x.VectorizedApply(Vector.SquareRoot, MathF.Sqrt);
+    public static Tensor<float> Sqrt(Tensor<float> x, Tensor<float>? destination = null) => x.VectorizedApplyTo(Vector.SquareRoot, MathF.Sqrt, destination);
 
-    public static Tensor<double> Sqrt(Tensor<double> x) => x.VectorizedApply(Vector.SquareRoot, Math.Sqrt);
+    public static Tensor<double> Sqrt(Tensor<double> x, Tensor<double>? destination = null) => x.VectorizedApplyTo(Vector.SquareRoot, Math.Sqrt, destination);
 
     public static Tensor<int> MatMul2D(Tensor<int> x, Tensor<int> y)
     {
@@ -353,7 +611,41 @@ where T : unmanaged
         return output;
     }
 
-    public static Tensor<float> MatMul2D(Tensor<float> x, Tensor<float> y)
+    // The minimum tensor length for which row-wise kernels like Softmax and LayerNormalization process rows in parallel.
+    private const int ParallelRowsMinLength = 1 << 15;
+
+    // The number of elements processed by each task of a parallel elementwise kernel.
+    private const int ElementwiseChunk = 1 << 15;
+
+    // The number of output elements accumulated together when reducing a dimension that is not innermost.
+    private const int ReduceBlock = 1 << 12;
+
+    // The number of rows and columns of the tiles copied by a transpose that moves the innermost dimension.
+    private const int TransposeTile = 32;
+
+    // Small products are faster with the single-pass kernels than with the tiling and packing overhead of the blocked kernel.
+    private static bool UseBlockedMatMul(int m, int n, int k) => (long) m * n * k >= GemmBlockM * GemmBlockM * GemmBlockM;
+
+    /// <summary>
+    /// True if the blocked kernel can read a view in place. A right operand is packed anyway so it can have any strides, but the elements
+    /// of each row of a left operand must be contiguous.
+    /// </summary>
+    private static bool CanMatMulInPlace(StridedTensor<float> t, bool left) => !left || t.dimensions[^1] == 1 || t.viewStrides[^1] == 1;
+
+    /// <summary>
+    /// The distance between the rows and between the columns of the matrices in the last two dimensions of a MatMul operand.
+    /// </summary>
+    private static (int Row, int Column) GetMatrixStrides(Tensor<float> t) =>
+        t is StridedTensor<float> st ? (st.viewStrides[^2], st.viewStrides[^1]) : (t.dimensions[^1], 1);
+
+    /// <summary>
+    /// Multiply two matrices, optionally adding a bias vector to each row of the result.
+    /// </summary>
+    /// <param name="bias">If not null, a tensor with one element per column of the result whose last dimension is the number of columns. 
+    /// Each row of the result is initialized with the bias and the kernels accumulate the product into it, so adding the bias costs no extra 
+    /// pass over the result.</param>
+    /// <param name="destination">If not null, a dense row-major tensor with the shape of the result that the result is written to.</param>
+    public static Tensor<float> MatMul2D(Tensor<float> x, Tensor<float> y, Tensor<float>? bias = null, Tensor<float>? destination = null)
     {
         StartOpStage(OpStage.ValidateArguments);
         if (x.Rank != 2) throw new ArgumentException(nameof(x), "The rank of this tensor is not 2.");
@@ -364,9 +656,27 @@ where T : unmanaged
         var k = y.Dimensions[1];
 
         StartOpStage(OpStage.Copy);
+        var output = MatMulOutput(new int[] { x.Dimensions[0], y.Dimensions[1] }, bias, destination);
+        if (HardwareConfig.UseSimd && UseBlockedMatMul(m, n, k))
+        {
+            var bx = x is StridedTensor<float> sx && CanMatMulInPlace(sx, true) ? x : x.ToDenseTensor();
+            var by = y is StridedTensor<float> ? y : y.ToDenseTensor();
+            var (xRowStride, _) = GetMatrixStrides(bx);
+            var (yRowStride, yColStride) = GetMatrixStrides(by);
+
+            StartOpStage(OpStage.Math);
+            using var bxh = bx.Storage.Pin();
+            using var byh = by.Storage.Pin();
+            using var boh = output.Buffer.Pin();
+            unsafe
+            {
+                mm_blocked_parallel(m, n, k, (float*)bxh.Pointer, (float*)byh.Pointer, (float*)boh.Pointer, new[] { bx.GetStorageIndex(new int[2]) },
+                    new[] { by.GetStorageIndex(new int[2]) }, new[] { 0 }, xRowStride, yRowStride, yColStride, HardwareConfig.IntraOpThreads);
+            }
+            return output;
+        }
         var _x = x.ToDenseTensor();
         var _y = y.ToDenseTensor();
-        var output = DenseTensor<float>.OfShape(new int[] { x.Dimensions[0], y.Dimensions[1] });
 
         StartOpStage(OpStage.Math);
         using var xh = _x.Buffer.Pin(); 
@@ -406,6 +716,59 @@ where T : unmanaged
         return output;
     }
 
+    /// <summary>
+    /// The tensor a matrix product with shape <paramref name="dims"/> is accumulated into, initialized with the bias or with zeros.
+    /// </summary>
+    private static DenseTensor<float> MatMulOutput(int[] dims, Tensor<float>? bias, Tensor<float>? destination)
+    {
+        var output = OutputTensor(destination, dims);
+        if (bias is not null)
+        {
+            FillRows(output, bias);
+        }
+        else if (destination is not null)
+        {
+            output.Buffer.Span.Clear();
+        }
+        return output;
+    }
+
+    /// <summary>
+    /// The tensor a kernel writes an output with shape <paramref name="dims"/> to: <paramref name="destination"/> if it is not null, or a 
+    /// new tensor.
+    /// </summary>
+    private static DenseTensor<U> OutputTensor<U>(Tensor<U>? destination, int[] dims) where U : unmanaged
+    {
+        if (destination is null)
+        {
+            return DenseTensor<U>.OfShape(dims);
+        }
+        else if (destination is not DenseTensor<U> { IsReversedStride: false } d || !d.Dimensions.SequenceEqual(dims))
+        {
+            throw new ArgumentException(nameof(destination), $"The destination tensor must be a dense tensor with shape [{string.Join(",", dims)}].");
+        }
+        else
+        {
+            return d;
+        }
+    }
+
+    private static void FillRows(DenseTensor<float> output, Tensor<float> bias)
+    {
+        var k = output.Dimensions[^1];
+        if (bias.Rank == 0 || bias.Length != k || bias.Dimensions[^1] != k)
+        {
+            throw new ArgumentException($"The bias with shape {bias.PrintShape()} does not have one element for each of the {k} columns of the result.", nameof(bias));
+        }
+        if (k == 0) return;
+        var b = bias.ToDenseTensor().Buffer.Span.Slice(0, k);
+        var o = output.Buffer.Span;
+        for (int r = 0; r < output.Length; r += k)
+        {
+            b.CopyTo(o.Slice(r, k));
+        }
+    }
+
     public static Tensor<double> MatMul2D(Tensor<double> x, Tensor<double> y)
     {
         if (x.Rank != 2) throw new ArgumentException(nameof(x), "The rank of this tensor is not 2.");
@@ -521,6 +884,9 @@ where T : unmanaged
             {
                 throw new ArgumentException("The tensor shapes are not compatible for broadcasting.");
             }
+            // The kernels read each matrix contiguously from the storage of an operand, so strided views are copied first.
+            x = x is StridedTensor<int> ? x.ToDenseTensor() : x;
+            y = y is StridedTensor<int> ? y.ToDenseTensor() : y;
             var bdx = bd.Append(xdl[0]).Append(xdl[1]).ToArray();
             var bdy = bd.Append(ydl[0]).Append(ydl[1]).ToArray();
             if (!Tensor<int>.Broadcast(y, bdy, out var by))
@@ -597,12 +963,19 @@ where T : unmanaged
     }
 
     [MethodImpl(MethodImplOptions.AggressiveOptimization)]  
-    public static Tensor<float> MatMul(Tensor<float> x, Tensor<float> y)
+    /// <summary>
+    /// Matrix product of two tensors with the semantics of numpy.matmul, optionally adding a bias vector to each row of the result 
+    /// like a MatMul followed by an Add of the bias.
+    /// </summary>
+    /// <param name="bias">If not null, a tensor with one element per column of the result whose last dimension is the number of columns.</param>
+    /// <param name="destination">If not null, a dense row-major tensor with the shape of the result that the result is written to. Only used 
+    /// when both operands have a rank of 2 or more.</param>
+    public static Tensor<float> MatMul(Tensor<float> x, Tensor<float> y, Tensor<float>? bias = null, Tensor<float>? destination = null)
     {
         if (x.Rank == 0 || y.Rank == 0) throw new ArgumentException("The rank of each tensor in matrix multiplication must be greater than 1.");
         if (x.Rank == 2 && y.Rank == 2)
         {
-            return Tensor<float>.MatMul2D(x, y);
+            return Tensor<float>.MatMul2D(x, y, bias, destination);
         }
         else if (x.Rank >= 2 && y.Rank >= 2)
         {
@@ -617,6 +990,15 @@ where T : unmanaged
             {
                 throw new ArgumentException("The tensor shapes are not compatible for broadcasting.");
             }
+            var blocked = HardwareConfig.UseSimd && UseBlockedMatMul(xdl[0], xdl[1], ydl[1]);
+            if (x is StridedTensor<float> sx && !(blocked && CanMatMulInPlace(sx, true)))
+            {
+                x = x.ToDenseTensor();
+            }
+            if (y is StridedTensor<float> && !blocked)
+            {
+                y = y.ToDenseTensor();
+            }
 
             var bdx = bd.Append(xdl[0]).Append(xdl[1]).ToArray();
             if (!Tensor<float>.Broadcast(x, bdx, out var bx))
@@ -631,7 +1013,7 @@ where T : unmanaged
 
             StartOpStage(OpStage.Math);
 
-            var z = DenseTensor<float>.OfShape(bd.Append(xdl[0]).Append(ydl[1]).ToArray());
+            var z = MatMulOutput(bd.Append(xdl[0]).Append(ydl[1]).ToArray(), bias, destination);
             var di = bx.GetDimensionsIterator(0..^2);
             using var xh = bx.Storage.Pin();
             using var yh = by.Storage.Pin();
@@ -645,6 +1027,22 @@ where T : unmanaged
                 var xp = (float*)xh.Pointer;
                 var yp = (float*)yh.Pointer;
                 var zp = (float*)zh.Pointer;
+                if (blocked)
+                {
+                    var xo = new List<int>();
+                    var yo = new List<int>();
+                    var zo = new List<int>();
+                    foreach (var idx in di)
+                    {
+                        xo.Add(bx.GetStorageIndex(idx));
+                        yo.Add(by.GetStorageIndex(idx));
+                        zo.Add(z.GetStorageIndex(idx));
+                    }
+                    var (xRowStride, _) = GetMatrixStrides(bx);
+                    var (yRowStride, yColStride) = GetMatrixStrides(by);
+                    mm_blocked_parallel(m, n, k, xp, yp, zp, xo.ToArray(), yo.ToArray(), zo.ToArray(), xRowStride, yRowStride, yColStride, HardwareConfig.IntraOpThreads);
+                    return z;
+                }
                 foreach (var idx in di)
                 {
                     if (HardwareConfig.UseSimd && HardwareConfig.UseIntrinsics && Fma.IsSupported)
@@ -678,7 +1076,7 @@ where T : unmanaged
             }
             else
             {
-                return MatMul(bx, by);
+                return MatMul(bx, by, bias);
             }
         }
         else //(x.Rank < 2 && y.Rank < 2)
@@ -694,7 +1092,7 @@ where T : unmanaged
                 y = y.PadRight();
                 bcast = true;
             }
-            var c = MatMul2D(x, y);
+            var c = MatMul2D(x, y, bias);
             if (bcast)
             {
                 c.RemoveDim(0);
@@ -818,6 +1216,9 @@ where T : unmanaged
             {
                 throw new ArgumentException("The tensor shapes are not compatible for broadcasting.");
             }
+            // The kernels read each matrix contiguously from the storage of an operand, so strided views are copied first.
+            x = x is StridedTensor<double> ? x.ToDenseTensor() : x;
+            y = y is StridedTensor<double> ? y.ToDenseTensor() : y;
 
             var bdx = bd.Append(xdl[0]).Append(xdl[1]).ToArray();
             if (!Tensor<double>.Broadcast(x, bdx, out var bx))
@@ -1249,9 +1650,9 @@ where T : unmanaged
         }
         return Y;
     }
-    public static Tensor<float> Relu(Tensor<float> x) => x.Apply(l => l > 0.0f ? l : 0.0f);
+    public static Tensor<float> Relu(Tensor<float> x, Tensor<float>? destination = null) => x.ApplyTo(l => l > 0.0f ? l : 0.0f, destination);
 
-    public static Tensor<double> Relu(Tensor<double> x) => x.Apply(l => l > 0.0 ? l : 0.0);
+    public static Tensor<double> Relu(Tensor<double> x, Tensor<double>? destination = null) => x.ApplyTo(l => l > 0.0 ? l : 0.0, destination);
 
     public static Tensor<T> Reshape(Tensor<T> input, Tensor<long> shape, bool allowZero = false)
     {
@@ -1309,27 +1710,126 @@ where T : unmanaged
         return input.Reshape(newShapeDims.ToArray());
     }
 
-    public static Tensor<float> Softmax(Tensor<float> x, int axis = -1) 
+    public static Tensor<float> Softmax(Tensor<float> x, int axis = -1, Tensor<float>? destination = null) 
     {
         StartOpStage(OpStage.ValidateArguments);
         axis = ArrayUtilities.HandleNegativeAxisOrIndex(x.Rank, axis);
-        if (axis >= x.Rank) throw new ArgumentException(nameof(axis), "The specified axis must be less than the rank of the tensor.");      
-        var max = Tensor<float>.ReduceMax(x, (new int[] { axis }).ToTensor<int>(), true);
-        if (!Tensor<float>.Broadcast(x, max, out var bx, out var bmax))
+        if (axis >= x.Rank) throw new ArgumentException(nameof(axis), "The specified axis must be less than the rank of the tensor.");
+
+        StartOpStage(OpStage.Copy);
+        var _x = x.ToDenseTensor();
+        var output = OutputTensor(destination, x.Dimensions.ToArray());
+        if (x.Length == 0)
         {
-            throw new InvalidOperationException("Could not broadcast result of Max op with original tensor.");
+            return output;
         }
-        var sub = Tensor<float>.Subtract(x, bmax);
-        var t = sub.Apply(MathF.Exp);
-        var s = Tensor<float>.ReduceSum(t, (new int[] { axis }).ToTensor<int>(), true);
-        if (!Tensor<float>.Broadcast(t, s, out var bt, out var bs))
+        var n = x.Dimensions[axis];
+        var outer = ArrayUtilities.ComputeOffsetForReduction(x.Dimensions[..axis]);
+        var inner = ArrayUtilities.ComputeOffsetForReduction(x.Dimensions[(axis + 1)..]);
+
+        StartOpStage(OpStage.Math);
+        using var xh = _x.Buffer.Pin();
+        using var oh = output.Buffer.Pin();
+        // Split the tensor into independent units of work: rows when the axis is innermost, otherwise blocks of adjacent columns of each outer index.
+        var columnBlocks = (inner + SoftmaxBlock - 1) / SoftmaxBlock;
+        var units = inner == 1 ? outer : outer * columnBlocks;
+        unsafe
         {
-            throw new InvalidOperationException("Could not broadcast results of ReduceSum and Exp ops.");
+            nint xp = (nint)xh.Pointer, op = (nint)oh.Pointer;
+            void Unit(int u)
+            {
+                if (inner == 1)
+                {
+                    MathOps.Softmax((float*)xp + (long) u * n, (float*)op + (long) u * n, n);
+                }
+                else
+                {
+                    var c = (u % columnBlocks) * SoftmaxBlock;
+                    var offset = (long) (u / columnBlocks) * n * inner + c;
+                    MathOps.Softmax((float*)xp + offset, (float*)op + offset, n, inner, Math.Min(SoftmaxBlock, inner - c));
+                }
+            }
+            if (HardwareConfig.IntraOpThreads > 1 && units > 1 && x.Length >= ParallelRowsMinLength)
+            {
+                Parallel.For(0, units, new ParallelOptions() { MaxDegreeOfParallelism = HardwareConfig.IntraOpThreads }, Unit);
+            }
+            else
+            {
+                for (int u = 0; u < units; u++)
+                {
+                    Unit(u);
+                }
+            }
         }
-        return Tensor<float>.Divide(bt, bs);
+        return output;
     }
 
-    public static Tensor<double> Softmax(Tensor<double> x, int axis = -1)
+    /// <summary>
+    /// Normalize each slice of <paramref name="x"/> over the dimensions from <paramref name="axis"/> to the last dimension to zero mean and 
+    /// unit variance, then scale and shift it. 
+    /// </summary>
+    /// <param name="scale">The scale of each element of a normalized slice.</param>
+    /// <param name="bias">The bias of each element of a normalized slice, or null.</param>
+    /// <param name="mean">The mean of each normalized slice, with the normalized dimensions of <paramref name="x"/> set to 1.</param>
+    /// <param name="invStdDev">The inverse standard deviation of each normalized slice, with the same shape as <paramref name="mean"/>.</param>
+    /// <param name="destination">If not null, a dense row-major tensor with the shape of <paramref name="x"/> that the result is written to.</param>
+    public static Tensor<float> LayerNormalization(Tensor<float> x, Tensor<float> scale, Tensor<float>? bias, int axis, float epsilon, out Tensor<float> mean, out Tensor<float> invStdDev,
+        Tensor<float>? destination = null)
+    {
+        StartOpStage(OpStage.ValidateArguments);
+        axis = ArrayUtilities.HandleNegativeAxisOrIndex(x.Rank, axis);
+        if (axis >= x.Rank) throw new ArgumentException(nameof(axis), "The specified axis must be less than the rank of the tensor.");
+        var n = ArrayUtilities.ComputeOffsetForReduction(x.Dimensions[axis..]);
+        var rows = ArrayUtilities.ComputeOffsetForReduction(x.Dimensions[..axis]);
+        if (scale.Length != n) throw new ArgumentException(nameof(scale), $"The scale must have one element for each of the {n} elements of a normalized slice.");
+        if (bias is not null && bias.Length != n) throw new ArgumentException(nameof(bias), $"The bias must have one element for each of the {n} elements of a normalized slice.");
+
+        StartOpStage(OpStage.Copy);
+        var _x = x.ToDenseTensor();
+        var _scale = scale.ToDenseTensor();
+        var _bias = bias?.ToDenseTensor();
+        var output = OutputTensor(destination, x.Dimensions.ToArray());
+        var statsShape = x.Dimensions.ToArray();
+        for (int i = axis; i < statsShape.Length; i++)
+        {
+            statsShape[i] = 1;
+        }
+        var _mean = DenseTensor<float>.OfShape(statsShape);
+        var _invStdDev = DenseTensor<float>.OfShape(statsShape);
+        mean = _mean;
+        invStdDev = _invStdDev;
+        if (x.Length == 0)
+        {
+            return output;
+        }
+
+        StartOpStage(OpStage.Math);
+        using var xh = _x.Buffer.Pin();
+        using var sh = _scale.Buffer.Pin();
+        using var bh = _bias is not null ? _bias.Buffer.Pin() : default;
+        using var oh = output.Buffer.Pin();
+        using var mh = _mean.Buffer.Pin();
+        using var ih = _invStdDev.Buffer.Pin();
+        unsafe
+        {
+            nint xp = (nint)xh.Pointer, sp = (nint)sh.Pointer, bp = (nint)bh.Pointer, op = (nint)oh.Pointer, mp = (nint)mh.Pointer, ip = (nint)ih.Pointer;
+            void Row(int r) => MathOps.LayerNorm((float*)xp + (long) r * n, (float*)op + (long) r * n, n, (float*)sp, (float*)bp, epsilon, (float*)mp + r, (float*)ip + r);
+            if (HardwareConfig.IntraOpThreads > 1 && rows > 1 && x.Length >= ParallelRowsMinLength)
+            {
+                Parallel.For(0, rows, new ParallelOptions() { MaxDegreeOfParallelism = HardwareConfig.IntraOpThreads }, Row);
+            }
+            else
+            {
+                for (int r = 0; r < rows; r++)
+                {
+                    Row(r);
+                }
+            }
+        }
+        return output;
+    }
+
+    public static Tensor<double> Softmax(Tensor<double> x, int axis = -1, Tensor<double>? destination = null)
     {
         StartOpStage(OpStage.ValidateArguments);
         axis = ArrayUtilities.HandleNegativeAxisOrIndex(x.Rank, axis);
@@ -1347,12 +1847,61 @@ where T : unmanaged
         {
             throw new InvalidOperationException("Could not broadcast results of ReduceSum and Exp ops.");
         }
-        return Tensor<double>.Divide(bt, bs);
+        return Tensor<double>.Divide(bt, bs, destination);
     }
 
-    public static Tensor<float> Erf(Tensor<float> x) => x.Apply(MathOps.Erf);
+    public unsafe static Tensor<float> Erf(Tensor<float> x, Tensor<float>? destination = null) => ApplyElementwiseKernel(x, MathOps.Erf, destination);
+
+    public static Tensor<double> Erf(Tensor<double> x, Tensor<double>? destination = null) => x.ApplyTo(MathOps.Erf, destination);
+
+    /// <summary>
+    /// The Gaussian error linear unit of each element.
+    /// </summary>
+    /// <param name="approximate">If true, use the tanh approximation of the function.</param>
+    public unsafe static Tensor<float> Gelu(Tensor<float> x, bool approximate = false, Tensor<float>? destination = null) =>
+        ApplyElementwiseKernel(x, approximate ? MathOps.GeluTanh : MathOps.Gelu, destination);
 
-    public static Tensor<double> Erf(Tensor<double> x) => x.Apply(MathOps.Erf);
+    public static Tensor<double> Gelu(Tensor<double> x, bool approximate = false, Tensor<double>? destination = null) => approximate ?
+        x.ApplyTo(l => 0.5 * l * (1.0 + Math.Tanh(Math.Sqrt(2.0 / Math.PI) * (l + 0.044715 * l * l * l))), destination) :
+        x.ApplyTo(l => 0.5 * l * (1.0 + MathOps.Erf(l / Math.Sqrt(2.0))), destination);
+
+    private unsafe delegate void ElementwiseKernel(float* x, float* y, int n);
+
+    /// <summary>
+    /// Apply a kernel to the elements of a dense copy of <paramref name="x"/>. Large tensors are split into chunks that are processed in parallel.
+    /// </summary>
+    /// <param name="destination">If not null, a dense tensor with the same length as <paramref name="x"/> that the results are written to
+    /// instead of a new tensor. The destination can be <paramref name="x"/> itself.</param>
+    private unsafe static Tensor<float> ApplyElementwiseKernel(Tensor<float> x, ElementwiseKernel kernel, Tensor<float>? destination = null)
+    {
+        StartOpStage(OpStage.Copy);
+        var _x = x.ToDenseTensor();
+        if (destination is not null && (destination is not DenseTensor<float> { IsReversedStride: false } || destination.Length != x.Length))
+        {
+            throw new ArgumentException(nameof(destination), "The destination tensor must be a dense tensor with the same length as the input tensor.");
+        }
+        var output = (DenseTensor<float>?) destination ?? DenseTensor<float>.OfShape(x.Dimensions.ToArray());
+        var n = (int) x.Length;
+        
+        StartOpStage(OpStage.Math);
+        using var xh = _x.Buffer.Pin();
+        using var oh = output.Buffer.Pin();
+        nint xp = (nint)xh.Pointer, op = (nint)oh.Pointer;
+        var chunks = (n + ElementwiseChunk - 1) / ElementwiseChunk;
+        if (HardwareConfig.IntraOpThreads > 1 && chunks > 1)
+        {
+            Parallel.For(0, chunks, new ParallelOptions() { MaxDegreeOfParallelism = HardwareConfig.IntraOpThreads }, c =>
+            {
+                var start = c * ElementwiseChunk;
+                kernel((float*)xp + start, (float*)op + start, Math.Min(ElementwiseChunk, n - start));
+            });
+        }
+        else
+        {
+            kernel((float*)xp, (float*)op, n);
+        }
+        return output;
+    }
 
     [MethodImpl(MethodImplOptions.AggressiveInlining | MethodImplOptions.AggressiveOptimization)]
     public static Tensor<T> Transpose(Tensor<T> data, int[] perm = null)
@@ -1385,6 +1934,12 @@ where T : unmanaged
         {
             return data;
         }
+        else if (StridedTensor<T>.CanView(data))
+        {
+            // Only the strides are permuted. A kernel that needs the transposed elements contiguous copies the view with ToDenseTensor.
+            var view = StridedTensor<T>.Of(data).Transpose(perm);
+            return view.IsContiguous ? view.Reshape(view.dimensions) : view;
+        }
 
         StartOpStage(OpStage.Copy);
         var shape = new int[data.Rank];
@@ -1406,6 +1961,218 @@ where T : unmanaged
         return r;
     }
 
+    /// <summary>
+    /// Simplify the layout of a strided view without changing the order of its elements. Dimensions of size 1 are dropped, and two adjacent
+    /// dimensions are merged when the stride of the outer one is the stride of the inner one times its size.
+    /// </summary>
+    private static (int[] Dims, int[] Strides) CollapseStrides(int[] dimensions, int[] strides)
+    {
+        var dims = new List<int>();
+        var s = new List<int>();
+        for (int i = 0; i < dimensions.Length; i++)
+        {
+            if (dimensions[i] == 1)
+            {
+                continue;
+            }
+            else if (dims.Count > 0 && s[^1] == strides[i] * dimensions[i])
+            {
+                dims[^1] *= dimensions[i];
+                s[^1] = strides[i];
+            }
+            else
+            {
+                dims.Add(dimensions[i]);
+                s.Add(strides[i]);
+            }
+        }
+        return (dims.ToArray(), s.ToArray());
+    }
+
+    /// <summary>
+    /// Copy the elements of a view of <paramref name="x"/>, that starts at <paramref name="offset"/> and has the given dimensions and strides,
+    /// into the row-major <paramref name="y"/>. If the innermost dimension of the view has stride 1 each of its rows is copied whole. If another
+    /// dimension has stride 1, that dimension and the innermost dimension of the output are swapped tile by tile, for each index of the other
+    /// dimensions, so that both the reads and the writes of a tile stay in cache. Otherwise each row is gathered element by element.
+    /// </summary>
+    internal static void CopyStrided(Memory<T> x, int offset, int[] dimensions, int[] strides, Memory<T> y)
+    {
+        var (dims, s) = CollapseStrides(dimensions, strides);
+        var k = dims.Length;
+        if (k == 0)
+        {
+            y.Span[0] = x.Span[offset];
+            return;
+        }
+        var ystrides = ArrayUtilities.GetStrides(dims);
+        var options = new ParallelOptions() { MaxDegreeOfParallelism = HardwareConfig.IntraOpThreads };
+        var q = s[k - 1] == 1 ? k - 1 : Array.IndexOf(s, 1);
+        if (q == k - 1 || q < 0)
+        {
+            // The output is a sequence of rows of the view, each found at the offset of the outer output index.
+            var n = dims[k - 1];
+            var stride = s[k - 1];
+            var outer = Enumerable.Range(0, k - 1).Select(i => (dims[i], s[i])).ToArray();
+            var rows = y.Length / n;
+            void Rows(int start, int end)
+            {
+                var xs = x.Span;
+                var ys = y.Span;
+                for (int o = start; o < end; o++)
+                {
+                    var xo = offset + StridedOffset(o, outer);
+                    if (stride == 1)
+                    {
+                        xs.Slice(xo, n).CopyTo(ys.Slice(o * n, n));
+                    }
+                    else
+                    {
+                        var yrow = ys.Slice(o * n, n);
+                        for (int j = 0; j < n; j++)
+                        {
+                            yrow[j] = xs[xo + j * stride];
+                        }
+                    }
+                }
+            }
+            var rowsPerChunk = Math.Max(1, ElementwiseChunk / n);
+            var chunks = (rows + rowsPerChunk - 1) / rowsPerChunk;
+            if (HardwareConfig.IntraOpThreads > 1 && chunks > 1)
+            {
+                Parallel.For(0, chunks, options, c => Rows(c * rowsPerChunk, Math.Min(rows, (c + 1) * rowsPerChunk)));
+            }
+            else
+            {
+                Rows(0, rows);
+            }
+        }
+        else
+        {
+            // The innermost output dimension is read with stride xstride and view dimension q, read with stride 1, is written with stride ystride.
+            var m = dims[k - 1];
+            var n = dims[q];
+            var xstride = s[k - 1];
+            var ystride = ystrides[q];
+            var batch = Enumerable.Range(0, k - 1).Where(i => i != q).ToArray();
+            var xbatch = batch.Select(i => (dims[i], s[i])).ToArray();
+            var ybatch = batch.Select(i => (dims[i], ystrides[i])).ToArray();
+            var tiles = (m + TransposeTile - 1) / TransposeTile;
+            var units = y.Length / (m * n) * tiles;
+            void Tiles(int start, int end)
+            {
+                var xs = x.Span;
+                var ys = y.Span;
+                for (int u = start; u < end; u++)
+                {
+                    var b = u / tiles;
+                    var i0 = (u % tiles) * TransposeTile;
+                    var i1 = Math.Min(m, i0 + TransposeTile);
+                    TransposeTiles(xs, offset + StridedOffset(b, xbatch), ys, StridedOffset(b, ybatch), i0, i1, n, xstride, ystride);
+                }
+            }
+            var unitsPerChunk = Math.Max(1, ElementwiseChunk / (TransposeTile * n));
+            var chunks = (units + unitsPerChunk - 1) / unitsPerChunk;
+            if (HardwareConfig.IntraOpThreads > 1 && chunks > 1)
+            {
+                Parallel.For(0, chunks, options, c => Tiles(c * unitsPerChunk, Math.Min(units, (c + 1) * unitsPerChunk)));
+            }
+            else
+            {
+                Tiles(0, units);
+            }
+        }
+    }
+
+    /// <summary>
+    /// Copy the rows <paramref name="i0"/> to <paramref name="i1"/> of an n-column matrix at <paramref name="xo"/> with row stride
+    /// <paramref name="xstride"/> into the columns of a matrix at <paramref name="yo"/> with row stride <paramref name="ystride"/>, one square
+    /// tile at a time. The row stride of the input may be 0 or negative, so elements are addressed from the start of the spans.
+    /// </summary>
+    private unsafe static void TransposeTiles(ReadOnlySpan<T> x, int xo, Span<T> y, int yo, int i0, int i1, int n, int xstride, int ystride)
+    {
+        if (HardwareConfig.UseSimd && HardwareConfig.UseIntrinsics && Sse.IsSupported && sizeof(T) == sizeof(float))
+        {
+            fixed (T* xp = x)
+            fixed (T* yp = y)
+            {
+                TransposeTiles4x4((float*)xp + xo, (float*)yp + yo, i0, i1, n, xstride, ystride);
+            }
+            return;
+        }
+        for (int j0 = 0; j0 < n; j0 += TransposeTile)
+        {
+            var j1 = Math.Min(n, j0 + TransposeTile);
+            for (int j = j0; j < j1; j++)
+            {
+                var yrow = y.Slice(yo + j * ystride);
+                for (int i = i0; i < i1; i++)
+                {
+                    yrow[i] = x[xo + i * xstride + j];
+                }
+            }
+        }
+    }
+
+    /// <summary>
+    /// Copy tiles of 4-byte elements like <see cref="TransposeTiles"/>, transposing each 4x4 block inside a tile in SSE registers.
+    /// </summary>
+    private unsafe static void TransposeTiles4x4(float* x, float* y, int i0, int i1, int n, int xstride, int ystride)
+    {
+        for (int j0 = 0; j0 < n; j0 += TransposeTile)
+        {
+            var j1 = Math.Min(n, j0 + TransposeTile);
+            int i = i0;
+            for (; i <= i1 - 4; i += 4)
+            {
+                int j = j0;
+                for (; j <= j1 - 4; j += 4)
+                {
+                    var r0 = Sse.LoadVector128(x + i * xstride + j);
+                    var r1 = Sse.LoadVector128(x + (i + 1) * xstride + j);
+                    var r2 = Sse.LoadVector128(x + (i + 2) * xstride + j);
+                    var r3 = Sse.LoadVector128(x + (i + 3) * xstride + j);
+                    var t0 = Sse.UnpackLow(r0, r1);
+                    var t1 = Sse.UnpackLow(r2, r3);
+                    var t2 = Sse.UnpackHigh(r0, r1);
+                    var t3 = Sse.UnpackHigh(r2, r3);
+                    Sse.Store(y + j * ystride + i, Sse.MoveLowToHigh(t0, t1));
+                    Sse.Store(y + (j + 1) * ystride + i, Sse.MoveHighToLow(t1, t0));
+                    Sse.Store(y + (j + 2) * ystride + i, Sse.MoveLowToHigh(t2, t3));
+                    Sse.Store(y + (j + 3) * ystride + i, Sse.MoveHighToLow(t3, t2));
+                }
+                for (; j < j1; j++)
+                {
+                    for (int k = i; k < i + 4; k++)
+                    {
+                        y[j * ystride + k] = x[k * xstride + j];
+                    }
+                }
+            }
+            for (; i < i1; i++)
+            {
+                for (int j = j0; j < j1; j++)
+                {
+                    y[j * ystride + i] = x[i * xstride + j];
+                }
+            }
+        }
+    }
+
+    /// <summary>
+    /// Compute the offset of the element at a row-major <paramref name="index"/> over <paramref name="dims"/>, given the stride of each dimension.
+    /// </summary>
+    [MethodImpl(MethodImplOptions.AggressiveInlining)]
+    private static int StridedOffset(int index, (int Size, int Stride)[] dims)
+    {
+        var offset = 0;
+        for (int i = dims.Length - 1; i >= 0; i--)
+        {
+            offset += (index % dims[i].Size) * dims[i].Stride;
+            index /= dims[i].Size;
+        }
+        return offset;
+    }
+
     [MethodImpl(MethodImplOptions.AggressiveInlining | MethodImplOptions.AggressiveOptimization)]  
     public unsafe static Tensor<T> Gather(Tensor<T> data, Tensor<int> indices, int? _axis = null)
     {
@@ -1528,6 +2295,11 @@ where T : unmanaged
         {
             indices[i] = axes.Contains(i) ? new SliceIndex(start[axes.IndexOf(i)], ends[axes.IndexOf(i)], steps[axes.IndexOf(i)]) : new SliceIndex(0, data.dimensions[i]);
         }
+        if (StridedTensor<T>.CanView(data))
+        {
+            var view = StridedTensor<T>.Of(data).Slice(indices.Select((s, i) => s.ToSliceDef(data.dimensions[i])).ToArray());
+            return view.IsContiguous ? view.Reshape(view.dimensions) : view;
+        }
         return data.Slice(indices); 
     }
 
@@ -1558,97 +2330,260 @@ where T : unmanaged
         }
         return data.Reshape(newshape);
     }
-    public static Tensor<int> ReduceSum(Tensor<int> data, Tensor<int> axes = null, bool? _keepDims = null, bool? _noOpWithEmptyAxes = null)
+    /// <summary>
+    /// Reduce a tensor along <paramref name="axes"/> with an associative and commutative operation, without transposing it. Dimensions of size 1
+    /// are dropped and adjacent dimensions that are both reduced or both kept are merged. Each group of reduced dimensions is then reduced in
+    /// turn, starting from the innermost, see <see cref="ReduceAxis"/>.
+    /// </summary>
+    /// <param name="identity">The result of reducing no elements.</param>
+    private static DenseTensor<T> Reduce(Tensor<T> data, int[] axes, Func<Vector<T>, Vector<T>, Vector<T>> op, Func<T, T, T> sop, T identity)
     {
-        StartOpStage(OpStage.ValidateArguments);
-        if (axes is not null && axes.Length > data.Rank) throw new ArgumentException(nameof(axes), "The number of axes specified must be less than the tensor rank.");
-        if (axes is not null && !axes.All(a =>  a < data.Rank)) throw new ArgumentException(nameof(axes), $"Each axis specified must be less than the rank of the tensor.");
-        if (axes is not null && !ArrayUtilities.CheckNoRepeatedDims(axes.ToArray())) throw new ArgumentException(nameof(axes), "axes contains a repeated dimension.");
-
-        StartOpStage(OpStage.CalculateIndices);
-        var keepDims = _keepDims.HasValue ? _keepDims.Value : false;
-        var noOpWithEmptyAxes = _noOpWithEmptyAxes.HasValue ? _noOpWithEmptyAxes.Value : false;
-        var _axes = axes is null || axes.Length == 0 ? Enumerable.Range(0, data.Rank).ToArray() : axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(data.Rank, a)).ToArray();
-        var permutation = ArrayUtilities.GetAxesPermutationForReduction(_axes, data.Rank);
-        Tensor<int> pdata;
-        int[] paxes;
-        if (permutation is not null)
+        if (data is StridedTensor<T> st && st.TryGetPermutedDense(out var block, out var perm))
         {
-            pdata = Tensor<int>.Transpose(data, permutation);
-            paxes = ArrayUtilities.GetInnerMostAxes(_axes.Length, data.Rank);
+            // A transposed view is reduced along the corresponding axes of the block it permutes. The kept dimensions of the result are then
+            // in the order of the block, so only the result is transposed back to the order of the view.
+            var result = Reduce(block, axes.Select(a => perm[a]).ToArray(), op, sop, identity);
+            var kept = Enumerable.Range(0, data.Rank).Where(i => !axes.Contains(i)).Select(i => perm[i]).ToArray();
+            return Transpose(result, kept.Select(p => kept.Count(q => q < p)).ToArray()).ToDenseTensor();
         }
-        else
+        var dense = data.ToDenseTensor();
+        if (dense.IsReversedStride)
         {
-            pdata = data;
-            paxes = _axes;
+            return ReduceTransposed(dense, axes, sop, identity);
+        }
+        var (oshape, _) = ArrayUtilities.ComputeShapesForReduction(data.dimensions, axes);
+        var output = DenseTensor<T>.OfShape(oshape);
+        if (dense.Length == 0)
+        {
+            output.Buffer.Span.Fill(identity);
+            return output;
+        }
+        var groups = new List<(int Size, bool Reduced)>();
+        for (int i = 0; i < dense.Rank; i++)
+        {
+            var size = dense.dimensions[i];
+            var reduced = axes.Contains(i);
+            if (size == 1)
+            {
+                continue;
+            }
+            else if (groups.Count > 0 && groups[^1].Reduced == reduced)
+            {
+                groups[^1] = (groups[^1].Size * size, reduced);
+            }
+            else
+            {
+                groups.Add((size, reduced));
+            }
         }
-        var (oshape, rshape) = ArrayUtilities.ComputeShapesForReduction(pdata.dimensions, paxes);
-        var output = DenseTensor<int>.OfShape(oshape);
-        var r = ArrayUtilities.ComputeOffsetForReduction(rshape);
 
         StartOpStage(OpStage.Math);
-        for (var i = 0; i < output.Length; ++i)
+        var src = dense.Buffer;
+        if (!groups.Any(g => g.Reduced))
         {
-            var offset = i * r;
-            var sum = 0;
-            for (int j = 0; j < r; ++j)
+            src.CopyTo(output.Buffer);
+            return output;
+        }
+        int r;
+        while ((r = groups.FindLastIndex(g => g.Reduced)) >= 0)
+        {
+            var outer = groups.Take(r).Aggregate(1, (p, g) => p * g.Size);
+            var inner = groups.Skip(r + 1).Aggregate(1, (p, g) => p * g.Size);
+            var n = groups[r].Size;
+            groups.RemoveAt(r);
+            var dst = groups.Any(g => g.Reduced) ? DenseTensor<T>.OfShape(new[] { outer * inner }).Buffer : output.Buffer;
+            ReduceAxis(src, outer, n, inner, dst, op, sop);
+            src = dst;
+        }
+        return output;
+    }
+
+    /// <summary>
+    /// Reduce the middle dimension of a row-major tensor of shape [outer, n, inner] into a tensor of shape [outer, inner]. If inner is 1 each
+    /// contiguous row of n elements is reduced with vector accumulators. Otherwise the n rows of inner elements of each outer index are
+    /// accumulated elementwise into the output, so the reduced dimension is read with a stride and never copied. Large reductions are split
+    /// into chunks that are processed in parallel.
+    /// </summary>
+    private static void ReduceAxis(Memory<T> x, int outer, int n, int inner, Memory<T> y, Func<Vector<T>, Vector<T>, Vector<T>> op, Func<T, T, T> sop)
+    {
+        var options = new ParallelOptions() { MaxDegreeOfParallelism = HardwareConfig.IntraOpThreads };
+        if (inner == 1 && outer == 1)
+        {
+            // A single long row is reduced in chunks whose partial results are then combined, in the same order regardless of the number of threads.
+            var chunks = (n + ElementwiseChunk - 1) / ElementwiseChunk;
+            var partials = new T[chunks];
+            void Chunk(int c) => partials[c] = ReduceRow(op, sop, x.Span.Slice(c * ElementwiseChunk, Math.Min(ElementwiseChunk, n - c * ElementwiseChunk)));
+            if (HardwareConfig.IntraOpThreads > 1 && chunks > 1)
             {
-                sum += pdata.GetValue(offset + j);
+                Parallel.For(0, chunks, options, Chunk);
             }
-            output.SetValue(i, sum);
+            else
+            {
+                for (int c = 0; c < chunks; c++)
+                {
+                    Chunk(c);
+                }
+            }
+            var result = partials[0];
+            for (int c = 1; c < chunks; c++)
+            {
+                result = sop(result, partials[c]);
+            }
+            y.Span[0] = result;
         }
-        if (keepDims)
+        else if (inner == 1)
         {
-            return Tensor<int>.Unsqueeze(output, _axes);
+            void Rows(int start, int end)
+            {
+                var xs = x.Span;
+                var ys = y.Span;
+                for (int o = start; o < end; o++)
+                {
+                    ys[o] = ReduceRow(op, sop, xs.Slice(o * n, n));
+                }
+            }
+            var rowsPerChunk = Math.Max(1, ElementwiseChunk / n);
+            var chunks = (outer + rowsPerChunk - 1) / rowsPerChunk;
+            if (HardwareConfig.IntraOpThreads > 1 && chunks > 1)
+            {
+                Parallel.For(0, chunks, options, c => Rows(c * rowsPerChunk, Math.Min(outer, (c + 1) * rowsPerChunk)));
+            }
+            else
+            {
+                Rows(0, outer);
+            }
         }
         else
         {
-            return output;
+            // The inner dimension is split into blocks of columns so that each block of the output stays in cache while it accumulates n rows.
+            var block = Math.Min(inner, ReduceBlock);
+            var blocks = (inner + block - 1) / block;
+            void Columns(int start, int end)
+            {
+                var xs = x.Span;
+                var ys = y.Span;
+                for (int u = start; u < end; u++)
+                {
+                    var o = u / blocks;
+                    var c = (u % blocks) * block;
+                    var m = Math.Min(block, inner - c);
+                    var acc = ys.Slice(o * inner + c, m);
+                    xs.Slice(o * n * inner + c, m).CopyTo(acc);
+                    for (int j = 1; j < n; j++)
+                    {
+                        AccumulateRow(op, sop, xs.Slice((o * n + j) * inner + c, m), acc);
+                    }
+                }
+            }
+            var units = outer * blocks;
+            var unitsPerChunk = Math.Max(1, ElementwiseChunk / (n * block));
+            var chunks = (units + unitsPerChunk - 1) / unitsPerChunk;
+            if (HardwareConfig.IntraOpThreads > 1 && chunks > 1)
+            {
+                Parallel.For(0, chunks, options, c => Columns(c * unitsPerChunk, Math.Min(units, (c + 1) * unitsPerChunk)));
+            }
+            else
+            {
+                Columns(0, units);
+            }
         }
     }
 
-    public static Tensor<float> ReduceSum(Tensor<float> data, Tensor<int> axes = null, bool? _keepDims = null, bool? _noOpWithEmptyAxes = null)
+    /// <summary>
+    /// Reduce a contiguous row of elements, accumulating whole vectors and then combining the lanes of the accumulator.
+    /// </summary>
+    private static T ReduceRow(Func<Vector<T>, Vector<T>, Vector<T>> op, Func<T, T, T> sop, ReadOnlySpan<T> x)
     {
-        StartOpStage(OpStage.ValidateArguments);
-        if (axes is not null && axes.Length > data.Rank) throw new ArgumentException(nameof(axes), "The number of axes specified must be less than the tensor rank.");
-        if (axes is not null && !axes.All(a => a < data.Rank)) throw new ArgumentException(nameof(axes), $"Each axis specified must be less than the rank of the tensor.");
-        if (axes is not null && !ArrayUtilities.CheckNoRepeatedDims(axes.ToArray())) throw new ArgumentException(nameof(axes), "axes contains a repeated dimension.");
-
-        StartOpStage(OpStage.ValidateArguments);
-        var keepDims = _keepDims.HasValue ? _keepDims.Value : false;
-        var noOpWithEmptyAxes = _noOpWithEmptyAxes.HasValue ? _noOpWithEmptyAxes.Value : false;
-        var _axes = axes is null || axes.Length == 0 ? Enumerable.Range(0, data.Rank).ToArray() : axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(data.Rank, a)).ToArray();
-        var permutation = ArrayUtilities.GetAxesPermutationForReduction(_axes, data.Rank);
-        Tensor<float> pdata;
-        int[] paxes;
-        if (permutation is not null)
+        var n = x.Length;
+        var V = Vector<T>.Count;
+        int i;
+        T result;
+        if (HardwareConfig.UseSimd && n >= 2 * V)
         {
-            pdata = Tensor<float>.Transpose(data, permutation);
-            paxes = ArrayUtilities.GetInnerMostAxes(_axes.Length, data.Rank);
+            var acc = new Vector<T>(x);
+            for (i = V; i <= n - V; i += V)
+            {
+                acc = op(acc, new Vector<T>(x.Slice(i)));
+            }
+            result = acc[0];
+            for (int k = 1; k < V; k++)
+            {
+                result = sop(result, acc[k]);
+            }
         }
         else
         {
-            pdata = data;
-            paxes = _axes;
+            result = x[0];
+            i = 1;
+        }
+        for (; i < n; i++)
+        {
+            result = sop(result, x[i]);
         }
+        return result;
+    }
+
+    /// <summary>
+    /// Combine each element of a row of accumulators with the element at the same position in <paramref name="x"/>.
+    /// </summary>
+    private static void AccumulateRow(Func<Vector<T>, Vector<T>, Vector<T>> op, Func<T, T, T> sop, ReadOnlySpan<T> x, Span<T> acc)
+    {
+        var n = acc.Length;
+        var V = Vector<T>.Count;
+        int i = 0;
+        if (HardwareConfig.UseSimd)
+        {
+            for (; i <= n - V; i += V)
+            {
+                op(new Vector<T>(acc.Slice(i)), new Vector<T>(x.Slice(i))).CopyTo(acc.Slice(i));
+            }
+        }
+        for (; i < n; i++)
+        {
+            acc[i] = sop(acc[i], x[i]);
+        }
+    }
+
+    /// <summary>
+    /// Reduce a tensor with reversed strides by transposing the reduced axes to the innermost dimensions and reducing element by element.
+    /// </summary>
+    private static DenseTensor<T> ReduceTransposed(Tensor<T> data, int[] axes, Func<T, T, T> sop, T identity)
+    {
+        var permutation = ArrayUtilities.GetAxesPermutationForReduction(axes, data.Rank);
+        var pdata = permutation is not null ? Transpose(data, permutation) : data;
+        var paxes = permutation is not null ? ArrayUtilities.GetInnerMostAxes(axes.Length, data.Rank) : axes;
         var (oshape, rshape) = ArrayUtilities.ComputeShapesForReduction(pdata.dimensions, paxes);
-        var output = DenseTensor<float>.OfShape(oshape);
+        var output = DenseTensor<T>.OfShape(oshape);
+        var r = ArrayUtilities.ComputeOffsetForReduction(rshape);
 
         StartOpStage(OpStage.Math);
-        var r = ArrayUtilities.ComputeOffsetForReduction(rshape);
         for (var i = 0; i < output.Length; ++i)
         {
-            var offset = i * r;
-            var sum = 0.0f;
+            var result = identity;
             for (int j = 0; j < r; ++j)
             {
-                sum += pdata.GetValue(offset + j);
+                result = sop(result, pdata.GetValue(i * r + j));
             }
-            output.SetValue(i, sum);
+            output.SetValue(i, result);
         }
+        return output;
+    }
+
+    public static Tensor<int> ReduceSum(Tensor<int> data, Tensor<int> axes = null, bool? _keepDims = null, bool? _noOpWithEmptyAxes = null)
+    {
+        StartOpStage(OpStage.ValidateArguments);
+        if (axes is not null && axes.Length > data.Rank) throw new ArgumentException(nameof(axes), "The number of axes specified must be less than the tensor rank.");
+        if (axes is not null && !axes.All(a => a < data.Rank)) throw new ArgumentException(nameof(axes), $"Each axis specified must be less than the rank of the tensor.");
+        if (axes is not null && !ArrayUtilities.CheckNoRepeatedDims(axes.ToArray())) throw new ArgumentException(nameof(axes), "axes contains a repeated dimension.");
+
+        StartOpStage(OpStage.CalculateIndices);
+        var keepDims = _keepDims.HasValue ? _keepDims.Value : false;
+        var noOpWithEmptyAxes = _noOpWithEmptyAxes.HasValue ? _noOpWithEmptyAxes.Value : false;
+        var _axes = axes is null || axes.Length == 0 ? Enumerable.Range(0, data.Rank).ToArray() : axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(data.Rank, a)).ToArray();
+        var output = Tensor<int>.Reduce(data, _axes, (l, r) => l + r, (l, r) => l + r, 0);
         if (keepDims)
         {
-            return Tensor<float>.Unsqueeze(output, _axes);
+            return Tensor<int>.Unsqueeze(output, _axes);
         }
         else
         {
@@ -1656,7 +2591,7 @@ where T : unmanaged
         }
     }
 
-    public static Tensor<double> ReduceSum(Tensor<double> data, Tensor<int> axes = null, bool? _keepDims = null, bool? _noOpWithEmptyAxes = null)
+    public static Tensor<float> ReduceSum(Tensor<float> data, Tensor<int> axes = null, bool? _keepDims = null, bool? _noOpWithEmptyAxes = null)
     {
         StartOpStage(OpStage.ValidateArguments);
         if (axes is not null && axes.Length > data.Rank) throw new ArgumentException(nameof(axes), "The number of axes specified must be less than the tensor rank.");
@@ -1667,35 +2602,29 @@ where T : unmanaged
         var keepDims = _keepDims.HasValue ? _keepDims.Value : false;
         var noOpWithEmptyAxes = _noOpWithEmptyAxes.HasValue ? _noOpWithEmptyAxes.Value : false;
         var _axes = axes is null || axes.Length == 0 ? Enumerable.Range(0, data.Rank).ToArray() : axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(data.Rank, a)).ToArray();
-        var permutation = ArrayUtilities.GetAxesPermutationForReduction(_axes, data.Rank);
-        Tensor<double> pdata;
-        int[] paxes;
-        if (permutation is not null)
+        var output = Tensor<float>.Reduce(data, _axes, (l, r) => l + r, (l, r) => l + r, 0.0f);
+        if (keepDims)
         {
-            pdata = Tensor<double>.Transpose(data, permutation);
-            paxes = ArrayUtilities.GetInnerMostAxes(_axes.Length, data.Rank);
+            return Tensor<float>.Unsqueeze(output, _axes);
         }
         else
         {
-            pdata = data;
-            paxes = _axes;
+            return output;
         }
+    }
 
-        var (oshape, rshape) = ArrayUtilities.ComputeShapesForReduction(pdata.dimensions, paxes);
-        var output = DenseTensor<double>.OfShape(oshape);
+    public static Tensor<double> ReduceSum(Tensor<double> data, Tensor<int> axes = null, bool? _keepDims = null, bool? _noOpWithEmptyAxes = null)
+    {
+        StartOpStage(OpStage.ValidateArguments);
+        if (axes is not null && axes.Length > data.Rank) throw new ArgumentException(nameof(axes), "The number of axes specified must be less than the tensor rank.");
+        if (axes is not null && !axes.All(a => a < data.Rank)) throw new ArgumentException(nameof(axes), $"Each axis specified must be less than the rank of the tensor.");
+        if (axes is not null && !ArrayUtilities.CheckNoRepeatedDims(axes.ToArray())) throw new ArgumentException(nameof(axes), "axes contains a repeated dimension.");
 
-        StartOpStage(OpStage.Math);
-        var r = ArrayUtilities.ComputeOffsetForReduction(rshape);
-        for (var i = 0; i < output.Length; ++i)
-        {
-            var offset = i * r;
-            var sum = 0.0;
-            for (int j = 0; j < r; ++j)
-            {
-                sum += pdata.GetValue(offset + j);
-            }
-            output.SetValue(i, sum);
-        }
+        StartOpStage(OpStage.CalculateIndices);
+        var keepDims = _keepDims.HasValue ? _keepDims.Value : false;
+        var noOpWithEmptyAxes = _noOpWithEmptyAxes.HasValue ? _noOpWithEmptyAxes.Value : false;
+        var _axes = axes is null || axes.Length == 0 ? Enumerable.Range(0, data.Rank).ToArray() : axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(data.Rank, a)).ToArray();
+        var output = Tensor<double>.Reduce(data, _axes, (l, r) => l + r, (l, r) => l + r, 0.0);
         if (keepDims)
         {
             return Tensor<double>.Unsqueeze(output, _axes);
@@ -1774,8 +2703,8 @@ where T : unmanaged
         var r = Convert.ToDouble(ArrayUtilities.ComputeOffsetForReduction(rshape));
         
         StartOpStage(OpStage.Math);
-        Tensor<double> output = Tensor<double>.Divide(data, r);
-        output = Tensor<double>.ReduceSum(output, _axes.ToTensor<int>());
+        Tensor<double> output = Tensor<double>.ReduceSum(data, _axes.ToTensor<int>());
+        output = Tensor<double>.Divide(output, r);
         if (keepDims)
         {
             return Tensor<double>.Unsqueeze(output, _axes);
@@ -1796,38 +2725,7 @@ where T : unmanaged
         StartOpStage(OpStage.CalculateIndices);
         var _axes = axes is null || axes.Length == 0 ? Enumerable.Range(0, data.Rank).ToArray() : axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(data.Rank, a)).ToArray();
         var keepDims = _keepDims.HasValue ? _keepDims.Value : true;
-        var permutation = ArrayUtilities.GetAxesPermutationForReduction(_axes, data.Rank);
-        Tensor<float> pdata;
-        int[] paxes;
-        if (permutation is not null)
-        {
-            pdata = Tensor<float>.Transpose(data, permutation);
-            paxes = ArrayUtilities.GetInnerMostAxes(_axes.Length, data.Rank);
-        }
-        else
-        {
-            pdata = data;
-            paxes = _axes;
-        }
-        var (oshape, rshape) = ArrayUtilities.ComputeShapesForReduction(pdata.dimensions, paxes);
-        var output = DenseTensor<float>.OfShape(oshape);
-        var r = ArrayUtilities.ComputeOffsetForReduction(rshape);
-
-        StartOpStage(OpStage.Math);
-        for (var i = 0; i < output.Length; ++i)
-        {
-            var offset = i * r;
-            var max = 0.0f;
-            for (int j = 0; j < r; ++j)
-            {
-                var v = pdata.GetValue(offset + j);
-                if (v > max)
-                {
-                    max = v;
-                }
-            }
-            output.SetValue(i, max);
-        }
+        var output = Tensor<float>.Reduce(data, _axes, (l, r) => Vector.Max(l, r), (l, r) => MathF.Max(l, r), float.NegativeInfinity);
         if (keepDims)
         {
             return Tensor<float>.Unsqueeze(output, _axes);
@@ -1848,38 +2746,7 @@ where T : unmanaged
         StartOpStage(OpStage.CalculateIndices);
         var _axes = axes is null || axes.Length == 0 ? Enumerable.Range(0, data.Rank).ToArray() : axes.Select(a => ArrayUtilities.HandleNegativeAxisOrIndex(data.Rank, a)).ToArray();
         var keepDims = _keepDims.HasValue ? _keepDims.Value : true;
-        var permutation = ArrayUtilities.GetAxesPermutationForReduction(_axes, data.Rank);
-        Tensor<double> pdata;
-        int[] paxes;
-        if (permutation is not null)
-        {
-            pdata = Tensor<double>.Transpose(data, permutation);
-            paxes = ArrayUtilities.GetInnerMostAxes(_axes.Length, data.Rank);
-        }
-        else
-        {
-            pdata = data;
-            paxes = _axes;
-        }
-        var (oshape, rshape) = ArrayUtilities.ComputeShapesForReduction(pdata.dimensions, paxes);
-        var output = DenseTensor<double>.OfShape(oshape);
-        var r = ArrayUtilities.ComputeOffsetForReduction(rshape);
-
-        StartOpStage(OpStage.Math);
-        for (var i = 0; i < output.Length; ++i)
-        {
-            var offset = i * r;
-            var max = 0.0;
-            for (int j = 0; j < r; ++j)
-            {
-                var v = pdata.GetValue(offset + j);
-                if (v > max)
-                {
-                    max = v;
-                }
-            }
-            output.SetValue(i, max);
-        }
+        var output = Tensor<double>.Reduce(data, _axes, (l, r) => Vector.Max(l, r), (l, r) => Math.Max(l, r), double.NegativeInfinity);
         if (keepDims)
         {
             return Tensor<double>.Unsqueeze(output, _axes);
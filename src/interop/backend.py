@@ -1,4 +1,5 @@
 import os
+import threading
 import onnx
 
 from typing import Any, Optional, Sequence, Tuple, Dict
@@ -17,7 +18,7 @@ clr.AddReference(os.path.join(file_dir, "..", "Lokad.Onnx.Interop", "bin", "Rele
 
 from System import Array, String
 from System.Collections.Generic import Dictionary
-from Lokad.Onnx import ITensor, ComputationalGraph
+from Lokad.Onnx import ITensor, ComputationalGraph, TensorArena
 from Lokad.Onnx.Interop import Tensors,Graph
         
 class LokadOnnxRep(BackendRep):
@@ -25,18 +26,63 @@ class LokadOnnxRep(BackendRep):
         super().__init__()
         self.model = model
         self.graph = graph
+        self.plan = graph.Compile()
+        # Plans that only compute some of the graph outputs or intermediate tensors, keyed by the tuple of output names.
+        self.plans = {None: self.plan}
+        # Each call to run executes with its own context so that one rep can serve concurrent callers. Calls into .NET 
+        # release the GIL, so threads calling run at the same time execute the graph in parallel. Idle contexts are kept 
+        # for reuse, which also keeps their tensor arenas warm.
+        self.contexts = {None: []}
+        self.contexts_lock = threading.Lock()
+
+    def get_plan(self, output_names:Optional[Tuple[str, ...]]=None):
+        with self.contexts_lock:
+            if output_names not in self.plans:
+                self.plans[output_names] = self.graph.Compile(Array[String](list(output_names)))
+                self.contexts[output_names] = []
+            return self.plans[output_names]
+
+    def acquire_context(self, output_names:Optional[Tuple[str, ...]]=None):
+        plan = self.get_plan(output_names)
+        with self.contexts_lock:
+            if len(self.contexts[output_names]) > 0:
+                return self.contexts[output_names].pop()
+        return self.graph.CreateContext(plan)
+
+    def release_context(self, context, output_names:Optional[Tuple[str, ...]]=None):
+        context.Reset()
+        with self.contexts_lock:
+            self.contexts[output_names].append(context)
 
     def run(self, inputs, **kwargs):
         file_args = kwargs['file_args'] if 'file_args' in kwargs else []
         save_file_arg = kwargs['save_file_arg'] if 'save_file_arg' in kwargs else False
         use_initializers = kwargs['use_initializers'] if 'use_initializers' in kwargs else False
+        zero_copy = kwargs['zero_copy'] if 'zero_copy' in kwargs else False
+        copy = kwargs['copy'] if 'copy' in kwargs else False
+        out = kwargs['outputs'] if 'outputs' in kwargs else kwargs['out'] if 'out' in kwargs else None
+        output_names = kwargs['output_names'] if 'output_names' in kwargs else None
         if not isinstance(file_args, list):
             raise TypeError(f'The file_args argument must be type list, not {type(file_args)}')
         if not isinstance(save_file_arg, bool):
             raise TypeError(f'The save_file_arg argument must be type bool, not {type(save_file_arg)}')
+        if not isinstance(zero_copy, bool):
+            raise TypeError(f'The zero_copy argument must be type bool, not {type(zero_copy)}')
+        if not isinstance(copy, bool):
+            raise TypeError(f'The copy argument must be type bool, not {type(copy)}')
+        if out is not None and not isinstance(out, (dict, list, tuple)):
+            raise TypeError(f'The outputs argument must be type dict, list or tuple, not {type(out)}')
+        if output_names is not None and (not isinstance(output_names, (list, tuple)) or not all(isinstance(n, str) for n in output_names)):
+            raise TypeError(f'The output_names argument must be a list or tuple of str, not {type(output_names)}')
         
-        r = False
-        
+        # Only the nodes needed to compute the requested graph outputs or intermediate tensors are executed.
+        output_names = tuple(output_names) if output_names is not None else None
+        # Graph outputs with a caller-provided buffer are written directly into the ndarray, which is 
+        # returned as is. Like zero-copy inputs, the buffers are kept alive by the caller until run returns.
+        output_buffers = self.get_output_buffers(out, output_names) if out is not None else None
+        # In zero-copy mode the input tensors wrap the ndarray buffers directly. The arrays are kept alive by 
+        # the inputs argument until the graph outputs are converted and the execution context is reset below.
+        make_tensor = tensors.make_tensor_from_ndarray_zero_copy if zero_copy else tensors.make_tensor_from_ndarray
         if isinstance(inputs, dict):
             _inputs = {}
             for key, value in inputs.items():
@@ -45,24 +91,28 @@ class LokadOnnxRep(BackendRep):
                 if key in file_args:
                     _inputs[key] = Graph.GetInputTensorFromFileArg(value, save_file_arg)
                 else:
-                    _inputs[key] = tensors.make_tensor_from_ndarray(value)
-            r = self.graph.Execute(tensors.make_tensor_dictionary(_inputs), use_initializers)
+                    _inputs[key] = make_tensor(value)
+            graph_inputs = tensors.make_tensor_dictionary(_inputs)
         elif isinstance(inputs, list):
             _inputs=[]
             for index,value in enumerate(inputs):
                 if index in file_args:
                     _inputs.append(Graph.GetInputTensorFromFileArg(value, save_file_arg))
                 else:
-                    _inputs.append(tensors.make_tensor_from_ndarray(value))
-            r = self.graph.Execute(tensors.make_tensor_array(_inputs), use_initializers)
+                    _inputs.append(make_tensor(value))
+            graph_inputs = tensors.make_tensor_array(_inputs)
         else:
             raise RuntimeError(f'The input type {type(inputs)} is not supported by the backend.')
         
-        if not r:
-            raise RuntimeError('The graph did not execute successfully.')
-        outputs = self.convert_graph_outputs(self.graph.Outputs, 'Outputs')
-        self.graph.Reset()
-        return outputs
+        # The context goes back to the pool even if execution or output conversion raises.
+        context = self.acquire_context(output_names)
+        try:
+            r = self.graph.Execute(context, graph_inputs, use_initializers, tensors.make_tensor_dictionary(output_buffers) if output_buffers is not None else None)
+            if not r:
+                raise RuntimeError('The graph did not execute successfully.')
+            return self.convert_graph_outputs(context.Outputs, 'Outputs', copy, self.get_output_ndarrays(out, output_names) if out is not None else None, output_names, context.Plan)
+        finally:
+            self.release_context(context, output_names)
     
     def run_node(self, node:Any, inputs:Any, **kwargs: Dict[str, Any]):
         node_name = '' 
@@ -74,6 +124,7 @@ class LokadOnnxRep(BackendRep):
         file_args = kwargs['file_args'] if 'file_args' in kwargs else []
         save_file_arg = kwargs['save_file_arg'] if 'save_file_arg' in kwargs else False
         use_initializers = kwargs['use_initializers'] if 'use_initializers' in kwargs else False
+        copy = kwargs['copy'] if 'copy' in kwargs else False
 
         r = False
 
@@ -99,18 +150,49 @@ class LokadOnnxRep(BackendRep):
         if not r:
             raise RuntimeError('The graph did not execute successfully.')
         
-        outputs = self.convert_graph_outputs(self.graph.Outputs, 'Outputs')
+        outputs = self.convert_graph_outputs(self.graph.Outputs, 'Outputs', copy)
         self.graph.Reset()
         return outputs
 
-    def convert_graph_outputs(self, dict, name:str):
+    def convert_graph_outputs(self, dict, name:str, copy:bool=False, out:Optional[Dict[str, np.ndarray]]=None, names:Optional[Sequence[str]]=None, plan=None):
+        '''
+        Converts graph output tensors to ndarrays. Unless copy is True the ndarrays are views of 
+        the output tensor buffers, which stay pinned until the ndarrays are released. Views of 
+        outputs that share a buffer with an initializer or a constant of plan are read-only so 
+        writing to them cannot change the model. Outputs that have a caller-provided ndarray in 
+        out are returned as that ndarray. If names is not None the outputs are returned in that order.
+        '''
         keys = []
         values = []
         for kv in dict:
             keys.append(kv.Key)
-            values.append(tensors.make_ndarray_from_tensor(kv.Value))
+            if out is not None and kv.Key in out:
+                values.append(out[kv.Key])
+            else:
+                readonly = not copy and self.graph.SharesInitializerArray(kv.Value, plan)
+                values.append(tensors.make_ndarray_from_tensor(kv.Value, copy, readonly))
+        if names is not None:
+            values = [values[keys.index(n)] for n in names]
+            keys = list(names)
         return namedtupledict(name, keys)(*values)
     
+    def get_output_ndarrays(self, out, output_names:Optional[Sequence[str]]=None) -> Dict[str, np.ndarray]:
+        if isinstance(out, dict):
+            for key, value in out.items():
+                if not isinstance(key, str) or not isinstance(value, np.ndarray):
+                    raise TypeError(f'An outputs dictionary item must have type str:ndarray, not {type(key)}:{type(value)}.')
+            return out
+        output_names = list(output_names) if output_names is not None else [o.name for o in self.model.graph.output]
+        if len(out) > len(output_names):
+            raise ValueError(f'{len(out)} output buffers were specified but the graph has only {len(output_names)} outputs.')
+        for value in out:
+            if not isinstance(value, np.ndarray):
+                raise TypeError(f'An output buffer must have type ndarray, not {type(value)}.')
+        return dict(zip(output_names, out))
+
+    def get_output_buffers(self, out, output_names:Optional[Sequence[str]]=None) -> Dict[str, ITensor]:
+        return {key: tensors.make_output_tensor_from_ndarray(value) for key, value in self.get_output_ndarrays(out, output_names).items()}
+
     def get_onnx_node(self, name:str):
         for node in self.model.graph.node:
             if node.name == name:
@@ -119,7 +201,7 @@ class LokadOnnxRep(BackendRep):
     
     def get_initializer(self, name:str):
         if self.graph.Initializers.ContainsKey(name):
-            return tensors.make_ndarray_from_tensor(self.graph.Initializers[name])
+            return tensors.make_ndarray_from_tensor(self.graph.Initializers[name], readonly=True)
         else:
             raise ValueError(f'The graph does not contain the initializer {name}.')
 
@@ -143,6 +225,11 @@ class LokadOnnxBackend(Backend):
     def prepare(cls, model:onnx.ModelProto, device:str='CPU', **kwargs) -> LokadOnnxRep:
         super(LokadOnnxBackend, cls).prepare(model, device, **kwargs)
         graph = load_graph(model.SerializeToString())
+        graph.ReleaseDeadTensors = kwargs['release_dead_tensors'] if 'release_dead_tensors' in kwargs else False
+        graph.ExecuteInPlace = kwargs['execute_in_place'] if 'execute_in_place' in kwargs else False
+        if 'use_arena' in kwargs and kwargs['use_arena']:
+            graph.Arena = TensorArena()
+        graph.InterOpParallelism = kwargs['inter_op_parallelism'] if 'inter_op_parallelism' in kwargs else 1
         return LokadOnnxRep(model, graph)
     
     @classmethod
@@ -187,9 +274,14 @@ class LokadOnnxBackend(Backend):
         return rep.run_node(node.name, node_inputs_list, **kwargs) if isinstance(inputs, list) else rep.run_node(node.name, node_inputs_dict, **kwargs)
         
     @classmethod
-    def prepare_file(cls, file_path:str) -> LokadOnnxRep:
+    def prepare_file(cls, file_path:str, **kwargs) -> LokadOnnxRep:
         model = onnx.load(file_path)
-        graph = load_graph(file_path)
+        graph = Graph.Load(file_path, kwargs['cache_dir']) if 'cache_dir' in kwargs and kwargs['cache_dir'] is not None else load_graph(file_path)
+        graph.ReleaseDeadTensors = kwargs['release_dead_tensors'] if 'release_dead_tensors' in kwargs else False
+        graph.ExecuteInPlace = kwargs['execute_in_place'] if 'execute_in_place' in kwargs else False
+        if 'use_arena' in kwargs and kwargs['use_arena']:
+            graph.Arena = TensorArena()
+        graph.InterOpParallelism = kwargs['inter_op_parallelism'] if 'inter_op_parallelism' in kwargs else 1
         return LokadOnnxRep(model, graph)
 
     @classmethod
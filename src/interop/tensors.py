@@ -134,7 +134,62 @@ def make_tensor_from_ndarray(a:np.ndarray[Any]) -> ITensor:
         return Tensors.MakeTensor[System.Double](asNetArray(a)) if a.ndim > 0 else Tensors.MakeScalar[System.Double](a.item())
     else: raise RuntimeError('fThe type {a.dtype} is not supported.')
 
-def make_ndarray_from_tensor(t:ITensor) -> np.ndarray[Any]:
+def make_tensor_from_ndarray_zero_copy(a:np.ndarray[Any]) -> ITensor:
+    '''
+    Given a C-contiguous `numpy.ndarray` returns a DenseTensor that wraps the array data 
+    buffer directly without copying it. The caller must keep `a` alive for as long as the 
+    tensor is in use. Arrays that cannot be wrapped (scalars, non-contiguous or unaligned 
+    arrays, non-native byte order or unsupported dtypes) are copied using make_tensor_from_ndarray.
+    '''
+    if a.ndim == 0 or not a.flags.c_contiguous or not a.flags.aligned or a.dtype not in _MAP_NP_NET:
+        return make_tensor_from_ndarray(a)
+    dims = Array[int](list(a.shape))
+    return Tensors.MakeTensorFromPointer[_MAP_NP_NET[a.dtype]](a.ctypes.data, dims)
+
+def make_output_tensor_from_ndarray(a:np.ndarray[Any]) -> ITensor:
+    '''
+    Given a preallocated `numpy.ndarray` returns a DenseTensor that wraps the array data buffer 
+    so that graph outputs can be written directly into it. The array must be C-contiguous, 
+    aligned, writeable and have a supported dtype. The caller must keep `a` alive for as long 
+    as the tensor is in use.
+    '''
+    if a.ndim == 0 or not a.flags.c_contiguous or not a.flags.aligned or not a.flags.writeable:
+        raise ValueError('An output buffer must be a writeable, aligned, C-contiguous array with at least 1 dimension.')
+    if a.dtype not in _MAP_NP_NET:
+        raise ValueError(f'The output buffer dtype {a.dtype} is not supported.')
+    return make_tensor_from_ndarray_zero_copy(a)
+
+class TensorBuffer:
+    '''
+    Owns a pinned .NET tensor buffer and exposes it to numpy through the array interface 
+    protocol. The tensor is kept alive and its buffer pinned until this object is released, 
+    which happens when the last numpy array viewing the buffer is garbage collected.
+    '''
+    def __init__(self, t:ITensor, readonly:bool=False):
+        self.handle = Tensors.PinTensor(t)
+        self.__array_interface__ = {
+            'shape': tuple(self.handle.Dims),
+            'typestr': _MAP_NET_NP[self.handle.PrimitiveType.Name].str,
+            'data': (self.handle.Pointer, readonly),
+            'version': 3,
+        }
+
+    def __del__(self):
+        self.handle.Dispose()
+
+def make_ndarray_from_tensor(t:ITensor, copy:bool=False, readonly:bool=False) -> np.ndarray[Any]:
+    '''
+    Given an ITensor returns a `numpy.ndarray`. By default the array is a view of the pinned 
+    tensor buffer and no data is copied. Pass copy=True to get an array that owns a copy of 
+    the data instead. Tensors that wrap memory not owned by .NET (e.g. zero-copy inputs) and 
+    tensors with unsupported element types are always copied.
+    '''
+    if not copy and t.PrimitiveType.Name in _MAP_NET_NP:
+        buf = TensorBuffer(t, readonly)
+        if buf.handle.IsManaged:
+            return np.asarray(buf)
+        else:
+            del buf
     a =  asNumpyArray(t.ToArray())
     a.resize(t.Dims)
     return a
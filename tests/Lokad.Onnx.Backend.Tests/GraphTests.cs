@@ -29,6 +29,279 @@ namespace Lokad.Onnx.Backend.Tests
             Assert.True(o[5] > 0.48);
         }
 
+        [Fact]
+        public void CanFuseMatMulAdd()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var node = Assert.Single(g.Nodes, n => n.Op == OpType.MatMulAdd);
+            Assert.Equal(new[] { "Plus214_Output_0" }, node.Outputs);
+            Assert.DoesNotContain("Times212_Output_0", g.IntermediateOutputs.Keys);
+            Assert.Equal(0, GraphOptimizer.FuseMatMulAdd(g));
+            Assert.True(g.ExecuteNode(new ITensor[] { Tensor<float>.Ones(1, 10) }, "Plus214", true));
+        }
+
+        [Fact]
+        public void CanFoldConstants()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            // Times212_reshape1 only reshapes the Parameter193 initializer and Times212 is fused with Plus214.
+            Assert.Equal(g.Model.Graph.Node.Count - 2, g.Nodes.Count);
+            Assert.DoesNotContain(g.Nodes, n => n.Name == "Times212_reshape1");
+            Assert.Equal(new[] { 256, 10 }, g.Initializers["Parameter193_reshape1"].Dims);
+            Assert.Equal(0, GraphOptimizer.FoldConstants(g));
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            Assert.True(g.Execute(ui, true));
+            var o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+        }
+
+        [Fact]
+        public void CanInferWithMnistPlan()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var plan = g.Compile();
+            Assert.Equal(g.Nodes.Count, plan.Nodes.Length);
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            Assert.True(g.Execute(plan, ui, true));
+            var o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+            g.Reset();
+            Assert.True(g.Execute(plan, Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist2.png::mnist" })!, true));
+            o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True((float)o[2] > 0.9);
+        }
+
+        [Fact]
+        public void CanInferWithMnistSpecializedPlan()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            var plan = g.GetPlan(ui, true);
+            Assert.NotNull(plan.InputShapes);
+            Assert.Same(plan, g.GetPlan(ui, true));
+            Assert.Equal(new[] { 1, 10 }, plan.SlotShapes[plan.Slot(g.Outputs.Keys.First())]!.Dims);
+            Assert.True(g.Execute(plan, ui, true));
+            var o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+            g.Reset();
+            Assert.False(g.Execute(plan, new ITensor[] { new DenseTensor<float>(new[] { 1, 1, 14, 14 }) }, true));
+        }
+
+        [Fact]
+        public void CanInferWithMnistReleasingDeadTensors()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            g.ReleaseDeadTensors = true;
+            var lastUses = g.GetIntermediateTensorLastUses();
+            Assert.Equal(g.IntermediateOutputs.Count, lastUses.Count);
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            Assert.True(g.Execute(ui, true));
+            Assert.All(g.IntermediateOutputs.Values, t => Assert.Null(t));
+            var o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+            g.Reset();
+            Assert.True(g.Execute(g.Compile(), ui, true));
+            o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+        }
+
+        [Fact]
+        public void CanInferWithMnistArena()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            g.Arena = new TensorArena();
+            g.ReleaseDeadTensors = true;
+            var plan = g.Compile();
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            Assert.True(g.Execute(plan, ui, true));
+            var o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+            g.Reset();
+            var allocated = g.Arena.BytesAllocated;
+            Assert.True(g.Execute(plan, Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist2.png::mnist" })!, true));
+            o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True((float)o[2] > 0.9);
+            Assert.True(g.Arena.Hits > 0);
+            Assert.True(g.Arena.BytesReused > 0);
+            Assert.True(g.Arena.BytesAllocated - allocated < allocated);
+        }
+
+        [Fact]
+        public void CanInferWithMnistConcurrently()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var plan = g.Compile();
+            Assert.True(g.Execute(plan, Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!, true));
+            var expected = (Tensor<float>) g.Outputs.Values.First();
+            g.Reset();
+            g.InterOpParallelism = 4;
+            g.ReleaseDeadTensors = true;
+            g.Arena = new TensorArena();
+            Assert.True(g.Execute(plan, Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!, true));
+            Assert.Equal(expected, (Tensor<float>) g.Outputs.Values.First());
+            var o = (Tensor<float>) g.Outputs.Values.First().RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+        }
+
+        [Fact]
+        public void CanInferWithMnistConcurrentContexts()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            g.Arena = new TensorArena();
+            g.ReleaseDeadTensors = true;
+            var plan = g.Compile();
+            var images = new[] { "images\\mnist4.png::mnist", "images\\mnist2.png::mnist" };
+            var expected = new[] { 4, 2 };
+            var results = new bool[16];
+            System.Threading.Tasks.Parallel.For(0, results.Length, i =>
+            {
+                var context = g.CreateContext(plan);
+                var ui = Data.GetInputTensorsFromFileArgs(new[] { images[i % 2] })!;
+                var r = g.Execute(context, ui, true);
+                var o = (Tensor<float>) context.Outputs.Values.First().RemoveDim(0).Softmax();
+                results[i] = r && o[expected[i % 2]] > 0.9;
+            });
+            Assert.All(results, r => Assert.True(r));
+        }
+
+        [Fact]
+        public void CanInferWithMnistIntoOutputBuffer()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            var name = g.Outputs.Keys.First();
+            var ob = new DenseTensor<float>(new[] { 1, 10 });
+            Assert.True(g.Execute(ui, true, new Dictionary<string, ITensor>() { { name, ob } }));
+            Assert.Same(ob, g.Outputs[name]);
+            var o = (Tensor<float>) ((ITensor) ob).RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+            g.Reset();
+            Assert.False(g.Execute(ui, true, new Dictionary<string, ITensor>() { { name, new DenseTensor<float>(new[] { 1, 9 }) } }));
+        }
+
+        [Fact]
+        public void CanReadOutputCopiedToBuffer()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            var conv = g.Nodes[0].Outputs[0];
+            var add = g.Nodes[1].Outputs[0];
+            Assert.True(g.Execute(ui, true, new[] { conv, add }));
+            var expected = ((Tensor<float>) g.Outputs[add]).ToArray();
+
+            // The Conv output is copied to the buffer and its tensor is returned to the arena, so the Add that reads it must read the buffer.
+            g.Arena = new TensorArena();
+            var ob = new DenseTensor<float>(g.Outputs[conv].Dims);
+            Assert.True(g.Execute(ui, true, new[] { conv, add }, new Dictionary<string, ITensor>() { { conv, ob } }));
+            Assert.Same(ob, g.Outputs[conv]);
+            Assert.Equal(expected, ((Tensor<float>) g.Outputs[add]).ToArray());
+        }
+
+        [Fact]
+        public void CanWriteOutputToBufferWithoutAllocating()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            var name = g.Outputs.Keys.First();
+            g.Arena = new TensorArena();
+            var plan = g.Compile();
+            Assert.Equal(OpType.MatMulAdd, Assert.Single(plan.Nodes, n => n.OutputKernel is not null).Node.Op);
+            Assert.True(g.Execute(plan, ui, true));
+            var expected = ((Tensor<float>) g.Outputs[name]).ToArray();
+            var requests = g.Arena.Requests;
+            Assert.True(g.Execute(plan, ui, true));
+            var allocated = g.Arena.Requests - requests;
+
+            // The MatMulAdd node writes the output directly to the buffer so it requests one tensor less from the arena.
+            var ob = new DenseTensor<float>(new[] { 1, 10 });
+            requests = g.Arena.Requests;
+            Assert.True(g.Execute(plan, ui, true, new Dictionary<string, ITensor>() { { name, ob } }));
+            Assert.Equal(allocated - 1, g.Arena.Requests - requests);
+            Assert.Same(ob, g.Outputs[name]);
+            Assert.Equal(expected, ob.ToArray());
+        }
+
+        [Fact]
+        public void CanFindTensorsSharingInitializerArray()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            var name = g.Outputs.Keys.First();
+            var w = "Parameter193_reshape1";
+            // The raw data of the model is not a managed array so the initializer is replaced by an array-backed copy.
+            g.Initializers[w] = g.Initializers[w].Clone();
+            var plan = g.Compile();
+            Assert.True(g.Execute(plan, ui, true));
+            Assert.False(g.SharesInitializerArray(g.Outputs[name], plan));
+            Assert.True(g.SharesInitializerArray(g.Initializers[w], plan));
+            Assert.True(g.SharesInitializerArray(g.Initializers[w].Reshape(2560), plan));
+            Assert.False(g.SharesInitializerArray(g.Initializers[w].Clone(), plan));
+        }
+
+        [Fact]
+        public void CanInferWithMnistSelectedOutputs()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            var name = g.Outputs.Keys.First();
+            var pool = "Pooling66_Output_0";
+            Assert.Equal(4, g.Compile(new[] { pool }).Nodes.Length);
+            Assert.True(g.Execute(ui, true, new[] { pool }));
+            Assert.Equal(new[] { pool }, g.Outputs.Keys);
+            Assert.Equal(new[] { 1, 8, 14, 14 }, g.Outputs[pool].Dims);
+            Assert.True(g.Execute(ui, true, new[] { name, pool }));
+            var o = (Tensor<float>) g.Outputs[name].RemoveDim(0).Softmax();
+            Assert.True(o[4] > 0.9);
+            Assert.False(g.Execute(ui, true, new[] { "NotATensor" }));
+        }
+
+        [Fact]
+        public void CanExecuteElementwiseNodesInPlace()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            var name = g.Outputs.Keys.First();
+            var plan = g.Compile();
+            Assert.Equal(new[] { -1, 0, 0, -1, -1, 0, 0, -1, -1, -1 }, plan.Nodes.Select(n => n.InPlaceInput));
+            g.ExecuteInPlace = false;
+            Assert.True(g.Execute(ui, true));
+            var expected = ((Tensor<float>) g.Outputs[name]).ToArray();
+            g.ExecuteInPlace = true;
+            g.Reset();
+            Assert.True(g.Execute(ui, true));
+            Assert.Equal(expected, ((Tensor<float>) g.Outputs[name]).ToArray());
+
+            // The output of the bias Add is requested so the Relu that reads it cannot overwrite it.
+            var add = g.Nodes[1].Outputs[0];
+            var relu = g.Nodes[2].Outputs[0];
+            Assert.Equal(new[] { -1, 0, -1 }, g.Compile(new[] { add, relu }).Nodes.Select(n => n.InPlaceInput));
+            Assert.True(g.Execute(ui, true, new[] { add, relu }));
+            var a = (Tensor<float>) g.Outputs[add];
+            var r = (Tensor<float>) g.Outputs[relu];
+            Assert.Equal(a.ToArray().Select(v => Math.Max(v, 0.0f)), r.ToArray());
+        }
+
+        [Fact]
+        public void CanSortNodesTopologically()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var nodes = g.Nodes.ToList();
+            Assert.True(g.IsTopologicallySorted());
+            var producers = g.GetProducers();
+            var predecessors = g.GetPredecessors();
+            Assert.Equal(nodes.Count, predecessors.Length);
+            Assert.Empty(predecessors[0]);
+            for (int i = 1; i < nodes.Count; i++)
+            {
+                Assert.Contains(i - 1, predecessors[i]);
+                Assert.All(predecessors[i], p => Assert.True(p < i));
+            }
+            Assert.Equal(nodes.Count - 1, producers[g.Outputs.Keys.First()]);
+            var reversed = Enumerable.Reverse(nodes).ToList();
+            Assert.False(ComputationalGraph.IsTopologicallySorted(reversed));
+            Assert.Equal(nodes, ComputationalGraph.GetTopologicalOrder(reversed));
+        }
+
         [Fact]
         public void CanInferWithMnist2()
         {
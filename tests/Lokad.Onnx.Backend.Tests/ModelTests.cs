@@ -1,4 +1,5 @@
 using Lokad.Onnx.Backend;
+using System.Runtime.InteropServices;
 using System.Runtime.Versioning;
 using System.Xml.Schema;
 
@@ -13,5 +14,73 @@ namespace Lokad.Onnx.Backend.Tests
             var m = Model.Parse("models\\mnist-8.onnx");
             Assert.NotNull(m);
         }
+
+        [Fact]
+        public void CanLoadInitializersLazily()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            Assert.False(g.Initializers.IsMaterialized("Parameter5"));
+            var w = g.Initializers["Parameter5"];
+            Assert.True(g.Initializers.IsMaterialized("Parameter5"));
+            Assert.Same(w, g.Initializers["Parameter5"]);
+        }
+
+        [Fact]
+        public void CanLoadOnlyInitializersReadByPlan()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var plan = g.Compile(new[] { g.Nodes[1].Outputs[0] });
+            Assert.Equal(new[] { "Parameter5", "Parameter6" }, plan.InitializerSlots.Keys.OrderBy(n => n));
+            // The initializers folded into Parameter193_reshape1 when the model was loaded are not read by any node.
+            Assert.Equal(new[] { "Parameter193", "Parameter193_reshape1_shape" }, g.Initializers.Keys.Except(g.Compile().InitializerSlots.Keys).OrderBy(n => n));
+        }
+
+        [Fact]
+        public void CanSpecializePlanWithoutLoadingWeights()
+        {
+            var g = Model.Load("models\\mnist-8.onnx")!;
+            var loaded = g.Initializers.MaterializedCount;
+            var input = g.Inputs.Keys.First(n => !g.Initializers.ContainsKey(n));
+            var shapes = new Dictionary<string, int[]>() { { input, new[] { 1, 1, 28, 28 } } };
+            g.Compile(shapes, new[] { g.Nodes[1].Outputs[0] });
+            Assert.Equal(loaded, g.Initializers.MaterializedCount);
+            // Only the shape input of the Reshape is read to infer shapes, the weights are not loaded.
+            var plan = g.Compile(shapes);
+            Assert.Equal(loaded + 1, g.Initializers.MaterializedCount);
+            Assert.True(g.Initializers.IsMaterialized("Pooling160_Output_0_reshape0_shape"));
+            Assert.Equal(new[] { 16, 8, 5, 5 }, plan.SlotShapes[plan.Slots["Parameter87"]]!.Dims);
+            Assert.False(g.Initializers.IsMaterialized("Parameter87"));
+        }
+
+        [Fact]
+        public void CanLoadFromCache()
+        {
+            var cache = new ModelCache(Path.Combine(Path.GetTempPath(), Path.GetRandomFileName()));
+            var g = Model.Load("models\\mnist-8.onnx", cache)!;
+            Assert.True(cache.Contains(ModelCache.GetKey("models\\mnist-8.onnx")));
+            Assert.Equal(ModelCache.GetKey("models\\mnist-8.onnx"), cache.GetCachedKey("models\\mnist-8.onnx"));
+            var c = Model.Load("models\\mnist-8.onnx", cache)!;
+            Assert.Equal(g.Nodes.Select(n => n.Op), c.Nodes.Select(n => n.Op));
+            Assert.Equal(0, c.Initializers.MaterializedCount);
+            var ui = Data.GetInputTensorsFromFileArgs(new[] { "images\\mnist4.png::mnist" })!;
+            Assert.True(g.Execute(ui, true));
+            Assert.True(c.Execute(ui, true));
+            Assert.Equal(((Tensor<float>) g.Outputs.Values.First()).ToArray(), ((Tensor<float>) c.Outputs.Values.First()).ToArray());
+        }
+
+        [Fact]
+        public void CanConvertRawTensorDataWithoutCopy()
+        {
+            var tp = new global::Onnx.TensorProto { Name = "w", DataType = (int) TensorElementType.Float };
+            tp.Dims.Add(2);
+            tp.Dims.Add(3);
+            tp.RawData = Google.Protobuf.ByteString.CopyFrom(Enumerable.Range(0, 6).SelectMany(i => BitConverter.GetBytes((float) i)).ToArray());
+            var t = (DenseTensor<float>) tp.ToTensor();
+            Assert.Equal("w", t.Name);
+            Assert.Equal(5.0f, t[1, 2]);
+            Assert.False(MemoryMarshal.TryGetArray<float>(t.Buffer, out _));
+            Assert.True(t.IsReadOnly);
+            Assert.Throws<InvalidOperationException>(() => t[0, 0] = 1.0f);
+        }
     }
 }
\ No newline at end of file
@@ -47,6 +47,28 @@ namespace Lokad.Onnx.Backend.Tests
             Assert.NotEmpty(r);
         }
 
+        [Fact]
+        public void CanMatMulAdd()
+        {
+            var A = Tensor<float>.Rand(2, 3, 70, 80);
+            var B = Tensor<float>.Rand(80, 96);
+            var C = Tensor<float>.Rand(96);
+            var r = CPU.MatMulAdd(A, B, C);
+            Assert.Equal(OpStatus.Success, r.Status);
+            var e = CPU.Add(CPU.MatMul(A, B).Outputs[0], C);
+            Assert.Equal(e.Outputs[0].Dims, r.Outputs[0].Dims);
+            for (int i = 0; i < r.Outputs[0].Length; i++)
+            {
+                Assert.Equal((float) e.Outputs[0].GetValue(i), (float) r.Outputs[0].GetValue(i), 3);
+            }
+
+            // A bias that is not a row vector is added after the product.
+            C = Tensor<float>.Rand(70, 96);
+            r = CPU.MatMulAdd(A, B, C);
+            Assert.Equal(OpStatus.Success, r.Status);
+            Assert.Equal(new[] { 2, 3, 70, 96 }, r.Outputs[0].Dims);
+        }
+
         [Fact]
         public void CanGetShape()
         {
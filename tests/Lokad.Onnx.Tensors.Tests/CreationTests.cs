@@ -10,5 +10,141 @@ public class CreationTests
         var t2 = t.Reshape(7, 3);
         Assert.Equal(20, t2[6, 2]);
     }
-}
 
+    [Fact]
+    public void CanCreateFromArena()
+    {
+        var arena = new TensorArena();
+        for (int i = 0; i < 2; i++)
+        {
+            using (arena.Activate())
+            {
+                var x = Tensor<float>.Ones(4, 8);
+                arena.BeginNode();
+                var y = Tensor<float>.Add(x, x);
+                arena.EndNode(new ITensor[] { x }, new ITensor[] { y });
+                arena.BeginNode();
+                var z = y.Reshape(8, 4);
+                arena.EndNode(new ITensor[] { y }, new ITensor[] { z });
+                arena.Release(y);
+                Assert.Equal(2.0f, z[7, 3]);
+                arena.Release(z);
+                arena.EndRun();
+            }
+        }
+        Assert.Null(TensorArena.Current);
+        Assert.Equal(1, arena.Hits);
+        Assert.Equal(4 * 8 * sizeof(float), arena.BytesReused);
+    }
+
+    [Fact]
+    public unsafe void CanCreateFromNativeMemory()
+    {
+        var data = new float[24];
+        for (int i = 0; i < data.Length; i++) data[i] = i;
+        fixed (float* p = data)
+        {
+            var t = DenseTensor<float>.OfNativeMemory((IntPtr)p, new[] { 2, 3, 4 });
+            Assert.Equal(23.0f, t[1, 2, 3]);
+            t[0, 0, 1] = 100.0f;
+            Assert.Equal(100.0f, data[1]);
+            var t2 = t.Reshape(6, 4);
+            Assert.Equal(23.0f, t2[5, 3]);
+            var c = Tensor<float>.Add(t, t);
+            Assert.Equal(46.0f, c[1, 2, 3]);
+        }
+    }
+
+    [Fact]
+    public unsafe void CanCreateFromBytes()
+    {
+        var data = new float[24];
+        for (int i = 0; i < data.Length; i++) data[i] = i;
+        var bytes = new byte[data.Length * sizeof(float) + 1];
+        Buffer.BlockCopy(data, 0, bytes, 1, data.Length * sizeof(float));
+        var t = DenseTensor<float>.OfBytes(bytes.AsMemory(1), new[] { 2, 3, 4 });
+        Assert.Equal(23.0f, t[1, 2, 3]);
+        t[0, 0, 1] = 100.0f;
+        Assert.Equal(100.0f, BitConverter.ToSingle(bytes, 1 + sizeof(float)));
+        var c = Tensor<float>.Add(t, t);
+        Assert.Equal(46.0f, c[1, 2, 3]);
+        using (var h = t.Buffer.Pin())
+        {
+            Assert.Equal(23.0f, ((float*) h.Pointer)[23]);
+        }
+        Assert.Throws<ArgumentException>(() => DenseTensor<float>.OfBytes(bytes, new[] { 2, 3, 4 }));
+    }
+
+    [Fact]
+    public void CanCreateReadOnlyFromBytes()
+    {
+        var bytes = new byte[6 * sizeof(float)];
+        Buffer.BlockCopy(new float[] { 0, 1, 2, 3, 4, 5 }, 0, bytes, 0, bytes.Length);
+        var t = DenseTensor<float>.OfReadOnlyBytes(new ReadOnlyMemory<byte>(bytes), new[] { 2, 3 });
+        Assert.True(t.IsReadOnly);
+        Assert.Equal(5.0f, t[1, 2]);
+        Assert.Throws<InvalidOperationException>(() => t[0, 1] = 100.0f);
+        var r = (DenseTensor<float>) t.Reshape(new[] { 3, 2 });
+        Assert.True(r.IsReadOnly);
+        Assert.Throws<InvalidOperationException>(() => r[0, 1] = 100.0f);
+        Assert.True(((DenseTensor<float>) Tensor<float>.Transpose(t.Reshape(new[] { 1, 6 })).Reshape(new[] { 6 })).IsReadOnly);
+        var c = t.Clone();
+        Assert.False(c.IsReadOnly);
+        c[0, 1] = 100.0f;
+        Assert.Equal(1.0f, BitConverter.ToSingle(bytes, sizeof(float)));
+    }
+
+    [Fact]
+    public unsafe void CanAccessElementsOfReinterpretedBytes()
+    {
+        var data = new float[] { 0, 1, 2, 3, 4, 5 };
+        var bytes = new byte[1 + data.Length * sizeof(float)];
+        Buffer.BlockCopy(data, 0, bytes, 1, data.Length * sizeof(float));
+        // The elements start at an unaligned offset of the managed bytes.
+        var t = DenseTensor<float>.OfBytes(new Memory<byte>(bytes, 1, data.Length * sizeof(float)), new[] { 2, 3 });
+        Assert.Equal(4.0f, t[1, 1]);
+        t[0, 2] = 100.0f;
+        Assert.Equal(100.0f, BitConverter.ToSingle(bytes, 1 + 2 * sizeof(float)));
+        Assert.Equal(5.0f, ((DenseTensor<float>) t.Reshape(new[] { 3, 2 }))[2, 1]);
+        Assert.Throws<IndexOutOfRangeException>(() => t.GetValue(6));
+        fixed (float* p = data)
+        {
+            var native = new NativeMemoryManager<byte>((byte*) p, data.Length * sizeof(float));
+            var n = DenseTensor<float>.OfBytes(native.Memory.Slice(sizeof(float)), new[] { 5 });
+            Assert.Equal(3.0f, n[2]);
+            n[4] = 100.0f;
+            Assert.Equal(100.0f, data[5]);
+            Assert.Throws<IndexOutOfRangeException>(() => n.SetValue(5, 0.0f));
+        }
+    }
+
+    [Fact]
+    public unsafe void CanPinReversedStrideTensor()
+    {
+        var t = new DenseTensor<float>(new[] { 2, 3 }, true);
+        for (int i = 0; i < 2; i++)
+        {
+            for (int j = 0; j < 3; j++) t[i, j] = 10 * i + j;
+        }
+        using var buffer = PinnedTensorBuffer.Create(t);
+        Assert.False(((Tensor<float>) buffer.Tensor).IsReversedStride);
+        Assert.Equal(new[] { 2, 3 }, buffer.Dims);
+        Assert.Equal(new float[] { 0, 1, 2, 10, 11, 12 }, new Span<float>((float*) buffer.Pointer, 6).ToArray());
+    }
+
+    [Fact]
+    public unsafe void CanCastInPlace()
+    {
+        var t = new DenseTensor<int>(new[] { 1, -2, 3, 40, 5, 6 }, new[] { 2, 3 });
+        var f = t.CastInPlace<float>();
+        Assert.Equal(new[] { 2, 3 }, f.Dimensions.ToArray());
+        Assert.Equal(40.0f, f[1, 0]);
+        using (var h = f.Buffer.Pin())
+        {
+            Assert.Equal(-2.0f, ((float*) h.Pointer)[1]);
+        }
+        Assert.Equal(1.0f, BitConverter.Int32BitsToSingle(t[0, 0]));
+        Assert.Null(((ITensor) DenseTensor<int>.OfShape(2)).CastInPlace<double>());
+        Assert.Equal(new long[] { 3, 40 }, ((Tensor<long>) ((ITensor) new DenseTensor<double>(new[] { 3.0, 40.0 }, new[] { 2 })).CastInPlace<long>()!).ToArray());
+    }
+}
@@ -0,0 +1,11 @@
+﻿namespace Lokad.Onnx.Tensors.Tests;
+
+/// <summary>
+/// Test classes that change the process-wide <see cref="HardwareConfig"/> flags. They run on their own so that
+/// tests in other classes never pick up a kernel selected by a flag set mid-run.
+/// </summary>
+[CollectionDefinition(Name, DisableParallelization = true)]
+public class HardwareConfigCollection
+{
+    public const string Name = "HardwareConfig";
+}
@@ -42,7 +42,71 @@ public class MathTests
         var b = Tensor<float>.Rand(8, 8, 8, 8);
         var c = Tensor<float>.Add(a, b);
     }
-    
+
+    [Fact]
+    public void CanBroadcastWithoutMaterializing()
+    {
+        var a = Tensor<float>.Arange(0.0f, 2 * 3 * 37).Reshape(2, 3, 37);
+        var bias = Tensor<float>.Arange(0.0f, 37).Reshape(37);
+        var c = Tensor<float>.Add(a, bias);
+        Assert.Equal(new int[] { 2, 3, 37 }, c.Dimensions.ToArray());
+        Assert.Equal(a[1, 2, 36] + bias[36], c[1, 2, 36]);
+
+        var s = Tensor<float>.Arange(1.0f, 4).Reshape(3, 1);
+        var d = Tensor<float>.Divide(a, s);
+        Assert.Equal(a[1, 2, 5] / s[2, 0], d[1, 2, 5]);
+        var e = Tensor<float>.Subtract(s, a);
+        Assert.Equal(s[1, 0] - a[0, 1, 20], e[0, 1, 20]);
+
+        var x = Tensor<float>.Arange(0.0f, 5).Reshape(5, 1);
+        var y = Tensor<float>.Arange(0.0f, 7).Reshape(1, 7);
+        var m = Tensor<float>.Multiply(x, y);
+        Assert.Equal(new int[] { 5, 7 }, m.Dimensions.ToArray());
+        Assert.Equal(24, m[4, 6]);
+        Assert.Equal(8, Tensor<float>.Pow(y, DenseTensor<float>.Scalar(3))[0, 2]);
+
+        Assert.True(Tensor<float>.Broadcast(x, y, out var bx, out var by));
+        Assert.Equal(m.ToArray(), Tensor<float>.Multiply(bx, by).ToArray());
+    }
+
+    [Fact]
+    public void CanApplyInPlace()
+    {
+        var a = Tensor<float>.Arange(-50.0f, 50.0f).Reshape(2, 5, 10);
+        var bias = Tensor<float>.Arange(0.0f, 10).Reshape(10);
+        var expected = Tensor<float>.Relu(Tensor<float>.Add(a, bias)).ToArray();
+        var c = Tensor<float>.Add(a, bias, a);
+        Assert.Same(a, c);
+        Assert.Same(a, Tensor<float>.Relu(a, a));
+        Assert.Equal(expected, a.ToArray());
+        Assert.Same(a, Tensor<float>.Erf(a, a));
+        Assert.Throws<ArgumentException>(() => Tensor<float>.Add(a, bias, bias));
+    }
+
+    [Fact]
+    public void CanWriteToDestination()
+    {
+        var x = Tensor<float>.Rand(2, 6, 8);
+        var w = Tensor<float>.Rand(8, 5);
+        var bias = Tensor<float>.Rand(5);
+        var d = Tensor<float>.Ones(2, 6, 5);
+        Assert.Same(d, Tensor<float>.MatMul(x, w, null, d));
+        Assert.Equal(Tensor<float>.MatMul(x, w).ToArray(), d.ToArray());
+        Assert.Same(d, Tensor<float>.MatMul(x, w, bias, d));
+        Assert.Equal(Tensor<float>.MatMul(x, w, bias).ToArray(), d.ToArray());
+        var x2 = Tensor<float>.Rand(6, 8);
+        var d2 = Tensor<float>.Ones(6, 5);
+        Assert.Same(d2, Tensor<float>.MatMul2D(x2, w, null, d2));
+        Assert.Equal(Tensor<float>.MatMul2D(x2, w).ToArray(), d2.ToArray());
+        var s = Tensor<float>.Ones(2, 6, 8);
+        Assert.Same(s, Tensor<float>.Softmax(x, 1, s));
+        Assert.Equal(Tensor<float>.Softmax(x, 1).ToArray(), s.ToArray());
+        var scale = Tensor<float>.Rand(8);
+        Assert.Same(s, Tensor<float>.LayerNormalization(x, scale, null, -1, 1e-5f, out _, out _, s));
+        Assert.Equal(Tensor<float>.LayerNormalization(x, scale, null, -1, 1e-5f, out _, out _).ToArray(), s.ToArray());
+        Assert.Throws<ArgumentException>(() => Tensor<float>.MatMul(x, w, null, s));
+    }
+
     [Fact]
     public unsafe void CanMatMul2D()
     {
@@ -176,6 +240,50 @@ public class MathTests
         Assert.NotNull(output); 
     }
 
+    [Fact]
+    public void CanReduceAlongAnyAxes()
+    {
+        var x = Tensor<float>.Arange(-1000.0f, 1000.0f).Reshape(4, 10, 50);
+        var inner = Tensor<float>.ReduceSum(x, new[] { -1 }.ToTensor<int>());
+        var middle = Tensor<float>.ReduceSum(x, new[] { 1 }.ToTensor<int>());
+        var outer = Tensor<float>.ReduceMax(x, new[] { 0 }.ToTensor<int>(), false);
+        var both = Tensor<float>.ReduceSum(x, new[] { 0, 2 }.ToTensor<int>(), true);
+        Assert.Equal(new[] { 4, 10 }, inner.Dimensions.ToArray());
+        Assert.Equal(new[] { 4, 50 }, middle.Dimensions.ToArray());
+        Assert.Equal(new[] { 10, 50 }, outer.Dimensions.ToArray());
+        Assert.Equal(new[] { 1, 10, 1 }, both.Dimensions.ToArray());
+        for (int i = 0; i < 4; i++)
+        {
+            for (int j = 0; j < 10; j++)
+            {
+                Assert.Equal(Enumerable.Range(0, 50).Sum(k => x[i, j, k]), inner[i, j]);
+                Assert.Equal(x[3, j, 7], outer[j, 7]);
+            }
+            Assert.Equal(Enumerable.Range(0, 10).Sum(j => x[i, j, 13]), middle[i, 13]);
+        }
+        Assert.Equal(Enumerable.Range(0, 4).Sum(i => Enumerable.Range(0, 50).Sum(k => x[i, 6, k])), both[0, 6, 0]);
+        Assert.Equal(-3.0f, Tensor<float>.ReduceMax(Tensor<float>.Arange(-10.0f, -2.0f), null, false).GetValue(0));
+    }
+
+    [Fact]
+    public void CanComputeOnStridedViews()
+    {
+        var x = Tensor<float>.Arange(-100.0f, 92.0f).Reshape(4, 6, 8);
+        var xt = Tensor<float>.Transpose(x, new int[] { 0, 2, 1 });
+        var d = xt.ToDenseTensor();
+        Assert.Equal(Tensor<float>.Add(d, d).ToArray(), Tensor<float>.Add(xt, d).ToArray());
+        Assert.Equal(Tensor<float>.Sqrt(d).ToArray(), Tensor<float>.Sqrt(xt).ToArray());
+        Assert.Equal(Tensor<float>.ReduceSum(d, new[] { 1 }.ToTensor<int>()).ToArray(), Tensor<float>.ReduceSum(xt, new[] { 1 }.ToTensor<int>()).ToArray());
+        Assert.Equal(Tensor<float>.ReduceMax(d, new[] { 0, 2 }.ToTensor<int>()).ToArray(), Tensor<float>.ReduceMax(xt, new[] { 0, 2 }.ToTensor<int>()).ToArray());
+
+        var a = Tensor<float>.Arange(0.0f, 128 * 96).Reshape(128, 96).Apply(v => v % 7);
+        var b = Tensor<float>.Arange(0.0f, 2 * 112 * 96).Reshape(2, 112, 96).Apply(v => v % 5);
+        var bt = Tensor<float>.Transpose(b, new int[] { 0, 2, 1 });
+        Assert.Equal(Tensor<float>.MatMul(a, bt.ToDenseTensor()).ToArray(), Tensor<float>.MatMul(a, bt).ToArray());
+        var b0 = Tensor<float>.Slice(b, new[] { 0 }.ToTensor<int>(), new[] { 1 }.ToTensor<int>()).Reshape(112, 96);
+        Assert.Equal(Tensor<float>.MatMul2D(a, Tensor<float>.Transpose(b0).ToDenseTensor()).ToArray(), Tensor<float>.MatMul2D(a, Tensor<float>.Transpose(b0)).ToArray());
+    }
+
     [Fact]
     public void CanSoftmax()
     {
@@ -183,6 +291,80 @@ public class MathTests
         var o = Tensor<float>.Softmax(data, 0);
     }
 
+    [Fact]
+    public void CanGelu()
+    {
+        var x = Tensor<float>.Rand(3, 5, 77);
+        var y = Tensor<float>.Gelu(x);
+        var e = Tensor<float>.Erf(x);
+        for (int i = 0; i < x.Length; i++)
+        {
+            var v = (double) x.GetValue(i);
+            Assert.Equal(0.5 * v * (1.0 + MathOps.Erf(v / Math.Sqrt(2.0))), y.GetValue(i), 5);
+            Assert.Equal(MathOps.Erf(v), e.GetValue(i), 5);
+        }
+    }
+
+    [Fact]
+    public void CanLayerNormalize()
+    {
+        var x = Tensor<float>.Rand(4, 3, 100);
+        var scale = Tensor<float>.Rand(100);
+        var bias = Tensor<float>.Rand(100);
+        var y = Tensor<float>.LayerNormalization(x, scale, bias, -1, 1e-5f, out var mean, out var invStdDev);
+        Assert.Equal(new[] { 4, 3, 1 }, mean.Dimensions.ToArray());
+        foreach (var idx in mean.GetDimensionsIterator())
+        {
+            var row = (int[]) idx.Clone();
+            double m = 0.0, v = 0.0;
+            for (row[2] = 0; row[2] < 100; row[2]++) m += x[row] / 100.0;
+            for (row[2] = 0; row[2] < 100; row[2]++) v += (x[row] - m) * (x[row] - m) / 100.0;
+            var r = 1.0 / Math.Sqrt(v + 1e-5);
+            Assert.Equal(m, mean[idx], 1e-5);
+            Assert.Equal(r, invStdDev[idx], 1e-4 * r);
+            for (row[2] = 0; row[2] < 100; row[2]++) Assert.Equal((x[row] - m) * r * scale[row[2]] + bias[row[2]], y[row], 1e-4);
+        }
+    }
+
+    [Fact]
+    public void CanSoftmaxOnEachAxis()
+    {
+        var x = Tensor<float>.Rand(3, 7, 600);
+        for (int axis = 0; axis < 3; axis++)
+        {
+            var o = Tensor<float>.Softmax(x, axis);
+            var n = x.Dimensions[axis];
+            foreach (var idx in x.GetDimensionsIterator())
+            {
+                var row = (int[]) idx.Clone();
+                double m = double.NegativeInfinity, s = 0.0;
+                for (row[axis] = 0; row[axis] < n; row[axis]++) m = Math.Max(m, x[row]);
+                for (row[axis] = 0; row[axis] < n; row[axis]++) s += Math.Exp(x[row] - m);
+                Assert.Equal(Math.Exp(x[idx] - m) / s, o[idx], 5);
+            }
+        }
+    }
+
+    [Fact]
+    public void CanSoftmaxWithMaskedPrefix()
+    {
+        // A left-padded attention mask: the masked positions span more than one block of the row kernel.
+        var x = Tensor<float>.Rand(2, 1000).ToDenseTensor();
+        for (int i = 0; i < 600; i++)
+        {
+            x[0, i] = float.NegativeInfinity;
+            x[1, i] = float.NegativeInfinity;
+        }
+        var o = Tensor<float>.Softmax(x, -1);
+        for (int r = 0; r < 2; r++)
+        {
+            double m = double.NegativeInfinity, s = 0.0;
+            for (int i = 0; i < 1000; i++) m = Math.Max(m, x[r, i]);
+            for (int i = 0; i < 1000; i++) s += Math.Exp(x[r, i] - m);
+            for (int i = 0; i < 1000; i++) Assert.Equal(Math.Exp(x[r, i] - m) / s, o[r, i], 5);
+        }
+    }
+
     
     /*
     public unsafe void CanTranspose()
@@ -6,6 +6,7 @@ using System.Threading.Tasks;
 
 namespace Lokad.Onnx.Tensors.Tests
 {
+    [Collection(HardwareConfigCollection.Name)]
     public class ShapeTests
     {
         [Fact]
@@ -118,6 +119,64 @@ namespace Lokad.Onnx.Tensors.Tests
             Assert.Throws<ArgumentException>(() => Tensor<int>.Transpose(X, new int[] { 2, 6 }));
         }
 
+        [Fact]
+        public void CanTransposeAlongAnyAxes()
+        {
+            var X = Tensor<float>.Arange(0.0f, 2 * 37 * 5 * 9).Reshape(2, 37, 5, 9);
+            var useIntrinsics = HardwareConfig.UseIntrinsics;
+            try
+            {
+                foreach (var intrinsics in new[] { false, true })
+                {
+                    HardwareConfig.UseIntrinsics = intrinsics;
+                    foreach (var perm in new[] { new[] { 0, 2, 1, 3 }, new[] { 0, 2, 3, 1 }, new[] { 0, 1, 3, 2 }, new[] { 3, 2, 1, 0 }, new[] { 0, 1, 2, 3 } })
+                    {
+                        var Y = Tensor<float>.Transpose(X, (int[]) perm.Clone());
+                        Assert.Equal(perm.Select(p => X.Dimensions[p]).ToArray(), Y.Dimensions.ToArray());
+                        foreach (var index in X.GetDimensionsIterator())
+                        {
+                            Assert.Equal(X[index], Y[perm.Select(p => index[p]).ToArray()]);
+                        }
+                    }
+                }
+            }
+            finally
+            {
+                HardwareConfig.UseIntrinsics = useIntrinsics;
+            }
+            var B = Tensor<int>.Transpose(DenseTensor<int>.Ones(1, 3, 1, 4), new int[] { 3, 1, 0, 2 });
+            Assert.Equal(new int[] { 4, 3, 1, 1 }, B.Dimensions.ToArray());
+            Assert.Equal(0, Tensor<int>.Transpose(DenseTensor<int>.OfShape(2, 0, 3)).Length);
+        }
+
+        [Fact]
+        public void CanViewWithStrides()
+        {
+            var X = Tensor<float>.Arange(0.0f, 2 * 6 * 5).Reshape(2, 6, 5);
+            var T = Tensor<float>.Transpose(X, new int[] { 2, 0, 1 });
+            Assert.IsType<StridedTensor<float>>(T);
+            Assert.Equal(X[1, 3, 4], T[4, 1, 3]);
+            var R = T.Reshape(5, 12);
+            Assert.IsType<StridedTensor<float>>(R);
+            Assert.Equal(X[1, 3, 4], R[4, 9]);
+            Assert.Equal(X[1, 3, 4], Tensor<float>.Transpose(X, new int[] { 0, 2, 1 }).Reshape(2, 30)[1, 27]);
+
+            var S = Tensor<float>.Slice(X, new[] { 1, 4 }.ToTensor<int>(), new[] { 6, 0 }.ToTensor<int>(), new[] { 1, 2 }.ToTensor<int>(), new[] { 2, -2 }.ToTensor<int>());
+            Assert.IsType<StridedTensor<float>>(S);
+            Assert.Equal(new int[] { 2, 3, 2 }, S.Dimensions.ToArray());
+            var U = Tensor<float>.Unsqueeze(S, new int[] { 0 });
+            Assert.IsType<StridedTensor<float>>(U);
+            var D = U.ToDenseTensor();
+            foreach (var index in S.GetDimensionsIterator())
+            {
+                Assert.Equal(X[index[0], 1 + 2 * index[1], 4 - 2 * index[2]], S[index]);
+                Assert.Equal(S[index], D[0, index[0], index[1], index[2]]);
+            }
+            S[1, 2, 1] = -1.0f;
+            Assert.Equal(-1.0f, X[1, 5, 2]);
+            Assert.IsType<DenseTensor<float>>(Tensor<float>.Slice(X, new[] { 1 }.ToTensor<int>(), new[] { 2 }.ToTensor<int>()));
+        }
+
         [Fact]
         public void CanConcat()
         {
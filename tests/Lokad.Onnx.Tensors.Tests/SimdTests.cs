@@ -5,6 +5,7 @@ using Xunit;
 
 
 using static Lokad.Onnx.MathOps;
+[Collection(HardwareConfigCollection.Name)]
 public class SimdTests
 {
     public SimdTests()
@@ -40,6 +41,39 @@ public class SimdTests
         mm_unsafe_vectorized_intrinsics(384, 384, 384, (float*)ah.Pointer, (float*)bh.Pointer, (float*)c2h.Pointer);
         Assert.Equal(t_384_384_c2[0,1], t_384_384_cr[0,1], .00001f);
     }
+
+    [Fact]
+    public unsafe void CanMatMulVectorizedIntrinsics2x4()
+    {
+        if (!System.Runtime.Intrinsics.X86.Fma.IsSupported) return;
+        mm_unsafe_vectorized_intrinsics_2x4(384, 384, 384, (float*)ah.Pointer, (float*)bh.Pointer, (float*)c2h.Pointer);
+        Assert.Equal(t_384_384_c2[0, 1], t_384_384_cr[0, 1], .001f);
+        Assert.Equal(t_384_384_c2[3, 1], t_384_384_cr[3, 1], .001f);
+        Assert.Equal(t_384_384_c2[383, 383], t_384_384_cr[383, 383], .001f);
+    }
+
+    [Fact]
+    public unsafe void CanMatMulBlockedParallel()
+    {
+        mm_blocked_parallel(384, 384, 384, (float*)ah.Pointer, (float*)bh.Pointer, (float*)c2h.Pointer, 4);
+        Assert.Equal(t_384_384_c2, t_384_384_cr);
+        var a = Tensor<float>.Rand(3, 4, 67, 129);
+        var b = Tensor<float>.Rand(4, 129, 131);
+        var useSimd = HardwareConfig.UseSimd;
+        try
+        {
+            HardwareConfig.UseSimd = false;
+            var c = Tensor<float>.MatMul(a, b);
+            HardwareConfig.UseSimd = true;
+            var c2 = Tensor<float>.MatMul(a, b);
+            Assert.Equal(c, c2);
+        }
+        finally
+        {
+            HardwareConfig.UseSimd = useSimd;
+        }
+    }
+
     #region Fields
     Tensor<float> t_384_384_a = Tensor<float>.Zeros(0);
     Tensor<float> t_384_384_b = Tensor<float>.Zeros(0);
@@ -6,6 +6,7 @@ import itertools
 
 import numpy as np
 import onnx
+from onnx import numpy_helper
 from onnx.reference import ReferenceEvaluator
 
 from interop import backend
@@ -33,7 +34,9 @@ def reference_eval_node(node:onnx.NodeProto, args:Dict[str, np.ndarray]):
 
 def test_load_graph():
     g = backend.load_graph(os.path.join(file_dir, "..", "..", "tests", "Lokad.Onnx.Backend.Tests", "models", "mnist-8.onnx"))
-    assert g.Nodes.Count == 12
+    assert g.Model.Graph.Node.Count == 12
+    # Times212_reshape1 is folded into an initializer and Times212 and Plus214 are fused into one MatMulAdd node.
+    assert g.Nodes.Count == 10
 
 def test_model_run():
     node = onnx.helper.make_node(
@@ -55,14 +58,79 @@ def test_model_run():
     assert len(a.shape) == 2
     assert a.shape[1] == 5
     assert a[0,1] == 2  
+
+
+def test_model_run_with_outputs():
+    node = onnx.helper.make_node(
+            name="Add1",
+            op_type="Add",
+            inputs=["x", "y"],
+            outputs=["Add1"],
+    )
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.INT32, [4,5])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.INT32, [4,5])
+    Add1 = onnx.helper.make_tensor_value_info("Add1", onnx.TensorProto.INT32, [4,5])
+    graph = onnx.helper.make_graph([node], "graph1", [x, y], [Add1])
+    model = onnx.helper.make_model(graph)
+    rep = backend.prepare(model)
+    p = np.arange(0, 20, dtype=np.int32).reshape(4, 5)
+    o = np.empty((4, 5), dtype=np.int32)
+    r = rep.run([p, p], outputs={"Add1": o})
+    assert r[0] is o
+    assert o[0,1] == 2
+    r = rep.run([p, p], out=[o], zero_copy=True)
+    assert r[0] is o
+    np.testing.assert_equal(o, p + p)
+
+def test_model_run_concurrently():
+    from concurrent.futures import ThreadPoolExecutor
+    node = onnx.helper.make_node(
+            name="Mul1",
+            op_type="Mul",
+            inputs=["x", "y"],
+            outputs=["Mul1"],
+    )
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.INT32, [4,5])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.INT32, [4,5])
+    Mul1 = onnx.helper.make_tensor_value_info("Mul1", onnx.TensorProto.INT32, [4,5])
+    graph = onnx.helper.make_graph([node], "graph1", [x, y], [Mul1])
+    model = onnx.helper.make_model(graph)
+    rep = backend.prepare(model)
+    ps = [np.full((4, 5), i, dtype=np.int32) for i in range(16)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        rs = list(pool.map(lambda p: rep.run([p, p], copy=True)[0], ps))
+    for p, r in zip(ps, rs):
+        np.testing.assert_equal(r, p * p)
     
 def test_model_file_run():
     rep = backend.prepare_file(onnx_model_file)
-    assert rep.graph.Nodes.Count == 12
+    assert rep.graph.Nodes.Count == 10
     inputs = [mnist4]
     file_args = [0]
     r = rep.run(inputs, file_args=file_args, use_initializers=True)
 
+def test_model_file_run_cached(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    rep = backend.prepare_file(onnx_model_file, cache_dir=cache_dir)
+    r = rep.run([mnist4], file_args=[0], use_initializers=True)
+    assert len(os.listdir(cache_dir)) == 2
+    cached = backend.prepare_file(onnx_model_file, cache_dir=cache_dir)
+    assert cached.graph.Nodes.Count == rep.graph.Nodes.Count
+    assert cached.graph.Initializers.MaterializedCount == 0
+    c = cached.run([mnist4], file_args=[0], use_initializers=True)
+    np.testing.assert_equal(c[0], r[0])
+
+def test_model_file_run_output_names():
+    rep = backend.prepare_file(onnx_model_file)
+    r = rep.run([mnist4], file_args=[0], use_initializers=True)
+    p = rep.run([mnist4], file_args=[0], use_initializers=True, output_names=["Pooling66_Output_0"])
+    assert len(p) == 1
+    assert p[0].shape == (1, 8, 14, 14)
+    o = rep.run([mnist4], file_args=[0], use_initializers=True, output_names=["Pooling66_Output_0", "Plus214_Output_0"])
+    assert o._fields == ("Pooling66_Output_0", "Plus214_Output_0")
+    np.testing.assert_equal(o[0], p[0])
+    np.testing.assert_equal(o[1], r[0])
+
 def test_node_run():
     node = onnx.helper.make_node(
             name="Add2",
@@ -219,6 +287,126 @@ def test_erf():
     output = backend.run_node(node_def, [x])
     np.testing.assert_allclose(output['Y'], y, rtol=1e-6, atol=1e-6)
 
+def test_gelu():
+    node_def = onnx.helper.make_node("Gelu", ["X"], ["Y"], "Gelu1")
+    x = np.random.randn(3, 4, 37).astype(np.float32)
+    output = backend.run_node(node_def, [x])
+    y = (0.5 * x * (1.0 + np.vectorize(math.erf)(x / math.sqrt(2.0)))).astype(np.float32)
+    np.testing.assert_allclose(output['Y'], y, rtol=1e-6, atol=1e-6)
+
+    node_def = onnx.helper.make_node("Gelu", ["X"], ["Y"], "Gelu2", approximate="tanh")
+    output = backend.run_node(node_def, [x])
+    y = (0.5 * x * (1.0 + np.tanh(math.sqrt(2.0 / math.pi) * (x + 0.044715 * x ** 3)))).astype(np.float32)
+    np.testing.assert_allclose(output['Y'], y, rtol=1e-5, atol=1e-6)
+
+def test_gelu_fusion():
+    nodes = [
+        onnx.helper.make_node("Div", ["x", "sqrt2"], ["d"], "Div1"),
+        onnx.helper.make_node("Erf", ["d"], ["e"], "Erf1"),
+        onnx.helper.make_node("Add", ["e", "one"], ["a"], "Add1"),
+        onnx.helper.make_node("Mul", ["x", "a"], ["m"], "Mul1"),
+        onnx.helper.make_node("Mul", ["m", "half"], ["y"], "Mul2"),
+    ]
+    initializers = [
+        numpy_helper.from_array(np.array([math.sqrt(2.0)], dtype=np.float32), "sqrt2"),
+        numpy_helper.from_array(np.array([1.0], dtype=np.float32), "one"),
+        numpy_helper.from_array(np.array([0.5], dtype=np.float32), "half"),
+    ]
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [2, 8, 64])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [2, 8, 64])
+    graph = onnx.helper.make_graph(nodes, "gelu", [x], [y], initializers)
+    model = onnx.helper.make_model(graph)
+    rep = backend.prepare(model)
+    assert rep.graph.Nodes.Count == 1
+    assert str(rep.graph.Nodes[0].Op) == "Gelu"
+    p = np.random.randn(2, 8, 64).astype(np.float32)
+    r = rep.run([p], use_initializers=True)
+    np.testing.assert_allclose(r[0], ReferenceEvaluator(model).run(None, {"x": p})[0], rtol=1e-5, atol=1e-6)
+
+def test_layer_normalization():
+    x = np.random.randn(2, 5, 48).astype(np.float32)
+    scale = np.random.randn(48).astype(np.float32)
+    bias = np.random.randn(48).astype(np.float32)
+    node_def = onnx.helper.make_node("LayerNormalization", ["X", "Scale", "B"], ["Y", "Mean", "InvStdDev"], "LayerNorm1", epsilon=1e-5)
+    output = backend.run_node(node_def, [x, scale, bias])
+    m = x.mean(axis=-1, keepdims=True)
+    r = 1.0 / np.sqrt(((x - m) ** 2).mean(axis=-1, keepdims=True) + 1e-5)
+    np.testing.assert_allclose(output['Y'], (x - m) * r * scale + bias, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(output['Mean'], m, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(output['InvStdDev'], r, rtol=1e-4, atol=1e-5)
+
+def test_layer_normalization_fusion():
+    nodes = [
+        onnx.helper.make_node("ReduceMean", ["x"], ["m"], "ReduceMean1", axes=[-1]),
+        onnx.helper.make_node("Sub", ["x", "m"], ["d"], "Sub1"),
+        onnx.helper.make_node("Pow", ["d", "two"], ["p"], "Pow1"),
+        onnx.helper.make_node("ReduceMean", ["p"], ["v"], "ReduceMean2", axes=[-1]),
+        onnx.helper.make_node("Add", ["v", "eps"], ["ve"], "Add1"),
+        onnx.helper.make_node("Sqrt", ["ve"], ["s"], "Sqrt1"),
+        onnx.helper.make_node("Div", ["d", "s"], ["n"], "Div1"),
+        onnx.helper.make_node("Mul", ["n", "gamma"], ["g"], "Mul1"),
+        onnx.helper.make_node("Add", ["g", "beta"], ["y"], "Add2"),
+    ]
+    initializers = [
+        numpy_helper.from_array(np.array(2.0, dtype=np.float32), "two"),
+        numpy_helper.from_array(np.array(1e-12, dtype=np.float32), "eps"),
+        numpy_helper.from_array(np.random.randn(64).astype(np.float32), "gamma"),
+        numpy_helper.from_array(np.random.randn(64).astype(np.float32), "beta"),
+    ]
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [2, 8, 64])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [2, 8, 64])
+    graph = onnx.helper.make_graph(nodes, "layernorm", [x], [y], initializers)
+    model = onnx.helper.make_model(graph, opset_imports=[onnx.helper.make_opsetid("", 17)])
+    rep = backend.prepare(model)
+    assert rep.graph.Nodes.Count == 1
+    assert str(rep.graph.Nodes[0].Op) == "LayerNormalization"
+    p = np.random.randn(2, 8, 64).astype(np.float32)
+    r = rep.run([p], use_initializers=True)
+    np.testing.assert_allclose(r[0], ReferenceEvaluator(model).run(None, {"x": p})[0], rtol=1e-4, atol=1e-5)
+
+def test_constant_folding():
+    nodes = [
+        onnx.helper.make_node("Transpose", ["w"], ["wt"], "Transpose1"),
+        onnx.helper.make_node("Constant", [], ["s"], "Constant1", value=numpy_helper.from_array(np.array([3, 2], dtype=np.int64))),
+        onnx.helper.make_node("Reshape", ["wt", "s"], ["wr"], "Reshape1"),
+        onnx.helper.make_node("MatMul", ["x", "wr"], ["y"], "MatMul1"),
+    ]
+    w = np.random.randn(2, 3).astype(np.float32)
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [4, 3])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [4, 2])
+    graph = onnx.helper.make_graph(nodes, "fold", [x], [y], [numpy_helper.from_array(w, "w")])
+    model = onnx.helper.make_model(graph)
+    rep = backend.prepare(model)
+    assert rep.graph.Nodes.Count == 1
+    assert str(rep.graph.Nodes[0].Op) == "MatMul"
+    assert not rep.graph.Initializers.ContainsKey("w")
+    p = np.random.randn(4, 3).astype(np.float32)
+    r = rep.run([p], use_initializers=True)
+    np.testing.assert_allclose(r[0], p @ w.T, rtol=1e-5, atol=1e-6)
+
+def test_external_data_model_file_run(tmp_path):
+    nodes = [
+        onnx.helper.make_node("MatMul", ["x", "w"], ["xw"], "MatMul1"),
+        onnx.helper.make_node("Add", ["xw", "b"], ["y"], "Add1"),
+    ]
+    w = np.random.randn(3, 2).astype(np.float32)
+    b = np.random.randn(2).astype(np.float32)
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [4, 3])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [4, 2])
+    graph = onnx.helper.make_graph(nodes, "external", [x], [y], [numpy_helper.from_array(w, "w"), numpy_helper.from_array(b, "b")])
+    model = onnx.helper.make_model(graph)
+    p = np.random.randn(4, 3).astype(np.float32)
+    raw_file = str(tmp_path / "raw.onnx")
+    onnx.save_model(model, raw_file)
+    external_file = str(tmp_path / "external.onnx")
+    onnx.save_model(model, external_file, save_as_external_data=True, all_tensors_to_one_file=True, location="external.bin", size_threshold=0)
+    assert os.path.exists(tmp_path / "external.bin")
+    for f in [raw_file, external_file]:
+        rep = backend.prepare_file(f)
+        np.testing.assert_equal(rep.get_initializer("w"), w)
+        r = rep.run([p], use_initializers=True)
+        np.testing.assert_allclose(r[0], p @ w + b, rtol=1e-5, atol=1e-6)
+
 def test_transpose():
     node_def = onnx.helper.make_node("Transpose", ["X"], ["Y"], perm=[0, 2, 1], name="Transpose")
     x = _get_rnd_float32(shape=[1000]).reshape([10, 10, 10])
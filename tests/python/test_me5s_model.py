@@ -31,7 +31,8 @@ model = AutoModel.from_pretrained('intfloat/multilingual-e5-small')
 
 def test_model_file_prepare():
     rep = backend.prepare_file(onnx_model_file)
-    assert rep.graph.Nodes.Count == 1243
+    assert len(rep.model.graph.node) == 1243
+    assert rep.graph.Nodes.Count < 1243
     assert rep.graph.Inputs.Count == 3
 
 def test_tokenizer():
@@ -18,6 +18,32 @@ def test_convert_tensors():
     assert b.dtype == np.float64
     assert b[1,4,5] == at[1,4,5]
 
+def test_convert_tensors_zero_copy():
+    a = np.random.rand(4,5,6).astype(np.float32)
+    at = tensors.make_tensor_from_ndarray_zero_copy(a)
+    assert at.Rank == 3
+    assert at.Dims[1] == 5
+    assert at[1,4,5] == a[1,4,5]
+    a[1,4,5] = 42.0
+    assert at[1,4,5] == 42.0
+    b = np.asfortranarray(a)
+    bt = tensors.make_tensor_from_ndarray_zero_copy(b)
+    assert bt[1,4,5] == 42.0
+
+def test_convert_tensors_view():
+    t = tensors.arange(0, 12).Reshape(3, 4)
+    a = tensors.make_ndarray_from_tensor(t)
+    assert a.shape == (3, 4)
+    assert a[2, 1] == 9
+    a[2, 1] = 42
+    assert t[2, 1] == 42
+    b = tensors.make_ndarray_from_tensor(t, copy=True)
+    b[0, 0] = 7
+    assert t[0, 0] == 0
+    assert b[2, 1] == 42
+    s = tensors.make_ndarray_from_tensor(t["2:3", "..."])
+    assert s.shape == (1, 4)
+    assert s[0, 1] == 42
 
 def test_arange():
     t  = tensors.arange(0, 9).Reshape(3, 3)